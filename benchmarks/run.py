@@ -0,0 +1,459 @@
+"""Run the benchmark suite and compare it against the stored baseline.
+
+Usage::
+
+    python -m benchmarks.run                     # compare against baseline.json
+    python -m benchmarks.run --size-mb 1024      # a realistic, 1 GB file
+    python -m benchmarks.run --update-baseline   # record this machine's numbers
+
+Each case scans (or downloads) the same synthetic file from
+:mod:`benchmarks.synthetic` and reports records/s and compressed MB/s, taking
+the best of several repeats.  Conversion cases instead time the HTML of the
+file's articles, decoded in advance, and report HTML MB/s and the size of
+their output relative to the HTML.  A case more than ``threshold`` slower than its
+baseline fails the run.  Baselines are machine-specific: record one on the
+machine you compare on.
+"""
+
+import gzip
+import json
+import os
+import random
+import shutil
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import cache, partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from itertools import pairwise
+from typing import NamedTuple
+
+import cc_news_analyzer.index
+import click
+from cc_news_analyzer.articles import decode_body, html_to_text, iter_articles
+from cc_news_analyzer.cdx import build_record_index, load_record_index
+from cc_news_analyzer.index import download_warc
+from cc_news_analyzer.jsonl import write_jsonl
+from cc_news_analyzer.lookup import ArticleLookup
+from cc_news_analyzer.markdown import convert_html_to_markdown
+from cc_news_analyzer.search import KeywordMatcher, Query, search_warcs
+from cc_news_analyzer.summaries import summarize_articles
+from cc_news_analyzer.textindex import build_text_index
+from cc_news_analyzer.warc import count_articles, count_records, is_article, scan_warc, scan_warc_files
+
+from benchmarks.synthetic import GENERATOR_VERSION, VOCABULARY, generate_warc
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_DATA_DIR = os.path.join(".tmp", "bench")
+DEFAULT_SIZE_MB = 64
+DEFAULT_THRESHOLD = 0.25
+REMOTE_PREFIX = "crawl-data/CC-NEWS/bench"
+PARALLEL_WORKERS = 4
+MB = 1024 * 1024
+
+
+@dataclass
+class BenchmarkResult:
+    """The timing of one benchmark case.
+
+    Attributes:
+        name: The case name.
+        seconds: Best wall-clock time over the repeats.
+        records: Records processed per run.
+        compressed_bytes: Compressed bytes read per run (HTML bytes
+            converted, for conversion cases).
+        output_ratio: Output size over input size, for conversion cases.
+    """
+
+    name: str
+    seconds: float
+    records: int
+    compressed_bytes: int
+    output_ratio: float | None = None
+
+    @property
+    def records_per_s(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.compressed_bytes / MB / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class Regression:
+    """A case that ran slower than its baseline by more than the threshold.
+
+    Attributes:
+        name: The case name.
+        baseline_mb_per_s: Throughput recorded in the baseline.
+        mb_per_s: Throughput of this run.
+    """
+
+    name: str
+    baseline_mb_per_s: float
+    mb_per_s: float
+
+
+@dataclass
+class Workload:
+    """The files every case runs against.
+
+    Attributes:
+        data_dir: The directory holding the files.
+        gz_path: The synthetic ``.warc.gz`` file.
+        warc_path: The same records, uncompressed.
+        copy_path: A second copy of *gz_path* for multi-file scans.
+        remote_path: *gz_path* as a CC-NEWS relative path on the local server.
+        records: Number of records in the file.
+        download_dir: Scratch directory for downloads.
+    """
+
+    data_dir: str
+    gz_path: str
+    warc_path: str
+    copy_path: str
+    remote_path: str
+    records: int
+    download_dir: str
+
+
+def prepare_workload(data_dir: str, size_mb: float, *, seed: int = 0, max_body_size: int | None = None) -> Workload:
+    """Generate the benchmark files, reusing ones generated by an earlier run.
+
+    Args:
+        data_dir: Directory for the generated files.
+        size_mb: Target compressed size of the file.
+        seed: Generator seed.
+        max_body_size: Override the generator's body size limit.
+
+    Returns:
+        The workload description.
+    """
+    stem = f"CC-NEWS-bench-v{GENERATOR_VERSION}-s{seed}-{size_mb:g}mb" + (f"-b{max_body_size}" if max_body_size else "")
+    remote_dir = os.path.join(data_dir, REMOTE_PREFIX)
+    os.makedirs(remote_dir, exist_ok=True)
+    gz_path = os.path.join(remote_dir, f"{stem}.warc.gz")
+    warc_path = os.path.join(data_dir, f"{stem}.warc")
+    copy_path = os.path.join(data_dir, f"{stem}-copy.warc.gz")
+    options = {"seed": seed} | ({"max_body_size": max_body_size} if max_body_size else {})
+
+    records = _generate_once(gz_path, int(size_mb * MB), options)
+    if not os.path.exists(warc_path):
+        # concatenated gzip members decompress to the same records as a plain WARC
+        with gzip.open(gz_path, "rb") as src, open(warc_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, MB)
+    if not os.path.exists(copy_path):
+        shutil.copyfile(gz_path, copy_path)
+    return Workload(
+        data_dir=data_dir,
+        gz_path=gz_path,
+        warc_path=warc_path,
+        copy_path=copy_path,
+        remote_path=f"{REMOTE_PREFIX}/{stem}.warc.gz",
+        records=records,
+        download_dir=os.path.join(data_dir, "downloads"),
+    )
+
+
+def _generate_once(path: str, target_bytes: int, options: dict) -> int:
+    """Generate *path* unless it exists, returning its record count."""
+    meta_path = path + ".json"
+    if os.path.exists(path) and os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)["records"]
+    generated = generate_warc(path, target_bytes, **options)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(asdict(generated), f)
+    return generated.records
+
+
+class Conversion(NamedTuple):
+    """What a conversion case returns: the bytes it converted and produced."""
+
+    input_bytes: int
+    output_bytes: int
+
+
+@dataclass
+class Case:
+    """One benchmark case.
+
+    Attributes:
+        run: Performs the work being measured.  A conversion case returns a
+            :class:`Conversion`.
+        path: The file the case reads.
+        files: How many times the case reads *path*.
+        prepare: Untimed setup, run once before the repeats.
+    """
+
+    run: Callable[[], object]
+    path: str
+    files: int = 1
+    prepare: Callable[[], object] | None = None
+
+
+def benchmark_cases(workload: Workload, base_url: str) -> dict[str, Case]:
+    """Return the benchmark cases by name.
+
+    Args:
+        workload: The files to run against.
+        base_url: Base URL of a server serving the data directory, for the
+            download case.
+    """
+    gz, plain, remote = workload.gz_path, workload.warc_path, workload.remote_path
+
+    def to_jsonl(workers: int = 1) -> None:
+        with open(os.devnull, "wb") as devnull:
+            write_jsonl([gz], devnull, workers=workers)
+
+    def search(keyword_count: int) -> None:
+        words = VOCABULARY.split()
+        matcher = KeywordMatcher([f"{a} {b}" for a, b in pairwise(words)][:keyword_count])
+        for _ in search_warcs([gz], matcher):
+            pass
+
+    def search_indexed() -> None:
+        # answered from the text index written by the build_text_index case
+        for _ in search_warcs([gz], Query('"election report" OR (market AND climate)')):
+            pass
+
+    @cache
+    def article_html() -> list[str]:
+        with open(plain, "rb") as f:
+            return [decode_body(article) for article in iter_articles(f)]
+
+    def convert(function: Callable[[str], str]) -> Conversion:
+        documents = article_html()
+        outputs = [function(html) for html in documents]
+        return Conversion(_utf8_size(documents), _utf8_size(outputs))
+
+    def html_to_plain_text(html: str) -> str:
+        return convert_html_to_markdown(html, text=True)
+
+    def download() -> None:
+        shutil.rmtree(workload.download_dir, ignore_errors=True)
+        download_warc(f"{base_url}/{remote}", workload.download_dir)
+
+    return {
+        "count_records": Case(partial(count_records, gz), gz),
+        "count_records_headers_only": Case(partial(count_records, gz, headers_only=True), gz),
+        "count_articles": Case(partial(count_articles, gz), gz),
+        "count_articles_headers_only": Case(partial(count_articles, gz, headers_only=True), gz),
+        "scan_warc": Case(partial(scan_warc, gz), gz),
+        "scan_warc_uncompressed": Case(partial(scan_warc, plain), plain),
+        "scan_uncompressed_headers_only": Case(partial(scan_warc, plain, headers_only=True), plain),
+        "scan_warc_parallel": Case(partial(scan_warc, gz, workers=PARALLEL_WORKERS), gz),
+        "scan_warc_files_2_files": Case(partial(scan_warc_files, [gz, workload.copy_path], workers=2), gz, files=2),
+        "scan_warc_remote_stream": Case(partial(scan_warc, remote), gz),
+        "to_jsonl": Case(to_jsonl, gz),
+        "to_jsonl_parallel": Case(partial(to_jsonl, PARALLEL_WORKERS), gz),
+        "search_10_keywords": Case(partial(search, 10), gz),
+        "search_100_keywords": Case(partial(search, 100), gz),
+        "build_text_index": Case(partial(build_text_index, gz), gz),
+        "search_query_indexed": Case(search_indexed, gz),
+        "article_summaries": Case(partial(_summarize, gz, use_index=False), gz),
+        "article_summaries_indexed": Case(
+            partial(_summarize, gz, use_index=True), gz, prepare=partial(build_record_index, gz)
+        ),
+        "article_lookup": Case(partial(_look_up_articles, gz), gz, prepare=partial(build_record_index, gz)),
+        "html_to_markdown": Case(partial(convert, convert_html_to_markdown), plain, prepare=article_html),
+        "html_to_text": Case(
+            partial(convert, partial(convert_html_to_markdown, text=True)), plain, prepare=article_html
+        ),
+        "html_to_text_regex": Case(partial(convert, html_to_text), plain, prepare=article_html),
+        "download_warc": Case(download, gz),
+    }
+
+
+def _look_up_articles(path: str) -> None:
+    # every article once, in random order: each is a cold, single-seek read
+    with load_record_index(path) as index:
+        record_ids = [entry.record_id for entry in index if is_article(entry.warc_type, entry.content_type)]
+    random.Random(0).shuffle(record_ids)
+    with ArticleLookup([path]) as lookup:
+        for record_id in record_ids:
+            lookup.get_article(record_id)
+
+
+def _summarize(path: str, *, use_index: bool) -> None:
+    for _ in summarize_articles(path, use_index=use_index):
+        pass
+
+
+def _utf8_size(texts: list[str]) -> int:
+    return sum(len(text.encode("utf-8")) for text in texts)
+
+
+def run_benchmarks(workload: Workload, *, repeat: int = 3, only: tuple[str, ...] = ()) -> list[BenchmarkResult]:
+    """Time every case against *workload*.
+
+    Args:
+        workload: From :func:`prepare_workload`.
+        repeat: Runs per case; the fastest is reported.
+        only: Run only cases whose names start with one of these prefixes.
+
+    Returns:
+        One result per case, in case order.
+    """
+    results = []
+    with serve_directory(workload.data_dir) as base_url:
+        for name, case in benchmark_cases(workload, base_url).items():
+            if only and not name.startswith(only):
+                continue
+            if case.prepare is not None:
+                case.prepare()
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                output = case.run()
+                timings.append(time.perf_counter() - start)
+            size = os.path.getsize(case.path) * case.files
+            ratio = None
+            if isinstance(output, Conversion):
+                size, ratio = output.input_bytes, output.output_bytes / output.input_bytes
+            results.append(BenchmarkResult(name, min(timings), workload.records * case.files, size, ratio))
+    shutil.rmtree(workload.download_dir, ignore_errors=True)
+    return results
+
+
+@contextmanager
+def serve_directory(directory: str) -> Iterator[str]:
+    """Serve *directory* over HTTP as a stand-in for data.commoncrawl.org.
+
+    Yields:
+        The server's base URL.  While the block runs, CC-NEWS relative paths
+        resolve against it.
+    """
+    handler = partial(_QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    original = cc_news_analyzer.index.CC_NEWS_BASE_URL
+    cc_news_analyzer.index.CC_NEWS_BASE_URL = base_url
+    try:
+        yield base_url
+    finally:
+        cc_news_analyzer.index.CC_NEWS_BASE_URL = original
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def compare_to_baseline(results: list[BenchmarkResult], baseline: dict, threshold: float) -> list[Regression]:
+    """Return the cases whose throughput fell more than *threshold* below the baseline.
+
+    Args:
+        results: This run's results.
+        baseline: The ``results`` mapping of a baseline file.
+        threshold: Allowed slowdown as a fraction (``0.25`` = 25% slower).
+    """
+    regressions = []
+    for result in results:
+        expected = baseline.get(result.name)
+        if expected and result.mb_per_s < expected["mb_per_s"] * (1 - threshold):
+            regressions.append(Regression(result.name, expected["mb_per_s"], result.mb_per_s))
+    return regressions
+
+
+def load_baseline(path: str) -> dict | None:
+    """Read a baseline file, or return ``None`` if there is none."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_baseline(path: str, results: list[BenchmarkResult], *, size_mb: float, seed: int, threshold: float) -> None:
+    """Write this run's results as the new baseline."""
+    baseline = {
+        "size_mb": size_mb,
+        "seed": seed,
+        "threshold": threshold,
+        "results": {
+            result.name: {"records_per_s": round(result.records_per_s, 1), "mb_per_s": round(result.mb_per_s, 2)}
+            for result in results
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def format_results(results: list[BenchmarkResult], baseline: dict) -> str:
+    """Render results as a table, with the change against the baseline where known."""
+    lines = [f"{'case':32} {'seconds':>9} {'records/s':>12} {'MB/s':>9} {'out/in':>7} {'vs baseline':>12}"]
+    for result in results:
+        expected = baseline.get(result.name)
+        change = f"{result.mb_per_s / expected['mb_per_s'] - 1:+.0%}" if expected else "-"
+        ratio = f"{result.output_ratio:.1%}" if result.output_ratio is not None else "-"
+        lines.append(
+            f"{result.name:32} {result.seconds:9.3f} {result.records_per_s:12,.0f} {result.mb_per_s:9.1f}"
+            f" {ratio:>7} {change:>12}"
+        )
+    return "\n".join(lines)
+
+
+@click.command()
+@click.option("--size-mb", type=click.FloatRange(min=0.01), default=DEFAULT_SIZE_MB, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option(
+    "--repeat", type=click.IntRange(min=1), default=3, show_default=True, help="Runs per case (best is kept)."
+)
+@click.option("--only", multiple=True, help="Run only cases whose names start with this prefix (repeatable).")
+@click.option("--data-dir", default=DEFAULT_DATA_DIR, show_default=True, help="Where generated files are kept.")
+@click.option("--baseline", "baseline_path", default=BASELINE_PATH, show_default=True)
+@click.option("--threshold", type=click.FloatRange(min=0, max=1), default=None, help="Allowed slowdown fraction.")
+@click.option("--update-baseline", is_flag=True, default=False, help="Record this run as the new baseline.")
+def main(
+    size_mb: float,
+    seed: int,
+    repeat: int,
+    only: tuple[str, ...],
+    data_dir: str,
+    baseline_path: str,
+    threshold: float | None,
+    update_baseline: bool,
+):
+    """Benchmark every scan function and download path on a synthetic CC-NEWS file."""
+    baseline = load_baseline(baseline_path) or {}
+    if threshold is None:
+        threshold = baseline.get("threshold", DEFAULT_THRESHOLD)
+    comparable = baseline.get("size_mb") == size_mb and baseline.get("seed") == seed
+    expected = baseline.get("results", {}) if comparable else {}
+
+    click.echo(f"Preparing a {size_mb:g} MB synthetic file in {data_dir} ...")
+    workload = prepare_workload(data_dir, size_mb, seed=seed)
+    results = run_benchmarks(workload, repeat=repeat, only=only)
+    click.echo(format_results(results, expected))
+
+    if update_baseline:
+        write_baseline(baseline_path, results, size_mb=size_mb, seed=seed, threshold=threshold)
+        click.echo(f"Baseline written to {baseline_path}")
+        return
+    if not comparable:
+        click.echo("No baseline for this size and seed; run with --update-baseline to record one.")
+        return
+    regressions = compare_to_baseline(results, expected, threshold)
+    for regression in regressions:
+        click.echo(
+            f"REGRESSION {regression.name}: {regression.mb_per_s:.1f} MB/s "
+            f"(baseline {regression.baseline_mb_per_s:.1f} MB/s, threshold {threshold:.0%})",
+            err=True,
+        )
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
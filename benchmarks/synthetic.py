@@ -0,0 +1,213 @@
+"""Deterministic generator for synthetic, CC-NEWS-shaped WARC files.
+
+The generated files have the structure of a real CC-NEWS file: a
+``warcinfo`` record followed by ``request``/``response`` pairs, every record
+compressed as its own gzip member.  Responses mix HTML articles -- text
+wrapped in the head, scripts, styles, navigation and footer of a news
+site's page -- with JSON, XML feeds, plain text and (incompressible)
+images, and their bodies range from 1 KB to 2 MB with most of them small,
+as on news sites.
+
+Everything -- record IDs, dates, URLs, body sizes and text -- is derived
+from a seed, so the same seed and size always produce the same bytes.
+"""
+
+import json
+import os
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from io import BytesIO
+
+from warcio.statusandheaders import StatusAndHeaders
+from warcio.warcwriter import WARCWriter
+
+# bump when the generated bytes change, so cached benchmark files are regenerated
+GENERATOR_VERSION = 2
+MIN_BODY_SIZE = 1024
+MAX_BODY_SIZE = 2 * 1024 * 1024
+START_DATE = datetime(2026, 2, 1, tzinfo=UTC)
+PARAGRAPH_COUNT = 512
+HTML_CHROME_SIZE = 2048  # about the size of the page around an article's text
+
+# (media type, weight); HTML responses are the articles
+CONTENT_TYPES = (
+    ("text/html; charset=utf-8", 75),
+    ("application/json", 8),
+    ("image/jpeg", 7),
+    ("application/rss+xml", 5),
+    ("text/plain", 5),
+)
+
+VOCABULARY = (
+    "the of and to in a is that for on with as was by at from said has have will not are his her "
+    "government market election minister city police report season team company people year week "
+    "percent million court health school climate energy price share official president local world "
+    "research economy policy border storm vote trade bank players coach study data water fire"
+)
+
+
+@dataclass
+class GeneratedWarc:
+    """A file written by :func:`generate_warc`.
+
+    Attributes:
+        path: Where the file was written.
+        records: Number of records, all with a ``WARC-Record-ID``.
+        articles: Number of HTML responses.
+        compressed_bytes: Size of the file on disk.
+        payload_bytes: Total size of the response bodies.
+    """
+
+    path: str
+    records: int = 0
+    articles: int = 0
+    compressed_bytes: int = 0
+    payload_bytes: int = 0
+
+
+def generate_warc(
+    path: str,
+    target_bytes: int,
+    *,
+    seed: int = 0,
+    max_body_size: int = MAX_BODY_SIZE,
+) -> GeneratedWarc:
+    """Write a synthetic CC-NEWS WARC file of roughly *target_bytes* on disk.
+
+    Records are written until the file reaches *target_bytes*, so the
+    result is at most one request/response pair larger.
+
+    Args:
+        path: Destination ``.warc.gz`` (one gzip member per record) or
+            ``.warc`` path.
+        target_bytes: Approximate size of the written file.
+        seed: Seed for every random choice.
+        max_body_size: Upper bound for response body sizes.
+
+    Returns:
+        A description of the written file.
+    """
+    rng = random.Random(seed)
+    paragraphs = _paragraphs(rng)
+    result = GeneratedWarc(path)
+    date = START_DATE
+    with open(path, "wb") as out:
+        writer = WARCWriter(out, gzip=path.endswith(".gz"))
+        info = writer.create_warcinfo_record(os.path.basename(path), {"software": "cc-news-benchmarks"})
+        _stamp(info, rng, date)
+        writer.write_record(info)
+        result.records += 1
+
+        while out.tell() < target_bytes:
+            date += timedelta(seconds=rng.randint(1, 30))
+            url = f"https://news{rng.randint(1, 500)}.example.com/{date:%Y/%m/%d}/story-{rng.getrandbits(32):08x}"
+            content_type = rng.choices([t for t, _ in CONTENT_TYPES], [w for _, w in CONTENT_TYPES])[0]
+            body = _body(rng, paragraphs, content_type, _body_size(rng, max_body_size))
+
+            writer.write_record(_stamp(_request(writer, url), rng, date))
+            writer.write_record(_stamp(_response(writer, url, content_type, body), rng, date))
+            result.records += 2
+            result.articles += content_type.startswith("text/html")
+            result.payload_bytes += len(body)
+        result.compressed_bytes = out.tell()
+    return result
+
+
+def _paragraphs(rng: random.Random) -> list[str]:
+    """Return a pool of pseudo-English paragraphs to assemble bodies from."""
+    words = VOCABULARY.split()
+    return [" ".join(rng.choices(words, k=rng.randint(40, 160))).capitalize() + "." for _ in range(PARAGRAPH_COUNT)]
+
+
+def _body_size(rng: random.Random, max_body_size: int) -> int:
+    """Draw a body size between 1 KB and *max_body_size*, skewed towards small bodies."""
+    upper = max(max_body_size, MIN_BODY_SIZE)
+    # log-scale draw, squared so most bodies are a few KB and few approach the maximum
+    return int(MIN_BODY_SIZE * (upper / MIN_BODY_SIZE) ** (rng.random() ** 2))
+
+
+def _body(rng: random.Random, paragraphs: list[str], content_type: str, size: int) -> bytes:
+    """Build a body of *size* bytes in the shape of *content_type*."""
+    if content_type == "image/jpeg":
+        return b"\xff\xd8\xff\xe0" + rng.randbytes(max(size - 4, 0))
+    is_html = content_type.startswith("text/html")
+    text = []
+    length = 0
+    # an HTML page holds its text twice: as markup and in its embedded page state
+    target = (size - HTML_CHROME_SIZE) // 2 if is_html else size
+    while length < target or not text:
+        paragraph = rng.choice(paragraphs)
+        text.append(paragraph)
+        length += len(paragraph) + 1
+    content = "\n".join(text)
+    if is_html:
+        content = _html_page(rng, text)
+    elif content_type == "application/json":
+        content = '{"items": ["' + content.replace("\n", '", "') + '"]}'
+    elif content_type == "application/rss+xml":
+        content = '<?xml version="1.0"?><rss><channel><item><description>' + content
+    return content.encode("utf-8")[:size]
+
+
+def _html_page(rng: random.Random, paragraphs: list[str]) -> str:
+    """Wrap paragraphs in the page of a news site: head, styles, navigation, SVG, footer and page-state script."""
+    title = paragraphs[0][:60]
+    section = rng.choice(("politics", "business", "sport", "world", "science"))
+    menu = "".join(f'<li><a href="/{name}/">{name.title()}</a></li>' for name in ("news", section, "opinion", "video"))
+    head = (
+        f'<head><meta charset="utf-8"><title>{title}</title>'
+        f'<meta name="description" content="{paragraphs[0][:150]}">'
+        f'<meta property="og:title" content="{title}">'
+        f'<link rel="stylesheet" href="/static/site.{rng.getrandbits(32):08x}.css">'
+        "<style>body{margin:0;font-family:Georgia,serif}.nav a{color:#333;text-decoration:none}</style>"
+        "<script>window.dataLayer=window.dataLayer||[];"
+        f'dataLayer.push({{"section":"{section}","id":{rng.getrandbits(31)}}});</script>'
+        '<script type="application/ld+json">{"@context":"https://schema.org","@type":"NewsArticle",'
+        f'"headline":"{title}"}}</script></head>'
+    )
+    header = (
+        '<header class="site"><a href="/"><svg viewBox="0 0 100 20" width="100"><path d="M0 0h100v20H0z"/>'
+        f'<text x="4" y="14">News {rng.randint(1, 500)}</text></svg></a>'
+        f'<nav class="nav"><ul>{menu}</ul></nav></header>'
+    )
+    body = "".join(f"<p>{paragraph}</p>\n" for paragraph in paragraphs[1:])
+    article = (
+        f'<main><article><h1>{title}</h1><p class="byline">By <a href="/staff/{rng.randint(1, 99)}">Staff</a></p>'
+        f"<p><strong>{paragraphs[0]}</strong></p>\n{body}</article>"
+        f"<aside><h2>Related</h2><ul>{menu}</ul></aside></main>"
+    )
+    state = json.dumps({"props": {"section": section, "paragraphs": paragraphs}})
+    state_script = f'<script id="__NEXT_DATA__" type="application/json">{state}</script>'
+    footer = '<footer><p>&copy; 2026 Example News</p></footer><script src="/static/app.js" async></script>'
+    return f"<!DOCTYPE html><html>{head}<body>{header}{article}{footer}{state_script}</body></html>"
+
+
+def _request(writer: WARCWriter, url: str):
+    """Create a ``request`` record for *url*."""
+    host = url.split("/")[2]
+    http_headers = StatusAndHeaders(
+        f"GET /{url.split('/', 3)[3]} HTTP/1.1",
+        [("Host", host), ("User-Agent", "CCBot/2.0"), ("Accept", "text/html")],
+        is_http_request=True,
+    )
+    return writer.create_warc_record(url, "request", payload=BytesIO(b""), http_headers=http_headers)
+
+
+def _response(writer: WARCWriter, url: str, content_type: str, body: bytes):
+    """Create a ``response`` record for *url*."""
+    http_headers = StatusAndHeaders(
+        "200 OK",
+        [("Content-Type", content_type), ("Content-Length", str(len(body))), ("Server", "nginx")],
+        protocol="HTTP/1.1",
+    )
+    return writer.create_warc_record(url, "response", payload=BytesIO(body), http_headers=http_headers)
+
+
+def _stamp(record, rng: random.Random, date: datetime):
+    """Replace the random record ID and the current date warcio assigns with seeded values."""
+    record_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+    record.rec_headers.replace_header("WARC-Record-ID", f"<urn:uuid:{record_id}>")
+    record.rec_headers.replace_header("WARC-Date", date.strftime("%Y-%m-%dT%H:%M:%SZ"))
+    return record
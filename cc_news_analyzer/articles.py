@@ -0,0 +1,109 @@
+"""Iterate over the article records of a WARC stream and decode their bodies."""
+
+import codecs
+import html
+import re
+from collections.abc import Iterator
+from typing import BinaryIO, NamedTuple
+
+from warcio.archiveiterator import ArchiveIterator
+
+from cc_news_analyzer.warc import is_article
+
+DEFAULT_CHARSET = "utf-8"
+
+# comments and elements whose content is not text, then any remaining tag
+_NON_TEXT_RE = re.compile(r"<!--.*?-->|<(script|style|noscript|template)\b.*?</\1\s*>", re.DOTALL | re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]*>")
+
+
+class Article(NamedTuple):
+    """An article (HTML response) record.
+
+    Attributes:
+        record_id: The ``WARC-Record-ID`` header.
+        uri: The ``WARC-Target-URI`` header.
+        date: The ``WARC-Date`` header.
+        content_type: The HTTP ``Content-Type`` header.
+        body: The HTTP payload with any transfer and content encoding removed.
+        offset: Byte offset of the record in the WARC file (compressed, for
+            a ``.warc.gz``).
+    """
+
+    record_id: str
+    uri: str
+    date: str
+    content_type: str
+    body: bytes
+    offset: int = 0
+
+
+def iter_articles(stream: BinaryIO) -> Iterator[Article]:
+    """Yield the article records of a WARC stream in file order.
+
+    Only one record body is held in memory at a time.
+
+    Args:
+        stream: A binary stream of a ``.warc`` or ``.warc.gz`` file (or of
+            a range of one starting at a record boundary).
+
+    Yields:
+        An :class:`Article` per HTML ``response`` record.
+
+    Raises:
+        ArchiveLoadFailed: If the stream is not a WARC file.
+    """
+    iterator = ArchiveIterator(stream)
+    for record in iterator:
+        if record.http_headers is None:
+            continue
+        headers = record.rec_headers
+        content_type = record.http_headers.get_header("Content-Type", "")
+        if not is_article(headers.get_header("WARC-Type"), content_type):
+            continue
+        yield Article(
+            record_id=headers.get_header("WARC-Record-ID") or "",
+            uri=headers.get_header("WARC-Target-URI") or "",
+            date=headers.get_header("WARC-Date") or "",
+            content_type=content_type,
+            body=record.content_stream().read(),
+            offset=iterator.get_record_offset(),
+        )
+
+
+def charset_of(content_type: str) -> str:
+    """Return the codec named by a ``charset`` parameter, or UTF-8 if it is missing or unknown.
+
+    Args:
+        content_type: An HTTP ``Content-Type`` header value.
+
+    Returns:
+        A codec name accepted by :meth:`bytes.decode`.
+    """
+    for param in content_type.split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset":
+            charset = value.strip().strip("\"'")
+            try:
+                return codecs.lookup(charset).name
+            except LookupError:
+                break
+    return DEFAULT_CHARSET
+
+
+def decode_body(article: Article) -> str:
+    """Decode an article's body with its declared charset, replacing undecodable bytes."""
+    return article.body.decode(charset_of(article.content_type), errors="replace")
+
+
+def html_to_text(markup: str) -> str:
+    """Return the text of an HTML document: tags, comments, scripts and styles removed, entities decoded.
+
+    Tags are replaced by a space, so words in adjacent elements stay apart.
+    """
+    return html.unescape(_TAG_RE.sub(" ", _NON_TEXT_RE.sub(" ", markup)))
+
+
+def article_text(article: Article) -> str:
+    """Decode an article's body and return its text (see :func:`html_to_text`)."""
+    return html_to_text(decode_body(article))
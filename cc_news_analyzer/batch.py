@@ -0,0 +1,240 @@
+"""Resumable batch conversion of a WARC file's articles to Markdown.
+
+:func:`generate_markdown` writes one JSON line per article holding its
+record ID, target URI, date and Markdown (see
+:mod:`cc_news_analyzer.markdown`).  Every *checkpoint_every* articles it
+records a checkpoint next to the output (``<output>.checkpoint``)::
+
+    {"version": 1, "warc_size": 1073741824, "text": false, "offset": 52488213,
+     "record_id": "<urn:uuid:...>", "articles": 5000, "output_bytes": 48210117}
+
+``offset`` is the byte offset -- compressed, in a ``.warc.gz`` -- of the
+next article to convert and ``record_id`` is that article's ID.  The output
+is flushed to disk before the checkpoint replaces the previous one, so after
+a crash the output holds at least ``output_bytes`` valid bytes.  A resumed
+run truncates the output to that length, seeks straight to ``offset``
+(CC-NEWS files compress each record as its own gzip member) and checks
+that the record found there has the expected ID before carrying on: no
+part of the file before the checkpoint is decompressed again.  The
+checkpoint is removed once the conversion is complete.
+"""
+
+import json
+import os
+import tempfile
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any, BinaryIO
+
+from cc_news_analyzer.articles import Article, decode_body, iter_articles
+from cc_news_analyzer.markdown import convert_html_to_markdown
+from cc_news_analyzer.profiling import add_records, phase, timed_iter, timed_stream
+
+CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT_EVERY = 1000
+
+
+@dataclass
+class Checkpoint:
+    """Where a conversion stopped.
+
+    Attributes:
+        warc_size: Size of the WARC file, to detect a checkpoint of another file.
+        text: Whether the conversion emits plain text instead of Markdown.
+        offset: Byte offset of the next article record in the WARC file.
+        record_id: ``WARC-Record-ID`` of the record at *offset*.
+        articles: Number of articles written before *offset*.
+        output_bytes: Length of the output holding those articles.
+    """
+
+    warc_size: int
+    text: bool
+    offset: int
+    record_id: str
+    articles: int
+    output_bytes: int
+
+
+@dataclass
+class MarkdownResult:
+    """The outcome of a conversion.
+
+    Attributes:
+        articles: Total number of articles in the output.
+        bytes_written: Size of the output.
+        resumed_from: The checkpoint the conversion resumed from, if any.
+    """
+
+    articles: int = 0
+    bytes_written: int = 0
+    resumed_from: Checkpoint | None = None
+
+
+def checkpoint_path(output_path: str) -> str:
+    """Return the checkpoint path for a conversion writing to *output_path*."""
+    return output_path + ".checkpoint"
+
+
+def load_checkpoint(path: str) -> Checkpoint | None:
+    """Read a checkpoint file.
+
+    Returns:
+        The checkpoint, or ``None`` if the file does not exist.
+
+    Raises:
+        ValueError: If the file is not a checkpoint of this version.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Not a checkpoint file: {path}") from exc
+    if not isinstance(data, dict) or data.pop("version", None) != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint file: {path}")
+    try:
+        return Checkpoint(**data)
+    except TypeError as exc:
+        raise ValueError(f"Not a checkpoint file: {path}") from exc
+
+
+def write_checkpoint(checkpoint: Checkpoint, path: str) -> None:
+    """Write *checkpoint* to *path* atomically: readers see the old or the new checkpoint, never a mix."""
+    data: dict[str, Any] = {"version": CHECKPOINT_VERSION, **checkpoint.__dict__}
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".checkpoint-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def article_to_markdown_json(article: Article, *, text: bool = False) -> str:
+    """Return the JSON line of one converted article, without a trailing newline."""
+    return json.dumps(
+        {
+            "record_id": article.record_id,
+            "uri": article.uri,
+            "date": article.date,
+            "text" if text else "markdown": convert_html_to_markdown(decode_body(article), text=text),
+        },
+        ensure_ascii=False,
+    )
+
+
+def generate_markdown(
+    warc_path: str,
+    output_path: str,
+    *,
+    text: bool = False,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    resume: bool = True,
+) -> MarkdownResult:
+    """Convert the articles of a WARC file to Markdown JSON Lines, resuming from a checkpoint.
+
+    Args:
+        warc_path: Path to a local ``.warc`` or ``.warc.gz`` file.
+        output_path: The JSON Lines file to write.
+        text: Emit plain text (under a ``text`` key) instead of Markdown.
+        checkpoint_every: Write a checkpoint after this many articles.
+        resume: Continue from the checkpoint of *output_path* if there is
+            one; otherwise (or if there is none) start from the beginning
+            and overwrite the output.
+
+    Returns:
+        The number of articles in the output and its size.
+
+    Raises:
+        FileNotFoundError: If the WARC file does not exist.
+        ArchiveLoadFailed: If the file is not a valid WARC.
+        ValueError: If *checkpoint_every* is not positive, or the checkpoint
+            does not match the WARC file, the output or the options.
+    """
+    if checkpoint_every < 1:
+        raise ValueError("checkpoint_every must be positive")
+    warc_size = os.path.getsize(warc_path)
+    state_path = checkpoint_path(output_path)
+    checkpoint = load_checkpoint(state_path) if resume else None
+    if checkpoint is not None:
+        _check_resumable(checkpoint, warc_size, text, output_path)
+    elif os.path.exists(state_path):
+        # a fresh start must not leave a checkpoint describing the old output
+        os.remove(state_path)
+    result = MarkdownResult(resumed_from=checkpoint)
+
+    with open(warc_path, "rb") as warc, open(output_path, "r+b" if checkpoint else "wb") as output:
+        if checkpoint is not None:
+            output.truncate(checkpoint.output_bytes)
+            output.seek(checkpoint.output_bytes)
+            warc.seek(checkpoint.offset)
+            result.articles = checkpoint.articles
+        _convert(warc, output, result, state_path, warc_size, text, checkpoint_every)
+        result.bytes_written = output.tell()
+    add_records(result.articles - (checkpoint.articles if checkpoint else 0))
+    if os.path.exists(state_path):
+        os.remove(state_path)
+    return result
+
+
+def _check_resumable(checkpoint: Checkpoint, warc_size: int, text: bool, output_path: str) -> None:
+    """Raise ``ValueError`` unless *checkpoint* can resume a conversion with these inputs."""
+    if checkpoint.warc_size != warc_size:
+        raise ValueError("The checkpoint was written for a different WARC file")
+    if checkpoint.text != text:
+        raise ValueError(f"The checkpoint was written with text={checkpoint.text}")
+    if not os.path.exists(output_path) or os.path.getsize(output_path) < checkpoint.output_bytes:
+        raise ValueError(f"The output is shorter than its checkpoint: {output_path}")
+
+
+def _convert(
+    warc: BinaryIO,
+    output: BinaryIO,
+    result: MarkdownResult,
+    state_path: str,
+    warc_size: int,
+    text: bool,
+    checkpoint_every: int,
+) -> None:
+    """Convert the articles from the current position of *warc*, checkpointing as it goes."""
+    articles = iter_articles(timed_stream(warc))
+    if result.resumed_from is not None:
+        articles = _verified(articles, result.resumed_from)
+    since_checkpoint = 0
+    with phase("filter"):
+        for article in timed_iter(articles, "parse"):
+            if since_checkpoint == checkpoint_every:
+                # everything before this article is on disk: a resume starts here
+                checkpoint = Checkpoint(warc_size, text, article.offset, article.record_id, result.articles, 0)
+                _save_checkpoint(checkpoint, output, state_path)
+                since_checkpoint = 0
+            line = article_to_markdown_json(article, text=text).encode("utf-8") + b"\n"
+            with phase("output"):
+                output.write(line)
+            result.articles += 1
+            since_checkpoint += 1
+
+
+def _verified(articles: Iterator[Article], checkpoint: Checkpoint) -> Iterator[Article]:
+    """Yield *articles*, checking that the first one is the record named by *checkpoint*."""
+    first = next(articles, None)
+    found = first.record_id if first is not None else None
+    if found != checkpoint.record_id:
+        raise ValueError(
+            f"Expected record {checkpoint.record_id} at offset {checkpoint.offset}, found {found or 'no article'}"
+        )
+    yield first
+    yield from articles
+
+
+def _save_checkpoint(checkpoint: Checkpoint, output: BinaryIO, state_path: str) -> None:
+    """Flush *output* to disk, then record *checkpoint* with the output's length."""
+    with phase("output"):
+        output.flush()
+        os.fsync(output.fileno())
+        checkpoint.output_bytes = output.tell()
+        write_checkpoint(checkpoint, state_path)
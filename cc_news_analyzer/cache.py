@@ -0,0 +1,177 @@
+"""A local, file-based cache of per-file scan results.
+
+Scanning a CC-NEWS file means decompressing about 1 GB, while the result
+is a few hundred bytes of JSON.  Results are stored under a cache directory
+keyed by the identity of the scanned file -- its absolute path, size,
+``mtime_ns`` and inode -- plus the version of the code that produced them,
+so a changed file or a scanner change never returns a stale result.
+
+Entries live at ``<cache_dir>/<kk>/<key>.json`` where ``key`` is the SHA-256
+of the identity and ``kk`` its first two hex digits.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+
+@dataclass
+class PruneResult:
+    """The outcome of :func:`prune_cache`.
+
+    Attributes:
+        removed: Number of entries deleted.
+        kept: Number of entries left in place.
+    """
+
+    removed: int = 0
+    kept: int = 0
+
+
+class FileStamp(NamedTuple):
+    """What tells a version of a file apart: a file rewritten in place keeps its size but not its ``mtime_ns``.
+
+    Attributes:
+        size: Size in bytes.
+        mtime_ns: Modification time in nanoseconds.
+        inode: Inode number; a file replaced by another one gets a new one.
+    """
+
+    size: int
+    mtime_ns: int
+    inode: int
+
+
+def file_stamp(path: str) -> FileStamp:
+    """Return the :class:`FileStamp` of a file.
+
+    Raises:
+        OSError: If the file cannot be stat'ed.
+    """
+    st = os.stat(path)
+    return FileStamp(st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def file_identity(path: str, version: int) -> dict[str, Any]:
+    """Return the identity of a file that cache entries for it are keyed on.
+
+    Args:
+        path: Path to an existing local file.
+        version: Version of the code producing the cached result.
+
+    Returns:
+        A JSON-serializable dict of the absolute path, size, ``mtime_ns``,
+        inode and *version*.
+
+    Raises:
+        OSError: If the file cannot be stat'ed.
+    """
+    return {"path": os.path.abspath(path), **file_stamp(path)._asdict(), "version": version}
+
+
+def load_result(identity: dict[str, Any], cache_dir: str) -> dict[str, Any] | None:
+    """Return the cached result for a file identity, or ``None`` on a miss.
+
+    Args:
+        identity: From :func:`file_identity`.
+        cache_dir: Root directory of the cache.
+
+    Returns:
+        The result dict stored by :func:`store_result`, or ``None``.
+    """
+    try:
+        with open(_entry_path(identity, cache_dir), encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry["result"] if entry.get("identity") == identity else None
+
+
+def store_result(identity: dict[str, Any], result: dict[str, Any], cache_dir: str) -> None:
+    """Store a result for a file identity, atomically replacing any existing entry.
+
+    Failures to write (e.g. a read-only cache directory) are ignored: the
+    cache is an optimization, never a requirement.
+
+    Args:
+        identity: From :func:`file_identity`, taken before the scan started.
+        result: A JSON-serializable result.
+        cache_dir: Root directory of the cache.
+    """
+    entry_path = _entry_path(identity, cache_dir)
+    try:
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(entry_path), prefix=".entry-")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"identity": identity, "created": time.time(), "result": result}, f)
+        os.replace(tmp_path, entry_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def prune_cache(cache_dir: str, version: int, *, max_age: float | None = None, remove_all: bool = False) -> PruneResult:
+    """Delete cache entries that can no longer be used.
+
+    An entry is removed when its file is gone or has changed, it was made
+    by another scanner version, it cannot be read, or (with *max_age*) it is
+    older than *max_age* seconds.
+
+    Args:
+        cache_dir: Root directory of the cache.
+        version: The current scanner version.
+        max_age: Also remove entries created more than this many seconds ago.
+        remove_all: Remove every entry.
+
+    Returns:
+        How many entries were removed and kept.
+    """
+    result = PruneResult()
+    now = time.time()
+    for entry_path in _iter_entry_paths(cache_dir):
+        if remove_all or _is_prunable(entry_path, version, now, max_age):
+            os.remove(entry_path)
+            result.removed += 1
+        else:
+            result.kept += 1
+    return result
+
+
+def _is_prunable(entry_path: str, version: int, now: float, max_age: float | None) -> bool:
+    """Return whether a cache entry is unreadable, stale, or too old."""
+    try:
+        with open(entry_path, encoding="utf-8") as f:
+            entry = json.load(f)
+        identity = entry["identity"]
+        current = file_identity(identity["path"], version)
+    except (OSError, ValueError, KeyError, TypeError):
+        return True
+    if identity != current:
+        return True
+    return max_age is not None and now - entry.get("created", 0) > max_age
+
+
+def _iter_entry_paths(cache_dir: str) -> Iterator[str]:
+    """Yield the path of every entry in the cache."""
+    if not os.path.isdir(cache_dir):
+        return
+    for shard in sorted(os.listdir(cache_dir)):
+        shard_dir = os.path.join(cache_dir, shard)
+        if os.path.isdir(shard_dir):
+            for name in sorted(os.listdir(shard_dir)):
+                if name.endswith(".json"):
+                    yield os.path.join(shard_dir, name)
+
+
+def _entry_path(identity: dict[str, Any], cache_dir: str) -> str:
+    """Return the path of the entry for a file identity."""
+    key = hashlib.sha256(json.dumps(identity, sort_keys=True).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, key[:2], f"{key}.json")
@@ -0,0 +1,350 @@
+"""A binary, memory-mappable record-offset index (CDX-style sidecar) for WARC files.
+
+Each ``.warc.gz`` in CC-NEWS stores one record per gzip member, so a record
+can be read with a single seek and the decompression of one member once its
+compressed offset and length are known.  :func:`build_record_index` records
+those offsets in a sidecar file next to the WARC (``<warc>.idx``) and
+:class:`RecordIndex` memory-maps it for lookups by record ID or URL.
+
+Sidecar layout (all integers little-endian):
+
+- Header: magic, version, entry count, size, ``mtime_ns`` and inode of
+  the indexed WARC file, and the byte offsets of the sections below.
+- Entries: one fixed-size row per record in file order with the
+  compressed offset and length, the block ``Content-Length`` and
+  ``(offset, length)`` references into the string heap for the record type,
+  record ID, target URI, date and HTTP content type.
+- Two ``uint32`` permutations of the entries, sorted by record ID and by
+  target URI, for binary search.
+- The string heap (UTF-8, de-duplicated).
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from typing import BinaryIO, NamedTuple
+
+from warcio.archiveiterator import ArchiveIterator
+from warcio.recordloader import ArcWarcRecord
+
+from cc_news_analyzer.cache import FileStamp, file_stamp
+from cc_news_analyzer.headers import GZIP_MAGIC, parse_content_length
+
+SIDECAR_SUFFIX = ".idx"
+MAGIC = b"CCNXCDX1"
+VERSION = 2
+
+_HEADER = struct.Struct("<8sIIQqQQQQQ")
+_ENTRY = struct.Struct("<QQQ10I")
+_INDEX = struct.Struct("<I")
+_STRING_FIELDS = ("warc_type", "record_id", "target_uri", "date", "content_type")
+
+
+class IndexEntry(NamedTuple):
+    """One record's location and key headers.
+
+    Attributes:
+        offset: Compressed byte offset of the record in the WARC file.
+        length: Compressed length of the record (its gzip member).
+        content_length: The record block's ``Content-Length``.
+        warc_type: The ``WARC-Type`` header value.
+        record_id: The ``WARC-Record-ID`` header value.
+        target_uri: The ``WARC-Target-URI`` header value.
+        date: The ``WARC-Date`` header value.
+        content_type: The HTTP ``Content-Type`` (``""`` for non-HTTP records).
+    """
+
+    offset: int
+    length: int
+    content_length: int
+    warc_type: str
+    record_id: str
+    target_uri: str
+    date: str
+    content_type: str
+
+
+def sidecar_path(warc_path: str) -> str:
+    """Return the path of the record index that sits next to *warc_path*."""
+    return warc_path + SIDECAR_SUFFIX
+
+
+def iter_index_entries(stream: BinaryIO) -> Iterator[IndexEntry]:
+    """Yield an :class:`IndexEntry` for every record in a WARC stream.
+
+    Args:
+        stream: A binary stream positioned at the start of a WARC file.
+
+    Yields:
+        One entry per record, in file order.
+    """
+    iterator = ArchiveIterator(stream)
+    for record in iterator:
+        yield index_entry(iterator, record)
+
+
+def index_entry(iterator: ArchiveIterator, record: ArcWarcRecord) -> IndexEntry:
+    """Build the :class:`IndexEntry` of the record an ``ArchiveIterator`` just yielded.
+
+    Args:
+        iterator: The iterator, still positioned on *record*.
+        record: The record it yielded.
+
+    Returns:
+        The record's location and key headers.
+    """
+    headers = record.rec_headers
+    content_type = ""
+    if record.http_headers is not None:
+        content_type = record.http_headers.get_header("Content-Type", "")
+    return IndexEntry(
+        offset=iterator.get_record_offset(),
+        length=iterator.get_record_length(),
+        content_length=parse_content_length(headers.get_header("Content-Length")),
+        warc_type=headers.get_header("WARC-Type") or "",
+        record_id=headers.get_header("WARC-Record-ID") or "",
+        target_uri=headers.get_header("WARC-Target-URI") or "",
+        date=headers.get_header("WARC-Date") or "",
+        content_type=content_type,
+    )
+
+
+def write_record_index(entries: Iterable[IndexEntry], index_path: str, warc_stamp: FileStamp) -> None:
+    """Write entries to a sidecar file, atomically replacing any existing one.
+
+    Args:
+        entries: Index entries in file order.
+        index_path: Destination sidecar path.
+        warc_stamp: Stamp of the indexed WARC file as it was before it was
+            read, used to detect a stale sidecar.
+    """
+    heap = bytearray()
+    heap_refs: dict[str, tuple[int, int]] = {}
+
+    def ref(value: str) -> tuple[int, int]:
+        if value not in heap_refs:
+            encoded = value.encode("utf-8")
+            heap_refs[value] = (len(heap), len(encoded))
+            heap.extend(encoded)
+        return heap_refs[value]
+
+    entries = list(entries)
+    rows = bytearray()
+    for entry in entries:
+        refs = [n for name in _STRING_FIELDS for n in ref(getattr(entry, name))]
+        rows += _ENTRY.pack(entry.offset, entry.length, entry.content_length, *refs)
+
+    # sort permutations by encoded key so lookups can compare raw heap bytes
+    by_id = sorted(range(len(entries)), key=lambda i: entries[i].record_id.encode("utf-8"))
+    by_uri = sorted(range(len(entries)), key=lambda i: entries[i].target_uri.encode("utf-8"))
+
+    entries_off = _HEADER.size
+    by_id_off = entries_off + len(rows)
+    by_uri_off = by_id_off + _INDEX.size * len(entries)
+    heap_off = by_uri_off + _INDEX.size * len(entries)
+    header = _HEADER.pack(MAGIC, VERSION, len(entries), *warc_stamp, entries_off, by_id_off, by_uri_off, heap_off)
+
+    directory = os.path.dirname(os.path.abspath(index_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".idx-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(rows)
+            f.write(struct.pack(f"<{len(by_id)}I", *by_id))
+            f.write(struct.pack(f"<{len(by_uri)}I", *by_uri))
+            f.write(heap)
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def build_record_index(warc_path: str, index_path: str | None = None) -> str:
+    """Scan a WARC file and write its record index sidecar.
+
+    Args:
+        warc_path: Path to a ``.warc`` or ``.warc.gz`` file.
+        index_path: Where to write the sidecar; defaults to
+            :func:`sidecar_path`.
+
+    Returns:
+        The path of the written sidecar.
+
+    Raises:
+        FileNotFoundError: If the WARC file does not exist.
+    """
+    if not os.path.isfile(warc_path):
+        raise FileNotFoundError(f"WARC file not found: {warc_path}")
+
+    index_path = index_path or sidecar_path(warc_path)
+    warc_stamp = file_stamp(warc_path)
+    with open(warc_path, "rb") as f:
+        entries = list(iter_index_entries(f))
+    write_record_index(entries, index_path, warc_stamp)
+    return index_path
+
+
+class RecordIndex:
+    """A memory-mapped, read-only view of a record index sidecar.
+
+    Use as a context manager, or call :meth:`close` when done::
+
+        with RecordIndex(sidecar_path(warc_path)) as index:
+            entry = index.find_by_id("<urn:uuid:...>")
+    """
+
+    def __init__(self, index_path: str):
+        with open(index_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            fields = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self._mm.close()
+            raise ValueError(f"Not a record index: {index_path}") from None
+        magic, version, self._count, size, mtime_ns, inode, *offsets = fields
+        self._entries_off, by_id_off, by_uri_off, self._heap_off = offsets
+        self.warc_stamp = FileStamp(size, mtime_ns, inode)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"Not a record index (or unsupported version): {index_path}")
+        if self._heap_off > len(self._mm):
+            self._mm.close()
+            raise ValueError(f"Truncated record index: {index_path}")
+        self._perm_offsets = {"record_id": by_id_off, "target_uri": by_uri_off}
+
+    def __enter__(self) -> "RecordIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the sidecar file."""
+        self._mm.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position: int) -> IndexEntry:
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        return self._entry(position)
+
+    def __iter__(self) -> Iterator[IndexEntry]:
+        for position in range(self._count):
+            yield self._entry(position)
+
+    def find_by_id(self, record_id: str) -> IndexEntry | None:
+        """Return the entry for a ``WARC-Record-ID``, or ``None`` if absent."""
+        # binary search: permutation is sorted by record ID
+        matches = self._find("record_id", record_id)
+        return self._entry(matches[0]) if matches else None
+
+    def find_by_uri(self, target_uri: str) -> list[IndexEntry]:
+        """Return all entries for a ``WARC-Target-URI`` in file order."""
+        # binary search: permutation is sorted by target URI
+        return [self._entry(position) for position in sorted(self._find("target_uri", target_uri))]
+
+    def _find(self, field: str, value: str) -> list[int]:
+        """Return the entry positions whose *field* equals *value*."""
+        perm_off = self._perm_offsets[field]
+        field_index = _STRING_FIELDS.index(field)
+        key = value.encode("utf-8")
+
+        def position_at(rank: int) -> int:
+            return _INDEX.unpack_from(self._mm, perm_off + rank * _INDEX.size)[0]
+
+        def key_at(rank: int) -> bytes:
+            return self._string(self._row(position_at(rank)), field_index)
+
+        rank = bisect_left(range(self._count), key, key=key_at)
+        positions = []
+        while rank < self._count and key_at(rank) == key:
+            positions.append(position_at(rank))
+            rank += 1
+        return positions
+
+    def _row(self, position: int) -> tuple:
+        """Unpack the fixed-size row of an entry."""
+        return _ENTRY.unpack_from(self._mm, self._entries_off + position * _ENTRY.size)
+
+    def _string(self, row: tuple, field_index: int) -> bytes:
+        """Return the raw heap bytes of one string field of a row."""
+        begin = self._heap_off + row[3 + 2 * field_index]
+        return self._mm[begin : begin + row[4 + 2 * field_index]]
+
+    def _entry(self, position: int) -> IndexEntry:
+        row = self._row(position)
+        strings = [self._string(row, i).decode("utf-8") for i in range(len(_STRING_FIELDS))]
+        return IndexEntry(row[0], row[1], row[2], *strings)
+
+
+def open_record_index(warc_path: str) -> RecordIndex | None:
+    """Open the sidecar index of a WARC file if it exists and is current.
+
+    Args:
+        warc_path: Path to the indexed WARC file.
+
+    Returns:
+        An open :class:`RecordIndex`, or ``None`` if there is no sidecar, it
+        is truncated or not a record index, or the file changed since it was
+        built (its size, ``mtime_ns`` or inode differ).
+    """
+    index_path = sidecar_path(warc_path)
+    if not os.path.isfile(index_path):
+        return None
+    try:
+        index = RecordIndex(index_path)
+    except ValueError:
+        return None
+    if index.warc_stamp != file_stamp(warc_path):
+        index.close()
+        return None
+    return index
+
+
+def load_record_index(warc_path: str) -> RecordIndex:
+    """Open the sidecar index of a WARC file, building it first if it is missing or stale.
+
+    Args:
+        warc_path: Path to a local ``.warc`` or ``.warc.gz`` file.
+
+    Returns:
+        An open :class:`RecordIndex`.
+
+    Raises:
+        FileNotFoundError: If the WARC file does not exist.
+        ArchiveLoadFailed: If the index has to be built and the file is not
+            a valid WARC.
+    """
+    index = open_record_index(warc_path)
+    if index is None:
+        index = RecordIndex(build_record_index(warc_path))
+    return index
+
+
+def read_record_bytes(warc_path: str, entry: IndexEntry) -> bytes:
+    """Read one record with a single seek, decompressing only its gzip member.
+
+    Args:
+        warc_path: Path to the WARC file the entry belongs to.
+        entry: The record's index entry.
+
+    Returns:
+        The uncompressed WARC record (headers and block).
+    """
+    with open(warc_path, "rb") as f:
+        return read_record_at(f, entry)
+
+
+def read_record_at(stream: BinaryIO, entry: IndexEntry) -> bytes:
+    """Like :func:`read_record_bytes`, reading from an already open WARC file."""
+    stream.seek(entry.offset)
+    data = stream.read(entry.length)
+    if data.startswith(GZIP_MAGIC):
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+    return data
@@ -1,23 +1,74 @@
 """CLI entrypoint for CC News Analyzer."""
 
+import glob
+import json
 import os
+import time
 import urllib.error
-from datetime import datetime
+from datetime import UTC, datetime
 
 import click
 from warcio.exceptions import ArchiveLoadFailed
 
+from cc_news_analyzer.batch import DEFAULT_CHECKPOINT_EVERY, article_to_markdown_json, generate_markdown
+from cc_news_analyzer.cache import prune_cache
+from cc_news_analyzer.cdx import RecordIndex, build_record_index
 from cc_news_analyzer.index import (
+    DownloadResult,
     download_warc_by_path,
+    download_warcs,
     fetch_warc_paths,
+    is_remote_warc_path,
     parse_month_date,
     resolve_warc_path,
 )
-from cc_news_analyzer.warc import count_articles as _count_articles
-from cc_news_analyzer.warc import count_records as _count_records
+from cc_news_analyzer.jsonl import article_to_json, write_jsonl
+from cc_news_analyzer.lookup import ArticleLookup
+from cc_news_analyzer.metrics import RunMetrics
+from cc_news_analyzer.pages import DEFAULT_STRIDE, load_page_table, titles_from_page
+from cc_news_analyzer.planner import estimate_sizes, parse_datetime_bound, plan_date_range
+from cc_news_analyzer.profiling import PHASES, ProfileReport, phase, start_profiling, stop_profiling
+from cc_news_analyzer.search import KeywordMatcher, Query, read_keywords, search_warcs
+from cc_news_analyzer.summaries import summarize_articles
+from cc_news_analyzer.table import MetadataTable, TableSet, build_tables, load_tables
+from cc_news_analyzer.textindex import TextIndex, build_text_indexes, text_index_path
+from cc_news_analyzer.warc import (
+    SCANNER_VERSION,
+    WARC_EXTENSIONS,
+    WarcStats,
+    expand_warc_inputs,
+    scan_warc,
+    scan_warc_files,
+)
 
-WARC_EXTENSIONS = (".warc", ".warc.gz")
 DEFAULT_DOWNLOAD_DIR = ".tmp"
+DEFAULT_CACHE_DIR = os.path.join(DEFAULT_DOWNLOAD_DIR, "cache")
+
+headers_only_option = click.option(
+    "--headers-only",
+    is_flag=True,
+    default=False,
+    help="Read only WARC and HTTP headers, skipping record bodies (faster).",
+)
+workers_option = click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes to scan files in parallel.",
+)
+no_cache_option = click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help=f"Rescan instead of using the scan result cache ({DEFAULT_CACHE_DIR}), and do not update it.",
+)
+no_index_option = click.option(
+    "--no-index",
+    is_flag=True,
+    default=False,
+    help="Do not write the record index sidecar (<file>.idx) as a by-product of the scan.",
+)
 
 
 class WarcFilePath(click.Path):
@@ -53,40 +104,680 @@ class WarcFilePath(click.Path):
         return path
 
 
+class WarcInputPath(WarcFilePath):
+    """A :class:`WarcFilePath` that also accepts directories, glob patterns and remote CC-NEWS paths."""
+
+    def convert(self, value, param, ctx):
+        """Pass directories, glob patterns and remote paths through for later expansion."""
+        if os.path.isdir(value) or glob.has_magic(value):
+            return value
+        if is_remote_warc_path(value) and not os.path.exists(value):
+            return value
+        return super().convert(value, param, ctx)
+
+
+def _scan_files(warc_inputs: tuple[str, ...], **options) -> list[tuple[str, WarcStats]]:
+    """Expand WARC inputs and scan them, translating failures into Click errors."""
+    paths = expand_warc_inputs(list(warc_inputs))
+    if not paths:
+        raise click.ClickException(f"No WARC files found in: {' '.join(warc_inputs)}")
+    try:
+        results = scan_warc_files(paths, **options)
+    except ArchiveLoadFailed as exc:
+        raise click.ClickException(
+            f"Failed to read WARC file: {exc} -- is this a valid .warc or .warc.gz file?"
+        ) from exc
+    except urllib.error.URLError as exc:
+        raise click.ClickException(
+            f"Failed to stream remote WARC file: {exc}\nRun 'cc-news get-index' to see available files."
+        ) from exc
+    _run_metrics().add_scans(results)
+    return results
+
+
+def _run_metrics() -> RunMetrics:
+    """Return the metrics of the running command (written out by --metrics-json)."""
+    return click.get_current_context().ensure_object(RunMetrics)
+
+
+def _write_metrics(metrics: RunMetrics, path: str) -> None:
+    """Write run metrics as JSON to *path*, or to stdout if it is ``-``."""
+    text = json.dumps(metrics.to_dict(), indent=2)
+    if path == "-":
+        click.echo(text)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+
+
+def _echo_counts(results: list[tuple[str, WarcStats]], field: str, label: str) -> None:
+    """Print one row per file (when there are several) and a grand total."""
+    with phase("output"):
+        if len(results) > 1:
+            for path, stats in results:
+                click.echo(f"{path}: {getattr(stats, field)}")
+        click.echo(f"{label}: {sum(getattr(stats, field) for _, stats in results)}")
+
+
+def _echo_profile(report: ProfileReport) -> None:
+    """Print a profiling report to stderr."""
+    lines = [f"Profile: {report.wall_seconds:.3f}s wall time"]
+    wall = report.wall_seconds or 1e-9
+    for name in PHASES:
+        seconds = report.phases.get(name, 0.0)
+        lines.append(f"  {name:<12}{seconds:9.3f}s {seconds / wall:6.1%}")
+    other = report.unattributed_seconds
+    lines.append(f"  {'other':<12}{other:9.3f}s {other / wall:6.1%}")
+    if report.records:
+        lines.append(f"Records: {report.records} ({report.records_per_second:,.0f} records/s)")
+    if report.peak_rss is not None:
+        lines.append(f"Peak RSS: {report.peak_rss / 1_000_000:.1f} MB")
+    if report.pstats_path:
+        lines.append(f"cProfile statistics written to {report.pstats_path}")
+    click.echo("\n".join(lines), err=True)
+
+
 @click.group(context_settings={"help_option_names": ["-h", "--help"]})
-def cli():
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="Print a breakdown of time by phase (open, decompress, parse, filter, output), "
+    "peak RSS and records/s to stderr when the command finishes. "
+    "Time spent in worker processes is reported as 'other'.",
+)
+@click.option(
+    "--profile-out",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Also run cProfile and write its statistics (pstats format) to this file. Implies --profile.",
+)
+@click.option(
+    "--metrics-json",
+    type=click.Path(dir_okay=False, writable=True, allow_dash=True),
+    default=None,
+    help="Write machine-readable metrics of the run (bytes read, records by type, wall and CPU time, "
+    "throughput, and HTTP status, retries and bytes of downloads) as JSON to this file, or '-' for stdout.",
+)
+@click.pass_context
+def cli(ctx: click.Context, profile: bool, profile_out: str | None, metrics_json: str | None):
     """CC News Analyzer - Analyze Common Crawl News WARC datasets."""
-    pass
+    ctx.obj = RunMetrics(ctx.invoked_subcommand or "")
+    if metrics_json:
+        ctx.call_on_close(lambda: _write_metrics(ctx.obj, metrics_json))
+    if profile or profile_out:
+        profiler = start_profiling(profile_out)
+        ctx.call_on_close(lambda: _echo_profile(stop_profiling(profiler)))
 
 
 @cli.command("count-records")
+@click.argument("warc_files", nargs=-1, required=True, type=WarcInputPath())
+@workers_option
+@headers_only_option
+@no_index_option
+@no_cache_option
+def count_records_cmd(warc_files: tuple[str, ...], workers: int, headers_only: bool, no_index: bool, no_cache: bool):
+    """Count the number of WARC records with a WARC-Record-ID in one or more files.
+
+    WARC_FILES may be files, directories or glob patterns, or CC-NEWS
+    relative paths or URLs, which are streamed without being saved to disk.
+    With several files, a row is printed per file followed by the grand total.
+    """
+    results = _scan_files(
+        warc_files,
+        workers=workers,
+        headers_only=headers_only,
+        write_index=not no_index,
+        cache_dir=None if no_cache else DEFAULT_CACHE_DIR,
+    )
+    _echo_counts(results, "records", "Total WARC records with WARC-Record-ID")
+
+
+@cli.command("count-articles")
+@click.argument("warc_files", nargs=-1, required=True, type=WarcInputPath())
+@workers_option
+@headers_only_option
+@no_index_option
+@no_cache_option
+def count_articles_cmd(warc_files: tuple[str, ...], workers: int, headers_only: bool, no_index: bool, no_cache: bool):
+    """Count article records (HTML responses) in one or more WARC files.
+
+    Articles are WARC response records with an HTML content type.
+    This is distinct from count-records, which counts all WARC record types.
+
+    WARC_FILES may be files, directories or glob patterns, or CC-NEWS
+    relative paths or URLs, which are streamed without being saved to disk.
+    With several files, a row is printed per file followed by the grand total.
+    """
+    results = _scan_files(
+        warc_files,
+        workers=workers,
+        headers_only=headers_only,
+        write_index=not no_index,
+        cache_dir=None if no_cache else DEFAULT_CACHE_DIR,
+    )
+    _echo_counts(results, "articles", "Total articles")
+
+
+@cli.command("stats")
 @click.argument("warc_file", type=WarcFilePath())
-def count_records_cmd(warc_file: str):
-    """Count the number of WARC records with a WARC-Record-ID in a file."""
+@headers_only_option
+@no_index_option
+@no_cache_option
+def stats_cmd(warc_file: str, headers_only: bool, no_index: bool, no_cache: bool):
+    """Show record, article, content-type, size and date statistics for a WARC file.
+
+    All statistics are gathered in a single pass over the file.
+    """
     try:
-        total = _count_records(warc_file)
+        stats = scan_warc(
+            warc_file,
+            headers_only=headers_only,
+            write_index=not no_index,
+            cache_dir=None if no_cache else DEFAULT_CACHE_DIR,
+        )
     except ArchiveLoadFailed as exc:
         raise click.ClickException(
             f"Failed to read WARC file: {warc_file} -- is this a valid .warc or .warc.gz file?"
         ) from exc
-    click.echo(f"Total WARC records with WARC-Record-ID: {total}")
+    _run_metrics().add_scans([(warc_file, stats)])
 
+    with phase("output"):
+        _echo_stats(stats)
 
-@cli.command("count-articles")
+
+def _echo_stats(stats: WarcStats) -> None:
+    """Print the statistics of one file."""
+    click.echo(f"Total WARC records with WARC-Record-ID: {stats.records}")
+    click.echo("Records by type:")
+    for warc_type, count in sorted(stats.records_by_type.items()):
+        click.echo(f"  {warc_type}: {count}")
+    click.echo(f"Total articles: {stats.articles}")
+    click.echo("Content types:")
+    for media_type, count in sorted(stats.content_types.items(), key=lambda item: (-item[1], item[0])):
+        click.echo(f"  {media_type}: {count}")
+    click.echo(f"Payload bytes: {stats.payload_bytes}")
+    click.echo(f"Date range: {stats.min_date or '-'} to {stats.max_date or '-'}")
+
+
+@cli.command("to-jsonl")
+@click.argument("warc_files", nargs=-1, required=True, type=WarcInputPath())
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, writable=True, allow_dash=True),
+    default="-",
+    show_default=True,
+    help="File to write, or '-' for stdout.",
+)
+@click.option(
+    "--gzip",
+    "compress",
+    is_flag=True,
+    default=False,
+    help="Gzip the output (the default when --output ends in .gz).",
+)
+@workers_option
+def to_jsonl_cmd(warc_files: tuple[str, ...], output: str, compress: bool, workers: int):
+    """Convert the articles of WARC files to JSON Lines.
+
+    Each article (HTML response) becomes one line holding a JSON object with
+    its record_id, uri, date, content_type and decoded body, in input order,
+    ready for jq or ripgrep. WARC_FILES may be files, directories or glob
+    patterns, or CC-NEWS relative paths or URLs, which are streamed.
+    """
+    paths = expand_warc_inputs(list(warc_files))
+    if not paths:
+        raise click.ClickException(f"No WARC files found in: {' '.join(warc_files)}")
+    compress = compress or output.endswith(".gz")
+    try:
+        with click.open_file(output, "wb") as f:
+            spool_dir = None if output == "-" else os.path.dirname(os.path.abspath(output))
+            result = write_jsonl(paths, f, workers=workers, compress=compress, spool_dir=spool_dir)
+    except ArchiveLoadFailed as exc:
+        raise click.ClickException(
+            f"Failed to read WARC file: {exc} -- is this a valid .warc or .warc.gz file?"
+        ) from exc
+    except urllib.error.URLError as exc:
+        raise click.ClickException(f"Failed to stream remote WARC file: {exc}") from exc
+    _run_metrics().count("articles", result.articles)
+    _run_metrics().count("bytes_written", result.bytes_written)
+    if output != "-":
+        click.echo(f"Wrote {result.articles} article(s) to {output} ({result.bytes_written / 1_000_000:.1f} MB)")
+
+
+@cli.command("to-markdown")
 @click.argument("warc_file", type=WarcFilePath())
-def count_articles_cmd(warc_file: str):
-    """Count article records (HTML responses) in a WARC file.
+@click.option(
+    "-o",
+    "--output",
+    required=True,
+    type=click.Path(dir_okay=False, writable=True),
+    help="JSON Lines file to write.",
+)
+@click.option("--text", is_flag=True, default=False, help="Emit plain text instead of Markdown.")
+@click.option(
+    "--checkpoint-every",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CHECKPOINT_EVERY,
+    show_default=True,
+    help="Write a resume checkpoint after this many articles.",
+)
+@click.option("--restart", is_flag=True, default=False, help="Ignore any checkpoint and start from the beginning.")
+def to_markdown_cmd(warc_file: str, output: str, text: bool, checkpoint_every: int, restart: bool):
+    """Convert the articles of a WARC file to Markdown, resumably.
 
-    Articles are WARC response records with an HTML content type.
-    This is distinct from count-records, which counts all WARC record types.
+    Each article becomes one JSON line holding its record_id, uri, date and
+    markdown (or text, with --text). A checkpoint (<output>.checkpoint) holds
+    the byte offset of the next article, so an interrupted run started again
+    with the same arguments seeks straight there and carries on.
     """
     try:
-        total = _count_articles(warc_file)
+        result = generate_markdown(warc_file, output, text=text, checkpoint_every=checkpoint_every, resume=not restart)
     except ArchiveLoadFailed as exc:
         raise click.ClickException(
             f"Failed to read WARC file: {warc_file} -- is this a valid .warc or .warc.gz file?"
         ) from exc
-    click.echo(f"Total articles: {total}")
+    except ValueError as exc:
+        raise click.ClickException(f"Cannot resume: {exc} (use --restart to start over)") from exc
+    if result.resumed_from is not None:
+        checkpoint = result.resumed_from
+        click.echo(f"Resumed after {checkpoint.articles} article(s) at offset {checkpoint.offset}")
+    _run_metrics().count("articles", result.articles)
+    click.echo(f"Wrote {result.articles} article(s) to {output} ({result.bytes_written / 1_000_000:.1f} MB)")
+
+
+@cli.command("index-warc")
+@click.argument("warc_file", type=WarcFilePath())
+def index_warc_cmd(warc_file: str):
+    """Build the record index sidecar (<file>.idx) for a WARC file.
+
+    The sidecar maps each record's ID, target URI, date, type and content
+    type to its compressed offset and length, so later lookups can seek
+    straight to a single gzip member instead of rescanning the file.
+    """
+    try:
+        index_path = build_record_index(warc_file)
+    except ArchiveLoadFailed as exc:
+        raise click.ClickException(
+            f"Failed to read WARC file: {warc_file} -- is this a valid .warc or .warc.gz file?"
+        ) from exc
+    with RecordIndex(index_path) as index:
+        total = len(index)
+    _run_metrics().count("indexed_records", total)
+    click.echo(f"Indexed {total} records: {index_path}")
+
+
+@cli.command("get-article")
+@click.argument("warc_files", nargs=-1, required=True, type=WarcFilePath())
+@click.option(
+    "--id", "record_ids", multiple=True, required=True, help="WARC-Record-ID of an article; repeat for several."
+)
+@click.option("--text", is_flag=True, default=False, help="Print the text of each article instead of its HTML.")
+def get_article_cmd(warc_files: tuple[str, ...], record_ids: tuple[str, ...], text: bool):
+    """Print articles by WARC-Record-ID as JSON Lines.
+
+    Each record is found in the record index (<file>.idx, built if missing)
+    and read with a single seek, decompressing only its gzip member.
+    Articles asked for more than once are decoded once and then served
+    from memory.
+    """
+    try:
+        lookup = ArticleLookup(warc_files)
+    except ArchiveLoadFailed as exc:
+        raise click.ClickException(
+            f"Failed to read WARC file: {exc} -- is this a valid .warc or .warc.gz file?"
+        ) from exc
+    missing = []
+    with lookup:
+        for record_id in record_ids:
+            article = lookup.get_article(record_id)
+            if article is None:
+                missing.append(record_id)
+            else:
+                click.echo(article_to_markdown_json(article, text=True) if text else article_to_json(article))
+        _run_metrics().count("articles", len(record_ids) - len(missing))
+        _run_metrics().count("cache_hits", lookup.cache.hits)
+    if missing:
+        raise click.ClickException(f"No article with record ID: {', '.join(missing)}")
+
+
+@cli.command("search")
+@click.argument("warc_files", nargs=-1, required=True, type=WarcInputPath())
+@click.option(
+    "--keywords",
+    "keywords_file",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="File of keywords or phrases, one per line ('#' starts a comment line).",
+)
+@click.option("-k", "--keyword", "keywords", multiple=True, help="A keyword or phrase to search for (repeatable).")
+@click.option(
+    "-q",
+    "--query",
+    default=None,
+    help="A boolean query instead of keywords, e.g. 'climate AND (\"carbon tax\" OR emissions)'.",
+)
+@click.option("--case-sensitive", is_flag=True, default=False, help="Match case exactly (default: case-folded).")
+@click.option("--whole-word", is_flag=True, default=False, help="Match only whole words, not parts of words.")
+@click.option("--no-index", is_flag=True, default=False, help="Scan the WARC files even if they have a text index.")
+@workers_option
+def search_cmd(
+    warc_files: tuple[str, ...],
+    keywords_file: str | None,
+    keywords: tuple[str, ...],
+    query: str | None,
+    case_sensitive: bool,
+    whole_word: bool,
+    no_index: bool,
+    workers: int,
+):
+    """Search the text of the articles of WARC files for keywords or a query.
+
+    Every article is scanned once, however many keywords are given.
+    Matching articles are printed as they are found, as WARC-Record-ID,
+    target URI and a KEYWORD=COUNT field per matching keyword separated by
+    tabs; a summary of hits per keyword is printed to stderr at the end.
+
+    A --query combines words and "quoted phrases" with AND and OR (AND binds
+    tighter; adjacent terms are ANDed) and parentheses. Queries and
+    --whole-word keyword searches that are not --case-sensitive are answered
+    from the text index of files that have one (see build-text-index)
+    without decompressing them.
+    """
+    keywords = [*keywords, *(read_keywords(keywords_file) if keywords_file else [])]
+    matcher = _search_matcher(keywords, query, case_sensitive=case_sensitive, whole_word=whole_word)
+    paths = expand_warc_inputs(list(warc_files))
+    if not paths:
+        raise click.ClickException(f"No WARC files found in: {' '.join(warc_files)}")
+
+    totals = dict.fromkeys(matcher.keywords, 0)
+    matches = 0
+    try:
+        for hit in search_warcs(paths, matcher, workers=workers, use_index=not no_index):
+            matches += 1
+            for keyword, count in hit.counts.items():
+                totals[keyword] += count
+            with phase("output"):
+                counts = "\t".join(f"{keyword}={count}" for keyword, count in hit.counts.items())
+                click.echo(f"{hit.record_id}\t{hit.uri}\t{counts}")
+    except ArchiveLoadFailed as exc:
+        raise click.ClickException(
+            f"Failed to read WARC file: {exc} -- is this a valid .warc or .warc.gz file?"
+        ) from exc
+    except urllib.error.URLError as exc:
+        raise click.ClickException(f"Failed to stream remote WARC file: {exc}") from exc
+
+    _run_metrics().count("matches", matches)
+    click.echo(f"Matched {matches} article(s).", err=True)
+    for keyword, count in totals.items():
+        click.echo(f"  {keyword}: {count}", err=True)
+
+
+def _search_matcher(
+    keywords: list[str], query: str | None, *, case_sensitive: bool, whole_word: bool
+) -> KeywordMatcher | Query:
+    """Compile the keywords or query of the search command, raising usage errors for bad input."""
+    if query is not None and keywords:
+        raise click.UsageError("Pass either --query or keywords, not both.")
+    if query is None and not keywords:
+        raise click.UsageError("Pass keywords with --keywords FILE or -k KEYWORD, or a --query.")
+    if query is None:
+        return KeywordMatcher(keywords, case_sensitive=case_sensitive, whole_word=whole_word)
+    try:
+        return Query(query)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="'--query'") from exc
+
+
+@cli.command("summaries")
+@click.argument("warc_files", nargs=-1, required=True, type=WarcInputPath())
+@click.option("--lede", is_flag=True, default=False, help="Also extract the first paragraph, reading into the body.")
+@click.option(
+    "--limit-bytes",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Read at most this many bytes of each article's HTML [default: 16 KiB, or 64 KiB with --lede].",
+)
+@click.option("--no-index", is_flag=True, default=False, help="Read the files in one pass even if they have a .idx.")
+def summaries_cmd(warc_files: tuple[str, ...], lede: bool, limit_bytes: int | None, no_index: bool):
+    """Print the title, meta description and meta tags of every article as JSON Lines.
+
+    Only the start of each article is read -- up to </head>, or the first
+    --limit-bytes with --lede -- and the rest of the record is skipped
+    without being decoded. With a current record index (<file>.idx, see
+    index-warc) each article is reached with a seek, so the rest of the
+    file is not even decompressed.
+    """
+    paths = expand_warc_inputs(list(warc_files))
+    if not paths:
+        raise click.ClickException(f"No WARC files found in: {' '.join(warc_files)}")
+    count = 0
+    try:
+        for path in paths:
+            for summary in summarize_articles(path, lede=lede, limit=limit_bytes, use_index=not no_index):
+                line = summary._asdict()
+                if not lede:
+                    del line["lede"]
+                click.echo(json.dumps(line, ensure_ascii=False))
+                count += 1
+    except ArchiveLoadFailed as exc:
+        raise click.ClickException(
+            f"Failed to read WARC file: {exc} -- is this a valid .warc or .warc.gz file?"
+        ) from exc
+    except urllib.error.URLError as exc:
+        raise click.ClickException(f"Failed to stream remote WARC file: {exc}") from exc
+    _run_metrics().count("articles", count)
+
+
+@cli.command("build-text-index")
+@click.argument("warc_files", nargs=-1, required=True, type=WarcInputPath())
+@workers_option
+def build_text_index_cmd(warc_files: tuple[str, ...], workers: int):
+    """Build the text index sidecar (<file>.tix) of WARC files.
+
+    The text of every article is tokenized once into an inverted index of
+    words to the articles and positions they occur at, so later searches
+    by word, phrase or boolean query read only the posting lists of the
+    words asked for instead of decompressing the WARC.
+    """
+    paths = expand_warc_inputs(list(warc_files))
+    if not paths:
+        raise click.ClickException(f"No WARC files found in: {' '.join(warc_files)}")
+    try:
+        build_text_indexes(paths, workers=workers)
+    except ArchiveLoadFailed as exc:
+        raise click.ClickException(
+            f"Failed to read WARC file: {exc} -- is this a valid .warc or .warc.gz file?"
+        ) from exc
+    documents = 0
+    for path in paths:
+        index_path = text_index_path(path)
+        with TextIndex(index_path) as index:
+            documents += len(index)
+            click.echo(f"Indexed {len(index)} article(s), {index.term_count} words: {index_path}")
+    _run_metrics().count("indexed_articles", documents)
+
+
+@cli.command("build-table")
+@click.argument("warc_files", nargs=-1, required=True, type=WarcInputPath())
+@workers_option
+def build_table_cmd(warc_files: tuple[str, ...], workers: int):
+    """Build the columnar metadata table (<file>.cols/) of WARC files.
+
+    The table holds the record ID, target URI, host, date, content type,
+    payload length and offset of every record as NumPy arrays, so
+    query-table can filter and count records without decompressing the
+    WARC. Tables are read from the record index sidecar when there is one.
+    Requires NumPy (pip install 'cc-news-analyzer[table]').
+    """
+    table = _load_tables(warc_files, build=True, workers=workers, rebuild=True)
+    _run_metrics().count("records", len(table))
+    click.echo(f"Built metadata tables for {len(table.files)} file(s), {len(table)} records.")
+
+
+@cli.command("titles")
+@click.argument("warc_file", type=WarcFilePath())
+@click.option("--page", type=click.IntRange(min=1), default=1, show_default=True, help="Page to show, from 1.")
+@click.option("--count", type=click.IntRange(min=1), default=20, show_default=True, help="Articles per page.")
+@click.option(
+    "--stride",
+    type=click.IntRange(min=1),
+    default=None,
+    help=(
+        "Record the offset of every this-many articles in the page table, rebuilding it if it has another "
+        f"stride. [default: the existing table's, or {DEFAULT_STRIDE} when building one]"
+    ),
+)
+def titles_cmd(warc_file: str, page: int, count: int, stride: int | None):
+    """List the titles of one page of a WARC file's articles.
+
+    The first run builds a page table sidecar (<file>.pages) of article
+    offsets, from the record index (<file>.idx, built too if missing), so
+    every page is then read with a single seek. Each title is read from the
+    start of the article only as far as </title>.
+    """
+    try:
+        with load_page_table(warc_file, stride=stride) as table:
+            titles = titles_from_page(warc_file, count, page, table=table)
+            pages = table.page_count(count)
+            total = len(table)
+    except ArchiveLoadFailed as exc:
+        raise click.ClickException(
+            f"Failed to read WARC file: {warc_file} -- is this a valid .warc or .warc.gz file?"
+        ) from exc
+    _run_metrics().count("articles", len(titles))
+    with phase("output"):
+        click.echo(f"Page {page} of {pages} ({total} articles)")
+        for title in titles:
+            click.echo(f"{title.number + 1}\t{title.title or '(no title)'}\t{title.uri}")
+
+
+@cli.command("query-table")
+@click.argument("warc_files", nargs=-1, required=True, type=WarcInputPath())
+@click.option("--host", "hosts", multiple=True, help="Keep records from this host (repeatable).")
+@click.option("--type", "warc_types", multiple=True, help="Keep records of this WARC-Type (repeatable).")
+@click.option("--content-type", "content_types", multiple=True, help="Keep records of this media type (repeatable).")
+@click.option("--articles", is_flag=True, default=False, help="Keep only articles (HTML responses).")
+@click.option("--from", "start", default=None, help="Keep records dated at or after this time (UTC).")
+@click.option("--to", "end", default=None, help="Keep records dated before this time (UTC).")
+@click.option("--record-id", "record_ids", multiple=True, help="Keep the record with this WARC-Record-ID (repeatable).")
+@click.option("--uri", "uris", multiple=True, help="Keep records with this target URI (repeatable).")
+@click.option(
+    "--count-by",
+    type=click.Choice(["host", "content_type", "warc_type", "file"]),
+    default=None,
+    help="Print the number of matching records per value instead of the records.",
+)
+@click.option("--limit", type=click.IntRange(min=0), default=None, help="Print at most this many records.")
+@workers_option
+def query_table_cmd(
+    warc_files: tuple[str, ...],
+    hosts: tuple[str, ...],
+    warc_types: tuple[str, ...],
+    content_types: tuple[str, ...],
+    articles: bool,
+    start: str | None,
+    end: str | None,
+    record_ids: tuple[str, ...],
+    uris: tuple[str, ...],
+    count_by: str | None,
+    limit: int | None,
+    workers: int,
+):
+    """Filter and count records using the metadata tables of WARC files.
+
+    Missing tables are built first (see build-table). Matching records are
+    printed as date, WARC-Record-ID and target URI separated by tabs.
+    """
+    try:
+        since = parse_datetime_bound(start) if start else None
+        until = parse_datetime_bound(end) if end else None
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
+    table = _load_tables(warc_files, build=True, workers=workers)
+    mask = table.select(
+        hosts=hosts,
+        content_types=content_types,
+        warc_types=warc_types,
+        since=since,
+        until=until,
+        articles=articles,
+        record_ids=record_ids,
+        uris=uris,
+    )
+    _run_metrics().count("records", len(table))
+    _run_metrics().count("matches", int(mask.sum()))
+    with phase("output"):
+        if count_by:
+            for value, count in table.value_counts(count_by, mask).items():
+                click.echo(f"{value or '-'}\t{count}")
+        else:
+            _echo_rows(table, mask, limit)
+
+
+def _load_tables(
+    warc_files: tuple[str, ...], *, build: bool, workers: int, rebuild: bool = False
+) -> MetadataTable | TableSet:
+    """Load (building as needed) the metadata tables of WARC inputs, translating failures into Click errors."""
+    paths = expand_warc_inputs(list(warc_files))
+    if not paths:
+        raise click.ClickException(f"No WARC files found in: {' '.join(warc_files)}")
+    try:
+        if rebuild:
+            build_tables(paths, workers=workers)
+        return load_tables(paths, build=build, workers=workers)
+    except ImportError as exc:
+        raise click.ClickException(str(exc)) from exc
+    except FileNotFoundError as exc:
+        raise click.ClickException(f"{exc} (metadata tables need local WARC files)") from exc
+    except ValueError as exc:
+        raise click.ClickException(f"{exc} (rebuild it with build-table)") from exc
+    except ArchiveLoadFailed as exc:
+        raise click.ClickException(
+            f"Failed to read WARC file: {exc} -- is this a valid .warc or .warc.gz file?"
+        ) from exc
+
+
+def _echo_rows(table: MetadataTable | TableSet, mask, limit: int | None) -> None:
+    """Print the date, record ID and URI of the selected rows."""
+    rows = mask.nonzero()[0]
+    for row in rows[:limit]:
+        values = table.row(int(row))
+        date = datetime.fromtimestamp(values["date"], UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        click.echo(f"{date}\t{values['record_id']}\t{values['target_uri']}")
+
+
+def _month_or_current(date: str | None) -> tuple[int, int]:
+    """Parse an ``MM-YYYY`` option value, defaulting to the current month."""
+    if not date:
+        now = datetime.now()
+        return now.year, now.month
+    try:
+        return parse_month_date(date)
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+
+@cli.command("cache-prune")
+@click.option(
+    "--older-than",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Also remove results cached more than this many days ago.",
+)
+@click.option("--all", "remove_all", is_flag=True, default=False, help="Remove every cached result.")
+def cache_prune_cmd(older_than: float | None, remove_all: bool):
+    """Remove stale entries from the scan result cache.
+
+    Results are stale when their WARC file was deleted or changed, or when
+    they were produced by another version of the scanner.
+    """
+    max_age = older_than * 24 * 60 * 60 if older_than is not None else None
+    result = prune_cache(DEFAULT_CACHE_DIR, SCANNER_VERSION, max_age=max_age, remove_all=remove_all)
+    _run_metrics().count("removed", result.removed)
+    _run_metrics().count("kept", result.kept)
+    click.echo(f"Removed {result.removed} cached result(s), kept {result.kept}.")
 
 
 @cli.command("get-index")
@@ -96,45 +787,153 @@ def count_articles_cmd(warc_file: str):
     help="Month to fetch in MM-YYYY format (defaults to current month).",
 )
 def get_index_cmd(date: str | None):
-    """Download the CC-NEWS WARC index and list available files."""
-    if date:
-        try:
-            year, month = parse_month_date(date)
-        except ValueError as exc:
-            raise click.ClickException(str(exc)) from exc
-    else:
-        now = datetime.now()
-        year, month = now.year, now.month
+    """Download the CC-NEWS WARC index and list available files.
+
+    Indexes are cached per month under .tmp/index/; past months are never
+    refetched and the current month is revalidated at most once an hour.
+    """
+    year, month = _month_or_current(date)
 
     dest_dir = ".tmp"
     paths = fetch_warc_paths(year, month, dest_dir)
+    _run_metrics().count("index_files", len(paths))
 
-    click.echo(f"Found {len(paths)} WARC file(s) for {year}-{month:02d}:")
-    for path in paths:
-        click.echo(path)
+    with phase("output"):
+        click.echo(f"Found {len(paths)} WARC file(s) for {year}-{month:02d}:")
+        for path in paths:
+            click.echo(path)
 
 
 @cli.command("get-warc")
-@click.argument("warc_path")
+@click.argument("warc_paths", nargs=-1)
 @click.option(
     "--dest",
     default=".tmp",
-    help="Destination directory for the downloaded file (defaults to .tmp).",
+    help="Destination directory for the downloaded files (defaults to .tmp).",
 )
-def get_warc_cmd(warc_path: str, dest: str):
-    """Download a WARC file from the CC-NEWS dataset.
+@click.option(
+    "--from-index",
+    is_flag=True,
+    default=False,
+    help="Download every file in the month's index (see --date).",
+)
+@click.option(
+    "--date",
+    default=None,
+    help="Month whose index --from-index uses, in MM-YYYY format (defaults to current month).",
+)
+@click.option(
+    "--from",
+    "start",
+    default=None,
+    help="Download the files covering a date range starting here (e.g. 2026-02-03T00, UTC).",
+)
+@click.option(
+    "--to",
+    "end",
+    default=None,
+    help="End of the --from date range, exclusive (defaults to now).",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Print the files and their estimated total size without downloading them.",
+)
+@click.option(
+    "--parallel",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Maximum number of concurrent downloads.",
+)
+def get_warc_cmd(
+    warc_paths: tuple[str, ...],
+    dest: str,
+    from_index: bool,
+    date: str | None,
+    start: str | None,
+    end: str | None,
+    dry_run: bool,
+    parallel: int,
+):
+    """Download one or more WARC files from the CC-NEWS dataset.
 
-    WARC_PATH can be a relative path (e.g.
+    Each WARC_PATH can be a relative path (e.g.
     crawl-data/CC-NEWS/2026/02/CC-NEWS-20260204051206-06668.warc.gz),
     a full URL, or a bare filename (requires a local index from get-index).
+    With --from-index, every file in the index of the month given by --date
+    is downloaded instead. With --from/--to, the files whose crawl segments
+    overlap the date range are selected from the timestamps in their names.
+
+    Several files are downloaded concurrently; failures are reported at the
+    end without stopping the rest of the batch.
     """
+    if [bool(warc_paths), from_index, start is not None].count(True) != 1:
+        raise click.UsageError("Pass one or more WARC_PATH arguments, --from-index, or --from.")
+    if date and not from_index:
+        raise click.UsageError("--date can only be used with --from-index.")
+    if end and start is None:
+        raise click.UsageError("--to can only be used with --from.")
+
+    resolved = _select_warc_paths(warc_paths, dest, from_index, date, start, end, parallel)
+    if dry_run:
+        _echo_plan(resolved, parallel)
+    elif len(resolved) == 1 and warc_paths:
+        _download_one(resolved[0], dest)
+    else:
+        _download_batch(resolved, dest, parallel)
+
+
+def _select_warc_paths(
+    warc_paths: tuple[str, ...],
+    dest: str,
+    from_index: bool,
+    date: str | None,
+    start: str | None,
+    end: str | None,
+    parallel: int,
+) -> list[str]:
+    """Resolve the get-warc selection to relative paths, translating failures into Click errors."""
     try:
-        resolved = resolve_warc_path(warc_path, index_dir=dest)
+        if from_index:
+            return fetch_warc_paths(*_month_or_current(date), dest)
+        if start is not None:
+            return _plan_date_range(start, end, dest, parallel)
+        return list(dict.fromkeys(resolve_warc_path(path, index_dir=dest) for path in warc_paths))
     except ValueError as exc:
         raise click.ClickException(str(exc)) from exc
+    except OSError as exc:
+        raise click.ClickException(f"Failed to fetch the WARC index: {exc}") from exc
+
+
+def _plan_date_range(start: str, end: str | None, dest: str, parallel: int) -> list[str]:
+    """Select the WARC paths covering ``[start, end)`` (``end`` defaults to now)."""
+    start_time = parse_datetime_bound(start)
+    end_time = parse_datetime_bound(end) if end else datetime.now(UTC)
+    return [warc.warc_path for warc in plan_date_range(start_time, end_time, dest, parallel=parallel)]
+
 
+def _echo_plan(warc_paths: list[str], parallel: int) -> None:
+    """Print the selected files with their remote sizes and the estimated total."""
+    with phase("open"):
+        sizes = estimate_sizes(warc_paths, parallel=parallel)
+    known = [size for size in sizes if size is not None]
+    _run_metrics().count("planned_files", len(warc_paths))
+    _run_metrics().count("estimated_bytes", sum(known))
+    with phase("output"):
+        for warc_path, size in zip(warc_paths, sizes, strict=True):
+            click.echo(f"{warc_path}\t{'?' if size is None else f'{size / 1_000_000:.1f} MB'}")
+        unknown = f" ({len(sizes) - len(known)} of unknown size)" if len(known) < len(sizes) else ""
+        click.echo(f"Plan: {len(warc_paths)} file(s), {sum(known) / 1_000_000:.1f} MB estimated{unknown}")
+
+
+def _download_one(warc_path: str, dest: str) -> None:
+    """Download a single WARC file, translating failures into Click errors."""
+    result = DownloadResult(warc_path)
+    _run_metrics().add_download(result)
     try:
-        local_path = download_warc_by_path(resolved, dest)
+        local_path = download_warc_by_path(warc_path, dest, result=result)
     except ValueError as exc:
         raise click.ClickException(str(exc)) from exc
     except urllib.error.HTTPError as exc:
@@ -155,5 +954,45 @@ def get_warc_cmd(warc_path: str, dest: str):
     click.echo(f"Downloaded: {local_path}")
 
 
+def _download_batch(warc_paths: list[str], dest: str, parallel: int) -> None:
+    """Download many WARC files concurrently and report throughput and failures."""
+
+    def report(result: DownloadResult) -> None:
+        if result.error is not None:
+            click.echo(f"Failed: {result.warc_path}: {result.error}", err=True)
+        elif _already_downloaded(result):
+            click.echo(f"Already downloaded: {result.local_path}")
+        else:
+            click.echo(f"Downloaded: {result.local_path} ({result.bytes_transferred / 1_000_000:.1f} MB)")
+
+    click.echo(f"Downloading {len(warc_paths)} WARC file(s) to {dest} ({parallel} at a time)...")
+    started = time.monotonic()
+    results = download_warcs(warc_paths, dest, parallel=parallel, on_result=report)
+    for result in results:
+        _run_metrics().add_download(result)
+    elapsed = max(time.monotonic() - started, 1e-9)
+
+    failed = [result for result in results if result.error is not None]
+    skipped = [result for result in results if _already_downloaded(result)]
+    # only bytes received now count towards throughput, not files already on disk
+    megabytes = sum(result.bytes_transferred for result in results) / 1_000_000
+    click.echo(
+        f"Downloaded {len(results) - len(failed) - len(skipped)} of {len(results)} file(s): "
+        f"{megabytes:.1f} MB in {elapsed:.1f}s ({megabytes / elapsed:.1f} MB/s)"
+    )
+    if skipped:
+        click.echo(f"Skipped {len(skipped)} file(s) already in {dest}.")
+    if failed:
+        click.echo("Failed downloads:", err=True)
+        for result in failed:
+            click.echo(f"  {result.warc_path}: {result.error}", err=True)
+        raise click.ClickException(f"{len(failed)} of {len(results)} download(s) failed.")
+
+
+def _already_downloaded(result: DownloadResult) -> bool:
+    """Return whether a download succeeded without a request because the file was already there."""
+    return result.error is None and result.status is None
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,231 @@
+"""Lightweight WARC header scanning that skips record bodies.
+
+:class:`warcio.archiveiterator.ArchiveIterator` parses every record's HTTP
+header block and streams every body through its buffered reader.  Counting
+and inventory jobs only need a handful of WARC headers (plus the HTTP
+``Content-Type`` for articles), so this module reads the WARC header block
+of each record and uses its ``Content-Length`` to jump over the block:
+
+- Uncompressed ``.warc`` files are skipped with a real ``seek``.
+- ``.warc.gz`` files are inflated and discarded chunk by chunk.  A gzip
+  member cannot be skipped without inflating it (the format records no
+  compressed length), but nothing past the headers is parsed, buffered
+  or copied.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from warcio.exceptions import ArchiveLoadFailed
+
+from cc_news_analyzer.profiling import gzip_decompressor
+
+READ_CHUNK_SIZE = 1024 * 1024
+INFLATE_CHUNK_SIZE = 64 * 1024
+HTTP_HEADER_LIMIT = 64 * 1024
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass
+class WarcHeader:
+    """The WARC headers of a single record.
+
+    Attributes:
+        warc_type: The ``WARC-Type`` header value.
+        record_id: The ``WARC-Record-ID`` header value, or ``None``.
+        date: The ``WARC-Date`` header value, or ``None``.
+        target_uri: The ``WARC-Target-URI`` header value, or ``None``.
+        content_length: The record block length in bytes.
+        http_content_type: The HTTP ``Content-Type`` of a ``response``
+            record (``""`` if absent), or ``None`` if it was not read.
+    """
+
+    warc_type: str | None
+    record_id: str | None
+    date: str | None
+    target_uri: str | None
+    content_length: int
+    http_content_type: str | None = None
+
+
+class _SkippingReader:
+    """A line reader over a plain or multi-member gzip stream that can skip bytes cheaply."""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._buf = b""
+        self._pos = 0
+        self._raw = stream.read(READ_CHUNK_SIZE)
+        self._raw_pos = 0
+        self.bytes_out = 0
+        self._decompressor = None
+        if self._raw.startswith(GZIP_MAGIC):
+            self._decompressor = gzip_decompressor()
+
+    def _fill(self) -> bool:
+        """Append more (decompressed) data to the buffer; return False at EOF."""
+        if self._raw_pos >= len(self._raw):
+            self._raw = self._stream.read(READ_CHUNK_SIZE)
+            self._raw_pos = 0
+            if not self._raw:
+                return False
+        if self._decompressor is None:
+            data = self._raw[self._raw_pos :] if self._raw_pos else self._raw
+            self._raw_pos = len(self._raw)
+        else:
+            # feed bounded slices: at a member end zlib copies the rest of its
+            # input into unused_data, which would be quadratic for large chunks
+            end = min(self._raw_pos + INFLATE_CHUNK_SIZE, len(self._raw))
+            data = self._decompressor.decompress(memoryview(self._raw)[self._raw_pos : end])
+            self._raw_pos = end - len(self._decompressor.unused_data)
+            if self._decompressor.eof:
+                # next gzip member (one per record in CC-NEWS files)
+                self._decompressor = gzip_decompressor()
+        self.bytes_out += len(data)
+        self._buf = self._buf[self._pos :] + data if self._pos < len(self._buf) else data
+        self._pos = 0
+        return True
+
+    def readline(self, limit: int = HTTP_HEADER_LIMIT) -> bytes:
+        """Read one line (including ``\\n``), at most *limit* bytes."""
+        while True:
+            end = self._buf.find(b"\n", self._pos, self._pos + limit)
+            if end != -1:
+                line = self._buf[self._pos : end + 1]
+                self._pos = end + 1
+                return line
+            if len(self._buf) - self._pos >= limit or not self._fill():
+                line = self._buf[self._pos : self._pos + limit]
+                self._pos += len(line)
+                return line
+
+    def skip(self, size: int) -> None:
+        """Discard the next *size* bytes without buffering them."""
+        available = len(self._buf) - self._pos
+        if size <= available:
+            self._pos += size
+            return
+        size -= available
+        self._buf = b""
+        self._pos = 0
+        if self._decompressor is None and self._stream.seekable():
+            self._stream.seek(size, 1)
+            return
+        while size > 0 and self._fill():
+            if len(self._buf) > size:
+                self._pos = size
+                return
+            size -= len(self._buf)
+            self._buf = b""
+
+
+class WarcHeaderIterator:
+    """Iterates the WARC headers of a stream (see :func:`iter_warc_headers`).
+
+    Attributes:
+        uncompressed_bytes: Bytes of (decompressed) WARC data read so far;
+            record bodies skipped with a real ``seek`` are not counted.
+    """
+
+    def __init__(self, stream: BinaryIO, *, http_content_type: bool = False):
+        self._reader = _SkippingReader(stream)
+        self._headers = _iter_headers(self._reader, http_content_type)
+
+    def __iter__(self) -> "WarcHeaderIterator":
+        return self
+
+    def __next__(self) -> WarcHeader:
+        return next(self._headers)
+
+    @property
+    def uncompressed_bytes(self) -> int:
+        return self._reader.bytes_out
+
+
+def iter_warc_headers(stream: BinaryIO, *, http_content_type: bool = False) -> WarcHeaderIterator:
+    """Iterate over the WARC headers of each record in a stream, skipping record bodies.
+
+    Args:
+        stream: A binary stream positioned at the start of a ``.warc`` or
+            ``.warc.gz`` file (compression is detected from the gzip magic).
+        http_content_type: Also read the HTTP header block of ``response``
+            records to fill :attr:`WarcHeader.http_content_type`.
+
+    Returns:
+        An iterator of one :class:`WarcHeader` per record, in file order,
+        that also counts the bytes it read.
+
+    Raises:
+        ArchiveLoadFailed: If the stream is not a WARC file (when iterated).
+    """
+    return WarcHeaderIterator(stream, http_content_type=http_content_type)
+
+
+def _iter_headers(reader: _SkippingReader, http_content_type: bool) -> Iterator[WarcHeader]:
+    """Yield the WARC headers of each record read from *reader*."""
+    while True:
+        line = reader.readline()
+        if not line:
+            return
+        if not line.strip():
+            # blank lines separate records
+            continue
+        if not line.startswith(b"WARC/"):
+            raise ArchiveLoadFailed(f"Unknown archive format, first line: {line[:64]!r}")
+
+        fields = _read_header_block(reader)
+        content_length = parse_content_length(fields.get("content-length"))
+        header = WarcHeader(
+            warc_type=fields.get("warc-type"),
+            record_id=fields.get("warc-record-id"),
+            date=fields.get("warc-date"),
+            target_uri=fields.get("warc-target-uri"),
+            content_length=content_length,
+        )
+
+        consumed = 0
+        if http_content_type and header.warc_type == "response":
+            header.http_content_type, consumed = _read_http_content_type(reader, content_length)
+        reader.skip(content_length - consumed)
+        yield header
+
+
+def _read_header_block(reader: _SkippingReader) -> dict[str, str]:
+    """Read ``Name: value`` lines up to a blank line, keyed by lowercase name."""
+    fields: dict[str, str] = {}
+    while True:
+        line = reader.readline()
+        if not line.strip():
+            return fields
+        name, _, value = line.decode("utf-8", "replace").partition(":")
+        fields[name.strip().lower()] = value.strip()
+
+
+def _read_http_content_type(reader: _SkippingReader, block_length: int) -> tuple[str, int]:
+    """Read an HTTP header block and return its ``Content-Type`` and the bytes consumed."""
+    consumed = 0
+    content_type = ""
+    status_line = True
+    while consumed < block_length:
+        line = reader.readline(min(HTTP_HEADER_LIMIT, block_length - consumed))
+        consumed += len(line)
+        if status_line:
+            status_line = False
+            if not line.startswith(b"HTTP/"):
+                break
+            continue
+        if not line.strip():
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-type":
+            content_type = value.strip()
+    return content_type, consumed
+
+
+def parse_content_length(value: str | None) -> int:
+    """Parse a ``Content-Length`` header value, treating junk as zero."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
@@ -1,12 +1,42 @@
 """Functions for working with CC-NEWS WARC index files."""
 
+import calendar
+import glob
 import gzip
+import http.client
+import io
+import json
 import os
+import queue
 import shutil
+import tempfile
+import threading
+import time
+import urllib.error
 import urllib.request
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
 from datetime import datetime
+from typing import BinaryIO
+
+from cc_news_analyzer.profiling import phase, timed_stream
 
 CC_NEWS_BASE_URL = "https://data.commoncrawl.org"
+PART_SUFFIX = ".part"
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_TIMEOUT = 60
+PREFETCH_DEPTH = 8
+INDEX_CACHE_DIR = "index"
+INDEX_CACHE_FILE = "warc.paths.json"
+INDEX_CACHE_TTL = 60 * 60
+MONTH_SETTLE_DAYS = 2
+BASENAME_INDEX_FILE = "basenames.json"
+
+_MONTH_INDEX_MEMO: dict[str, tuple[int, dict]] = {}
+_BASENAME_INDEX_MEMO: dict[str, tuple[list[list], list[list], dict[str, str]]] = {}
 
 
 def parse_month_date(date_str: str) -> tuple[int, int]:
@@ -78,15 +108,26 @@ def build_current_month_index_url() -> str:
 
 
 def fetch_warc_paths(year: int, month: int, dest_dir: str) -> list[str]:
-    """Download the CC-NEWS index for a given month and return the WARC paths.
+    """Return the WARC paths of a CC-NEWS month, from the local cache when possible.
+
+    Each month's parsed index is cached as JSON in
+    ``<dest_dir>/index/YYYY/MM/warc.paths.json`` (see
+    :func:`month_index_path`), so fetching one month never clobbers another.
+    The cache is used without any network request when:
 
-    Downloads the gzipped index file, decompresses it, and parses the list of
-    relative WARC paths.
+    - the month had already ended (plus :data:`MONTH_SETTLE_DAYS`) when it
+      was fetched -- past months are immutable and are never refetched; or
+    - it was fetched or revalidated less than :data:`INDEX_CACHE_TTL`
+      seconds ago.
+
+    Otherwise the index is revalidated with ``If-None-Match`` /
+    ``If-Modified-Since`` and only downloaded again if it changed.  Within a
+    process, repeated calls for a cached month cost a single ``stat``.
 
     Args:
         year: The four-digit year.
         month: The month number (1-12).
-        dest_dir: Directory to store the downloaded index files.
+        dest_dir: Root directory of the local index cache.
 
     Returns:
         A list of relative WARC paths (e.g.
@@ -96,24 +137,121 @@ def fetch_warc_paths(year: int, month: int, dest_dir: str) -> list[str]:
         ValueError: If year or month are out of range.
         OSError: If the download or decompression fails.
     """
-    os.makedirs(dest_dir, exist_ok=True)
-
     index_url = build_index_url(year, month)
-    gz_path = os.path.join(dest_dir, "warc.paths.gz")
-    txt_path = os.path.join(dest_dir, "warc.paths")
+    cache_path = month_index_path(year, month, dest_dir)
+
+    cached, mtime = _load_month_index(cache_path)
+    if cached is not None and _is_fresh(cached, mtime, year, month):
+        return cached["paths"]
+
+    return _revalidate_month_index(index_url, cache_path, cached)
+
+
+def month_index_path(year: int, month: int, dest_dir: str) -> str:
+    """Return the path of the cached index of one month under *dest_dir*."""
+    return os.path.join(dest_dir, INDEX_CACHE_DIR, f"{year:04d}", f"{month:02d}", INDEX_CACHE_FILE)
 
-    # Download the gzipped index
-    urllib.request.urlretrieve(index_url, gz_path)
 
-    # Decompress
-    with gzip.open(gz_path, "rb") as f_in, open(txt_path, "wb") as f_out:
-        shutil.copyfileobj(f_in, f_out)
+def cached_month_index_paths(dest_dir: str) -> list[str]:
+    """Return the paths of every cached month index under *dest_dir*, newest month first."""
+    pattern = os.path.join(glob.escape(dest_dir), INDEX_CACHE_DIR, "[0-9]" * 4, "[0-9]" * 2, INDEX_CACHE_FILE)
+    return sorted(glob.glob(pattern), reverse=True)
 
-    # Parse paths
-    with open(txt_path) as f:
-        paths = [line.strip() for line in f if line.strip()]
 
-    return paths
+def _load_month_index(cache_path: str) -> tuple[dict | None, float]:
+    """Load a cached month index and its modification time (memoized on ``mtime_ns``).
+
+    A missing, unreadable or corrupt file, or a record without ``fetched_at``
+    or ``paths`` (left by an interrupted older write), is a cache miss:
+    ``(None, 0.0)``, so the index is fetched again.
+    """
+    try:
+        st = os.stat(cache_path)
+        memo = _MONTH_INDEX_MEMO.get(cache_path)
+        if memo is None or memo[0] != st.st_mtime_ns:
+            with open(cache_path, encoding="utf-8") as f:
+                record = json.load(f)
+            record = {**record, "fetched_at": float(record["fetched_at"]), "paths": list(record["paths"])}
+            memo = (st.st_mtime_ns, record)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, 0.0
+    _MONTH_INDEX_MEMO[cache_path] = memo
+    return memo[1], st.st_mtime
+
+
+def _is_fresh(cached: dict, mtime: float, year: int, month: int) -> bool:
+    """Return whether a cached month index can be used without revalidating it."""
+    return _month_is_final(year, month, cached["fetched_at"]) or time.time() - mtime < INDEX_CACHE_TTL
+
+
+def _month_is_final(year: int, month: int, fetched_at: float) -> bool:
+    """Return whether an index fetched at *fetched_at* (epoch seconds) can no longer change."""
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    settled = calendar.timegm((next_year, next_month, 1 + MONTH_SETTLE_DAYS, 0, 0, 0))
+    return fetched_at >= settled
+
+
+def _revalidate_month_index(index_url: str, cache_path: str, cached: dict | None) -> list[str]:
+    """Fetch a month index (conditionally if cached) and update the cache."""
+    try:
+        with (
+            phase("open"),
+            urllib.request.urlopen(_index_request(index_url, cached), timeout=DOWNLOAD_TIMEOUT) as response,
+        ):
+            body = response.read()
+            headers = response.headers
+    except urllib.error.HTTPError as exc:
+        if exc.code != 304 or cached is None:
+            raise
+        # unchanged: record when it was validated, so a month validated after it
+        # settled is final from now on
+        record = {
+            **cached,
+            "etag": exc.headers.get("ETag") or cached.get("etag"),
+            "last_modified": exc.headers.get("Last-Modified") or cached.get("last_modified"),
+            "fetched_at": time.time(),
+        }
+        with phase("output"):
+            _write_json_atomic(cache_path, record)
+        return record["paths"]
+
+    with phase("decompress"):
+        text = gzip.decompress(body).decode("utf-8")
+    record = {
+        "url": index_url,
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "fetched_at": time.time(),
+        "paths": [line.strip() for line in text.splitlines() if line.strip()],
+    }
+    with phase("output"):
+        _write_json_atomic(cache_path, record)
+    return record["paths"]
+
+
+def _index_request(index_url: str, cached: dict | None) -> urllib.request.Request:
+    """Return the request for a month index, conditional on the validators of the cached copy if any."""
+    request = urllib.request.Request(index_url)
+    if cached is not None:
+        if cached.get("etag"):
+            request.add_header("If-None-Match", cached["etag"])
+        if cached.get("last_modified"):
+            request.add_header("If-Modified-Since", cached["last_modified"])
+    return request
+
+
+def _write_json_atomic(path: str, data: dict) -> None:
+    """Write *data* as JSON to *path* via a temporary file and ``os.replace``."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".json-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 
 def resolve_warc_path(user_input: str, *, index_dir: str = ".tmp") -> str:
@@ -125,12 +263,13 @@ def resolve_warc_path(user_input: str, *, index_dir: str = ".tmp") -> str:
     2. **Full URL** (starts with the CC-NEWS base URL): the base URL prefix
        is stripped and the remainder is returned.
     3. **Bare filename** (e.g. ``CC-NEWS-20260204051206-06668.warc.gz``):
-       looked up in the local index file at ``<index_dir>/warc.paths``.
+       looked up in the filename map of every month index cached under
+       *index_dir* (see :func:`load_basename_index`), in constant time.
 
     Args:
         user_input: A WARC relative path, full URL, or bare filename.
-        index_dir: Directory containing the ``warc.paths`` index file
-            (used for bare-filename lookups).  Defaults to ``".tmp"``.
+        index_dir: Root directory of the local index cache (used for
+            bare-filename lookups).  Defaults to ``".tmp"``.
 
     Returns:
         The resolved relative path (e.g.
@@ -154,29 +293,143 @@ def resolve_warc_path(user_input: str, *, index_dir: str = ".tmp") -> str:
     if value.startswith("crawl-data/"):
         return value
 
-    # Case 3: Bare filename -- look up in local index
-    index_file = os.path.join(index_dir, "warc.paths")
-    if not os.path.isfile(index_file):
+    # Case 3: Bare filename -- look up in the basename map of the cached month indexes
+    basenames = load_basename_index(index_dir)
+    if not basenames:
         raise ValueError(
-            f"Could not resolve filename '{value}': no local index found at "
-            f"'{index_file}'. Run 'cc-news get-index' first, then pass the "
+            f"Could not resolve filename '{value}': no local index found in "
+            f"'{index_dir}'. Run 'cc-news get-index' first, then pass the "
             f"full relative path."
         )
 
-    with open(index_file) as f:
-        for line in f:
-            line = line.strip()
-            if line and os.path.basename(line) == value:
-                return line
+    if value in basenames:
+        return basenames[value]
 
     raise ValueError(
-        f"Could not resolve filename '{value}' in the local index at "
-        f"'{index_file}'. Run 'cc-news get-index' to refresh the index, or "
-        f"pass the full relative path."
+        f"Could not resolve filename '{value}' in the local index in "
+        f"'{index_dir}'. Run 'cc-news get-index --date MM-YYYY' for the file's "
+        f"month, or pass the full relative path."
     )
 
 
-def download_warc_by_path(warc_path: str, dest_dir: str) -> str:
+def load_basename_index(index_dir: str) -> dict[str, str]:
+    """Return a map from WARC filename to relative path over every cached month.
+
+    The map covers every month index cached under *index_dir* by
+    :func:`fetch_warc_paths` (and a legacy ``<index_dir>/warc.paths``).  It
+    is saved to ``<index_dir>/index/basenames.json`` and memoized in-process,
+    both keyed on the size and ``mtime_ns`` of its source files, so it is
+    only rebuilt after an index is fetched or changed.  When two months list
+    the same filename, the newer month wins.
+
+    Args:
+        index_dir: Root directory of the local index cache.
+
+    Returns:
+        The filename-to-path map (empty if nothing is cached).
+    """
+    memo = _BASENAME_INDEX_MEMO.get(index_dir)
+    # fast path: the cache directories and every source file are unchanged
+    if memo is not None and _stat_signature([row[0] for row in memo[0]]) == memo[0]:
+        return memo[2]
+
+    directories = _basename_index_directories(index_dir)
+    sources = _basename_index_sources(index_dir)
+    if memo is not None and memo[1] == sources:
+        basenames = memo[2]
+    else:
+        index_file = os.path.join(index_dir, INDEX_CACHE_DIR, BASENAME_INDEX_FILE)
+        basenames = _read_basename_index(index_file, sources)
+        if basenames is None:
+            basenames = _build_basename_index(sources)
+            # a read-only cache still gets the in-process memo
+            if sources:
+                with suppress(OSError):
+                    _write_json_atomic(index_file, {"sources": sources, "basenames": basenames})
+    _BASENAME_INDEX_MEMO[index_dir] = (_stat_signature(directories) + sources, sources, basenames)
+    return basenames
+
+
+def _basename_index_directories(index_dir: str) -> list[str]:
+    """Return the directories whose listings decide which month indexes exist."""
+    root = os.path.join(index_dir, INDEX_CACHE_DIR)
+    return [index_dir, root, *glob.glob(os.path.join(glob.escape(root), "[0-9]" * 4))]
+
+
+def _basename_index_sources(index_dir: str) -> list[list]:
+    """Return ``[path, size, mtime_ns]`` of every index file the basename map is built from."""
+    paths = cached_month_index_paths(index_dir)
+    legacy_file = os.path.join(index_dir, "warc.paths")
+    if os.path.isfile(legacy_file):
+        paths.append(legacy_file)
+    return _stat_signature(paths)
+
+
+def _stat_signature(paths: list[str]) -> list[list]:
+    """Return ``[path, size, mtime_ns]`` for each path (``None`` values if it is missing)."""
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            signature.append([path, None, None])
+        else:
+            signature.append([path, st.st_size, st.st_mtime_ns])
+    return signature
+
+
+def _read_basename_index(index_file: str, sources: list[list]) -> dict[str, str] | None:
+    """Load a saved basename map if it was built from exactly *sources*."""
+    try:
+        with open(index_file, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return saved["basenames"] if saved.get("sources") == sources else None
+
+
+def _build_basename_index(sources: list[list]) -> dict[str, str]:
+    """Map each filename to its path, earlier (newer) sources taking precedence."""
+    basenames: dict[str, str] = {}
+    for path, _, _ in reversed(sources):
+        if path.endswith(INDEX_CACHE_FILE):
+            cached = _load_month_index(path)[0]
+            paths = cached["paths"] if cached is not None else []
+        else:
+            with open(path) as f:
+                paths = [line.strip() for line in f if line.strip()]
+        basenames.update((os.path.basename(warc_path), warc_path) for warc_path in paths)
+    return basenames
+
+
+@dataclass
+class DownloadResult:
+    """The outcome and transfer counters of downloading one WARC file.
+
+    Attributes:
+        warc_path: The relative WARC path (or URL) that was requested.
+        local_path: The local file path, or ``None`` if the download failed.
+        size: Size of the local file in bytes.
+        error: The exception that made the download fail, or ``None``.
+        status: HTTP status of the last response, or ``None`` if no request
+            was made (the file was already downloaded) or none completed.
+        retries: How many times the transfer was resumed after a dropped
+            or short transfer.
+        bytes_transferred: Bytes received and written by this call.
+        wall_seconds: Elapsed time of the download.
+    """
+
+    warc_path: str
+    local_path: str | None = None
+    size: int = 0
+    error: Exception | None = None
+    status: int | None = None
+    retries: int = 0
+    bytes_transferred: int = 0
+    wall_seconds: float = 0.0
+
+
+def download_warc_by_path(warc_path: str, dest_dir: str, *, result: DownloadResult | None = None) -> str:
     """Download a WARC file given its relative path in the CC-NEWS dataset.
 
     The relative path is the format returned by :func:`fetch_warc_paths`, e.g.
@@ -185,6 +438,8 @@ def download_warc_by_path(warc_path: str, dest_dir: str) -> str:
     Args:
         warc_path: Relative WARC path within the Common Crawl dataset.
         dest_dir: Directory where the file should be saved.
+        result: If given, filled in with the transfer counters (see
+            :func:`download_warc`).
 
     Returns:
         The local file path of the downloaded WARC file.
@@ -201,7 +456,139 @@ def download_warc_by_path(warc_path: str, dest_dir: str) -> str:
         raise ValueError(f"Cannot determine filename from WARC path: {warc_path!r}")
 
     url = f"{CC_NEWS_BASE_URL}/{warc_path.strip()}"
-    return download_warc(url, dest_dir)
+    return download_warc(url, dest_dir, result=result)
+
+
+def is_remote_warc_path(value: str) -> bool:
+    """Return whether *value* is a CC-NEWS relative path or URL rather than a local file name.
+
+    Args:
+        value: A command-line WARC argument.
+
+    Returns:
+        ``True`` for values :func:`resolve_warc_path` maps to a dataset path
+        without a local index (``crawl-data/...`` or a full CC-NEWS URL).
+    """
+    return value.startswith(("crawl-data/", CC_NEWS_BASE_URL + "/"))
+
+
+@contextmanager
+def open_remote_warc(warc_path: str) -> Iterator[io.RawIOBase]:
+    """Open a CC-NEWS WARC file as a stream straight from the HTTP response.
+
+    Nothing is written to disk.  A background thread reads the response
+    ahead (see :class:`PrefetchingReader`), so network transfer overlaps
+    with the decompression and parsing done by the caller.
+
+    Args:
+        warc_path: A relative WARC path or full URL (see
+            :func:`resolve_warc_path`).
+
+    Yields:
+        A readable, unseekable binary stream of the (still compressed) file.
+
+    Raises:
+        ValueError: If *warc_path* cannot be resolved.
+        OSError: If the request fails.
+    """
+    url = f"{CC_NEWS_BASE_URL}/{resolve_warc_path(warc_path)}"
+    with phase("open"):
+        response = urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT)
+    with response:
+        reader = PrefetchingReader(response)
+        try:
+            yield reader
+        finally:
+            reader.close()
+
+
+class PrefetchingReader(io.RawIOBase):
+    """A read-only stream that reads ahead of its consumer in a background thread.
+
+    Up to *depth* chunks of *chunk_size* bytes are buffered, so a slow
+    source (a socket) and a CPU-bound consumer (decompression) run at the
+    same time instead of taking turns.  An error raised by the source is
+    re-raised to the consumer, on that read and every later one.
+    """
+
+    def __init__(self, stream: BinaryIO, chunk_size: int = DOWNLOAD_CHUNK_SIZE, depth: int = PREFETCH_DEPTH):
+        super().__init__()
+        self._chunks: queue.Queue[bytes | BaseException] = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._buf = b""
+        self._pos = 0
+        self._eof = False
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._pump, args=(stream, chunk_size), daemon=True)
+        self._thread.start()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._pos >= len(self._buf):
+            if self._error is not None:
+                # the pump thread has stopped: nothing more will be queued
+                raise self._error
+            if self._eof:
+                return 0
+            chunk = self._chunks.get()
+            if isinstance(chunk, BaseException):
+                self._error = chunk
+                raise chunk
+            if not chunk:
+                self._eof = True
+                return 0
+            self._buf, self._pos = chunk, 0
+        size = min(len(buffer), len(self._buf) - self._pos)
+        buffer[:size] = self._buf[self._pos : self._pos + size]
+        self._pos += size
+        return size
+
+    def close(self) -> None:
+        """Stop the background thread and close the stream."""
+        self._stop.set()
+        super().close()
+
+    def _pump(self, stream: BinaryIO, chunk_size: int) -> None:
+        """Read *stream* into the queue until EOF, an error, or :meth:`close`."""
+        try:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not self._put(chunk) or not chunk:
+                    return
+        except Exception as exc:  # handed to the consumer by readinto()
+            self._put(exc)
+
+    def _put(self, item: bytes | BaseException) -> bool:
+        """Queue an item, giving up once the reader is closed."""
+        while not self._stop.is_set():
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+def fetch_remote_size(warc_path: str) -> int | None:
+    """Return the size of a CC-NEWS file from a ``HEAD`` request, without downloading it.
+
+    Args:
+        warc_path: A relative WARC path or full URL.
+
+    Returns:
+        The ``Content-Length`` in bytes, or ``None`` if the request fails or
+        the server does not report it.
+    """
+    url = f"{CC_NEWS_BASE_URL}/{resolve_warc_path(warc_path)}"
+    request = urllib.request.Request(url, method="HEAD")
+    try:
+        with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response:
+            length = response.headers.get("Content-Length")
+    except OSError:
+        return None
+    return int(length) if length and length.isdigit() else None
 
 
 def build_warc_urls(warc_paths: list[str]) -> list[str]:
@@ -217,18 +604,36 @@ def build_warc_urls(warc_paths: list[str]) -> list[str]:
     return [f"{CC_NEWS_BASE_URL}/{path}" for path in warc_paths]
 
 
-def download_warc(url: str, dest_dir: str) -> str:
+def download_warc(
+    url: str,
+    dest_dir: str,
+    *,
+    retries: int = DOWNLOAD_RETRIES,
+    result: DownloadResult | None = None,
+) -> str:
     """Download a WARC file from the given URL.
 
+    The file is written to ``<filename>.part`` and only renamed to its final
+    name once its size matches the length the server reported, so an
+    interrupted transfer never leaves a truncated file behind.  A leftover
+    ``.part`` file is resumed with an HTTP ``Range`` request, both across
+    calls and after a dropped connection (up to *retries* times).  If the
+    final file already exists, nothing is downloaded.
+
     Args:
         url: The full URL to the WARC file.
         dest_dir: Directory where the file should be saved.
+        retries: How many times to resume after a dropped or short transfer.
+        result: If given, filled in with the local path and the transfer
+            counters (HTTP status, retries, bytes transferred, elapsed
+            time), including when the download fails.
 
     Returns:
         The local file path of the downloaded WARC file.
 
     Raises:
-        OSError: If the download fails.
+        OSError: If the download fails or is still incomplete after all
+            retries (the ``.part`` file is kept for a later resume).
     """
     os.makedirs(dest_dir, exist_ok=True)
 
@@ -237,6 +642,135 @@ def download_warc(url: str, dest_dir: str) -> str:
         raise ValueError(f"Cannot determine filename from URL: {url}")
 
     dest_path = os.path.join(dest_dir, filename)
-    urllib.request.urlretrieve(url, dest_path)
-
+    result = result if result is not None else DownloadResult(url)
+    started = time.perf_counter()
+    try:
+        if not os.path.isfile(dest_path):
+            _download_to(url, dest_path, retries, result)
+    finally:
+        result.wall_seconds = time.perf_counter() - started
+    result.local_path = dest_path
+    result.size = os.path.getsize(dest_path)
     return dest_path
+
+
+def _download_to(url: str, dest_path: str, retries: int, result: DownloadResult) -> None:
+    """Fetch *url* through a part file, resuming up to *retries* times, then move it to *dest_path*."""
+    part_path = dest_path + PART_SUFFIX
+    for attempt in range(retries + 1):
+        result.retries = attempt
+        try:
+            total = _fetch_to_part(url, part_path, result)
+        except urllib.error.HTTPError as exc:
+            result.status = exc.code
+            raise
+        except (OSError, http.client.HTTPException) as exc:
+            if attempt == retries:
+                raise OSError(f"Download of {url} failed: {exc}") from exc
+            continue
+        size = os.path.getsize(part_path)
+        if total is None or size == total:
+            os.replace(part_path, dest_path)
+            return
+
+    raise OSError(f"Download of {url} is incomplete ({size} of {total} bytes); run again to resume.")
+
+
+def _fetch_to_part(url: str, part_path: str, result: DownloadResult) -> int | None:
+    """Fetch *url* into *part_path*, resuming from its current size.
+
+    Returns:
+        The total size of the remote file, or ``None`` if the server did
+        not report it.
+    """
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    request = urllib.request.Request(url)
+    if offset:
+        request.add_header("Range", f"bytes={offset}-")
+
+    try:
+        with phase("open"):
+            response = urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT)
+    except urllib.error.HTTPError as exc:
+        if exc.code != 416 or not offset:
+            raise
+        result.status = exc.code
+        # nothing left to fetch: either the part file is complete or it is
+        # longer than the remote file and must be fetched again
+        total = _content_range_total(exc.headers.get("Content-Range"))
+        if total == offset:
+            return total
+        os.remove(part_path)
+        return _fetch_to_part(url, part_path, result)
+
+    result.status = response.status
+    with response:
+        return _write_response(response, part_path, offset, result)
+
+
+def _write_response(
+    response: http.client.HTTPResponse, part_path: str, offset: int, result: DownloadResult
+) -> int | None:
+    """Append a ranged response to the part file, or overwrite it with a full one."""
+    if offset and response.status == 206:
+        mode = "ab"
+        total = _content_range_total(response.headers.get("Content-Range"))
+    else:
+        # the server ignored the Range header and sent the whole file
+        mode = "wb"
+        length = response.headers.get("Content-Length")
+        total = int(length) if length and length.isdigit() else None
+    with open(part_path, mode) as f:
+        start = f.tell()
+        try:
+            shutil.copyfileobj(timed_stream(response), timed_stream(f), DOWNLOAD_CHUNK_SIZE)
+        finally:
+            result.bytes_transferred += f.tell() - start
+    return total
+
+
+def _content_range_total(content_range: str | None) -> int | None:
+    """Return the complete length from a ``Content-Range`` header, if known."""
+    total = (content_range or "").rpartition("/")[2].strip()
+    return int(total) if total.isdigit() else None
+
+
+def download_warcs(
+    warc_paths: list[str],
+    dest_dir: str,
+    *,
+    parallel: int = 4,
+    on_result: Callable[[DownloadResult], None] | None = None,
+) -> list[DownloadResult]:
+    """Download many WARC files with bounded concurrency.
+
+    Downloads are I/O bound, so they run in a thread pool of *parallel*
+    workers.  A failed download does not stop the batch; its error is
+    recorded in its :class:`DownloadResult` instead.
+
+    Args:
+        warc_paths: Relative WARC paths as returned by :func:`fetch_warc_paths`.
+        dest_dir: Directory where the files should be saved.
+        parallel: Maximum number of concurrent downloads.
+        on_result: Called with each result as soon as its download finishes
+            (in completion order), e.g. to report progress.
+
+    Returns:
+        One result per path, in the order of *warc_paths*.
+    """
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        futures = [executor.submit(_download_one, warc_path, dest_dir) for warc_path in warc_paths]
+        if on_result is not None:
+            for future in as_completed(futures):
+                on_result(future.result())
+    return [future.result() for future in futures]
+
+
+def _download_one(warc_path: str, dest_dir: str) -> DownloadResult:
+    """Download one WARC file, capturing any failure in the result."""
+    result = DownloadResult(warc_path)
+    try:
+        download_warc_by_path(warc_path, dest_dir, result=result)
+    except (OSError, ValueError) as exc:
+        result.error = exc
+    return result
@@ -0,0 +1,191 @@
+"""Convert the articles of WARC files to JSON Lines for ``jq`` and ``ripgrep`` workflows.
+
+Each article becomes one line holding a JSON object with its record ID,
+target URI, date, content type and decoded body::
+
+    {"record_id": "<urn:uuid:...>", "uri": "https://...", "date": "2026-02-04T05:12:06Z",
+     "content_type": "text/html; charset=utf-8", "body": "<!DOCTYPE html>..."}
+
+Conversion streams: memory use is bounded by the largest record plus the
+write buffer, whatever the size of the input.  With several workers the
+input is split into files (or, for a single file, into ranges of gzip
+members) that are converted in parallel to spool files and appended to the
+output in input order, so the lines come out in the same order as a serial
+conversion.  Compressed output written by several workers holds one gzip
+member per part, which decompresses to the same bytes.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from cc_news_analyzer.articles import Article, decode_body, iter_articles
+from cc_news_analyzer.members import WarcPart, open_warc_part, split_warc_parts
+from cc_news_analyzer.profiling import add_records, phase, timed_iter, timed_stream
+
+WRITE_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class JsonlResult:
+    """The outcome of a conversion.
+
+    Attributes:
+        articles: Number of lines written.
+        bytes_written: Bytes written to the output (compressed, if it is).
+    """
+
+    articles: int = 0
+    bytes_written: int = 0
+
+
+def article_to_json(article: Article) -> str:
+    """Return the JSON object of one article, without a trailing newline."""
+    return json.dumps(
+        {
+            "record_id": article.record_id,
+            "uri": article.uri,
+            "date": article.date,
+            "content_type": article.content_type,
+            "body": decode_body(article),
+        },
+        ensure_ascii=False,
+    )
+
+
+def write_jsonl(
+    warc_paths: list[str],
+    output: BinaryIO,
+    *,
+    workers: int = 1,
+    compress: bool = False,
+    spool_dir: str | None = None,
+) -> JsonlResult:
+    """Write the articles of WARC files to *output* as JSON Lines.
+
+    Args:
+        warc_paths: Paths to ``.warc`` or ``.warc.gz`` files, or CC-NEWS
+            relative paths or URLs to stream (see
+            :func:`cc_news_analyzer.warc.scan_warc`).
+        output: A writable binary stream; it is not closed.
+        workers: Number of worker processes.  Above one, files (or the gzip
+            member ranges of a single local file) are converted in parallel.
+        compress: Gzip the output.
+        spool_dir: Where workers write their parts before they are appended
+            to *output* (defaults to the system temporary directory).
+
+    Returns:
+        The number of articles and bytes written.
+
+    Raises:
+        FileNotFoundError: If a WARC file does not exist.
+        ArchiveLoadFailed: If a file is not a valid WARC.
+        OSError: If a remote WARC file cannot be fetched.
+    """
+    parts = split_warc_parts(warc_paths, workers)
+    if workers == 1 or len(parts) == 1:
+        result = JsonlResult()
+        for part in parts:
+            _convert_part(part, output, compress, result)
+    else:
+        result = _convert_parallel(parts, output, compress, min(workers, len(parts)), spool_dir)
+    add_records(result.articles)
+    return result
+
+
+def _convert_parallel(
+    parts: list[WarcPart],
+    output: BinaryIO,
+    compress: bool,
+    workers: int,
+    spool_dir: str | None,
+) -> JsonlResult:
+    """Convert parts in a process pool and append their spool files to *output* in order."""
+    result = JsonlResult()
+    with tempfile.TemporaryDirectory(dir=spool_dir, prefix="jsonl-") as spool:
+        spool_paths = [os.path.join(spool, f"{i:06d}.part") for i in range(len(parts))]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map() yields in submission order, so each part is appended (and
+            # its spool file removed) as soon as it and those before it are done
+            for spool_path, articles in zip(
+                spool_paths, executor.map(_convert_to_file, parts, spool_paths, [compress] * len(parts)), strict=True
+            ):
+                with phase("output"), open(spool_path, "rb") as f:
+                    shutil.copyfileobj(f, output, WRITE_CHUNK_SIZE)
+                result.articles += articles
+                result.bytes_written += os.path.getsize(spool_path)
+                os.remove(spool_path)
+    return result
+
+
+def _convert_to_file(part: WarcPart, spool_path: str, compress: bool) -> int:
+    """Convert one part to a spool file (runs in a worker process) and return its article count."""
+    result = JsonlResult()
+    with open(spool_path, "wb") as f:
+        _convert_part(part, f, compress, result)
+    return result.articles
+
+
+def _convert_part(part: WarcPart, output: BinaryIO, compress: bool, result: JsonlResult) -> None:
+    """Write the articles of one part to *output*, adding to *result*."""
+    with open_warc_part(part) as stream, _ChunkedWriter(output, compress) as writer, phase("filter"):
+        for article in timed_iter(iter_articles(timed_stream(stream)), "parse"):
+            writer.write(article_to_json(article).encode("utf-8") + b"\n")
+            result.articles += 1
+    result.bytes_written += writer.bytes_written
+
+
+class _ChunkedWriter:
+    """Buffers lines and writes them to a stream in chunks, optionally as one gzip member."""
+
+    def __init__(self, output: BinaryIO, compress: bool):
+        self._output = _CountingWriter(timed_stream(output))
+        self._target = gzip.GzipFile(fileobj=self._output, mode="wb", mtime=0) if compress else self._output
+        self._pending: list[bytes] = []
+        self._pending_size = 0
+
+    @property
+    def bytes_written(self) -> int:
+        return self._output.bytes_written
+
+    def write(self, line: bytes) -> None:
+        self._pending.append(line)
+        self._pending_size += len(line)
+        if self._pending_size >= WRITE_CHUNK_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        with phase("output"):
+            self._target.write(b"".join(self._pending))
+        self._pending.clear()
+        self._pending_size = 0
+
+    def __enter__(self) -> "_ChunkedWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.flush()
+        if self._target is not self._output:
+            # ends the gzip member without closing the underlying stream
+            self._target.close()
+
+
+class _CountingWriter:
+    """Proxies a writable binary stream, counting the bytes written through it."""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self.bytes_written = 0
+
+    def write(self, data) -> int:
+        self._stream.write(data)
+        self.bytes_written += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        self._stream.flush()
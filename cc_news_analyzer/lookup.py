@@ -0,0 +1,177 @@
+"""Look up articles by ``WARC-Record-ID``, keeping recently decoded ones in memory.
+
+:class:`ArticleLookup` finds a record ID in the record index sidecars
+(``<warc>.idx``, see :mod:`cc_news_analyzer.cdx`) of a set of WARC files,
+seeks straight to the record's gzip member in a file it keeps open and
+decompresses and decodes only that member.  Decoded articles go into a
+:class:`RecordCache`, a least-recently-used cache bounded by the total
+size of the articles it holds rather than by their number (article bodies
+range from a few to several hundred kilobytes), so looking the same
+article up again is answered from memory without reading the index or
+the file.
+"""
+
+import io
+from collections import OrderedDict
+from collections.abc import Iterable
+from contextlib import ExitStack
+from typing import BinaryIO
+
+from cc_news_analyzer.articles import Article, decode_body, iter_articles
+from cc_news_analyzer.cdx import RecordIndex, load_record_index, read_record_at
+from cc_news_analyzer.warc import is_article
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+# rough size of a cached article beyond its body and header strings
+_ARTICLE_OVERHEAD = 512
+
+
+def article_size(article: Article) -> int:
+    """Return the approximate memory an article takes up in a :class:`RecordCache`, in bytes."""
+    strings = (article.record_id, article.uri, article.date, article.content_type)
+    return len(article.body) + sum(len(string) for string in strings) + _ARTICLE_OVERHEAD
+
+
+class RecordCache:
+    """A least-recently-used cache of articles, keyed by record ID and bounded in bytes.
+
+    Adding an article evicts the least recently used ones until the sizes
+    (see :func:`article_size`) of those left add up to at most *max_bytes*.
+    An article larger than *max_bytes* on its own is not cached.
+
+    Attributes:
+        max_bytes: The most bytes of articles to hold.
+        size: The bytes of articles held.
+        hits: Number of :meth:`get` calls answered from the cache.
+        misses: Number of :meth:`get` calls that were not.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._articles: OrderedDict[str, Article] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._articles)
+
+    def __contains__(self, record_id: str) -> bool:
+        return record_id in self._articles
+
+    def get(self, record_id: str) -> Article | None:
+        """Return the cached article of a record ID, marking it most recently used, or ``None``."""
+        article = self._articles.get(record_id)
+        if article is None:
+            self.misses += 1
+            return None
+        self._articles.move_to_end(record_id)
+        self.hits += 1
+        return article
+
+    def put(self, article: Article) -> None:
+        """Cache an article, evicting the least recently used ones to make room."""
+        self.discard(article.record_id)
+        size = article_size(article)
+        if size > self.max_bytes:
+            return
+        while self.size + size > self.max_bytes:
+            _, evicted = self._articles.popitem(last=False)
+            self.size -= article_size(evicted)
+        self._articles[article.record_id] = article
+        self.size += size
+
+    def discard(self, record_id: str) -> None:
+        """Drop the article of a record ID if it is cached."""
+        article = self._articles.pop(record_id, None)
+        if article is not None:
+            self.size -= article_size(article)
+
+    def clear(self) -> None:
+        """Drop every cached article."""
+        self._articles.clear()
+        self.size = 0
+
+
+class ArticleLookup:
+    """Find articles by ``WARC-Record-ID`` in a set of local WARC files.
+
+    The record index of every file is opened, and built first if it is
+    missing or stale, when the lookup is created.  Use as a context
+    manager, or call :meth:`close` when done::
+
+        with ArticleLookup(warc_paths) as lookup:
+            article = lookup.get_article("<urn:uuid:...>")
+
+    Attributes:
+        cache: The cache of decoded articles.
+    """
+
+    def __init__(self, warc_paths: Iterable[str], *, cache_bytes: int = DEFAULT_CACHE_BYTES):
+        """Open the record indexes and files of *warc_paths*.
+
+        Args:
+            warc_paths: Paths to local ``.warc`` or ``.warc.gz`` files.
+            cache_bytes: Bound of the article cache, in bytes.
+
+        Raises:
+            FileNotFoundError: If a WARC file does not exist.
+            ArchiveLoadFailed: If an index has to be built and the file is
+                not a valid WARC.
+        """
+        self.cache = RecordCache(cache_bytes)
+        self._files: list[tuple[RecordIndex, BinaryIO]] = []
+        with ExitStack() as stack:
+            for path in warc_paths:
+                index = stack.enter_context(load_record_index(path))
+                self._files.append((index, stack.enter_context(open(path, "rb"))))
+            self._stack = stack.pop_all()
+
+    def __enter__(self) -> "ArticleLookup":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the record indexes and files."""
+        self._stack.close()
+        self._files = []
+
+    def get_article(self, record_id: str) -> Article | None:
+        """Return the article with a ``WARC-Record-ID``.
+
+        A cached article is returned without reading the index or the
+        file; otherwise the record is read with one seek and decoded.
+
+        Args:
+            record_id: The ``WARC-Record-ID``, angle brackets included.
+
+        Returns:
+            The :class:`Article`, or ``None`` if no file has an article
+            (HTML response) record with that ID.
+        """
+        article = self.cache.get(record_id)
+        if article is not None:
+            return article
+        for index, f in self._files:
+            entry = index.find_by_id(record_id)
+            if entry is None:
+                continue
+            if not is_article(entry.warc_type, entry.content_type):
+                return None
+            article = next(iter_articles(io.BytesIO(read_record_at(f, entry))), None)
+            if article is None:
+                return None
+            article = article._replace(offset=entry.offset)
+            self.cache.put(article)
+            return article
+        return None
+
+    def get_article_contents(self, record_id: str) -> str | None:
+        """Return the decoded HTML of the article with a ``WARC-Record-ID``, or ``None`` (see :meth:`get_article`)."""
+        article = self.get_article(record_id)
+        return decode_body(article) if article is not None else None
@@ -0,0 +1,202 @@
+"""Zero-copy reading of uncompressed ``.warc`` files through a memory map.
+
+``ArchiveIterator`` pushes every record block through a buffered reader
+and copies it into fresh ``bytes``.  An uncompressed file can instead be
+memory-mapped: :class:`MappedWarc` finds record boundaries by parsing each
+record's WARC header block and jumping ``Content-Length`` bytes ahead, and
+hands out record blocks and HTTP payloads as ``memoryview`` slices of the
+map.  Only header lines are copied, so scanning, hashing (``hashlib``
+accepts any buffer) and regular expression searches over payloads work on
+the page cache directly, and memory use stays flat however large the file
+is.  Files that are queried many times are worth decompressing once
+(``gunzip -k``) for this; a ``.warc.gz`` cannot be mapped.
+"""
+
+import mmap
+import os
+from collections.abc import Iterator
+from contextlib import suppress
+from typing import NamedTuple
+
+from warcio.exceptions import ArchiveLoadFailed
+
+from cc_news_analyzer.headers import GZIP_MAGIC, parse_content_length
+
+_RECORD_SEPARATOR = b"\r\n"
+
+
+class MappedRecord(NamedTuple):
+    """One record of a memory-mapped WARC file.
+
+    Attributes:
+        offset: Byte offset of the record in the file.
+        length: Length of the record up to the end of its block, without
+            the blank lines that separate it from the next one.
+        warc_type: The ``WARC-Type`` header value (``""`` if absent).
+        record_id: The ``WARC-Record-ID`` header value (``""`` if absent).
+        target_uri: The ``WARC-Target-URI`` header value (``""`` if absent).
+        date: The ``WARC-Date`` header value (``""`` if absent).
+        content_type: The HTTP ``Content-Type`` (``""`` for non-HTTP records).
+        block: The record block, a view of the map.
+        payload: The HTTP body of a record whose block is an HTTP message
+            (``application/http``), or else the whole block, a view of the map.  Transfer and
+            content encodings are not removed.
+    """
+
+    offset: int
+    length: int
+    warc_type: str
+    record_id: str
+    target_uri: str
+    date: str
+    content_type: str
+    block: memoryview
+    payload: memoryview
+
+
+class MappedWarc:
+    """A memory-mapped, read-only uncompressed WARC file.
+
+    Use as a context manager, or call :meth:`close` when done::
+
+        with MappedWarc(warc_path) as warc:
+            for record in warc:
+                digest = hashlib.sha1(record.payload).hexdigest()
+
+    The views of a record stay valid until the file is closed; views still
+    held then keep the map alive until they are released.
+
+    Attributes:
+        size: Size of the file in bytes.
+    """
+
+    def __init__(self, warc_path: str):
+        """Map *warc_path* into memory.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file is gzip-compressed.
+        """
+        with open(warc_path, "rb") as f:
+            self.size = os.fstat(f.fileno()).st_size
+            # an empty file cannot be mapped
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        self._view = memoryview(self._data)
+        if self._view[: len(GZIP_MAGIC)] == GZIP_MAGIC:
+            self.close()
+            raise ValueError(f"Compressed WARC files cannot be memory-mapped: {warc_path}")
+
+    def __enter__(self) -> "MappedWarc":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file, unless views of it are still held."""
+        self._view.release()
+        if isinstance(self._data, mmap.mmap):
+            # record views still held keep the map until they are released
+            with suppress(BufferError):
+                self._data.close()
+
+    def __iter__(self) -> Iterator[MappedRecord]:
+        offset = _skip_separators(self._data, 0)
+        while offset < self.size:
+            record = self.record_at(offset)
+            yield record
+            offset = _skip_separators(self._data, offset + record.length)
+
+    def record_at(self, offset: int) -> MappedRecord:
+        """Parse the record that starts at *offset*.
+
+        Args:
+            offset: Byte offset of a record, such as an :class:`IndexEntry`
+                offset from the record index of the file.
+
+        Raises:
+            ArchiveLoadFailed: If no WARC record starts at *offset*.
+        """
+        data = self._data
+        version_end = data.find(b"\n", offset, offset + 64)
+        if data[offset : offset + 5] != b"WARC/" or version_end == -1:
+            raise ArchiveLoadFailed(f"No WARC record at offset {offset}: {data[offset : offset + 64]!r}")
+        fields, block_start = _read_header_block(data, version_end + 1, self.size)
+        block_end = min(block_start + parse_content_length(fields.get("content-length")), self.size)
+        content_type, payload_start = _http_payload(data, fields.get("content-type", ""), block_start, block_end)
+        return MappedRecord(
+            offset=offset,
+            length=block_end - offset,
+            warc_type=fields.get("warc-type", ""),
+            record_id=fields.get("warc-record-id", ""),
+            target_uri=fields.get("warc-target-uri", ""),
+            date=fields.get("warc-date", ""),
+            content_type=content_type,
+            block=self._view[block_start:block_end],
+            payload=self._view[payload_start:block_end],
+        )
+
+
+def open_mapped_warc(warc_path: str) -> MappedWarc | None:
+    """Memory-map a WARC file if it is uncompressed.
+
+    Args:
+        warc_path: Path to a local ``.warc`` or ``.warc.gz`` file.
+
+    Returns:
+        An open :class:`MappedWarc`, or ``None`` for a compressed file.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    try:
+        return MappedWarc(warc_path)
+    except ValueError:
+        return None
+
+
+def _read_header_block(data: bytes, start: int, end: int) -> tuple[dict[str, str], int]:
+    """Read ``Name: value`` lines from *start* up to a blank line.
+
+    Returns:
+        The fields keyed by lowercase name, and the offset after the blank
+        line (*end* if there is none).
+    """
+    fields: dict[str, str] = {}
+    position = start
+    while position < end:
+        line_end = data.find(b"\n", position, end)
+        line = data[position : line_end if line_end != -1 else end]
+        position = line_end + 1 if line_end != -1 else end
+        if not line.strip():
+            break
+        name, _, value = line.decode("utf-8", "replace").partition(":")
+        fields[name.strip().lower()] = value.strip()
+    return fields, position
+
+
+def _http_payload(data: bytes, block_type: str, block_start: int, block_end: int) -> tuple[str, int]:
+    """Return the HTTP ``Content-Type`` of a block and where its body starts (*block_start* if not HTTP).
+
+    Args:
+        data: The mapped file.
+        block_type: The record's WARC ``Content-Type``; an HTTP request or
+            response block is ``application/http``.
+        block_start: Offset of the block.
+        block_end: Offset of the end of the block.
+    """
+    if not block_type.lower().startswith("application/http"):
+        return "", block_start
+    status_end = data.find(b"\n", block_start, block_end)
+    if status_end == -1:
+        return "", block_end
+    fields, payload_start = _read_header_block(data, status_end + 1, block_end)
+    return fields.get("content-type", ""), payload_start
+
+
+def _skip_separators(data: bytes, offset: int) -> int:
+    """Return the offset of the first byte from *offset* on that is not part of a blank line."""
+    size = len(data)
+    while offset < size and data[offset] in _RECORD_SEPARATOR:
+        offset += 1
+    return offset
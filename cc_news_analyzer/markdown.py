@@ -0,0 +1,298 @@
+"""Convert article HTML to compact Markdown (or plain text) in one streaming pass.
+
+:class:`MarkdownConverter` works on :class:`html.parser.HTMLParser` events
+instead of building a DOM: memory use is bounded by the block of text being
+assembled, and the HTML can be fed in chunks as it is decompressed.
+Elements that carry no article text -- scripts, styles, SVG, navigation,
+forms, asides, footers and the document head -- are dropped as soon as they
+open, together with everything inside them.
+
+The Markdown is compact rather than faithful: headings, paragraphs, lists,
+block quotes, preformatted blocks, links, emphasis and inline code are
+kept; images, attributes, layout containers and table structure are not.
+Text is not escaped, so a paragraph starting with ``#`` reads as a heading.
+"""
+
+from collections.abc import Iterable, Iterator
+from html.parser import HTMLParser
+
+# dropped with their content; void elements (which never close) are never skipped
+SKIPPED_TAGS = frozenset(
+    {
+        "aside",
+        "audio",
+        "button",
+        "canvas",
+        "dialog",
+        "footer",
+        "form",
+        "head",
+        "iframe",
+        "map",
+        "math",
+        "nav",
+        "noscript",
+        "object",
+        "script",
+        "select",
+        "style",
+        "svg",
+        "template",
+        "textarea",
+        "video",
+    }
+)
+# end the current block of text
+BLOCK_TAGS = frozenset(
+    {
+        "address",
+        "article",
+        "blockquote",
+        "body",
+        "dd",
+        "div",
+        "dl",
+        "dt",
+        "figcaption",
+        "figure",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hr",
+        "li",
+        "main",
+        "ol",
+        "p",
+        "pre",
+        "section",
+        "table",
+        "td",
+        "th",
+        "tr",
+        "ul",
+    }
+)
+HEADING_LEVELS = {f"h{level}": level for level in range(1, 7)}
+EMPHASIS_MARKERS = {"b": "**", "strong": "**", "i": "_", "em": "_", "code": "`"}
+
+# stands for <br> in the text of a block until the block's whitespace is collapsed
+_LINE_BREAK = "\x00"
+
+
+class MarkdownConverter(HTMLParser):
+    """Converts HTML fed in chunks to Markdown blocks.
+
+    Feed the document with :meth:`feed`, collect finished blocks with
+    :meth:`pop_blocks` as you go, and call :meth:`close` at the end::
+
+        converter = MarkdownConverter()
+        for chunk in chunks:
+            converter.feed(chunk)
+            blocks.extend(converter.pop_blocks())
+        converter.close()
+        blocks.extend(converter.pop_blocks())
+
+    Args:
+        text: Emit plain text: no heading, emphasis, link or quote markers.
+            List items keep their bullets.
+    """
+
+    def __init__(self, *, text: bool = False):
+        super().__init__(convert_charrefs=True)
+        self.plain = text
+        self._blocks: list[tuple[str, bool]] = []
+        self._inline: list[str] = []
+        self._skipping: str | None = None
+        self._skip_depth = 0
+        self._heading = 0
+        self._quote_depth = 0
+        self._lists: list[list] = []  # [ordered, next number] per open list
+        self._item_prefix = ""
+        self._pre_depth = 0
+        self._links: list[tuple[int, str]] = []
+        self._emphasis: list[tuple[int, str]] = []
+
+    def updatepos(self, i: int, j: int) -> int:
+        # HTMLParser counts lines and columns for getpos(); skip that bookkeeping
+        return j
+
+    def pop_blocks(self) -> list[tuple[str, bool]]:
+        """Return and forget the blocks finished so far.
+
+        Returns:
+            ``(block, is_list_item)`` pairs in document order.  List items
+            are meant to be separated by a single newline, other blocks by a
+            blank line (see :func:`join_blocks`).
+        """
+        blocks = self._blocks
+        self._blocks = []
+        return blocks
+
+    def close(self) -> None:
+        """Process any buffered input and finish the last block."""
+        super().close()
+        self._flush()
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self._skipping is not None:
+            self._skip_depth += tag == self._skipping
+            return
+        if tag in SKIPPED_TAGS:
+            self._skipping = tag
+            self._skip_depth = 1
+            return
+        if tag in BLOCK_TAGS:
+            self._start_block(tag)
+        elif tag == "br":
+            self._inline.append(_LINE_BREAK)
+        elif tag == "a":
+            self._links.append((len(self._inline), dict(attrs).get("href") or ""))
+        elif tag in EMPHASIS_MARKERS and not self._pre_depth and not self.plain:
+            self._emphasis.append((len(self._inline), tag))
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        # a self-closing tag opens no subtree, so it never starts skipping
+        if self._skipping is None and tag in ("br", "hr"):
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._skipping is not None:
+            if tag == self._skipping:
+                self._skip_depth -= 1
+                if not self._skip_depth:
+                    self._skipping = None
+            elif tag in ("body", "html"):
+                # an unclosed skipped element ends with the document
+                self._skipping = None
+            return
+        if tag in BLOCK_TAGS:
+            self._end_block(tag)
+        elif tag == "a" and self._links:
+            self._end_link()
+        elif self._emphasis and self._emphasis[-1][1] == tag:
+            self._end_emphasis()
+
+    def handle_data(self, data: str) -> None:
+        if self._skipping is None:
+            self._inline.append(data)
+
+    def _start_block(self, tag: str) -> None:
+        self._flush()
+        if tag in HEADING_LEVELS:
+            self._heading = HEADING_LEVELS[tag]
+        elif tag == "blockquote":
+            self._quote_depth += 1
+        elif tag in ("ul", "ol"):
+            self._lists.append([tag == "ol", 1])
+        elif tag == "li" and self._lists:
+            ordered, number = self._lists[-1]
+            indent = "  " * (len(self._lists) - 1)
+            self._item_prefix = f"{indent}{number}. " if ordered else f"{indent}- "
+            self._lists[-1][1] += 1
+        elif tag == "pre":
+            self._pre_depth += 1
+
+    def _end_block(self, tag: str) -> None:
+        self._flush()
+        if tag in HEADING_LEVELS:
+            self._heading = 0
+        elif tag == "blockquote":
+            self._quote_depth = max(self._quote_depth - 1, 0)
+        elif tag in ("ul", "ol") and self._lists:
+            self._lists.pop()
+        elif tag == "pre":
+            self._pre_depth = max(self._pre_depth - 1, 0)
+
+    def _end_link(self) -> None:
+        start, href = self._links.pop()
+        if self.plain or not href or href.startswith(("#", "javascript:")):
+            return
+        label = " ".join("".join(self._inline[start:]).replace(_LINE_BREAK, " ").split())
+        if label:
+            self._inline[start:] = [f"[{label}]({href})"]
+
+    def _end_emphasis(self) -> None:
+        start, tag = self._emphasis.pop()
+        content = "".join(self._inline[start:])
+        label = content.strip()
+        if label:
+            # markers must touch the text: "a<b> b </b>c" becomes "a **b** c"
+            marker = EMPHASIS_MARKERS[tag]
+            leading = content[: len(content) - len(content.lstrip())]
+            trailing = content[len(content.rstrip()) :]
+            self._inline[start:] = [leading, marker, label, marker, trailing]
+
+    def _flush(self) -> None:
+        """Finish the current block of text, if it has any."""
+        self._links.clear()
+        self._emphasis.clear()
+        block = self._block_text("".join(self._inline))
+        self._inline.clear()
+        if not block:
+            return
+        is_item = bool(self._item_prefix)
+        if self._heading and not self.plain:
+            block = f"{'#' * self._heading} {block}"
+        block = self._item_prefix + block
+        self._item_prefix = ""
+        if self._quote_depth and not self.plain:
+            block = "\n".join(f"{'> ' * self._quote_depth}{line}" for line in block.split("\n"))
+        self._blocks.append((block, is_item))
+
+    def _block_text(self, raw: str) -> str:
+        """Return the text of a block: whitespace collapsed, or kept and fenced in a ``<pre>``."""
+        if not self._pre_depth:
+            # str.split() collapses whitespace much faster than a regular expression
+            return "\n".join(" ".join(line.split()) for line in raw.split(_LINE_BREAK)).strip("\n")
+        block = raw.replace(_LINE_BREAK, "\n").strip("\n")
+        if not block.strip():
+            return ""
+        return block if self.plain else f"```\n{block}\n```"
+
+
+def join_blocks(blocks: Iterable[tuple[str, bool]]) -> str:
+    """Join ``(block, is_list_item)`` pairs: list items by a newline, others by a blank line."""
+    parts = []
+    previous_item = False
+    for block, is_item in blocks:
+        if parts:
+            parts.append("\n" if is_item and previous_item else "\n\n")
+        parts.append(block)
+        previous_item = is_item
+    return "".join(parts)
+
+
+def iter_markdown_blocks(chunks: Iterable[str], *, text: bool = False) -> Iterator[tuple[str, bool]]:
+    """Convert HTML arriving in chunks, yielding each block as soon as it is finished.
+
+    Args:
+        chunks: The HTML document in pieces of any size.
+        text: Emit plain text instead of Markdown.
+
+    Yields:
+        ``(block, is_list_item)`` pairs (see :func:`join_blocks`).
+    """
+    converter = MarkdownConverter(text=text)
+    for chunk in chunks:
+        converter.feed(chunk)
+        yield from converter.pop_blocks()
+    converter.close()
+    yield from converter.pop_blocks()
+
+
+def convert_html_to_markdown(html: str, *, text: bool = False) -> str:
+    """Convert an HTML document to compact Markdown.
+
+    Args:
+        html: The document.
+        text: Emit plain text instead of Markdown.
+
+    Returns:
+        The article text as Markdown (or plain text), without a trailing
+        newline.
+    """
+    return join_blocks(iter_markdown_blocks([html], text=text))
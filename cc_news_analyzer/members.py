@@ -0,0 +1,184 @@
+"""Split WARC files into byte ranges aligned to record (gzip member) boundaries.
+
+CC-NEWS ``.warc.gz`` files compress each record as its own gzip member, so
+any member start is a valid place to begin decompressing.  Splitting a file
+into ranges that begin at member starts lets separate worker processes scan
+one file in parallel.  :func:`split_warc_parts` and :func:`open_warc_part`
+divide a list of files into such units of work for a process pool.
+"""
+
+import io
+import os
+import zlib
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from itertools import pairwise
+from typing import BinaryIO
+
+from cc_news_analyzer.cdx import RecordIndex, open_record_index
+from cc_news_analyzer.index import is_remote_warc_path, open_remote_warc
+
+GZIP_MEMBER_MAGIC = b"\x1f\x8b\x08"
+RESYNC_WINDOW_SIZE = 1024 * 1024
+VERIFY_READ_SIZE = 16 * 1024
+
+# a unit of work: a WARC path and an optional byte range within the file
+WarcPart = tuple[str, tuple[int, int] | None]
+
+
+class RangeReader(io.RawIOBase):
+    """A read-only stream over bytes ``[start, end)`` of an open binary file.
+
+    ``tell()`` reports absolute file positions, so offsets computed by
+    readers such as ``ArchiveIterator`` match offsets in the whole file.
+    """
+
+    def __init__(self, fileobj: BinaryIO, start: int, end: int):
+        super().__init__()
+        self._fileobj = fileobj
+        self._fileobj.seek(start)
+        self._remaining = max(0, end - start)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._fileobj.tell()
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._fileobj.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_CUR) -> int:
+        """Skip forward within the range (only relative forward seeks are supported)."""
+        if whence != io.SEEK_CUR or offset < 0:
+            raise io.UnsupportedOperation("RangeReader only supports forward relative seeks")
+        offset = min(offset, self._remaining)
+        self._remaining -= offset
+        return self._fileobj.seek(offset, io.SEEK_CUR)
+
+
+def is_record_member(fileobj: BinaryIO, offset: int) -> bool:
+    """Return whether a gzip member holding a WARC record starts at *offset*."""
+    fileobj.seek(offset)
+    data = fileobj.read(VERIFY_READ_SIZE)
+    try:
+        head = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(data, 5)
+    except zlib.error:
+        return False
+    return head == b"WARC/"
+
+
+def find_member_start(fileobj: BinaryIO, position: int, size: int) -> int:
+    """Find the first record gzip member starting at or after *position*.
+
+    Scans forward for the gzip magic bytes and confirms each candidate by
+    decompressing the start of the member and checking for ``WARC/``.
+
+    Args:
+        fileobj: An open ``.warc.gz`` file.
+        position: Byte offset to start searching from.
+        size: Size of the file in bytes.
+
+    Returns:
+        The offset of the member, or *size* if there is none.
+    """
+    while position < size:
+        fileobj.seek(position)
+        # overlap windows so a magic number split across them is still found
+        window = fileobj.read(RESYNC_WINDOW_SIZE + len(GZIP_MEMBER_MAGIC) - 1)
+        found = window.find(GZIP_MEMBER_MAGIC)
+        while found != -1 and found < RESYNC_WINDOW_SIZE:
+            if is_record_member(fileobj, position + found):
+                return position + found
+            found = window.find(GZIP_MEMBER_MAGIC, found + 1)
+        position += RESYNC_WINDOW_SIZE
+    return size
+
+
+def split_member_ranges(warc_path: str, parts: int) -> list[tuple[int, int]]:
+    """Split a WARC file into up to *parts* byte ranges that start at record boundaries.
+
+    Boundaries come from the record index sidecar when a current one exists;
+    otherwise ``.warc.gz`` files are resynchronized on gzip member headers.
+    Uncompressed files without a sidecar are returned as a single range.
+
+    Args:
+        warc_path: Path to a ``.warc`` or ``.warc.gz`` file.
+        parts: The desired number of ranges.
+
+    Returns:
+        Non-empty, contiguous ``(start, end)`` ranges covering the file.
+    """
+    size = os.path.getsize(warc_path)
+    targets = [size * k // parts for k in range(1, parts)]
+
+    index = open_record_index(warc_path)
+    if index is not None:
+        with index:
+            offsets = [_indexed_record_start(index, target, size) for target in targets]
+    else:
+        with open(warc_path, "rb") as f:
+            if f.read(len(GZIP_MEMBER_MAGIC)) != GZIP_MEMBER_MAGIC:
+                return [(0, size)]
+            offsets = [find_member_start(f, target, size) for target in targets]
+
+    bounds = sorted({0, size, *offsets})
+    return [(start, end) for start, end in pairwise(bounds) if start < end]
+
+
+def _indexed_record_start(index: RecordIndex, position: int, size: int) -> int:
+    """Return the offset of the first indexed record at or after *position*."""
+    # binary search: entries are in file order, so offsets are sorted
+    found = bisect_left(range(len(index)), position, key=lambda i: index[i].offset)
+    return index[found].offset if found < len(index) else size
+
+
+def split_warc_parts(warc_paths: list[str], workers: int) -> list[WarcPart]:
+    """Split WARC inputs into parts for *workers* worker processes.
+
+    Several files are processed one per part; a single local file is split
+    into member ranges with :func:`split_member_ranges`.  Processing the
+    parts in order visits the records in input order.
+
+    Args:
+        warc_paths: Paths to ``.warc`` or ``.warc.gz`` files, or CC-NEWS
+            relative paths or URLs to stream.
+        workers: Number of worker processes.
+
+    Returns:
+        The parts, in input order.
+
+    Raises:
+        FileNotFoundError: If a path is neither a file nor a remote path.
+    """
+    for path in warc_paths:
+        if not os.path.isfile(path) and not is_remote_warc_path(path):
+            raise FileNotFoundError(f"WARC file not found: {path}")
+    if len(warc_paths) == 1 and workers > 1 and os.path.isfile(warc_paths[0]):
+        return [(warc_paths[0], byte_range) for byte_range in split_member_ranges(warc_paths[0], workers)]
+    return [(path, None) for path in warc_paths]
+
+
+@contextmanager
+def open_warc_part(part: WarcPart) -> Iterator[BinaryIO]:
+    """Open a part from :func:`split_warc_parts`: a local file, a range of one, or a remote stream."""
+    warc_path, byte_range = part
+    if not os.path.isfile(warc_path):
+        with open_remote_warc(warc_path) as stream:
+            yield stream
+        return
+    with open(warc_path, "rb") as f:
+        yield f if byte_range is None else RangeReader(f, *byte_range)
@@ -0,0 +1,121 @@
+"""Machine-readable metrics of one command run (the CLI's ``--metrics-json``).
+
+The counters are collected by the library itself: every :class:`WarcStats`
+carries the bytes read and the time taken by its scan, and every
+:class:`DownloadResult` the HTTP status, retries and bytes of its transfer.
+A :class:`RunMetrics` gathers them for one command, along with any
+command-specific counts, and totals them into a JSON-serializable dict
+whose keys are stable across releases (new keys may be added; existing
+ones are not renamed).
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from cc_news_analyzer.index import DownloadResult
+from cc_news_analyzer.warc import WarcStats
+
+METRICS_VERSION = 1
+
+
+def _cpu_time() -> float:
+    """Return the CPU time of this process and its finished children."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+@dataclass
+class RunMetrics:
+    """Counters of one command run.
+
+    Attributes:
+        command: Name of the command.
+        scans: ``(path, stats)`` pairs of the WARC files scanned.
+        downloads: Results of the WARC files downloaded.
+        counts: Command-specific counters, such as files listed or removed.
+    """
+
+    command: str = ""
+    scans: list[tuple[str, WarcStats]] = field(default_factory=list)
+    downloads: list[DownloadResult] = field(default_factory=list)
+    counts: dict[str, int] = field(default_factory=dict)
+    _wall_started: float = field(default_factory=time.perf_counter, repr=False)
+    _cpu_started: float = field(default_factory=_cpu_time, repr=False)
+
+    def add_scans(self, results: list[tuple[str, WarcStats]]) -> None:
+        """Record the statistics of scanned files."""
+        self.scans.extend(results)
+
+    def add_download(self, result: DownloadResult) -> None:
+        """Record the result of a download."""
+        self.downloads.append(result)
+
+    def count(self, name: str, value: int) -> None:
+        """Set a command-specific counter."""
+        self.counts[name] = value
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the metrics of the run so far as a JSON-serializable dict.
+
+        Times cover the whole run up to this call, including the CPU time of
+        worker processes that have finished.
+        """
+        wall_seconds = time.perf_counter() - self._wall_started
+        totals = WarcStats()
+        for _, stats in self.scans:
+            totals.merge(stats)
+        transferred = sum(result.bytes_transferred for result in self.downloads)
+        return {
+            "version": METRICS_VERSION,
+            "command": self.command,
+            "wall_seconds": wall_seconds,
+            "cpu_seconds": _cpu_time() - self._cpu_started,
+            "records": totals.records,
+            "records_by_type": dict(sorted(totals.records_by_type.items())),
+            "articles": totals.articles,
+            "compressed_bytes": totals.compressed_bytes,
+            "uncompressed_bytes": totals.uncompressed_bytes,
+            "records_per_second": _rate(totals.records, wall_seconds),
+            "compressed_mb_per_second": _rate(totals.compressed_bytes / 1_000_000, wall_seconds),
+            "bytes_transferred": transferred,
+            "download_mb_per_second": _rate(transferred / 1_000_000, wall_seconds),
+            "files": [_scan_dict(path, stats) for path, stats in self.scans],
+            "downloads": [_download_dict(result) for result in self.downloads],
+            "counts": dict(self.counts),
+        }
+
+
+def _rate(amount: float, seconds: float) -> float:
+    return amount / seconds if seconds else 0.0
+
+
+def _scan_dict(path: str, stats: WarcStats) -> dict[str, Any]:
+    """Return the metrics of one scanned file."""
+    return {
+        "path": path,
+        "records": stats.records,
+        "records_by_type": dict(sorted(stats.records_by_type.items())),
+        "articles": stats.articles,
+        "compressed_bytes": stats.compressed_bytes,
+        "uncompressed_bytes": stats.uncompressed_bytes,
+        "wall_seconds": stats.wall_seconds,
+        "cpu_seconds": stats.cpu_seconds,
+        "records_per_second": stats.records_per_second,
+        "from_cache": stats.from_cache,
+    }
+
+
+def _download_dict(result: DownloadResult) -> dict[str, Any]:
+    """Return the metrics of one download."""
+    return {
+        "warc_path": result.warc_path,
+        "local_path": result.local_path,
+        "status": result.status,
+        "retries": result.retries,
+        "bytes_transferred": result.bytes_transferred,
+        "size": result.size,
+        "wall_seconds": result.wall_seconds,
+        "error": None if result.error is None else str(result.error),
+    }
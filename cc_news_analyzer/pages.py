@@ -0,0 +1,301 @@
+"""Browse the article titles of a WARC file page by page, one seek per page.
+
+Listing page *n* of a file's titles by iterating from the start costs a
+scan of every article before it, so paging through a large file is
+quadratic.  :func:`build_page_table` writes a small sidecar next to the WARC
+(``<warc>.pages``) holding the byte offset -- compressed, in a
+``.warc.gz`` -- of every *stride*-th article, read from the record index
+sidecar (``<warc>.idx``, see :mod:`cc_news_analyzer.cdx`), which is built
+first if it is missing.  :func:`titles_from_page` then seeks to the
+nearest table entry at or before the page, steps over at most
+``stride - 1`` articles and reads each title from the start of its body,
+stopping at ``</title>`` instead of decoding and parsing the whole page.
+
+Sidecar layout (all integers little-endian): a header with the magic,
+version, stride, size, ``mtime_ns`` and inode of the WARC file and the
+article count, then one ``uint64`` offset per entry.
+"""
+
+import html
+import mmap
+import os
+import re
+import struct
+import tempfile
+from collections.abc import Iterator
+from itertools import islice
+from typing import BinaryIO, NamedTuple
+
+from warcio.archiveiterator import ArchiveIterator
+from warcio.recordloader import ArcWarcRecord
+
+from cc_news_analyzer.articles import DEFAULT_CHARSET, charset_of
+from cc_news_analyzer.cache import FileStamp, file_stamp
+from cc_news_analyzer.cdx import load_record_index
+from cc_news_analyzer.warc import is_article, read_prefix
+
+PAGE_TABLE_SUFFIX = ".pages"
+MAGIC = b"CCNXPAG1"
+VERSION = 2
+DEFAULT_STRIDE = 10
+TITLE_READ_LIMIT = 64 * 1024
+
+_HEADER = struct.Struct("<8sIIQqQQ")
+_OFFSET = struct.Struct("<Q")
+_TITLE_RE = re.compile(rb"<title\b[^>]*>(.*?)</title", re.DOTALL | re.IGNORECASE)
+_TITLE_END = b"</title"
+
+
+class ArticleTitle(NamedTuple):
+    """The title of an article.
+
+    Attributes:
+        number: Position of the article among the file's articles, from 0.
+        record_id: The ``WARC-Record-ID`` header value.
+        uri: The ``WARC-Target-URI`` header value.
+        title: The text of the HTML ``<title>`` (``""`` if it has none).
+    """
+
+    number: int
+    record_id: str
+    uri: str
+    title: str
+
+
+def page_table_path(warc_path: str) -> str:
+    """Return the page table sidecar path for a WARC file."""
+    return warc_path + PAGE_TABLE_SUFFIX
+
+
+def build_page_table(warc_path: str, *, stride: int = DEFAULT_STRIDE, table_path: str | None = None) -> str:
+    """Write the page table sidecar of a WARC file.
+
+    The article offsets come from the record index sidecar, which is built
+    (scanning the file once) if it is missing or stale.
+
+    Args:
+        warc_path: Path to a ``.warc`` or ``.warc.gz`` file.
+        stride: Record the offset of every *stride*-th article.
+        table_path: Where to write the sidecar; defaults to
+            :func:`page_table_path`.
+
+    Returns:
+        The path of the written sidecar.
+
+    Raises:
+        FileNotFoundError: If the WARC file does not exist.
+        ValueError: If *stride* is not positive.
+    """
+    if stride < 1:
+        raise ValueError("stride must be positive")
+    with load_record_index(warc_path) as index:
+        offsets = bytearray()
+        articles = 0
+        for entry in index:
+            if is_article(entry.warc_type, entry.content_type):
+                if articles % stride == 0:
+                    offsets += _OFFSET.pack(entry.offset)
+                articles += 1
+        warc_stamp = index.warc_stamp
+
+    table_path = table_path or page_table_path(warc_path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(table_path)), prefix=".pages-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, stride, *warc_stamp, articles))
+            f.write(offsets)
+        os.replace(tmp_path, table_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return table_path
+
+
+class PageTable:
+    """A memory-mapped, read-only view of a page table sidecar.
+
+    Use as a context manager, or call :meth:`close` when done.  Keep one
+    open to page through a file without reopening it::
+
+        with load_page_table(warc_path) as table:
+            for page in range(1, table.page_count(20) + 1):
+                titles = titles_from_page(warc_path, 20, page, table=table)
+    """
+
+    def __init__(self, table_path: str):
+        with open(table_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, self.stride, size, mtime_ns, inode, self._articles = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self._mm.close()
+            raise ValueError(f"Not a page table: {table_path}") from None
+        self.warc_stamp = FileStamp(size, mtime_ns, inode)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"Not a page table (or unsupported version): {table_path}")
+        if self.stride < 1 or _HEADER.size + self.page_count(self.stride) * _OFFSET.size > len(self._mm):
+            self._mm.close()
+            raise ValueError(f"Truncated page table: {table_path}")
+
+    def __enter__(self) -> "PageTable":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the sidecar file."""
+        self._mm.close()
+
+    def __len__(self) -> int:
+        return self._articles
+
+    def page_count(self, count: int) -> int:
+        """Return the number of pages of *count* articles."""
+        return -(-self._articles // count)
+
+    def locate(self, article: int) -> tuple[int, int]:
+        """Return where to start reading to reach an article.
+
+        Args:
+            article: Position of the article among the file's articles.
+
+        Returns:
+            The byte offset of the nearest recorded article at or before
+            it, and the number of articles to step over from there.
+        """
+        if not 0 <= article < self._articles:
+            raise IndexError(article)
+        entry, skip = divmod(article, self.stride)
+        (offset,) = _OFFSET.unpack_from(self._mm, _HEADER.size + entry * _OFFSET.size)
+        return offset, skip
+
+
+def open_page_table(warc_path: str) -> PageTable | None:
+    """Open the page table of a WARC file if it exists and is current.
+
+    Args:
+        warc_path: Path to the WARC file.
+
+    Returns:
+        An open :class:`PageTable`, or ``None`` if there is no sidecar, it
+        is truncated or not a page table, or the file changed since it was
+        built (its size, ``mtime_ns`` or inode differ).
+    """
+    table_path = page_table_path(warc_path)
+    if not os.path.isfile(table_path):
+        return None
+    try:
+        table = PageTable(table_path)
+    except ValueError:
+        return None
+    if table.warc_stamp != file_stamp(warc_path):
+        table.close()
+        return None
+    return table
+
+
+def load_page_table(warc_path: str, *, stride: int | None = None) -> PageTable:
+    """Open the page table of a WARC file, building it first if it is missing or stale.
+
+    Args:
+        warc_path: Path to the WARC file.
+        stride: The stride the table must have; an existing table with
+            another stride is rebuilt.  ``None`` accepts any existing table
+            and builds a missing one with :data:`DEFAULT_STRIDE`.
+
+    Returns:
+        An open :class:`PageTable`.
+    """
+    table = open_page_table(warc_path)
+    if table is not None and stride is not None and table.stride != stride:
+        table.close()
+        table = None
+    if table is None:
+        table = PageTable(build_page_table(warc_path, stride=stride or DEFAULT_STRIDE))
+    return table
+
+
+def titles_from_page(warc_path: str, count: int, page: int, *, table: PageTable | None = None) -> list[ArticleTitle]:
+    """Return the titles of one page of a WARC file's articles.
+
+    Args:
+        warc_path: Path to the WARC file.
+        count: Articles per page.
+        page: The page number, from 1.
+        table: The file's open page table; loaded (and built if needed)
+            when omitted.
+
+    Returns:
+        The titles of articles ``(page - 1) * count`` up to ``page * count``
+        in file order; fewer on the last page, none past it.
+
+    Raises:
+        ValueError: If *count* or *page* is not positive.
+    """
+    if count < 1 or page < 1:
+        raise ValueError("count and page must be positive")
+    if table is None:
+        with load_page_table(warc_path) as table:
+            return titles_from_page(warc_path, count, page, table=table)
+    first = (page - 1) * count
+    if first >= len(table):
+        return []
+    wanted = min(count, len(table) - first)
+    offset, skip = table.locate(first)
+    titles: list[ArticleTitle] = []
+    with open(warc_path, "rb") as f:
+        f.seek(offset)
+        for number, record in enumerate(islice(_iter_article_records(f), skip, skip + wanted), first):
+            headers = record.rec_headers
+            titles.append(
+                ArticleTitle(
+                    number,
+                    headers.get_header("WARC-Record-ID") or "",
+                    headers.get_header("WARC-Target-URI") or "",
+                    read_title(record.content_stream(), charset_of(record.http_headers.get_header("Content-Type"))),
+                )
+            )
+    return titles
+
+
+def _iter_article_records(stream: BinaryIO) -> Iterator[ArcWarcRecord]:
+    """Yield the article records of a WARC stream without reading their bodies."""
+    for record in ArchiveIterator(stream):
+        if record.http_headers is not None and is_article(
+            record.rec_headers.get_header("WARC-Type"), record.http_headers.get_header("Content-Type", "")
+        ):
+            yield record
+
+
+def read_title(stream: BinaryIO, charset: str = DEFAULT_CHARSET, *, limit: int = TITLE_READ_LIMIT) -> str:
+    """Read an HTML body only as far as its ``</title>`` and return the title.
+
+    Args:
+        stream: The HTML body, positioned at its start.
+        charset: The codec of the body.
+        limit: Give up after reading this many bytes.
+
+    Returns:
+        The title (see :func:`extract_title`), or ``""`` if there is none
+        within *limit* bytes.
+    """
+    return extract_title(read_prefix(stream, limit, _TITLE_END), charset)
+
+
+def extract_title(head: bytes, charset: str = DEFAULT_CHARSET) -> str:
+    """Return the ``<title>`` of the start of an HTML document, entities decoded and whitespace collapsed.
+
+    Args:
+        head: The start of the document; a title cut off before its end tag
+            does not count.
+        charset: The codec of the document.
+
+    Returns:
+        The title, or ``""`` if *head* has none.
+    """
+    match = _TITLE_RE.search(head)
+    if match is None:
+        return ""
+    return " ".join(html.unescape(match.group(1).decode(charset, errors="replace")).split())
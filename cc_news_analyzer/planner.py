@@ -0,0 +1,154 @@
+"""Select the CC-NEWS WARC files that cover a date range.
+
+CC-NEWS file names embed the time their crawl segment started
+(``CC-NEWS-YYYYMMDDHHMMSS-NNNNN.warc.gz``), so a month index sorted by name
+is also sorted by time.  A file covers the interval from its own timestamp
+up to the next file's timestamp, which means the file that covers the start
+of a range may be the last file of the previous month.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from cc_news_analyzer.index import fetch_remote_size, fetch_warc_paths
+
+WARC_TIMESTAMP_PATTERN = re.compile(r"CC-NEWS-(\d{14})-\d+\.warc(?:\.gz)?$")
+
+
+@dataclass
+class PlannedWarc:
+    """A WARC file selected for a date range.
+
+    Attributes:
+        warc_path: The relative WARC path.
+        timestamp: The crawl start time embedded in the filename (UTC).
+    """
+
+    warc_path: str
+    timestamp: datetime
+
+
+def parse_warc_timestamp(warc_path: str) -> datetime | None:
+    """Return the UTC timestamp embedded in a CC-NEWS WARC filename.
+
+    Args:
+        warc_path: A relative path or filename such as
+            ``CC-NEWS-20260204051206-06668.warc.gz``.
+
+    Returns:
+        The timestamp, or ``None`` if the name has no timestamp.
+    """
+    match = WARC_TIMESTAMP_PATTERN.search(warc_path)
+    if match is None:
+        return None
+    return datetime.strptime(match.group(1), "%Y%m%d%H%M%S").replace(tzinfo=UTC)
+
+
+def parse_datetime_bound(value: str) -> datetime:
+    """Parse a range bound such as ``2026-02-03``, ``2026-02-03T00`` or ``2026-02-03T12:30``.
+
+    Args:
+        value: An ISO 8601 date or date-time; naive values are taken as UTC.
+
+    Returns:
+        The parsed, timezone-aware datetime.
+
+    Raises:
+        ValueError: If the value is not an ISO 8601 date or date-time.
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid date-time: {value!r}. Expected e.g. 2026-02-03 or 2026-02-03T12.") from None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def months_between(start: datetime, end: datetime) -> list[tuple[int, int]]:
+    """Return every ``(year, month)`` from *start*'s month to *end*'s month inclusive."""
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def plan_date_range(start: datetime, end: datetime, dest_dir: str, *, parallel: int = 4) -> list[PlannedWarc]:
+    """Select the WARC files whose crawl segments overlap ``[start, end)``.
+
+    The indexes of every month in the range are fetched concurrently through
+    :func:`cc_news_analyzer.index.fetch_warc_paths` (and so come from the
+    local cache when possible).  The sorted timestamps are binary-searched
+    for the last file starting at or before *start* and the first file
+    starting at or after *end*.
+
+    Args:
+        start: Start of the range (inclusive).
+        end: End of the range (exclusive).
+        dest_dir: Root directory of the local index cache.
+        parallel: Maximum number of concurrent index requests.
+
+    Returns:
+        The covering files in time order.
+
+    Raises:
+        ValueError: If *end* is not after *start*, or a month is out of range.
+        OSError: If a month index cannot be fetched.
+    """
+    if end <= start:
+        raise ValueError("The end of the date range must be after its start.")
+
+    # an exclusive end at midnight on the 1st does not need that month's index
+    months = months_between(start, end - timedelta(microseconds=1))
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        path_lists = list(executor.map(lambda ym: fetch_warc_paths(*ym, dest_dir), months))
+    warcs = _sorted_warcs(path for paths in path_lists for path in paths)
+
+    if not warcs or warcs[0].timestamp > start:
+        # the segment covering the start began in the previous month
+        warcs = _previous_month_tail(months[0], dest_dir) + warcs
+
+    timestamps = [warc.timestamp for warc in warcs]
+    first = max(bisect_right(timestamps, start) - 1, 0)
+    last = bisect_left(timestamps, end)
+    return warcs[first:last]
+
+
+def estimate_sizes(warc_paths: list[str], *, parallel: int = 4) -> list[int | None]:
+    """Look up remote file sizes with concurrent ``HEAD`` requests.
+
+    Args:
+        warc_paths: Relative WARC paths.
+        parallel: Maximum number of concurrent requests.
+
+    Returns:
+        The size in bytes of each file, or ``None`` where the server did not
+        report one, in the order of *warc_paths*.
+    """
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        return list(executor.map(fetch_remote_size, warc_paths))
+
+
+def _sorted_warcs(paths) -> list[PlannedWarc]:
+    """Wrap timestamped paths as :class:`PlannedWarc` objects in time order."""
+    warcs = []
+    for path in paths:
+        timestamp = parse_warc_timestamp(path)
+        if timestamp is not None:
+            warcs.append(PlannedWarc(path, timestamp))
+    warcs.sort(key=lambda warc: (warc.timestamp, warc.warc_path))
+    return warcs
+
+
+def _previous_month_tail(month: tuple[int, int], dest_dir: str) -> list[PlannedWarc]:
+    """Return the last file of the month before *month*, if it has an index."""
+    year, number = month
+    year, number = (year - 1, 12) if number == 1 else (year, number - 1)
+    try:
+        warcs = _sorted_warcs(fetch_warc_paths(year, number, dest_dir))
+    except (ValueError, OSError):
+        return []
+    return warcs[-1:]
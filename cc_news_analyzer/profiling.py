@@ -0,0 +1,283 @@
+"""Opt-in, phase-level timing of scans, downloads and output.
+
+Profiling is off unless :func:`start_profiling` was called (the CLI's
+``--profile`` option), and the hot loops pay nothing for it while it is off:
+:func:`timed_stream`, :func:`timed_iter` and :func:`gzip_decompressor`
+return their argument (or a plain ``zlib`` object) unchanged.  While it is
+on, they return wrappers that charge their time to a phase:
+
+- ``open``: opening files and connections and reading raw bytes from them.
+- ``decompress``: inflating gzip members (including inside warcio).
+- ``parse``: parsing WARC and HTTP headers, excluding the two above.
+- ``filter``: our own per-record work, such as classifying articles.
+- ``output``: writing results, downloads and caches.
+
+Phases nest and each reports exclusive time, so a read made while parsing
+counts as ``open`` rather than ``parse``.  Times are per thread and summed,
+and only work done in this process is seen: time spent waiting for worker
+processes is left unattributed.
+"""
+
+import cProfile
+import sys
+import threading
+import time
+import zlib
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO
+
+from warcio.bufferedreaders import BufferedReader
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+PHASES = ("open", "decompress", "parse", "filter", "output")
+
+_active: "Profiler | None" = None
+
+
+@dataclass
+class ProfileReport:
+    """The outcome of a profiling session.
+
+    Attributes:
+        wall_seconds: Elapsed time of the session.
+        phases: Exclusive seconds per phase, in :data:`PHASES` order.
+        records: Records scanned in this session.
+        peak_rss: Peak resident set size of this process or its children
+            in bytes, or ``None`` where the platform does not report it.
+        pstats_path: Where cProfile statistics were written, if anywhere.
+    """
+
+    wall_seconds: float
+    phases: dict[str, float] = field(default_factory=dict)
+    records: int = 0
+    peak_rss: int | None = None
+    pstats_path: str | None = None
+
+    @property
+    def unattributed_seconds(self) -> float:
+        """Wall time not charged to any phase (never negative)."""
+        return max(self.wall_seconds - sum(self.phases.values()), 0.0)
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.wall_seconds if self.wall_seconds else 0.0
+
+
+class Profiler:
+    """Accumulates exclusive time per phase across threads."""
+
+    def __init__(self, pstats_path: str | None = None):
+        self.pstats_path = pstats_path
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self.records = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cprofile = cProfile.Profile() if pstats_path else None
+        self._warcio_gzip = None
+        self._started = time.perf_counter()
+
+    def enter(self, name: str) -> None:
+        """Start charging time to phase *name* until the matching :meth:`exit`."""
+        stack = self._stack()
+        # frames are [name, start, time spent in nested phases]
+        stack.append([name, time.perf_counter(), 0.0])
+
+    def exit(self) -> None:
+        """Stop the innermost phase of the calling thread."""
+        stack = self._stack()
+        name, started, nested = stack.pop()
+        elapsed = time.perf_counter() - started
+        if stack:
+            stack[-1][2] += elapsed
+        with self._lock:
+            self.totals[name] += elapsed - nested
+
+    def add_records(self, count: int) -> None:
+        """Count records scanned, for the records/s figure."""
+        with self._lock:
+            self.records += count
+
+    def _stack(self) -> list[list]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+
+def start_profiling(pstats_path: str | None = None) -> Profiler:
+    """Turn profiling on for this process.
+
+    Args:
+        pstats_path: Also run cProfile and write its statistics here (in
+            :mod:`pstats` format) when profiling stops.
+
+    Returns:
+        The active profiler, to pass to :func:`stop_profiling`.
+    """
+    global _active
+    profiler = Profiler(pstats_path)
+    _active = profiler
+    # warcio looks decompressors up in this table for every gzip member
+    profiler._warcio_gzip = BufferedReader.DECOMPRESSORS["gzip"]
+    BufferedReader.DECOMPRESSORS["gzip"] = gzip_decompressor
+    if profiler._cprofile is not None:
+        profiler._cprofile.enable()
+    return profiler
+
+
+def stop_profiling(profiler: Profiler) -> ProfileReport:
+    """Turn profiling off and summarize the session.
+
+    Args:
+        profiler: From :func:`start_profiling`.
+
+    Returns:
+        The timings, record count and peak memory of the session.
+    """
+    global _active
+    wall_seconds = time.perf_counter() - profiler._started
+    if profiler._cprofile is not None:
+        profiler._cprofile.disable()
+        profiler._cprofile.dump_stats(profiler.pstats_path)
+    _active = None
+    BufferedReader.DECOMPRESSORS["gzip"] = profiler._warcio_gzip
+    return ProfileReport(
+        wall_seconds=wall_seconds,
+        phases=dict(profiler.totals),
+        records=profiler.records,
+        peak_rss=peak_rss(),
+        pstats_path=profiler.pstats_path,
+    )
+
+
+def peak_rss() -> int | None:
+    """Return the peak resident set size of this process or its children in bytes."""
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Charge the time spent in the block to phase *name* (a no-op when profiling is off)."""
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    profiler.enter(name)
+    try:
+        yield
+    finally:
+        profiler.exit()
+
+
+def add_records(count: int) -> None:
+    """Count records scanned (a no-op when profiling is off)."""
+    if _active is not None:
+        _active.add_records(count)
+
+
+def timed_iter(iterable: Iterable, name: str) -> Iterable:
+    """Charge the time spent fetching each item of *iterable* to phase *name*."""
+    profiler = _active
+    if profiler is None:
+        return iterable
+    return _timed_iter(profiler, iter(iterable), name)
+
+
+def _timed_iter(profiler: Profiler, iterator: Iterator, name: str) -> Iterator:
+    while True:
+        profiler.enter(name)
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            profiler.exit()
+        yield item
+
+
+def timed_stream(stream: BinaryIO) -> BinaryIO:
+    """Charge reads from *stream* to the ``open`` phase and writes to ``output``."""
+    profiler = _active
+    if profiler is None:
+        return stream
+    return _TimedStream(stream, profiler)
+
+
+class _TimedStream:
+    """Proxies a binary stream, timing its read and write methods."""
+
+    def __init__(self, stream: BinaryIO, profiler: Profiler):
+        self._stream = stream
+        self._profiler = profiler
+
+    def _timed(self, method: str, *args, phase: str = "open") -> Any:
+        self._profiler.enter(phase)
+        try:
+            return getattr(self._stream, method)(*args)
+        finally:
+            self._profiler.exit()
+
+    def read(self, *args) -> bytes:
+        return self._timed("read", *args)
+
+    def read1(self, *args) -> bytes:
+        return self._timed("read1", *args)
+
+    def readinto(self, buffer) -> int:
+        return self._timed("readinto", buffer)
+
+    def readline(self, *args) -> bytes:
+        return self._timed("readline", *args)
+
+    def write(self, data) -> int:
+        return self._timed("write", data, phase="output")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+def gzip_decompressor():
+    """Return a gzip member decompressor, timed under ``decompress`` while profiling."""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    profiler = _active
+    if profiler is None:
+        return decompressor
+    return _TimedDecompressor(decompressor, profiler)
+
+
+class _TimedDecompressor:
+    """Proxies a ``zlib`` decompressor, timing ``decompress`` and ``flush``."""
+
+    def __init__(self, decompressor, profiler: Profiler):
+        self._decompressor = decompressor
+        self._profiler = profiler
+
+    def decompress(self, data, max_length: int = 0) -> bytes:
+        self._profiler.enter("decompress")
+        try:
+            return self._decompressor.decompress(data, max_length)
+        finally:
+            self._profiler.exit()
+
+    def flush(self, *args) -> bytes:
+        self._profiler.enter("decompress")
+        try:
+            return self._decompressor.flush(*args)
+        finally:
+            self._profiler.exit()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._decompressor, name)
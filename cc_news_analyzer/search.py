@@ -0,0 +1,383 @@
+"""Multi-keyword and boolean search over the text of the articles of WARC files.
+
+:class:`KeywordMatcher` compiles the keywords into one Aho-Corasick
+automaton, so each article's text is scanned once whatever the number of
+keywords: the cost grows with the size of the text, not with text size
+times keyword count.  Matches may overlap (``new`` and ``new york`` both
+count in "new york").  :class:`Query` matches a boolean expression of
+words and phrases.
+
+Searches are over article text (see
+:func:`cc_news_analyzer.articles.article_text`), not markup.  Word-based
+searches -- queries, and case-insensitive whole-word keyword searches --
+are answered from a file's text index (see
+:mod:`cc_news_analyzer.textindex`) instead of scanning it, when it has a
+current one; the results are the same either way.
+"""
+
+import os
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+
+from cc_news_analyzer.articles import article_text, iter_articles
+from cc_news_analyzer.index import is_remote_warc_path
+from cc_news_analyzer.members import WarcPart, open_warc_part, split_warc_parts
+from cc_news_analyzer.profiling import add_records, phase, timed_iter, timed_stream
+from cc_news_analyzer.textindex import TextIndex, open_text_index, phrase_occurrences, tokenize, word_positions
+
+_QUERY_TOKEN_RE = re.compile(r'"([^"]*)"|([()])|([^\s()"]+)')
+
+
+class KeywordMatcher:
+    """Counts the occurrences of many keywords in one pass over a text.
+
+    Args:
+        keywords: The keywords; blank and duplicate entries are ignored.
+        case_sensitive: Match case exactly instead of comparing case-folded
+            text.
+        whole_word: Match words rather than substrings: a keyword matches
+            its words (see :func:`cc_news_analyzer.textindex.tokenize`) in
+            sequence, whatever separates them in the text.  Keywords without
+            any word character are then ignored.
+    """
+
+    def __init__(self, keywords: Iterable[str], *, case_sensitive: bool = False, whole_word: bool = False):
+        self.case_sensitive = case_sensitive
+        self.whole_word = whole_word
+        keywords = [keyword for keyword in keywords if keyword.strip()]
+        if whole_word:
+            keywords = [keyword for keyword in keywords if tokenize(keyword)]
+        self.keywords = list(dict.fromkeys(keywords))
+        self._patterns = [self._normalize(keyword) for keyword in self.keywords]
+        self._build()
+
+    @property
+    def indexable(self) -> bool:
+        """Whether a text index can answer this search (it is case-insensitive and by whole word)."""
+        return self.whole_word and not self.case_sensitive
+
+    @property
+    def phrases(self) -> dict[str, list[str]]:
+        """The words of each keyword, for text index lookups."""
+        return {keyword: tokenize(keyword) for keyword in self.keywords}
+
+    def matches(self, counts: dict[str, int]) -> bool:
+        """Return whether an article with these keyword counts is a hit."""
+        return bool(counts)
+
+    def _normalize(self, text: str) -> str:
+        """Case-fold *text* unless matching case; for whole words, reduce it to its words between spaces."""
+        if self.whole_word:
+            # padding with spaces makes every match start and end at a word boundary
+            return f" {' '.join(tokenize(text, fold_case=not self.case_sensitive))} "
+        return text if self.case_sensitive else text.casefold()
+
+    def _build(self) -> None:
+        """Build the automaton as a DFA: one transition table lookup per character."""
+        goto, outputs = _build_trie(self._patterns)
+        # breadth-first, so each state's failure state is complete before it is used
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for char, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(char, 0)
+                queue.append(child)
+        self._delta = delta
+        self._outputs = [tuple(output) for output in outputs]
+        # most states output nothing; a set test is cheaper than looping over an empty tuple
+        self._accepting = frozenset(state for state, output in enumerate(outputs) if output)
+
+    def count(self, text: str) -> dict[str, int]:
+        """Count the occurrences of each keyword in *text*.
+
+        Returns:
+            Occurrence counts keyed by keyword, in keyword order, for the
+            keywords that occur.
+        """
+        text = self._normalize(text)
+        counts = [0] * len(self._patterns)
+        delta, accepting = self._delta, self._accepting
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if state not in accepting:
+                continue
+            for index in self._outputs[state]:
+                counts[index] += 1
+        return {keyword: n for keyword, n in zip(self.keywords, counts, strict=True) if n}
+
+
+def _build_trie(patterns: list[str]) -> tuple[list[dict[str, int]], list[list[int]]]:
+    """Return the goto table of a trie of *patterns* and the pattern indexes ending at each state."""
+    goto: list[dict[str, int]] = [{}]
+    outputs: list[list[int]] = [[]]
+    for index, pattern in enumerate(patterns):
+        state = 0
+        for char in pattern:
+            if char not in goto[state]:
+                goto[state][char] = len(goto)
+                goto.append({})
+                outputs.append([])
+            state = goto[state][char]
+        outputs[state].append(index)
+    return goto, outputs
+
+
+class Query:
+    """A boolean query over the words of article text.
+
+    Terms are words or double-quoted phrases, matched case-insensitively
+    by their words (see :func:`cc_news_analyzer.textindex.tokenize`); a term
+    with several words, like ``covid-19``, is a phrase.  ``AND`` binds
+    tighter than ``OR``, adjacent terms are joined by ``AND``, and
+    parentheses group::
+
+        climate AND ("carbon tax" OR "emissions trading")
+
+    Args:
+        expression: The query.
+
+    Raises:
+        ValueError: If the query is empty or malformed.
+    """
+
+    indexable = True
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.phrases: dict[str, list[str]] = {}
+        self._root = _QueryParser(expression, self.phrases).parse()
+
+    @property
+    def keywords(self) -> list[str]:
+        """The query's terms, as their words separated by spaces."""
+        return list(self.phrases)
+
+    def matches(self, counts: dict[str, int]) -> bool:
+        """Return whether an article with these term counts is a hit."""
+        return self._root.matches(counts)
+
+    def count(self, text: str) -> dict[str, int]:
+        """Count the terms of the query in *text*.
+
+        Returns:
+            Occurrence counts keyed by term, for the terms that occur, if
+            the text matches the query; otherwise an empty dict.
+        """
+        positions = word_positions(tokenize(text))
+        counts = {}
+        for keyword, words in self.phrases.items():
+            count = phrase_occurrences([positions.get(word, ()) for word in words])
+            if count:
+                counts[keyword] = count
+        return counts if self.matches(counts) else {}
+
+
+@dataclass(frozen=True)
+class _Term:
+    keyword: str
+
+    def matches(self, counts: dict[str, int]) -> bool:
+        return self.keyword in counts
+
+
+@dataclass(frozen=True)
+class _AllOf:
+    children: tuple
+
+    def matches(self, counts: dict[str, int]) -> bool:
+        return all(child.matches(counts) for child in self.children)
+
+
+@dataclass(frozen=True)
+class _AnyOf:
+    children: tuple
+
+    def matches(self, counts: dict[str, int]) -> bool:
+        return any(child.matches(counts) for child in self.children)
+
+
+class _QueryParser:
+    """Recursive-descent parser of :class:`Query` expressions, collecting their phrases."""
+
+    def __init__(self, expression: str, phrases: dict[str, list[str]]):
+        if expression.count('"') % 2:
+            raise ValueError(f"Unbalanced quotes in query: {expression}")
+        self._tokens = [match.group() for match in _QUERY_TOKEN_RE.finditer(expression)]
+        self._position = 0
+        self._phrases = phrases
+
+    def parse(self):
+        if not self._tokens:
+            raise ValueError("Empty query")
+        node = self._any_of()
+        if self._position < len(self._tokens):
+            raise ValueError(f"Unexpected {self._tokens[self._position]!r} in query")
+        return node
+
+    def _peek(self) -> str | None:
+        return self._tokens[self._position] if self._position < len(self._tokens) else None
+
+    def _next(self) -> str:
+        token = self._peek()
+        if token is None:
+            raise ValueError("Incomplete query")
+        self._position += 1
+        return token
+
+    def _any_of(self):
+        children = [self._all_of()]
+        while self._peek() == "OR":
+            self._next()
+            children.append(self._all_of())
+        return children[0] if len(children) == 1 else _AnyOf(tuple(children))
+
+    def _all_of(self):
+        children = [self._term()]
+        while self._peek() not in (None, "OR", ")"):
+            if self._peek() == "AND":
+                self._next()
+            children.append(self._term())
+        return children[0] if len(children) == 1 else _AllOf(tuple(children))
+
+    def _term(self):
+        token = self._next()
+        if token == "(":
+            node = self._any_of()
+            if self._next() != ")":
+                raise ValueError("Unbalanced parentheses in query")
+            return node
+        if token in ("AND", "OR", ")"):
+            raise ValueError(f"Unexpected {token!r} in query")
+        words = tokenize(token.strip('"'))
+        if not words:
+            raise ValueError(f"No words to search for in {token!r}")
+        keyword = " ".join(words)
+        self._phrases[keyword] = words
+        return _Term(keyword)
+
+
+def read_keywords(path: str) -> list[str]:
+    """Read a keyword list: one keyword or phrase per line, ``#`` starting a comment line.
+
+    Args:
+        path: Path to a UTF-8 text file.
+
+    Returns:
+        The keywords in file order, stripped of surrounding whitespace.
+    """
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+@dataclass
+class SearchHit:
+    """An article matching at least one keyword.
+
+    Attributes:
+        warc_path: The file the article was found in.
+        record_id: The article's ``WARC-Record-ID``.
+        uri: The article's ``WARC-Target-URI``.
+        counts: Occurrences per matching keyword.
+    """
+
+    warc_path: str
+    record_id: str
+    uri: str
+    counts: dict[str, int] = field(default_factory=dict)
+
+
+def search_warcs(
+    warc_paths: list[str],
+    matcher: "KeywordMatcher | Query",
+    *,
+    workers: int = 1,
+    use_index: bool = True,
+) -> Iterator[SearchHit]:
+    """Search the articles of WARC files for keywords, yielding hits as they are found.
+
+    Args:
+        warc_paths: Paths to ``.warc`` or ``.warc.gz`` files, or CC-NEWS
+            relative paths or URLs to stream.
+        matcher: The compiled keywords or query.
+        workers: Number of worker processes.  Above one, files (or the
+            member ranges of a single local file) are searched in parallel
+            and each part's hits are yielded once it and the parts before
+            it are done, so hits always come in file order.
+        use_index: Answer the search from the text index of files that
+            have a current one, when the matcher allows it.
+
+    Yields:
+        A :class:`SearchHit` per matching article.
+
+    Raises:
+        FileNotFoundError: If a WARC file does not exist.
+        ArchiveLoadFailed: If a file is not a valid WARC.
+        OSError: If a remote WARC file cannot be fetched.
+    """
+    unindexed: list[str] = []
+    for path in warc_paths:
+        index = None
+        if use_index and matcher.indexable and not is_remote_warc_path(path) and os.path.isfile(path):
+            index = open_text_index(path)
+        if index is None:
+            unindexed.append(path)
+            continue
+        # scan the files before this one first, to keep hits in file order
+        yield from _scan_warcs(unindexed, matcher, workers)
+        unindexed = []
+        with index:
+            yield from _search_index(path, index, matcher)
+    yield from _scan_warcs(unindexed, matcher, workers)
+
+
+def _search_index(warc_path: str, index: TextIndex, matcher: "KeywordMatcher | Query") -> Iterator[SearchHit]:
+    """Yield the hits of one file from its text index."""
+    with phase("filter"):
+        documents = {keyword: index.phrase(words) for keyword, words in matcher.phrases.items()}
+        candidates = sorted(set().union(*documents.values()))
+    for document in candidates:
+        counts = {keyword: found[document] for keyword, found in documents.items() if document in found}
+        if matcher.matches(counts):
+            indexed = index.document(document)
+            yield SearchHit(warc_path, indexed.record_id, indexed.uri, counts)
+
+
+def _scan_warcs(warc_paths: list[str], matcher: "KeywordMatcher | Query", workers: int) -> Iterator[SearchHit]:
+    """Yield the hits of files by scanning their articles."""
+    if not warc_paths:
+        return
+    parts = split_warc_parts(warc_paths, workers)
+    if workers == 1 or len(parts) == 1:
+        for part in parts:
+            yield from _search_part(part, matcher)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(parts))) as executor:
+        for hits in executor.map(partial(_search_part_to_list, matcher=matcher), parts):
+            yield from hits
+
+
+def _search_part_to_list(part: WarcPart, matcher: "KeywordMatcher | Query") -> list[SearchHit]:
+    """Search one part (runs in a worker process)."""
+    return list(_search_part(part, matcher))
+
+
+def _search_part(part: WarcPart, matcher: "KeywordMatcher | Query") -> Iterator[SearchHit]:
+    """Yield the hits of one part of the input."""
+    articles = 0
+    with open_warc_part(part) as stream:
+        for article in timed_iter(iter_articles(timed_stream(stream)), "parse"):
+            articles += 1
+            with phase("filter"):
+                counts = matcher.count(article_text(article))
+            if counts:
+                yield SearchHit(part[0], article.record_id, article.uri, counts)
+    add_records(articles)
@@ -0,0 +1,122 @@
+"""Summarize articles from the first few kilobytes of their HTML: title, meta tags and lede.
+
+Titles, ``og:`` tags and meta descriptions sit in the document head, and
+the lede is usually the first paragraph of the body, all within the first
+few kilobytes of a page that may be hundreds of kilobytes long.
+:func:`summarize_articles` reads only that much of each article (see
+:func:`cc_news_analyzer.warc.iter_payload_prefixes`) and pulls the summary
+out of it with regular expressions, without parsing the rest of the page.
+"""
+
+import html
+import re
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from cc_news_analyzer.articles import charset_of, html_to_text
+from cc_news_analyzer.pages import extract_title
+from cc_news_analyzer.warc import DEFAULT_PREFIX_LIMIT, iter_payload_prefixes
+
+HEAD_END = b"</head>"
+# enough for the head and opening paragraphs of most pages
+DEFAULT_LEDE_LIMIT = 64 * 1024
+LEDE_MIN_WORDS = 8
+
+_META_RE = re.compile(rb"<meta\b[^>]*>", re.IGNORECASE)
+_ATTRIBUTE_RE = re.compile(rb"""([\w:.-]+)\s*=\s*("[^"]*"|'[^']*'|[^\s"'>]+)""")
+_BODY_RE = re.compile(rb"<body\b", re.IGNORECASE)
+_PARAGRAPH_RE = re.compile(rb"<p\b[^>]*>(.*?)</p\s*>", re.DOTALL | re.IGNORECASE)
+
+
+class ArticleSummary(NamedTuple):
+    """What the start of an article says about it.
+
+    Attributes:
+        record_id: The ``WARC-Record-ID`` header.
+        uri: The ``WARC-Target-URI`` header.
+        date: The ``WARC-Date`` header.
+        title: The HTML ``<title>``.
+        description: The ``og:description`` or ``description`` meta tag.
+        meta: The ``content`` of every ``<meta>`` tag read, keyed
+            by its lowercased ``name`` or ``property`` (``og:title``,
+            ``author``, ...); the first tag of each name wins.
+        lede: The first paragraph of at least :data:`LEDE_MIN_WORDS` words,
+            if it was asked for and found.
+    """
+
+    record_id: str
+    uri: str
+    date: str
+    title: str
+    description: str
+    meta: dict[str, str]
+    lede: str = ""
+
+
+def extract_meta(head: bytes, charset: str) -> dict[str, str]:
+    """Return the ``content`` of the ``<meta>`` tags in *head*, keyed by lowercased name or property."""
+    meta: dict[str, str] = {}
+    for tag in _META_RE.findall(head):
+        attributes = {name.lower(): value.strip(b"\"'") for name, value in _ATTRIBUTE_RE.findall(tag[len(b"<meta") :])}
+        key = attributes.get(b"property") or attributes.get(b"name")
+        content = attributes.get(b"content")
+        if key and content is not None:
+            name = key.decode(charset, errors="replace").lower()
+            if name not in meta:
+                meta[name] = " ".join(html.unescape(content.decode(charset, errors="replace")).split())
+    return meta
+
+
+def extract_lede(head: bytes, charset: str) -> str:
+    """Return the text of the first paragraph of at least :data:`LEDE_MIN_WORDS` words in *head*, or ``""``."""
+    body = _BODY_RE.search(head)
+    for match in _PARAGRAPH_RE.finditer(head, body.start() if body else 0):
+        words = html_to_text(match.group(1).decode(charset, errors="replace")).split()
+        if len(words) >= LEDE_MIN_WORDS:
+            return " ".join(words)
+    return ""
+
+
+def summarize_articles(
+    warc_path: str,
+    *,
+    lede: bool = False,
+    limit: int | None = None,
+    use_index: bool = True,
+) -> Iterator[ArticleSummary]:
+    """Summarize every article of a WARC file from the start of its HTML.
+
+    Without *lede*, each article is read only as far as ``</head>``.
+
+    Args:
+        warc_path: Path to a ``.warc`` or ``.warc.gz`` file, or a CC-NEWS
+            relative path or URL to stream.
+        lede: Also find the lede, reading into the body.
+        limit: The most bytes of HTML to read per article; defaults to
+            16 KiB, or 64 KiB with *lede*.
+        use_index: Seek from article to article with the record index
+            sidecar if it is current.
+
+    Yields:
+        An :class:`ArticleSummary` per article, in file order.
+
+    Raises:
+        FileNotFoundError: If the WARC file does not exist.
+        ArchiveLoadFailed: If the file is not a valid WARC.
+        OSError: If a remote WARC file cannot be fetched.
+    """
+    if limit is None:
+        limit = DEFAULT_LEDE_LIMIT if lede else DEFAULT_PREFIX_LIMIT
+    sentinel = None if lede else HEAD_END
+    for payload in iter_payload_prefixes(warc_path, limit=limit, sentinel=sentinel, use_index=use_index):
+        charset = charset_of(payload.content_type)
+        meta = extract_meta(payload.prefix, charset)
+        yield ArticleSummary(
+            record_id=payload.record_id,
+            uri=payload.uri,
+            date=payload.date,
+            title=extract_title(payload.prefix, charset),
+            description=meta.get("og:description") or meta.get("description", ""),
+            meta=meta,
+            lede=extract_lede(payload.prefix, charset) if lede else "",
+        )
@@ -0,0 +1,457 @@
+"""A columnar, memory-mappable metadata table of the records in WARC files.
+
+Filtering records by host, date or content type otherwise means
+decompressing the whole WARC again.  :func:`build_table` extracts the
+metadata of every record once -- from the record index sidecar when a
+current one exists (see :mod:`cc_news_analyzer.cdx`), otherwise in one
+pass over the file -- into NumPy arrays saved as ``.npy`` files in a
+directory next to the WARC (``<warc>.cols/``).  :func:`load_tables` maps
+the tables of a directory of WARCs (a month, say) to query them as one
+(a :class:`TableSet`), without copying their columns into memory; filters
+and aggregations are vectorized array operations on the maps.
+
+Columns (one row per record, in file order):
+
+- ``record_id``, ``target_uri``: strings (:class:`StringColumn`).
+- ``host``, ``content_type``, ``warc_type``, ``file``: ``int32`` codes
+  into the ``hosts``, ``content_types``, ``warc_types`` and ``files``
+  vocabularies.  Content types are media types, lowercased and without
+  parameters; hosts are lowercased.
+- ``date``: ``WARC-Date`` as ``int64`` seconds since the epoch (``0`` if
+  missing).
+- ``payload_length``: the block ``Content-Length``.
+- ``offset``, ``length``: where the record is stored in its file.
+
+NumPy is an optional dependency (``pip install 'cc-news-analyzer[table]'``).
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from urllib.parse import urlsplit
+
+from cc_news_analyzer.cache import FileStamp, file_stamp
+from cc_news_analyzer.cdx import IndexEntry, iter_index_entries, open_record_index
+from cc_news_analyzer.warc import expand_warc_inputs
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install 'cc-news-analyzer[table]'
+    np = None
+
+TABLE_SUFFIX = ".cols"
+TABLE_VERSION = 2
+META_FILE = "meta.json"
+NO_DATE = 0
+
+_CODE_COLUMNS = {"host": "hosts", "content_type": "content_types", "warc_type": "warc_types"}
+_INT_COLUMNS = ("date", "payload_length", "offset", "length")
+_STRING_COLUMNS = ("record_id", "target_uri")
+
+
+def require_numpy() -> None:
+    """Raise ImportError with an install hint if NumPy is missing."""
+    if np is None:
+        raise ImportError("The metadata table requires NumPy: pip install 'cc-news-analyzer[table]'")
+
+
+def table_path(warc_path: str) -> str:
+    """Return the path of the table directory of a WARC file."""
+    return warc_path + TABLE_SUFFIX
+
+
+class StringColumn:
+    """A column of strings stored as one UTF-8 buffer and ``int64`` row offsets."""
+
+    def __init__(self, data: "np.ndarray", offsets: "np.ndarray"):
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, values: Iterable[str]) -> "StringColumn":
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        return self.data[self.offsets[row] : self.offsets[row + 1]].tobytes().decode("utf-8")
+
+    def equals(self, value: str) -> "np.ndarray":
+        """Return a boolean mask of the rows equal to *value*.
+
+        Rows of the right length are compared a byte position at a time,
+        each step a vectorized gather that keeps only the rows still
+        matching, so the work shrinks as soon as the key diverges.
+        """
+        key = value.encode("utf-8")
+        rows = np.flatnonzero(np.diff(self.offsets) == len(key))
+        starts = self.offsets[rows]
+        for position, byte in enumerate(key):
+            if not len(rows):
+                break
+            keep = self.data[starts + position] == byte
+            rows, starts = rows[keep], starts[keep]
+        mask = np.zeros(len(self), dtype=bool)
+        mask[rows] = True
+        return mask
+
+
+@dataclass
+class MetadataTable:
+    """Record metadata of one or more WARC files as columns (see the module docstring)."""
+
+    record_id: StringColumn
+    target_uri: StringColumn
+    host: "np.ndarray"
+    content_type: "np.ndarray"
+    warc_type: "np.ndarray"
+    file: "np.ndarray"
+    date: "np.ndarray"
+    payload_length: "np.ndarray"
+    offset: "np.ndarray"
+    length: "np.ndarray"
+    hosts: list[str] = field(default_factory=list)
+    content_types: list[str] = field(default_factory=list)
+    warc_types: list[str] = field(default_factory=list)
+    files: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.date)
+
+    def select(
+        self,
+        *,
+        hosts: Iterable[str] = (),
+        content_types: Iterable[str] = (),
+        warc_types: Iterable[str] = (),
+        since: datetime | None = None,
+        until: datetime | None = None,
+        articles: bool = False,
+        record_ids: Iterable[str] = (),
+        uris: Iterable[str] = (),
+    ) -> "np.ndarray":
+        """Return a boolean mask of the rows matching every given filter.
+
+        Args:
+            hosts: Keep rows whose host is one of these.
+            content_types: Keep rows whose media type is one of these.
+            warc_types: Keep rows whose ``WARC-Type`` is one of these.
+            since: Keep rows dated at or after this time.
+            until: Keep rows dated before this time.
+            articles: Keep only articles (HTML ``response`` records).
+            record_ids: Keep rows whose ``WARC-Record-ID`` is one of these.
+            uris: Keep rows whose ``WARC-Target-URI`` is one of these.
+
+        Returns:
+            A mask with one entry per row.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        filters = (
+            ("host", [host.lower() for host in hosts]),
+            ("content_type", [media_type.lower() for media_type in content_types]),
+            ("warc_type", list(warc_types)),
+            ("record_id", list(record_ids)),
+            ("target_uri", list(uris)),
+        )
+        for column, values in filters:
+            if values:
+                mask &= self._matches(column, values)
+        if since is not None:
+            mask &= self.date >= int(since.timestamp())
+        if until is not None:
+            mask &= self.date < int(until.timestamp())
+        if articles:
+            mask &= self.article_mask()
+        return mask
+
+    def article_mask(self) -> "np.ndarray":
+        """Return a boolean mask of the articles (HTML ``response`` records)."""
+        html = [i for i, media_type in enumerate(self.content_types) if media_type.startswith("text/html")]
+        return np.isin(self.warc_type, self._codes("warc_type", ["response"])) & np.isin(self.content_type, html)
+
+    def value_counts(self, column: str, mask: "np.ndarray | None" = None) -> dict[str, int]:
+        """Count the rows per value of a coded column.
+
+        Args:
+            column: ``host``, ``content_type``, ``warc_type`` or ``file``.
+            mask: Count only the rows selected by this mask.
+
+        Returns:
+            Row counts by value, most frequent first, zero counts omitted.
+        """
+        vocabulary = self._vocabulary(column)
+        codes = getattr(self, column) if mask is None else getattr(self, column)[mask]
+        counts = np.bincount(codes, minlength=len(vocabulary))
+        order = np.argsort(-counts, kind="stable")
+        return {vocabulary[i]: int(counts[i]) for i in order if counts[i]}
+
+    def row(self, row: int) -> dict[str, Any]:
+        """Return one row with codes resolved to their values."""
+        return {
+            "record_id": self.record_id[row],
+            "target_uri": self.target_uri[row],
+            "host": self.hosts[self.host[row]],
+            "content_type": self.content_types[self.content_type[row]],
+            "warc_type": self.warc_types[self.warc_type[row]],
+            "file": self.files[self.file[row]],
+            "date": int(self.date[row]),
+            "payload_length": int(self.payload_length[row]),
+            "offset": int(self.offset[row]),
+            "length": int(self.length[row]),
+        }
+
+    def _vocabulary(self, column: str) -> list[str]:
+        return self.files if column == "file" else getattr(self, _CODE_COLUMNS[column])
+
+    def _codes(self, column: str, values: list[str]) -> list[int]:
+        vocabulary = self._vocabulary(column)
+        return [vocabulary.index(value) for value in values if value in vocabulary]
+
+    def _matches(self, column: str, values: list[str]) -> "np.ndarray":
+        """Return a boolean mask of the rows whose value in *column* is one of *values*."""
+        if column in _STRING_COLUMNS:
+            return np.logical_or.reduce([getattr(self, column).equals(value) for value in values])
+        return np.isin(getattr(self, column), self._codes(column, values))
+
+
+def build_table(warc_path: str, table_dir: str | None = None) -> str:
+    """Extract the record metadata of a WARC file into a table directory.
+
+    The metadata is read from the record index sidecar when a current one
+    exists, so the WARC is not decompressed again.
+
+    Args:
+        warc_path: Path to a ``.warc`` or ``.warc.gz`` file.
+        table_dir: Where to write the table; defaults to :func:`table_path`.
+            An existing table there is replaced.
+
+    Returns:
+        The path of the table directory.
+
+    Raises:
+        FileNotFoundError: If the WARC file does not exist.
+        ImportError: If NumPy is not installed.
+    """
+    require_numpy()
+    if not os.path.isfile(warc_path):
+        raise FileNotFoundError(f"WARC file not found: {warc_path}")
+
+    table_dir = table_dir or table_path(warc_path)
+    index = open_record_index(warc_path)
+    if index is not None:
+        with index:
+            entries = list(index)
+            warc_stamp = index.warc_stamp
+    else:
+        warc_stamp = file_stamp(warc_path)
+        with open(warc_path, "rb") as f:
+            entries = list(iter_index_entries(f))
+    write_table(entries, table_dir, warc_stamp)
+    return table_dir
+
+
+def write_table(entries: Iterable[IndexEntry], table_dir: str, warc_stamp: FileStamp) -> None:
+    """Write record index entries as a table directory, replacing any existing one.
+
+    Args:
+        entries: The records of the WARC file, in file order.
+        table_dir: Destination directory.
+        warc_stamp: Stamp of the WARC file as it was before it was read,
+            used to detect stale tables.
+    """
+    entries = list(entries)
+    arrays, vocabularies = _entry_columns(entries)
+    for column in _STRING_COLUMNS:
+        strings = StringColumn.from_strings(getattr(entry, column) for entry in entries)
+        arrays[f"{column}.data"] = strings.data
+        arrays[f"{column}.offsets"] = strings.offsets
+    meta = {"version": TABLE_VERSION, "warc_stamp": list(warc_stamp), "records": len(entries), **vocabularies}
+
+    # write next to the destination and rename, so readers never see a partial table
+    tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(table_dir)), prefix=".table-")
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), array)
+        with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        shutil.rmtree(table_dir, ignore_errors=True)
+        os.replace(tmp_dir, table_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def _entry_columns(entries: list[IndexEntry]) -> tuple[dict[str, "np.ndarray"], dict[str, list[str]]]:
+    """Return the coded and integer columns of *entries* and the vocabularies of the codes."""
+    vocabularies: dict[str, dict[str, int]] = {column: {} for column in _CODE_COLUMNS}
+    columns: dict[str, list] = {column: [] for column in (*_CODE_COLUMNS, *_INT_COLUMNS)}
+    for entry in entries:
+        values = {
+            "host": (urlsplit(entry.target_uri).hostname or "").lower(),
+            "content_type": entry.content_type.split(";", 1)[0].strip().lower(),
+            "warc_type": entry.warc_type,
+        }
+        for column, value in values.items():
+            columns[column].append(vocabularies[column].setdefault(value, len(vocabularies[column])))
+        columns["date"].append(_epoch_seconds(entry.date))
+        columns["payload_length"].append(entry.content_length)
+        columns["offset"].append(entry.offset)
+        columns["length"].append(entry.length)
+    arrays = {column: np.array(columns[column], dtype=np.int32) for column in _CODE_COLUMNS}
+    arrays.update({column: np.array(columns[column], dtype=np.int64) for column in _INT_COLUMNS})
+    return arrays, {vocab: list(vocabularies[column]) for column, vocab in _CODE_COLUMNS.items()}
+
+
+def _epoch_seconds(date: str) -> int:
+    """Parse a ``WARC-Date`` into seconds since the epoch, or :data:`NO_DATE`."""
+    try:
+        return int(datetime.fromisoformat(date).timestamp())
+    except ValueError:
+        return NO_DATE
+
+
+def open_table(warc_path: str) -> MetadataTable | None:
+    """Memory-map the table of a WARC file if it exists and is current.
+
+    Args:
+        warc_path: Path to the WARC file.
+
+    Returns:
+        The table, or ``None`` if there is none, it was built by another
+        version of the table format, or the file changed since it was built
+        (its size, ``mtime_ns`` or inode differ).
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        ValueError: If a column file of a current table is missing.
+    """
+    require_numpy()
+    table_dir = table_path(warc_path)
+    try:
+        with open(os.path.join(table_dir, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != TABLE_VERSION or meta.get("warc_stamp") != list(file_stamp(warc_path)):
+        return None
+
+    def load(name: str) -> "np.ndarray":
+        column_path = os.path.join(table_dir, f"{name}.npy")
+        try:
+            return np.load(column_path, mmap_mode="r")
+        except FileNotFoundError:
+            raise ValueError(f"Incomplete metadata table, missing column file: {column_path}") from None
+
+    strings = {column: StringColumn(load(f"{column}.data"), load(f"{column}.offsets")) for column in _STRING_COLUMNS}
+    return MetadataTable(
+        **strings,
+        **{column: load(column) for column in (*_CODE_COLUMNS, *_INT_COLUMNS)},
+        # every row is file 0: a zero-stride view rather than an array in memory
+        file=np.broadcast_to(np.int32(0), (meta["records"],)),
+        hosts=meta["hosts"],
+        content_types=meta["content_types"],
+        warc_types=meta["warc_types"],
+        files=[warc_path],
+    )
+
+
+def load_tables(inputs: list[str], *, build: bool = True, workers: int = 1) -> "MetadataTable | TableSet":
+    """Load the tables of many WARC files to query them as one.
+
+    Args:
+        inputs: WARC files, directories or glob patterns (expanded as by
+            :func:`cc_news_analyzer.warc.expand_warc_inputs`).
+        build: Build missing or stale tables first; otherwise such files
+            raise ``FileNotFoundError``.
+        workers: Number of worker processes to build tables with.
+
+    Returns:
+        The memory-mapped table of a single file, or a :class:`TableSet`
+        of the tables of several, in input order.  Either way no column is
+        copied into memory.
+
+    Raises:
+        FileNotFoundError: If a WARC file does not exist, or has no current
+            table and *build* is false.
+        ImportError: If NumPy is not installed.
+        ValueError: If a column file of a current table is missing.
+    """
+    require_numpy()
+    paths = expand_warc_inputs(inputs)
+    tables = [open_table(path) if os.path.isfile(path) else None for path in paths]
+    missing = [path for path, table in zip(paths, tables, strict=True) if table is None]
+    if missing and not build:
+        raise FileNotFoundError(f"No current metadata table for: {missing[0]}")
+    build_tables(missing, workers=workers)
+    tables = [table or open_table(path) for path, table in zip(paths, tables, strict=True)]
+    return tables[0] if len(tables) == 1 else TableSet(tables)
+
+
+def build_tables(warc_paths: list[str], *, workers: int = 1) -> None:
+    """Build the tables of several WARC files with :func:`build_table`.
+
+    Args:
+        warc_paths: Paths to ``.warc`` or ``.warc.gz`` files.
+        workers: Number of worker processes; ``1`` builds serially in-process.
+    """
+    if workers > 1 and len(warc_paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(warc_paths))) as executor:
+            list(executor.map(build_table, warc_paths))
+    else:
+        for path in warc_paths:
+            build_table(path)
+
+
+class TableSet:
+    """The tables of several WARC files, queried as one without copying their columns.
+
+    Masks and row numbers run over the rows of every table in order, as
+    if the tables had been concatenated, and :meth:`value_counts` merges
+    the counts of equal values across the tables' vocabularies.
+
+    Attributes:
+        tables: The memory-mapped table of each file.
+    """
+
+    def __init__(self, tables: list[MetadataTable]):
+        self.tables = tables
+        # row number at which each table starts, and the total
+        self._starts = np.cumsum([0, *(len(table) for table in tables)])
+
+    def __len__(self) -> int:
+        return int(self._starts[-1])
+
+    @property
+    def files(self) -> list[str]:
+        return [path for table in self.tables for path in table.files]
+
+    def select(self, **filters: Any) -> "np.ndarray":
+        """Return a boolean mask of the rows matching every filter (see :meth:`MetadataTable.select`)."""
+        masks = [table.select(**filters) for table in self.tables]
+        return np.concatenate(masks) if masks else np.zeros(0, dtype=bool)
+
+    def value_counts(self, column: str, mask: "np.ndarray | None" = None) -> dict[str, int]:
+        """Count the rows per value of a coded column (see :meth:`MetadataTable.value_counts`)."""
+        counts: dict[str, int] = {}
+        for table, start, end in zip(self.tables, self._starts, self._starts[1:], strict=False):
+            part = None if mask is None else mask[start:end]
+            for value, count in table.value_counts(column, part).items():
+                counts[value] = counts.get(value, 0) + count
+        return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+    def row(self, row: int) -> dict[str, Any]:
+        """Return one row with codes resolved to their values."""
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        part = int(np.searchsorted(self._starts, row, side="right")) - 1
+        return self.tables[part].row(row - int(self._starts[part]))
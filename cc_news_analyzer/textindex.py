@@ -0,0 +1,462 @@
+"""A memory-mappable inverted index of the words of a WARC file's articles.
+
+Refining a keyword list otherwise means decompressing and scanning the
+whole WARC again for every query.  :func:`build_text_index` tokenizes the
+text of every article once (see :func:`tokenize`) and writes a sidecar next
+to the WARC (``<warc>.tix``) mapping each word to the articles containing
+it and its positions in them; :class:`TextIndex` memory-maps the sidecar
+and answers word and phrase lookups by decoding only the posting lists of
+the words asked for.
+
+Sidecar layout (all integers little-endian):
+
+- Header: magic, version, document and term counts, size, ``mtime_ns``
+  and inode of the indexed WARC file, and the byte offsets of the
+  sections below.
+- Documents: one fixed-size row per article in file order with the
+  record's byte offset in the WARC and ``(offset, length)`` references
+  into the string heap for its record ID and target URI.
+- Terms: one fixed-size row per word, sorted by its UTF-8 bytes for binary
+  search, with a heap reference to the word, its document frequency and
+  the ``(offset, length)`` of its postings and positions.
+- Postings: per word, a ``(document delta, occurrences, positions length)``
+  triple of varints for each article containing it, in document order.
+  The positions length lets a phrase lookup skip to the positions of just
+  the articles containing every word.
+- Positions: per word, for each of those articles, the word positions in
+  its token sequence as varint deltas.
+- The string heap (UTF-8).
+
+Varints are LEB128: seven bits per byte, least significant group first,
+the high bit set on every byte but the last.
+"""
+
+import mmap
+import os
+import re
+import struct
+import tempfile
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from typing import NamedTuple
+
+from cc_news_analyzer.articles import Article, article_text, iter_articles
+from cc_news_analyzer.cache import FileStamp, file_stamp
+
+TEXT_INDEX_SUFFIX = ".tix"
+MAGIC = b"CCNXTIX1"
+VERSION = 2
+
+_HEADER = struct.Struct("<8sIIIQqQQQQQQ")
+_DOCUMENT = struct.Struct("<QIIII")
+_TERM = struct.Struct("<IIIQQQQ")
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class IndexedDocument(NamedTuple):
+    """An article of an indexed WARC file.
+
+    Attributes:
+        offset: Byte offset of the record in the WARC file.
+        record_id: The ``WARC-Record-ID`` header value.
+        uri: The ``WARC-Target-URI`` header value.
+    """
+
+    offset: int
+    record_id: str
+    uri: str
+
+
+def tokenize(text: str, *, fold_case: bool = True) -> list[str]:
+    """Split text into words: runs of letters, digits and underscores.
+
+    Args:
+        text: The text to split.
+        fold_case: Case-fold the words, as the index does.
+
+    Returns:
+        The words in text order.
+    """
+    return _TOKEN_RE.findall(text.casefold() if fold_case else text)
+
+
+def word_positions(tokens: Iterable[str]) -> dict[str, list[int]]:
+    """Return the positions of each distinct word in a token sequence."""
+    positions: dict[str, list[int]] = {}
+    for position, token in enumerate(tokens):
+        positions.setdefault(token, []).append(position)
+    return positions
+
+
+def phrase_occurrences(position_lists: Sequence[Sequence[int]]) -> int:
+    """Count the occurrences of a phrase given the positions of each of its words.
+
+    Args:
+        position_lists: For each word of the phrase, in phrase order, its
+            sorted positions in one document.
+
+    Returns:
+        The number of positions where the words occur one after another.
+    """
+    first, *rest = position_lists
+    if not rest:
+        return len(first)
+    starts = set(first)
+    for i, positions in enumerate(rest, 1):
+        starts &= {position - i for position in positions}
+    return len(starts)
+
+
+def text_index_path(warc_path: str) -> str:
+    """Return the path of the text index that sits next to *warc_path*."""
+    return warc_path + TEXT_INDEX_SUFFIX
+
+
+def _append_varint(buffer: bytearray, value: int) -> None:
+    while value >= 0x80:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _decode_varints(data: bytes) -> list[int]:
+    """Decode a buffer of varints."""
+    if data.isascii():
+        # every value fits in one byte, as most deltas do
+        return list(data)
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+class _TermPostings:
+    """The encoded postings and positions of one word, as they are built."""
+
+    __slots__ = ("documents", "last_document", "positions", "postings")
+
+    def __init__(self):
+        self.last_document = 0
+        self.documents = 0
+        self.postings = bytearray()
+        self.positions = bytearray()
+
+    def add(self, document: int, positions: list[int]) -> None:
+        start = len(self.positions)
+        previous = 0
+        for position in positions:
+            _append_varint(self.positions, position - previous)
+            previous = position
+        _append_varint(self.postings, document - self.last_document)
+        _append_varint(self.postings, len(positions))
+        _append_varint(self.postings, len(self.positions) - start)
+        self.last_document = document
+        self.documents += 1
+
+
+class TextIndexWriter:
+    """Accumulates articles and writes them as a text index sidecar.
+
+    Postings are kept varint-encoded as they are added, so memory use is
+    about the size of the finished index.
+    """
+
+    def __init__(self):
+        self._documents: list[IndexedDocument] = []
+        self._terms: dict[str, _TermPostings] = {}
+
+    def add(self, article: Article) -> None:
+        """Tokenize an article's text and add it as the next document."""
+        document = len(self._documents)
+        self._documents.append(IndexedDocument(article.offset, article.record_id, article.uri))
+        for term, positions in word_positions(tokenize(article_text(article))).items():
+            postings = self._terms.get(term)
+            if postings is None:
+                postings = self._terms[term] = _TermPostings()
+            postings.add(document, positions)
+
+    def write(self, index_path: str, warc_stamp: FileStamp) -> None:
+        """Write the sidecar, atomically replacing any existing one.
+
+        Args:
+            index_path: Destination sidecar path.
+            warc_stamp: Stamp of the indexed WARC file as it was before it
+                was read, used to detect a stale sidecar.
+        """
+        heap = bytearray()
+
+        def ref(value: str) -> tuple[int, int]:
+            encoded = value.encode("utf-8")
+            heap.extend(encoded)
+            return len(heap) - len(encoded), len(encoded)
+
+        documents = bytearray()
+        for document in self._documents:
+            documents += _DOCUMENT.pack(document.offset, *ref(document.record_id), *ref(document.uri))
+
+        terms = bytearray()
+        postings = bytearray()
+        positions = bytearray()
+        # sorted by encoded key so lookups can compare raw heap bytes
+        for term in sorted(self._terms, key=lambda term: term.encode("utf-8")):
+            entry = self._terms[term]
+            terms += _TERM.pack(
+                *ref(term),
+                entry.documents,
+                len(postings),
+                len(entry.postings),
+                len(positions),
+                len(entry.positions),
+            )
+            postings += entry.postings
+            positions += entry.positions
+
+        documents_off = _HEADER.size
+        terms_off = documents_off + len(documents)
+        postings_off = terms_off + len(terms)
+        positions_off = postings_off + len(postings)
+        heap_off = positions_off + len(positions)
+        header = _HEADER.pack(
+            MAGIC,
+            VERSION,
+            len(self._documents),
+            len(self._terms),
+            *warc_stamp,
+            documents_off,
+            terms_off,
+            postings_off,
+            positions_off,
+            heap_off,
+        )
+
+        directory = os.path.dirname(os.path.abspath(index_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tix-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for section in (header, documents, terms, postings, positions, heap):
+                    f.write(section)
+            os.replace(tmp_path, index_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def build_text_index(warc_path: str, index_path: str | None = None) -> str:
+    """Tokenize the articles of a WARC file and write its text index sidecar.
+
+    Args:
+        warc_path: Path to a ``.warc`` or ``.warc.gz`` file.
+        index_path: Where to write the sidecar; defaults to
+            :func:`text_index_path`.
+
+    Returns:
+        The path of the written sidecar.
+
+    Raises:
+        FileNotFoundError: If the WARC file does not exist.
+        ArchiveLoadFailed: If the file is not a valid WARC.
+    """
+    if not os.path.isfile(warc_path):
+        raise FileNotFoundError(f"WARC file not found: {warc_path}")
+
+    index_path = index_path or text_index_path(warc_path)
+    warc_stamp = file_stamp(warc_path)
+    writer = TextIndexWriter()
+    with open(warc_path, "rb") as f:
+        for article in iter_articles(f):
+            writer.add(article)
+    writer.write(index_path, warc_stamp)
+    return index_path
+
+
+def build_text_indexes(warc_paths: list[str], *, workers: int = 1) -> None:
+    """Build the text indexes of several WARC files with :func:`build_text_index`.
+
+    Args:
+        warc_paths: Paths to ``.warc`` or ``.warc.gz`` files.
+        workers: Number of worker processes; ``1`` builds serially in-process.
+    """
+    if workers > 1 and len(warc_paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(warc_paths))) as executor:
+            list(executor.map(build_text_index, warc_paths))
+    else:
+        for path in warc_paths:
+            build_text_index(path)
+
+
+class TextIndex:
+    """A memory-mapped, read-only view of a text index sidecar.
+
+    Use as a context manager, or call :meth:`close` when done::
+
+        with TextIndex(text_index_path(warc_path)) as index:
+            documents = index.phrase(["climate", "change"])
+    """
+
+    def __init__(self, index_path: str):
+        with open(index_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            fields = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self._mm.close()
+            raise ValueError(f"Not a text index: {index_path}") from None
+        magic, version, self._documents, self._terms, size, mtime_ns, inode, *offsets = fields
+        self.warc_stamp = FileStamp(size, mtime_ns, inode)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"Not a text index (or unsupported version): {index_path}")
+        if max(offsets) > len(self._mm):
+            self._mm.close()
+            raise ValueError(f"Truncated text index: {index_path}")
+        self._documents_off, self._terms_off, self._postings_off, self._positions_off, self._heap_off = offsets
+
+    def __enter__(self) -> "TextIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the sidecar file."""
+        self._mm.close()
+
+    def __len__(self) -> int:
+        return self._documents
+
+    @property
+    def term_count(self) -> int:
+        """Number of distinct words in the index."""
+        return self._terms
+
+    def document(self, document: int) -> IndexedDocument:
+        """Return an article by its document number (its position among the file's articles)."""
+        if not 0 <= document < self._documents:
+            raise IndexError(document)
+        offset, id_off, id_len, uri_off, uri_len = _DOCUMENT.unpack_from(
+            self._mm, self._documents_off + document * _DOCUMENT.size
+        )
+        return IndexedDocument(offset, self._string(id_off, id_len), self._string(uri_off, uri_len))
+
+    def postings(self, term: str) -> dict[int, int]:
+        """Return the occurrences of a word per document number, for the documents containing it."""
+        row = self._term_row(term)
+        if row is None:
+            return {}
+        documents, counts, _ = self._postings(row)
+        return dict(zip(documents, counts, strict=True))
+
+    def positions(self, term: str, documents: Iterable[int] | None = None) -> dict[int, list[int]]:
+        """Return the positions of a word per document number.
+
+        Args:
+            term: A word, as returned by :func:`tokenize`.
+            documents: Only return these documents (default: all containing
+                the word).
+        """
+        row = self._term_row(term)
+        return {} if row is None else self._positions(self._postings(row), documents)
+
+    def phrase(self, tokens: Sequence[str]) -> dict[int, int]:
+        """Return the occurrences of a word sequence per document number.
+
+        Args:
+            tokens: The words of the phrase, as returned by :func:`tokenize`.
+
+        Returns:
+            The number of occurrences in each document containing the
+            phrase at least once.
+        """
+        if len(tokens) == 1:
+            return self.postings(tokens[0])
+        postings = {}
+        for token in dict.fromkeys(tokens):
+            row = self._term_row(token)
+            if row is None:
+                return {}
+            postings[token] = self._postings(row)
+        candidates = set.intersection(*(set(documents) for documents, _, _ in postings.values()))
+        positions = {token: self._positions(decoded, candidates) for token, decoded in postings.items()}
+        result = {}
+        for document in sorted(candidates):
+            count = phrase_occurrences([positions[token][document] for token in tokens])
+            if count:
+                result[document] = count
+        return result
+
+    def _postings(self, row: tuple[int, ...]) -> tuple[list[int], list[int], list[int]]:
+        """Decode a word's postings into its document numbers, occurrence counts and positions offsets.
+
+        The offsets have one more entry than the documents: the positions of
+        the ``i``-th document are the bytes from ``offsets[i]`` to
+        ``offsets[i + 1]``.
+        """
+        _, postings_off, postings_len, positions_off, _ = row
+        begin = self._postings_off + postings_off
+        values = _decode_varints(self._mm[begin : begin + postings_len])
+        documents = list(accumulate(values[0::3]))
+        offsets = list(accumulate(values[2::3], initial=self._positions_off + positions_off))
+        return documents, values[1::3], offsets
+
+    def _positions(
+        self, postings: tuple[list[int], list[int], list[int]], documents: Iterable[int] | None
+    ) -> dict[int, list[int]]:
+        """Decode the positions of a word in some (default: all) of the documents of its postings."""
+        numbers, _, offsets = postings
+        wanted = None if documents is None else set(documents)
+        result = {}
+        for i, document in enumerate(numbers):
+            if wanted is None or document in wanted:
+                deltas = _decode_varints(self._mm[offsets[i] : offsets[i + 1]])
+                result[document] = list(accumulate(deltas))
+        return result
+
+    def _term_row(self, term: str) -> tuple[int, int, int, int, int] | None:
+        """Return a word's document frequency and section references, or ``None`` if it is absent."""
+        key = term.encode("utf-8")
+
+        def key_at(rank: int) -> bytes:
+            term_off, term_len = struct.unpack_from("<II", self._mm, self._terms_off + rank * _TERM.size)
+            return self._mm[self._heap_off + term_off : self._heap_off + term_off + term_len]
+
+        # binary search: terms are sorted by encoded key
+        rank = bisect_left(range(self._terms), key, key=key_at)
+        if rank == self._terms or key_at(rank) != key:
+            return None
+        return _TERM.unpack_from(self._mm, self._terms_off + rank * _TERM.size)[2:]
+
+    def _string(self, offset: int, length: int) -> str:
+        begin = self._heap_off + offset
+        return self._mm[begin : begin + length].decode("utf-8")
+
+
+def open_text_index(warc_path: str) -> TextIndex | None:
+    """Open the text index of a WARC file if it exists and is current.
+
+    Args:
+        warc_path: Path to the indexed WARC file.
+
+    Returns:
+        An open :class:`TextIndex`, or ``None`` if there is no sidecar, it is
+        truncated or not a text index, or the file changed since it was built
+        (its size, ``mtime_ns`` or inode differ).
+    """
+    index_path = text_index_path(warc_path)
+    if not os.path.isfile(index_path):
+        return None
+    try:
+        index = TextIndex(index_path)
+    except ValueError:
+        return None
+    if index.warc_stamp != file_stamp(warc_path):
+        index.close()
+        return None
+    return index
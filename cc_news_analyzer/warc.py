@@ -1,9 +1,32 @@
 """Functions for analyzing WARC files."""
 
+import glob
 import os
-from typing import Any
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from functools import partial
+from typing import Any, BinaryIO, NamedTuple
 
 from warcio.archiveiterator import ArchiveIterator
+from warcio.exceptions import ArchiveLoadFailed
+from warcio.recordloader import ArcWarcRecord
+
+from cc_news_analyzer.cache import file_identity, file_stamp, load_result, store_result
+from cc_news_analyzer.cdx import IndexEntry, index_entry, open_record_index, sidecar_path, write_record_index
+from cc_news_analyzer.headers import iter_warc_headers, parse_content_length
+from cc_news_analyzer.index import is_remote_warc_path, open_remote_warc
+from cc_news_analyzer.mapped import MappedWarc, open_mapped_warc
+from cc_news_analyzer.members import RangeReader, split_member_ranges
+from cc_news_analyzer.profiling import add_records, phase, timed_iter, timed_stream
+
+WARC_EXTENSIONS = (".warc", ".warc.gz")
+# bump whenever a change to the scanners changes the WarcStats they produce,
+# so results cached by an older version are not reused
+SCANNER_VERSION = 2
+DEFAULT_PREFIX_LIMIT = 16 * 1024
+PREFIX_CHUNK_SIZE = 4096
 
 
 def list_warc_files(directory: str) -> list[dict[str, Any]]:
@@ -30,7 +53,7 @@ def list_warc_files(directory: str) -> list[dict[str, Any]]:
 
     results: list[dict[str, Any]] = []
     for filename in sorted(os.listdir(directory)):
-        if filename.endswith((".warc", ".warc.gz")):
+        if filename.endswith(WARC_EXTENSIONS):
             full_path = os.path.join(directory, filename)
             size_bytes = os.path.getsize(full_path)
             results.append(
@@ -45,31 +68,486 @@ def list_warc_files(directory: str) -> list[dict[str, Any]]:
     return results
 
 
-def count_records(warc_path: str) -> int:
-    """Count WARC records that have a WARC-Record-ID header.
+def expand_warc_inputs(inputs: list[str]) -> list[str]:
+    """Expand files, directories and glob patterns into a list of WARC file paths.
+
+    Directories are expanded (non-recursively) via :func:`list_warc_files`;
+    glob patterns are expanded and filtered to ``.warc``/``.warc.gz`` files.
+    Plain file paths are kept as given.  Duplicates are dropped, keeping the
+    first occurrence.
 
     Args:
-        warc_path: Path to a ``.warc`` or ``.warc.gz`` file.
+        inputs: File paths, directory paths or glob patterns.
 
     Returns:
-        The number of records containing a ``WARC-Record-ID`` header.
+        The WARC file paths, in input order (sorted within each expansion).
+
+    Raises:
+        FileNotFoundError: If a directory does not exist.
+    """
+    paths: list[str] = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(entry["path"] for entry in list_warc_files(item))
+        elif glob.has_magic(item):
+            paths.extend(match for match in sorted(glob.glob(item)) if match.endswith(WARC_EXTENSIONS))
+        else:
+            paths.append(item)
+    return list(dict.fromkeys(paths))
+
+
+def is_article(warc_type: str | None, content_type: str) -> bool:
+    """Return whether a record is an article (an HTML ``response`` record).
+
+    Args:
+        warc_type: The record's ``WARC-Type`` header value.
+        content_type: The HTTP ``Content-Type`` header value (``""`` if absent).
+
+    Returns:
+        ``True`` for ``response`` records whose content type starts with
+        ``text/html``.
+    """
+    return warc_type == "response" and content_type.startswith("text/html")
+
+
+@dataclass
+class WarcStats:
+    """Statistics gathered from a single pass over a WARC file.
+
+    Attributes:
+        records: Number of records that have a ``WARC-Record-ID`` header.
+        records_by_type: Record counts keyed by ``WARC-Type``.
+        articles: Number of article (HTML response) records.
+        content_types: Histogram of HTTP media types (parameters stripped,
+            lowercased) across ``response`` records.
+        payload_bytes: Sum of the ``Content-Length`` of every record block.
+        min_date: Earliest ``WARC-Date`` seen, or ``None``.
+        max_date: Latest ``WARC-Date`` seen, or ``None``.
+        compressed_bytes: Bytes read from the file or stream by this scan
+            (compressed, for ``.warc.gz``).
+        uncompressed_bytes: Bytes of WARC data those decompressed to.
+        wall_seconds: Elapsed time of the scan.
+        cpu_seconds: CPU time of the scan, including worker processes.
+        from_cache: Whether the statistics came from the scan result cache,
+            in which case nothing was read.
+
+    The last five describe the run rather than the file, so they are left
+    out of comparisons and of cached results.
+    """
+
+    records: int = 0
+    records_by_type: dict[str, int] = field(default_factory=dict)
+    articles: int = 0
+    content_types: dict[str, int] = field(default_factory=dict)
+    payload_bytes: int = 0
+    min_date: str | None = None
+    max_date: str | None = None
+    compressed_bytes: int = field(default=0, compare=False)
+    uncompressed_bytes: int = field(default=0, compare=False)
+    wall_seconds: float = field(default=0.0, compare=False)
+    cpu_seconds: float = field(default=0.0, compare=False)
+    from_cache: bool = field(default=False, compare=False)
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def compressed_bytes_per_second(self) -> float:
+        return self.compressed_bytes / self.wall_seconds if self.wall_seconds else 0.0
+
+    def file_stats(self) -> dict[str, Any]:
+        """Return the fields that describe the file, for the scan result cache."""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.compare}
+
+    def add_record(
+        self,
+        warc_type: str | None,
+        record_id: str | None,
+        content_type: str,
+        content_length: int,
+        date: str | None,
+    ) -> None:
+        """Fold one record's headers into the statistics."""
+        if record_id:
+            self.records += 1
+        if warc_type:
+            self.records_by_type[warc_type] = self.records_by_type.get(warc_type, 0) + 1
+        if warc_type == "response" and content_type:
+            media_type = content_type.split(";", 1)[0].strip().lower()
+            self.content_types[media_type] = self.content_types.get(media_type, 0) + 1
+        if is_article(warc_type, content_type):
+            self.articles += 1
+        self.payload_bytes += content_length
+        self._add_date(date)
+
+    def merge(self, other: "WarcStats") -> None:
+        """Add another set of statistics into this one.
+
+        Byte counts and CPU time are added up too; wall time is not, since
+        merged scans may have run in parallel.
+        """
+        self.records += other.records
+        self.articles += other.articles
+        self.payload_bytes += other.payload_bytes
+        for warc_type, count in other.records_by_type.items():
+            self.records_by_type[warc_type] = self.records_by_type.get(warc_type, 0) + count
+        for media_type, count in other.content_types.items():
+            self.content_types[media_type] = self.content_types.get(media_type, 0) + count
+        self._add_date(other.min_date)
+        self._add_date(other.max_date)
+        self.compressed_bytes += other.compressed_bytes
+        self.uncompressed_bytes += other.uncompressed_bytes
+        self.cpu_seconds += other.cpu_seconds
+
+    def _add_date(self, date: str | None) -> None:
+        # WARC-Date values are ISO 8601 UTC timestamps, so string order is time order
+        if not date:
+            return
+        if self.min_date is None or date < self.min_date:
+            self.min_date = date
+        if self.max_date is None or date > self.max_date:
+            self.max_date = date
+
+
+def scan_warc(
+    warc_path: str,
+    *,
+    headers_only: bool = False,
+    write_index: bool = False,
+    workers: int = 1,
+    cache_dir: str | None = None,
+) -> WarcStats:
+    """Gather record, article, content-type, size and date statistics in one pass.
+
+    Args:
+        warc_path: Path to a ``.warc`` or ``.warc.gz`` file, or a CC-NEWS
+            relative path or URL that is not a local file.  Remote files are
+            scanned straight from the HTTP response without touching disk,
+            so *write_index* and *workers* do not apply to them.
+        headers_only: Use the header-only scanner from
+            :mod:`cc_news_analyzer.headers`, which skips record bodies
+            instead of parsing them with ``ArchiveIterator``.  A local
+            uncompressed file is memory-mapped instead and its record
+            headers parsed in place (see :mod:`cc_news_analyzer.mapped`).
+        write_index: Build the record index sidecar (see
+            :mod:`cc_news_analyzer.cdx`) as a by-product of a full scan if it
+            is missing or stale and the directory is writable.  Ignored when
+            *headers_only* is set.
+        workers: Number of worker processes.  Above one, the file is split
+            into byte ranges at record boundaries (see
+            :func:`cc_news_analyzer.members.split_member_ranges`) that are
+            scanned in parallel and merged.
+        cache_dir: Directory of the scan result cache (see
+            :mod:`cc_news_analyzer.cache`).  A cached result for the
+            unchanged file is returned without scanning, and a new result is
+            stored.  ``None`` disables the cache.
+
+    Returns:
+        A :class:`WarcStats` describing every record in the file, and how
+        many bytes and how much time the scan took.
 
     Raises:
         FileNotFoundError: If the WARC file does not exist.
+        OSError: If a remote WARC file cannot be fetched.
     """
+    wall_started, cpu_started = time.perf_counter(), time.process_time()
+    stats = _scan_path(
+        warc_path, headers_only=headers_only, write_index=write_index, workers=workers, cache_dir=cache_dir
+    )
+    stats.wall_seconds = time.perf_counter() - wall_started
+    stats.cpu_seconds += time.process_time() - cpu_started
+    return stats
+
+
+def _scan_path(
+    warc_path: str,
+    *,
+    headers_only: bool,
+    write_index: bool,
+    workers: int,
+    cache_dir: str | None,
+) -> WarcStats:
+    """Scan a local or remote file for :func:`scan_warc`, going through the cache."""
     if not os.path.isfile(warc_path):
+        if is_remote_warc_path(warc_path):
+            with open_remote_warc(warc_path) as stream:
+                return _scan_stream(stream, headers_only=headers_only)
         raise FileNotFoundError(f"WARC file not found: {warc_path}")
 
-    count = 0
+    if cache_dir is None:
+        return _scan_local(warc_path, headers_only=headers_only, write_index=write_index, workers=workers)
+
+    # header-only and full scans produce the same statistics, so they share entries
+    identity = file_identity(warc_path, SCANNER_VERSION)
+    cached = load_result(identity, cache_dir)
+    if cached is not None:
+        return WarcStats(**cached, from_cache=True)
+    stats = _scan_local(warc_path, headers_only=headers_only, write_index=write_index, workers=workers)
+    store_result(identity, stats.file_stats(), cache_dir)
+    return stats
+
+
+def _scan_local(warc_path: str, *, headers_only: bool, write_index: bool, workers: int) -> WarcStats:
+    """Scan a local file, optionally in parallel ranges and writing its sidecar index."""
+    collect_index = write_index and not headers_only and _needs_record_index(warc_path)
+    # stamp the file before reading it, so a change during the scan makes the sidecar stale
+    warc_stamp = file_stamp(warc_path) if collect_index else None
+    ranges = split_member_ranges(warc_path, workers) if workers > 1 else []
+    if len(ranges) > 1:
+        stats, entries = _scan_ranges(warc_path, ranges, headers_only=headers_only, collect_index=collect_index)
+    else:
+        entries = [] if collect_index else None
+        stats = _scan_whole_file(warc_path, headers_only=headers_only, index_entries=entries)
+
+    if entries is not None:
+        write_record_index(entries, sidecar_path(warc_path), warc_stamp)
+    return stats
+
+
+def _scan_whole_file(warc_path: str, *, headers_only: bool, index_entries: list[IndexEntry] | None) -> WarcStats:
+    """Scan a local file in one pass, header-only scans of an uncompressed file through a memory map."""
+    warc = open_mapped_warc(warc_path) if headers_only else None
+    if warc is None:
+        with open(warc_path, "rb") as f:
+            return _scan_stream(f, headers_only=headers_only, index_entries=index_entries)
+    with warc:
+        return _scan_mapped(warc)
+
+
+def _scan_mapped(warc: MappedWarc) -> WarcStats:
+    """Scan a memory-mapped file, parsing record headers in place and skipping blocks without reading them."""
+    stats = WarcStats()
+    with phase("filter"):
+        for record in timed_iter(warc, "parse"):
+            stats.add_record(record.warc_type, record.record_id, record.content_type, len(record.block), record.date)
+    stats.compressed_bytes = stats.uncompressed_bytes = warc.size
+    add_records(stats.records)
+    return stats
+
+
+def _needs_record_index(warc_path: str) -> bool:
+    """Return whether a missing or stale sidecar index can be written for a file."""
+    index = open_record_index(warc_path)
+    if index is not None:
+        index.close()
+        return False
+    return os.access(os.path.dirname(os.path.abspath(warc_path)), os.W_OK)
+
+
+def _scan_ranges(
+    warc_path: str,
+    ranges: list[tuple[int, int]],
+    *,
+    headers_only: bool,
+    collect_index: bool,
+) -> tuple[WarcStats, list[IndexEntry] | None]:
+    """Scan byte ranges of one file in a process pool and merge the results in order."""
+    scan = partial(_scan_range, warc_path, headers_only=headers_only, collect_index=collect_index)
+    stats = WarcStats()
+    entries: list[IndexEntry] | None = [] if collect_index else None
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        for range_stats, range_entries in executor.map(scan, ranges):
+            stats.merge(range_stats)
+            if entries is not None:
+                entries.extend(range_entries)
+    # worker processes do not report to this process's profiler
+    add_records(stats.records)
+    return stats, entries
+
+
+def _scan_range(
+    warc_path: str,
+    byte_range: tuple[int, int],
+    *,
+    headers_only: bool,
+    collect_index: bool,
+) -> tuple[WarcStats, list[IndexEntry] | None]:
+    """Scan the records in one byte range of a file (runs in a worker process)."""
+    cpu_started = time.process_time()
+    entries = [] if collect_index else None
     with open(warc_path, "rb") as f:
-        for record in ArchiveIterator(f):
-            if record.rec_headers.get_header("WARC-Record-ID"):
-                count += 1
+        stats = _scan_stream(RangeReader(f, *byte_range), headers_only=headers_only, index_entries=entries)
+    stats.cpu_seconds = time.process_time() - cpu_started
+    return stats, entries
+
+
+def _scan_stream(
+    stream: BinaryIO,
+    *,
+    headers_only: bool = False,
+    index_entries: list[IndexEntry] | None = None,
+) -> WarcStats:
+    """Scan a WARC stream, appending index entries to *index_entries* if given."""
+    counter = _CountingReader(stream)
+    stream = timed_stream(counter)
+    if headers_only:
+        stats = _scan_headers(stream)
+    elif index_entries is not None:
+        stats = _scan_and_index(stream, index_entries)
+    else:
+        stats = _scan_records(stream)
+    stats.compressed_bytes = counter.bytes_read
+    add_records(stats.records)
+    return stats
+
+
+class _CountingReader:
+    """Proxies a binary stream, counting the bytes read through it."""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self.bytes_read = 0
+
+    def read(self, *args) -> bytes:
+        data = self._stream.read(*args)
+        self.bytes_read += len(data)
+        return data
+
+    def read1(self, *args) -> bytes:
+        data = self._stream.read1(*args)
+        self.bytes_read += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        count = self._stream.readinto(buffer)
+        self.bytes_read += count or 0
+        return count
+
+    def readline(self, *args) -> bytes:
+        data = self._stream.readline(*args)
+        self.bytes_read += len(data)
+        return data
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
 
-    return count
+def _scan_and_index(stream: BinaryIO, index_entries: list[IndexEntry]) -> WarcStats:
+    """Scan a stream with ``ArchiveIterator``, collecting record index entries."""
+    stats = WarcStats()
+    iterator = ArchiveIterator(stream)
+    # the iterator drops its reader once exhausted, so keep it for the byte count
+    reader = iterator.reader
+    with phase("filter"):
+        for record in timed_iter(iterator, "parse"):
+            entry = index_entry(iterator, record)
+            stats.add_record(entry.warc_type, entry.record_id, entry.content_type, entry.content_length, entry.date)
+            index_entries.append(entry)
+    stats.uncompressed_bytes = reader.num_read
+    return stats
 
 
-def count_articles(warc_path: str) -> int:
+def _scan_records(stream: BinaryIO) -> WarcStats:
+    """Scan a stream with ``ArchiveIterator``, parsing every record."""
+    stats = WarcStats()
+    iterator = ArchiveIterator(stream)
+    reader = iterator.reader
+    with phase("filter"):
+        for record in timed_iter(iterator, "parse"):
+            content_type = ""
+            if record.http_headers is not None:
+                content_type = record.http_headers.get_header("Content-Type", "")
+            stats.add_record(
+                warc_type=record.rec_headers.get_header("WARC-Type"),
+                record_id=record.rec_headers.get_header("WARC-Record-ID"),
+                content_type=content_type,
+                content_length=parse_content_length(record.rec_headers.get_header("Content-Length")),
+                date=record.rec_headers.get_header("WARC-Date"),
+            )
+    stats.uncompressed_bytes = reader.num_read
+    return stats
+
+
+def _scan_headers(stream: BinaryIO) -> WarcStats:
+    """Scan a stream with the header-only scanner, skipping record bodies."""
+    stats = WarcStats()
+    headers = iter_warc_headers(stream, http_content_type=True)
+    with phase("filter"):
+        for header in timed_iter(headers, "parse"):
+            stats.add_record(
+                warc_type=header.warc_type,
+                record_id=header.record_id,
+                content_type=header.http_content_type or "",
+                content_length=header.content_length,
+                date=header.date,
+            )
+    stats.uncompressed_bytes = headers.uncompressed_bytes
+    return stats
+
+
+def scan_warc_files(
+    warc_paths: list[str],
+    *,
+    workers: int = 1,
+    headers_only: bool = False,
+    write_index: bool = False,
+    cache_dir: str | None = None,
+) -> list[tuple[str, WarcStats]]:
+    """Scan many WARC files, fanning them out across a process pool.
+
+    Decompression is CPU-bound and holds the GIL, so files are scanned in
+    separate processes rather than threads.  A single file is instead split
+    at record boundaries and its ranges are scanned in parallel (see
+    :func:`scan_warc`).
+
+    Args:
+        warc_paths: Paths to ``.warc`` or ``.warc.gz`` files, or CC-NEWS
+            relative paths or URLs to stream (see :func:`scan_warc`).
+        workers: Number of worker processes; ``1`` scans serially in-process.
+        headers_only: Passed through to :func:`scan_warc`.
+        write_index: Passed through to :func:`scan_warc`.
+        cache_dir: Passed through to :func:`scan_warc`.
+
+    Returns:
+        ``(path, stats)`` pairs in the same order as *warc_paths*.
+
+    Raises:
+        FileNotFoundError: If a WARC file does not exist.
+        ArchiveLoadFailed: If a file is not a valid WARC; the message is
+            prefixed with the offending path.
+    """
+    scan = partial(_scan_file, headers_only=headers_only, write_index=write_index, cache_dir=cache_dir)
+    if len(warc_paths) == 1:
+        return [(warc_paths[0], scan(warc_paths[0], workers=workers))]
+    workers = max(1, min(workers, len(warc_paths)))
+    if workers == 1:
+        return [(path, scan(path)) for path in warc_paths]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(zip(warc_paths, executor.map(scan, warc_paths), strict=True))
+    add_records(sum(stats.records for _, stats in results))
+    return results
+
+
+def _scan_file(warc_path: str, **options: Any) -> WarcStats:
+    """Scan one file for :func:`scan_warc_files`, naming it in load errors."""
+    try:
+        return scan_warc(warc_path, **options)
+    except ArchiveLoadFailed as exc:
+        raise ArchiveLoadFailed(f"{warc_path}: {exc}") from exc
+
+
+def count_records(warc_path: str, *, headers_only: bool = False, write_index: bool = False) -> int:
+    """Count WARC records that have a WARC-Record-ID header.
+
+    Args:
+        warc_path: Path to a ``.warc`` or ``.warc.gz`` file, or a CC-NEWS
+            relative path or URL to stream (see :func:`scan_warc`).
+        headers_only: Skip record bodies instead of parsing them (see
+            :func:`scan_warc`).
+        write_index: Build the record index sidecar as a by-product (see
+            :func:`scan_warc`).
+
+    Returns:
+        The number of records containing a ``WARC-Record-ID`` header.
+
+    Raises:
+        FileNotFoundError: If the WARC file does not exist.
+    """
+    return scan_warc(warc_path, headers_only=headers_only, write_index=write_index).records
+
+
+def count_articles(warc_path: str, *, headers_only: bool = False, write_index: bool = False) -> int:
     """Count article records in a WARC file.
 
     Articles are defined as WARC ``response`` records whose HTTP
@@ -78,7 +556,12 @@ def count_articles(warc_path: str) -> int:
     and non-HTML responses (images, JSON, etc.).
 
     Args:
-        warc_path: Path to a ``.warc`` or ``.warc.gz`` file.
+        warc_path: Path to a ``.warc`` or ``.warc.gz`` file, or a CC-NEWS
+            relative path or URL to stream (see :func:`scan_warc`).
+        headers_only: Skip record bodies, reading only the WARC headers and
+            the HTTP header block of responses (see :func:`scan_warc`).
+        write_index: Build the record index sidecar as a by-product (see
+            :func:`scan_warc`).
 
     Returns:
         The number of article (HTML response) records in the file.
@@ -86,18 +569,136 @@ def count_articles(warc_path: str) -> int:
     Raises:
         FileNotFoundError: If the WARC file does not exist.
     """
-    if not os.path.isfile(warc_path):
-        raise FileNotFoundError(f"WARC file not found: {warc_path}")
+    return scan_warc(warc_path, headers_only=headers_only, write_index=write_index).articles
+
+
+class PayloadPrefix(NamedTuple):
+    """The start of an article's payload.
+
+    Attributes:
+        record_id: The ``WARC-Record-ID`` header.
+        uri: The ``WARC-Target-URI`` header.
+        date: The ``WARC-Date`` header.
+        content_type: The HTTP ``Content-Type`` header.
+        offset: Byte offset of the record in the WARC file (compressed, for
+            a ``.warc.gz``).
+        prefix: The first bytes of the payload, with any transfer and
+            content encoding removed (see :func:`read_prefix`).
+    """
+
+    record_id: str
+    uri: str
+    date: str
+    content_type: str
+    offset: int
+    prefix: bytes
+
+
+def read_prefix(stream: BinaryIO, limit: int, sentinel: bytes | None = None) -> bytes:
+    """Read at most *limit* bytes from a stream, stopping early after *sentinel*.
+
+    The stream is read in small chunks, so little more than the returned
+    bytes is consumed from it.
+
+    Args:
+        stream: A readable binary stream.
+        limit: The most bytes to return.
+        sentinel: Stop after the first occurrence of these bytes, matched
+            case-insensitively (such as ``b"</head>"``).
+
+    Returns:
+        The bytes read, up to and including the sentinel if it was found.
+    """
+    data = bytearray()
+    sentinel = sentinel.lower() if sentinel else None
+    while len(data) < limit:
+        chunk = stream.read(min(PREFIX_CHUNK_SIZE, limit - len(data)))
+        if not chunk:
+            break
+        # search only the new bytes (and a sentinel split across chunks)
+        start = max(0, len(data) - len(sentinel) + 1) if sentinel else 0
+        data += chunk
+        if sentinel is not None:
+            found = data.lower().find(sentinel, start)
+            if found != -1:
+                del data[found + len(sentinel) :]
+                break
+    return bytes(data)
+
+
+def iter_payload_prefixes(
+    warc_path: str,
+    *,
+    limit: int = DEFAULT_PREFIX_LIMIT,
+    sentinel: bytes | None = None,
+    use_index: bool = True,
+) -> Iterator[PayloadPrefix]:
+    """Yield the first bytes of every article's payload, skipping the rest of each record.
+
+    Each payload is read with :func:`read_prefix` from the record's content
+    stream, which is ``record.raw_stream`` itself unless the body has a
+    transfer or content encoding, in which case just enough is decoded.
+    The rest of the record is never decoded, parsed or buffered: with a
+    current record index sidecar (see :mod:`cc_news_analyzer.cdx`) each
+    article is read with a seek to its gzip member and the rest of the file
+    is not even decompressed; otherwise the file is read in one pass and
+    the remainder of each record is only drained.
 
-    count = 0
+    Args:
+        warc_path: Path to a ``.warc`` or ``.warc.gz`` file, or a CC-NEWS
+            relative path or URL that is not a local file, which is streamed.
+        limit: The most payload bytes to read per article.
+        sentinel: Stop reading a payload after these bytes (such as
+            ``b"</head>"``), matched case-insensitively.
+        use_index: Use the record index sidecar if it is current.
+
+    Yields:
+        A :class:`PayloadPrefix` per article, in file order.
+
+    Raises:
+        FileNotFoundError: If the WARC file does not exist.
+        ArchiveLoadFailed: If the file is not a valid WARC.
+        OSError: If a remote WARC file cannot be fetched.
+    """
+    if not os.path.isfile(warc_path):
+        if not is_remote_warc_path(warc_path):
+            raise FileNotFoundError(f"WARC file not found: {warc_path}")
+        with open_remote_warc(warc_path) as stream:
+            yield from _iter_stream_prefixes(stream, limit, sentinel)
+        return
+    index = open_record_index(warc_path) if use_index else None
     with open(warc_path, "rb") as f:
-        for record in ArchiveIterator(f):
-            if record.rec_headers.get_header("WARC-Type") != "response":
-                continue
-            if record.http_headers is None:
-                continue
-            content_type = record.http_headers.get_header("Content-Type", "")
-            if content_type.startswith("text/html"):
-                count += 1
-
-    return count
+        if index is None:
+            yield from _iter_stream_prefixes(f, limit, sentinel)
+            return
+        with index:
+            for entry in index:
+                if is_article(entry.warc_type, entry.content_type):
+                    iterator = ArchiveIterator(RangeReader(f, entry.offset, entry.offset + entry.length))
+                    record = next(iterator)
+                    yield _payload_prefix(record, entry.offset, limit, sentinel)
+
+
+def _iter_stream_prefixes(stream: BinaryIO, limit: int, sentinel: bytes | None) -> Iterator[PayloadPrefix]:
+    """Yield the payload prefixes of the articles in a WARC stream, in one pass."""
+    iterator = ArchiveIterator(stream)
+    for record in iterator:
+        if record.http_headers is not None and is_article(
+            record.rec_headers.get_header("WARC-Type"), record.http_headers.get_header("Content-Type", "")
+        ):
+            prefix = _payload_prefix(record, 0, limit, sentinel)
+            # the offset is known once the iterator has drained the record
+            yield prefix._replace(offset=iterator.get_record_offset())
+
+
+def _payload_prefix(record: ArcWarcRecord, offset: int, limit: int, sentinel: bytes | None) -> PayloadPrefix:
+    """Read the start of an article record's payload."""
+    headers = record.rec_headers
+    return PayloadPrefix(
+        record_id=headers.get_header("WARC-Record-ID") or "",
+        uri=headers.get_header("WARC-Target-URI") or "",
+        date=headers.get_header("WARC-Date") or "",
+        content_type=record.http_headers.get_header("Content-Type", ""),
+        offset=offset,
+        prefix=read_prefix(record.content_stream(), limit, sentinel),
+    )
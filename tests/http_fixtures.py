@@ -0,0 +1,105 @@
+"""A local HTTP server standing in for data.commoncrawl.org in tests."""
+
+import hashlib
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FileServer(ThreadingHTTPServer):
+    """Serves in-memory files over HTTP with optional ``Range`` support.
+
+    Attributes:
+        files: Response bodies keyed by request path (e.g. ``"/a.warc.gz"``).
+        ranges: Whether to honour ``Range`` request headers.
+        truncate: How many upcoming ``GET`` responses to cut off halfway
+            through the body (simulating a dropped connection).
+        requests: ``(method, path, range_header)`` of every request served.
+        request_headers: The headers of every request served.
+    """
+
+    LAST_MODIFIED = "Sun, 01 Feb 2026 00:00:00 GMT"
+
+    def __init__(self, files: dict[str, bytes], *, ranges: bool = True, truncate: int = 0):
+        super().__init__(("127.0.0.1", 0), _FileHandler)
+        self.files = files
+        self.ranges = ranges
+        self.truncate = truncate
+        self.requests: list[tuple[str, str, str | None]] = []
+        self.request_headers: list[dict[str, str]] = []
+
+    def url(self, path: str) -> str:
+        """Return the full URL of *path* on this server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+
+class _FileHandler(BaseHTTPRequestHandler):
+    server: FileServer
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def _respond(self, send_body: bool) -> None:
+        range_header = self.headers.get("Range")
+        self.server.requests.append((self.command, self.path, range_header))
+        self.server.request_headers.append(dict(self.headers))
+        data = self.server.files.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        start = 0
+        if range_header and self.server.ranges:
+            start = int(range_header.removeprefix("bytes=").rstrip("-"))
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(data)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(data) - start))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.server.LAST_MODIFIED)
+        self.send_header("Accept-Ranges", "bytes" if self.server.ranges else "none")
+        self.end_headers()
+
+        if send_body:
+            body = data[start:]
+            if self.server.truncate:
+                self.server.truncate -= 1
+                body = body[: len(body) // 2]
+                self.close_connection = True
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve_files(files: dict[str, bytes], **options) -> Iterator[FileServer]:
+    """Run a :class:`FileServer` in a background thread for the duration of a block."""
+    server = FileServer(files, **options)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,67 @@
+"""Tests for cc_news_analyzer.articles module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from cc_news_analyzer.articles import html_to_text, iter_articles
+from cc_news_analyzer.cdx import build_record_index, open_record_index
+
+from tests.warc_fixtures import request, response, write_warc
+
+
+class TestHtmlToText(unittest.TestCase):
+    """Tests for html_to_text()."""
+
+    def test_strips_markup_and_decodes_entities(self):
+        """Should keep the text, drop tags, comments, scripts and styles, and decode entities."""
+        markup = (
+            "<html><head><style>p { color: red }</style><script type='x'>var a = '<p>';</script></head>"
+            "<body><!-- note --><h1>Caf&eacute;</h1><p>Fish &amp;<b>chips</b></p></body></html>"
+        )
+
+        self.assertEqual(html_to_text(markup).split(), ["Café", "Fish", "&", "chips"])
+
+    def test_keeps_words_in_adjacent_elements_apart(self):
+        """Should separate the text of adjacent elements."""
+        self.assertEqual(html_to_text("<li>one</li><li>two</li>").split(), ["one", "two"])
+
+
+class TestIterArticles(unittest.TestCase):
+    """Tests for iter_articles()."""
+
+    def setUp(self):
+        """Create a temporary directory for WARC files."""
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_yields_articles_with_record_offsets(self):
+        """Should yield HTML responses only, with the offsets the record index has for them."""
+        path = os.path.join(self.tmp_dir, "test.warc.gz")
+        record_ids = write_warc(
+            path,
+            [
+                request("http://example.com/1"),
+                response("http://example.com/1", b"<p>one</p>"),
+                response("http://example.com/x.json", b"{}", "application/json"),
+                response("http://example.com/2", b"<p>two</p>"),
+            ],
+        )
+        build_record_index(path)
+
+        with open(path, "rb") as f:
+            articles = list(iter_articles(f))
+        with open_record_index(path) as index:
+            offsets = [index.find_by_id(record_id).offset for record_id in (record_ids[2], record_ids[4])]
+
+        self.assertEqual([article.uri for article in articles], ["http://example.com/1", "http://example.com/2"])
+        self.assertEqual([article.body for article in articles], [b"<p>one</p>", b"<p>two</p>"])
+        self.assertEqual([article.offset for article in articles], offsets)
+
+
+if __name__ == "__main__":
+    unittest.main()
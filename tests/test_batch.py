@@ -0,0 +1,190 @@
+"""Tests for cc_news_analyzer.batch."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from cc_news_analyzer import batch
+from cc_news_analyzer.batch import checkpoint_path, generate_markdown, load_checkpoint
+
+from tests.warc_fixtures import request, response, write_warc
+
+
+class KilledError(Exception):
+    """Stands for the job being killed."""
+
+
+class TestGenerateMarkdown(unittest.TestCase):
+    """Tests for generate_markdown()."""
+
+    def setUp(self):
+        """Write a WARC file with ten articles between requests and other responses."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.output = os.path.join(self.tmp_dir, "articles.jsonl")
+        self.state_path = checkpoint_path(self.output)
+        self.paths = {}
+        self.ids = {}
+        for extension in (".warc.gz", ".warc"):
+            path = os.path.join(self.tmp_dir, "test" + extension)
+            records = []
+            for n in range(10):
+                uri = f"http://example.com/{n}"
+                records.append(request(uri))
+                records.append(response(uri, f"<h1>Story {n}</h1><p>Body <b>{n}</b></p>".encode()))
+                records.append(response(uri + ".json", b"{}", "application/json"))
+            self.ids[path] = write_warc(path, records)[2::3]
+            self.paths[extension] = path
+        self.warc_path = self.paths[".warc.gz"]
+        self.record_ids = self.ids[self.warc_path]
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _lines(self) -> list[dict]:
+        with open(self.output, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def _interrupt_after(self, count: int, **options) -> None:
+        """Run a conversion that is killed while converting article *count* + 1."""
+        convert = batch.article_to_markdown_json
+        calls = []
+
+        def failing(article, **kwargs):
+            if len(calls) == count:
+                raise KilledError
+            calls.append(article)
+            return convert(article, **kwargs)
+
+        with mock.patch.object(batch, "article_to_markdown_json", failing), self.assertRaises(KilledError):
+            generate_markdown(self.warc_path, self.output, **options)
+
+    def _converting(self, function, *args, **kwargs):
+        """Call *function*, returning its result and the IDs of the articles it converted."""
+        convert = batch.article_to_markdown_json
+        converted = []
+
+        def counting(article, **options):
+            converted.append(article.record_id)
+            return convert(article, **options)
+
+        with mock.patch.object(batch, "article_to_markdown_json", counting):
+            return function(*args, **kwargs), converted
+
+    def test_writes_one_markdown_line_per_article(self):
+        """Should convert every article in order and remove the checkpoint when done."""
+        result = generate_markdown(self.warc_path, self.output, checkpoint_every=3)
+
+        lines = self._lines()
+        self.assertEqual(result.articles, 10)
+        self.assertEqual(result.bytes_written, os.path.getsize(self.output))
+        self.assertIsNone(result.resumed_from)
+        self.assertEqual([line["record_id"] for line in lines], self.record_ids)
+        self.assertEqual(lines[4]["markdown"], "# Story 4\n\nBody **4**")
+        self.assertEqual(lines[4]["uri"], "http://example.com/4")
+        self.assertFalse(os.path.exists(self.state_path))
+
+    def test_text_mode_writes_plain_text(self):
+        """Should write plain text under a text key."""
+        generate_markdown(self.warc_path, self.output, text=True)
+
+        self.assertEqual(self._lines()[2]["text"], "Story 2\n\nBody 2")
+
+    def test_checkpoint_points_at_the_next_article(self):
+        """Should checkpoint the offset and ID of the first article not yet written."""
+        self._interrupt_after(7, checkpoint_every=3)
+
+        checkpoint = load_checkpoint(self.state_path)
+        self.assertEqual(checkpoint.articles, 6)
+        self.assertEqual(checkpoint.record_id, self.record_ids[6])
+        self.assertEqual(checkpoint.warc_size, os.path.getsize(self.warc_path))
+        with open(self.output, "rb") as f:
+            self.assertEqual(f.read(checkpoint.output_bytes).count(b"\n"), 6)
+
+    def test_resume_matches_an_uninterrupted_run(self):
+        """Should seek to the checkpoint and finish with the same output as a single run."""
+        for extension, path in self.paths.items():
+            with self.subTest(extension=extension):
+                self.warc_path = path
+                self.record_ids = self.ids[path]
+                generate_markdown(path, self.output)
+                with open(self.output, "rb") as f:
+                    expected = f.read()
+                self._interrupt_after(8, checkpoint_every=3)
+                result, converted = self._converting(generate_markdown, path, self.output, checkpoint_every=3)
+
+                self.assertEqual(result.resumed_from.articles, 6)
+                self.assertEqual(converted, self.record_ids[6:])
+                self.assertEqual(result.articles, 10)
+                with open(self.output, "rb") as f:
+                    self.assertEqual(f.read(), expected)
+                self.assertFalse(os.path.exists(self.state_path))
+
+    def test_restart_ignores_the_checkpoint(self):
+        """Should start over, removing the old checkpoint, when resume is off."""
+        self._interrupt_after(5, checkpoint_every=2)
+
+        result = generate_markdown(self.warc_path, self.output, resume=False)
+
+        self.assertIsNone(result.resumed_from)
+        self.assertEqual([line["record_id"] for line in self._lines()], self.record_ids)
+        self.assertFalse(os.path.exists(self.state_path))
+
+    def test_rejects_a_checkpoint_at_the_wrong_record(self):
+        """Should refuse to resume when the record at the offset has a different ID."""
+        self._interrupt_after(5, checkpoint_every=2)
+        with open(self.state_path, encoding="utf-8") as f:
+            data = json.load(f)
+        data["record_id"] = self.record_ids[0]
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+        with self.assertRaisesRegex(ValueError, "Expected record"):
+            generate_markdown(self.warc_path, self.output, checkpoint_every=2)
+
+    def test_rejects_a_mismatched_checkpoint(self):
+        """Should refuse to resume with another file, another mode or a truncated output."""
+        self._interrupt_after(5, checkpoint_every=2)
+
+        with self.assertRaisesRegex(ValueError, "different WARC file"):
+            generate_markdown(self.paths[".warc"], self.output)
+        with self.assertRaisesRegex(ValueError, "text=False"):
+            generate_markdown(self.warc_path, self.output, text=True)
+        with open(self.output, "wb"):
+            pass
+        with self.assertRaisesRegex(ValueError, "shorter than its checkpoint"):
+            generate_markdown(self.warc_path, self.output)
+
+    def test_rejects_non_positive_interval(self):
+        """Should reject a checkpoint interval below one."""
+        with self.assertRaises(ValueError):
+            generate_markdown(self.warc_path, self.output, checkpoint_every=0)
+
+
+class TestLoadCheckpoint(unittest.TestCase):
+    """Tests for load_checkpoint()."""
+
+    def setUp(self):
+        """Create a temporary directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "out.jsonl.checkpoint")
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_missing_file_has_no_checkpoint(self):
+        """Should return None when there is no checkpoint."""
+        self.assertIsNone(load_checkpoint(self.path))
+
+    def test_rejects_other_files(self):
+        """Should raise ValueError for files that are not checkpoints of this version."""
+        for content in ("not json", '{"version": 99}', '{"version": 1, "offset": 3}', "[]"):
+            with self.subTest(content=content):
+                with open(self.path, "w", encoding="utf-8") as f:
+                    f.write(content)
+                with self.assertRaises(ValueError):
+                    load_checkpoint(self.path)
@@ -0,0 +1,120 @@
+"""Tests for the benchmark suite in benchmarks/."""
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.run import BenchmarkResult, compare_to_baseline, prepare_workload, run_benchmarks
+from benchmarks.synthetic import generate_warc
+from cc_news_analyzer.warc import scan_warc
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class TestGenerateWarc(unittest.TestCase):
+    """Tests for generate_warc()."""
+
+    def setUp(self):
+        """Create a temporary directory for generated files."""
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_same_seed_gives_same_bytes(self):
+        """Should write identical files for the same seed and different ones for another seed."""
+        paths = [os.path.join(self.tmp_dir, name) for name in ("a", "b", "c")]
+        for path, seed in zip(paths, (1, 1, 2), strict=True):
+            os.mkdir(path)
+            generate_warc(os.path.join(path, "x.warc.gz"), 64 * 1024, seed=seed, max_body_size=16 * 1024)
+        a, b, c = (_read(os.path.join(path, "x.warc.gz")) for path in paths)
+
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_has_cc_news_shape(self):
+        """Should write warcinfo then request/response pairs of mixed content types, one gzip member each."""
+        path = os.path.join(self.tmp_dir, "x.warc.gz")
+        generated = generate_warc(path, 256 * 1024, max_body_size=32 * 1024)
+        stats = scan_warc(path)
+
+        self.assertGreaterEqual(generated.compressed_bytes, 256 * 1024)
+        self.assertEqual(stats.records, generated.records)
+        self.assertEqual(stats.articles, generated.articles)
+        self.assertEqual(stats.records_by_type["warcinfo"], 1)
+        self.assertEqual(stats.records_by_type["request"], stats.records_by_type["response"])
+        self.assertGreater(len(stats.content_types), 2)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read().count(b"\x1f\x8b\x08"), generated.records)
+        with gzip.open(path) as f:
+            self.assertEqual(f.read(5), b"WARC/")
+
+
+class TestRunBenchmarks(unittest.TestCase):
+    """Tests for the benchmark runner."""
+
+    def setUp(self):
+        """Create a temporary data directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_runs_every_case(self):
+        """Should time every case on a tiny workload with consistent record counts."""
+        workload = prepare_workload(self.tmp_dir, 0.05, max_body_size=8 * 1024)
+
+        results = run_benchmarks(workload, repeat=1)
+
+        self.assertIn("download_warc", [result.name for result in results])
+        self.assertIn("scan_warc_remote_stream", [result.name for result in results])
+        for result in results:
+            with self.subTest(case=result.name):
+                self.assertGreater(result.records_per_s, 0)
+                self.assertGreater(result.mb_per_s, 0)
+
+    def test_only_selects_cases_by_prefix(self):
+        """Should run just the cases matching --only prefixes."""
+        workload = prepare_workload(self.tmp_dir, 0.05, max_body_size=8 * 1024)
+
+        results = run_benchmarks(workload, repeat=1, only=("count_records",))
+
+        self.assertEqual([r.name for r in results], ["count_records", "count_records_headers_only"])
+
+    def test_conversion_cases_report_output_ratio(self):
+        """Should measure conversion cases on article HTML and report how much smaller the output is."""
+        workload = prepare_workload(self.tmp_dir, 0.05, max_body_size=8 * 1024)
+
+        results = run_benchmarks(workload, repeat=1, only=("html_to_markdown", "count_records_headers_only"))
+
+        ratios = {result.name: result.output_ratio for result in results}
+        self.assertIsNone(ratios["count_records_headers_only"])
+        self.assertGreater(ratios["html_to_markdown"], 0)
+        self.assertLess(ratios["html_to_markdown"], 1)
+
+    def test_compare_to_baseline_flags_slowdowns_beyond_threshold(self):
+        """Should report only cases more than the threshold slower than the baseline."""
+        mb = 1024 * 1024
+        results = [
+            BenchmarkResult("fast", seconds=1.0, records=10, compressed_bytes=100 * mb),
+            BenchmarkResult("slightly_slower", seconds=1.0, records=10, compressed_bytes=80 * mb),
+            BenchmarkResult("slow", seconds=1.0, records=10, compressed_bytes=50 * mb),
+            BenchmarkResult("new_case", seconds=1.0, records=10, compressed_bytes=mb),
+        ]
+        baseline = {name: {"mb_per_s": 100.0} for name in ("fast", "slightly_slower", "slow")}
+
+        regressions = compare_to_baseline(results, baseline, threshold=0.25)
+
+        self.assertEqual([r.name for r in regressions], ["slow"])
+        self.assertEqual(regressions[0].baseline_mb_per_s, 100.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+"""Tests for cc_news_analyzer.cache."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from cc_news_analyzer.cache import file_identity, load_result, prune_cache, store_result
+from cc_news_analyzer.warc import SCANNER_VERSION, scan_warc
+
+from tests.warc_fixtures import response, write_warc
+
+
+class TestScanResultCache(unittest.TestCase):
+    """Tests for file_identity(), load_result() and store_result()."""
+
+    def setUp(self):
+        """Create a data file and a cache directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        self.path = os.path.join(self.tmp_dir, "data.warc.gz")
+        with open(self.path, "wb") as f:
+            f.write(b"data")
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_hit_for_unchanged_file(self):
+        """Should return the stored result while the file is unchanged."""
+        store_result(file_identity(self.path, 1), {"records": 3}, self.cache_dir)
+
+        self.assertEqual(load_result(file_identity(self.path, 1), self.cache_dir), {"records": 3})
+
+    def test_miss_after_file_changes(self):
+        """Should not return a result once the file's size or mtime changes."""
+        store_result(file_identity(self.path, 1), {"records": 3}, self.cache_dir)
+        with open(self.path, "ab") as f:
+            f.write(b"more")
+
+        self.assertIsNone(load_result(file_identity(self.path, 1), self.cache_dir))
+
+    def test_miss_for_other_version(self):
+        """Should not return a result produced by another scanner version."""
+        store_result(file_identity(self.path, 1), {"records": 3}, self.cache_dir)
+
+        self.assertIsNone(load_result(file_identity(self.path, 2), self.cache_dir))
+
+    def test_miss_on_corrupt_entry(self):
+        """Should treat an unreadable entry as a miss."""
+        identity = file_identity(self.path, 1)
+        store_result(identity, {"records": 3}, self.cache_dir)
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                with open(os.path.join(root, name), "w") as f:
+                    f.write("{not json")
+
+        self.assertIsNone(load_result(identity, self.cache_dir))
+
+    def test_unwritable_cache_dir_is_ignored(self):
+        """Should silently skip storing when the cache directory cannot be created."""
+        blocker = os.path.join(self.tmp_dir, "blocker")
+        with open(blocker, "w") as f:
+            f.write("")
+        identity = file_identity(self.path, 1)
+
+        store_result(identity, {"records": 3}, os.path.join(blocker, "cache"))
+
+        self.assertIsNone(load_result(identity, os.path.join(blocker, "cache")))
+
+
+class TestPruneCache(unittest.TestCase):
+    """Tests for prune_cache()."""
+
+    def setUp(self):
+        """Create two data files with cached results."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        self.paths = []
+        for name in ("a.warc.gz", "b.warc.gz"):
+            path = os.path.join(self.tmp_dir, name)
+            with open(path, "wb") as f:
+                f.write(name.encode())
+            store_result(file_identity(path, 1), {"name": name}, self.cache_dir)
+            self.paths.append(path)
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_keeps_current_entries(self):
+        """Should keep entries whose files are unchanged."""
+        result = prune_cache(self.cache_dir, 1)
+
+        self.assertEqual((result.removed, result.kept), (0, 2))
+
+    def test_removes_entries_of_deleted_or_changed_files(self):
+        """Should remove entries for files that are gone or were rewritten."""
+        os.remove(self.paths[0])
+        with open(self.paths[1], "ab") as f:
+            f.write(b"changed")
+
+        result = prune_cache(self.cache_dir, 1)
+
+        self.assertEqual((result.removed, result.kept), (2, 0))
+
+    def test_removes_entries_of_other_versions(self):
+        """Should remove entries produced by another scanner version."""
+        result = prune_cache(self.cache_dir, 2)
+
+        self.assertEqual((result.removed, result.kept), (2, 0))
+
+    def test_max_age_and_remove_all(self):
+        """Should remove entries older than max_age, or every entry with remove_all."""
+        with patch("cc_news_analyzer.cache.time.time", return_value=1e12):
+            self.assertEqual(prune_cache(self.cache_dir, 1, max_age=60).removed, 2)
+
+        store_result(file_identity(self.paths[0], 1), {}, self.cache_dir)
+        self.assertEqual(prune_cache(self.cache_dir, 1, max_age=60).kept, 1)
+        self.assertEqual(prune_cache(self.cache_dir, 1, remove_all=True).removed, 1)
+
+    def test_missing_cache_dir(self):
+        """Should report nothing to do when the cache directory does not exist."""
+        result = prune_cache(os.path.join(self.tmp_dir, "missing"), 1)
+
+        self.assertEqual((result.removed, result.kept), (0, 0))
+
+
+class TestScanWarcCache(unittest.TestCase):
+    """Tests for scan_warc() with a cache directory."""
+
+    def setUp(self):
+        """Create a small WARC file and a cache directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        self.path = os.path.join(self.tmp_dir, "a.warc.gz")
+        write_warc(self.path, [response("http://example.com/a", b"<html>a</html>")])
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_second_scan_uses_cached_result(self):
+        """Should return equal statistics without rescanning the unchanged file."""
+        first = scan_warc(self.path, cache_dir=self.cache_dir)
+
+        with patch("cc_news_analyzer.warc._scan_local") as mock_scan:
+            second = scan_warc(self.path, headers_only=True, cache_dir=self.cache_dir)
+
+        mock_scan.assert_not_called()
+        self.assertEqual(second, first)
+        self.assertEqual(prune_cache(self.cache_dir, SCANNER_VERSION).kept, 1)
+
+    def test_rescans_changed_file(self):
+        """Should rescan once the file has been rewritten."""
+        scan_warc(self.path, cache_dir=self.cache_dir)
+        write_warc(self.path, [response("http://example.com/a", b"<html>a</html>")] * 2)
+
+        stats = scan_warc(self.path, cache_dir=self.cache_dir)
+
+        self.assertEqual(stats.articles, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
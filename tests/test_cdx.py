@@ -0,0 +1,168 @@
+"""Tests for cc_news_analyzer.cdx module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from cc_news_analyzer.cache import FileStamp
+from cc_news_analyzer.cdx import (
+    RecordIndex,
+    build_record_index,
+    load_record_index,
+    open_record_index,
+    read_record_bytes,
+    sidecar_path,
+    write_record_index,
+)
+from cc_news_analyzer.warc import scan_warc
+
+from tests.warc_fixtures import request, response, rewrite_in_place, write_warc
+
+
+class TestRecordIndex(unittest.TestCase):
+    """Tests for building and querying the record index sidecar."""
+
+    def setUp(self):
+        """Create a temporary directory for WARC files."""
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write(self, name: str = "test.warc.gz") -> tuple[str, list[str]]:
+        """Write a WARC with request/response pairs and return its path and record IDs."""
+        path = os.path.join(self.tmp_dir, name)
+        record_ids = write_warc(
+            path,
+            [
+                request("http://example.com/b"),
+                response("http://example.com/b", b"<html>b</html>", date="2026-02-04T05:12:07Z"),
+                request("http://example.com/a"),
+                response("http://example.com/a", b"{}", "application/json"),
+            ],
+        )
+        return path, record_ids
+
+    def test_entries_in_file_order(self):
+        """Should index every record with its headers, in file order."""
+        path, record_ids = self._write()
+
+        with RecordIndex(build_record_index(path)) as index:
+            self.assertEqual([entry.record_id for entry in index], record_ids)
+            self.assertEqual(len(index), 5)
+            self.assertEqual(index[2].warc_type, "response")
+            self.assertEqual(index[2].target_uri, "http://example.com/b")
+            self.assertEqual(index[2].date, "2026-02-04T05:12:07Z")
+            self.assertEqual(index[2].content_type, "text/html; charset=utf-8")
+            self.assertEqual(index[0].content_type, "")
+
+    def test_find_by_id_reads_single_record(self):
+        """Looking up a record ID should locate exactly that record's bytes."""
+        for name in ("test.warc.gz", "test.warc"):
+            with self.subTest(name=name):
+                path, record_ids = self._write(name)
+                with RecordIndex(build_record_index(path)) as index:
+                    for record_id in record_ids:
+                        entry = index.find_by_id(record_id)
+                        data = read_record_bytes(path, entry)
+                        self.assertTrue(data.startswith(b"WARC/1"))
+                        self.assertIn(f"WARC-Record-ID: {record_id}".encode(), data)
+
+    def test_find_by_id_missing(self):
+        """Should return None for an unknown record ID."""
+        path, _ = self._write()
+        with RecordIndex(build_record_index(path)) as index:
+            self.assertIsNone(index.find_by_id("<urn:uuid:missing>"))
+
+    def test_find_by_uri_returns_all_matches(self):
+        """Should return the request and response for a URL, in file order."""
+        path, _ = self._write()
+        with RecordIndex(build_record_index(path)) as index:
+            entries = index.find_by_uri("http://example.com/a")
+            self.assertEqual([entry.warc_type for entry in entries], ["request", "response"])
+            self.assertEqual(index.find_by_uri("http://example.com/missing"), [])
+
+    def test_empty_index(self):
+        """Should support an index with no entries."""
+        index_path = os.path.join(self.tmp_dir, "empty.idx")
+        write_record_index([], index_path, FileStamp(0, -1, 2))
+        with RecordIndex(index_path) as index:
+            self.assertEqual(len(index), 0)
+            self.assertEqual(index.warc_stamp, FileStamp(0, -1, 2))
+            self.assertIsNone(index.find_by_id("<urn:uuid:x>"))
+
+    def test_rejects_non_index_file(self):
+        """Should raise ValueError for a file that is not a record index."""
+        bogus = os.path.join(self.tmp_dir, "bogus.idx")
+        with open(bogus, "wb") as f:
+            f.write(b"not an index at all, just some bytes here")
+        with self.assertRaises(ValueError):
+            RecordIndex(bogus)
+
+    def test_open_record_index_ignores_stale_sidecar(self):
+        """Should return None when the WARC changed size since indexing."""
+        path, _ = self._write()
+        self.assertIsNone(open_record_index(path))
+        build_record_index(path)
+        index = open_record_index(path)
+        self.assertIsNotNone(index)
+        index.close()
+
+        with open(path, "ab") as f:
+            f.write(b"\n")
+        self.assertIsNone(open_record_index(path))
+
+    def test_open_record_index_ignores_sidecar_of_a_changed_file_of_the_same_size(self):
+        """Should return None once the file was rewritten in place or replaced, even at the same size."""
+        path, _ = self._write()
+        build_record_index(path)
+        # a copy keeps the size and (with copy2) the mtime, but is a new inode
+        copy = os.path.join(self.tmp_dir, "copy.warc.gz")
+        shutil.copy2(path, copy)
+        os.replace(copy, path)
+        self.assertIsNone(open_record_index(path))
+
+        build_record_index(path)
+        rewrite_in_place(path)
+        self.assertIsNone(open_record_index(path))
+
+    def test_open_record_index_ignores_corrupt_sidecar(self):
+        """Should return None for a truncated or foreign sidecar so that it gets rebuilt."""
+        path, record_ids = self._write()
+        index_path = build_record_index(path)
+        with open(index_path, "rb") as f:
+            header = f.read(64)
+
+        for contents in (b"", header, b"not an index at all, just some bytes here"):
+            with self.subTest(contents=contents[:8]):
+                with open(index_path, "wb") as f:
+                    f.write(contents)
+                self.assertIsNone(open_record_index(path))
+                with load_record_index(path) as index:
+                    self.assertEqual([entry.record_id for entry in index], record_ids)
+
+    def test_load_record_index_builds_missing_and_stale_sidecar(self):
+        """Should build the sidecar when there is none or it is stale."""
+        path, record_ids = self._write()
+
+        with load_record_index(path) as index:
+            self.assertEqual([entry.record_id for entry in index], record_ids)
+        record_ids = write_warc(path, [response("http://example.com/c", b"<html>c</html>")])
+        with load_record_index(path) as index:
+            self.assertEqual([entry.record_id for entry in index], record_ids)
+
+    def test_scan_writes_sidecar_as_by_product(self):
+        """scan_warc(write_index=True) should leave a current sidecar behind."""
+        path, record_ids = self._write()
+
+        stats = scan_warc(path, write_index=True)
+
+        self.assertEqual(stats, scan_warc(path))
+        with RecordIndex(sidecar_path(path)) as index:
+            self.assertEqual([entry.record_id for entry in index], record_ids)
+
+
+if __name__ == "__main__":
+    unittest.main()
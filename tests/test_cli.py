@@ -1,14 +1,34 @@
 """Tests for cc_news_analyzer.cli module."""
 
+import gzip
+import json
 import os
+import shutil
 import tempfile
 import unittest
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
+import cc_news_analyzer.cli as cli_module
+from cc_news_analyzer import table as table_module
 from cc_news_analyzer.cli import DEFAULT_DOWNLOAD_DIR, cli
+from cc_news_analyzer.index import DownloadResult
+from cc_news_analyzer.pages import PageTable
+from cc_news_analyzer.planner import PlannedWarc, parse_warc_timestamp
+from cc_news_analyzer.warc import WarcStats
 from click.testing import CliRunner
 
+from tests.http_fixtures import serve_files
+
+
+def setUpModule():
+    """Keep scan results cached by CLI tests out of the working directory."""
+    cache_dir = tempfile.mkdtemp()
+    patcher = patch.object(cli_module, "DEFAULT_CACHE_DIR", cache_dir)
+    patcher.start()
+    unittest.addModuleCleanup(patcher.stop)
+    unittest.addModuleCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+
 
 class TestGetIndexCmd(unittest.TestCase):
     """Tests for the get-index CLI command."""
@@ -107,6 +127,7 @@ class TestGetWarcCmd(unittest.TestCase):
         mock_download.assert_called_once_with(
             "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260204051206-06668.warc.gz",
             ".tmp",
+            result=ANY,
         )
         self.assertIn("CC-NEWS-20260204051206-06668.warc.gz", result.output)
 
@@ -129,6 +150,7 @@ class TestGetWarcCmd(unittest.TestCase):
         mock_download.assert_called_once_with(
             "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260204051206-06668.warc.gz",
             "/data",
+            result=ANY,
         )
 
     def test_missing_argument(self):
@@ -223,6 +245,7 @@ class TestGetWarcCmd(unittest.TestCase):
         mock_download.assert_called_once_with(
             "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260204051206-06668.warc.gz",
             ".tmp",
+            result=ANY,
         )
 
     @patch("cc_news_analyzer.cli.download_warc_by_path")
@@ -239,6 +262,7 @@ class TestGetWarcCmd(unittest.TestCase):
         mock_download.assert_called_once_with(
             "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260204051206-06668.warc.gz",
             ".tmp",
+            result=ANY,
         )
 
     @patch("cc_news_analyzer.cli.resolve_warc_path")
@@ -252,6 +276,160 @@ class TestGetWarcCmd(unittest.TestCase):
         self.assertIn("Could not resolve", result.output)
 
 
+class TestGetWarcBulk(unittest.TestCase):
+    """Tests for downloading several files with get-warc."""
+
+    def setUp(self):
+        """Set up the CLI test runner."""
+        self.runner = CliRunner()
+        self.paths = [
+            "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260201022924-06627.warc.gz",
+            "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260204051206-06668.warc.gz",
+        ]
+
+    @patch("cc_news_analyzer.cli.download_warcs")
+    def test_downloads_all_paths_concurrently(self, mock_download):
+        """Should pass every resolved path and the --parallel limit to download_warcs."""
+        mock_download.return_value = [
+            DownloadResult(path, f".tmp/{os.path.basename(path)}", 1_000_000, status=200, bytes_transferred=1_000_000)
+            for path in self.paths
+        ]
+
+        result = self.runner.invoke(cli, ["get-warc", "--parallel", "2", *self.paths])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        mock_download.assert_called_once()
+        self.assertEqual(mock_download.call_args.args, (self.paths, ".tmp"))
+        self.assertEqual(mock_download.call_args.kwargs["parallel"], 2)
+        self.assertIn("Downloaded 2 of 2 file(s): 2.0 MB", result.output)
+
+    @patch("cc_news_analyzer.cli.download_warcs")
+    def test_reports_files_already_downloaded_separately(self, mock_download):
+        """Should count only transferred bytes and list files already on disk as skipped."""
+        mock_download.return_value = [
+            DownloadResult(self.paths[0], "x/a.warc.gz", 5_000_000),
+            DownloadResult(self.paths[1], "x/b.warc.gz", 3_000_000, status=206, bytes_transferred=1_000_000),
+        ]
+
+        result = self.runner.invoke(cli, ["get-warc", "--dest", "x", *self.paths])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Downloaded 1 of 2 file(s): 1.0 MB", result.output)
+        self.assertIn("Skipped 1 file(s) already in x.", result.output)
+
+    @patch("cc_news_analyzer.cli.fetch_warc_paths")
+    @patch("cc_news_analyzer.cli.download_warcs")
+    def test_from_index(self, mock_download, mock_fetch):
+        """Should download every path in the month's index with --from-index."""
+        mock_fetch.return_value = self.paths
+        mock_download.return_value = [DownloadResult(path, f"x/{os.path.basename(path)}", 10) for path in self.paths]
+
+        result = self.runner.invoke(cli, ["get-warc", "--from-index", "--date", "02-2026", "--dest", "x"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        mock_fetch.assert_called_once_with(2026, 2, "x")
+        self.assertEqual(mock_download.call_args.args, (self.paths, "x"))
+
+    @patch("cc_news_analyzer.cli.fetch_warc_paths")
+    def test_from_index_fetch_error(self, mock_fetch):
+        """Should show a friendly error when the month's index cannot be fetched."""
+        mock_fetch.side_effect = OSError("Network error")
+
+        result = self.runner.invoke(cli, ["get-warc", "--from-index", "--date", "02-2026"])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Failed to fetch the WARC index", result.output)
+
+    def test_date_requires_from_index(self):
+        """Should reject --date without --from-index."""
+        result = self.runner.invoke(cli, ["get-warc", "--date", "02-2026", self.paths[0]])
+
+        self.assertEqual(result.exit_code, 2)
+
+    def test_paths_and_from_index_are_exclusive(self):
+        """Should reject WARC_PATH arguments combined with --from-index."""
+        result = self.runner.invoke(cli, ["get-warc", "--from-index", self.paths[0]])
+
+        self.assertEqual(result.exit_code, 2)
+
+    def test_reports_failures_at_end(self):
+        """Should finish the batch, then list failures and exit non-zero."""
+        with tempfile.TemporaryDirectory() as dest, serve_files({f"/{self.paths[1]}": b"fake"}) as server:
+            with patch("cc_news_analyzer.index.CC_NEWS_BASE_URL", server.url("")):
+                result = self.runner.invoke(cli, ["get-warc", "--dest", dest, *self.paths])
+
+            self.assertTrue(os.path.exists(os.path.join(dest, "CC-NEWS-20260204051206-06668.warc.gz")))
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Downloaded 1 of 2 file(s)", result.output)
+        self.assertIn("Failed downloads:", result.output)
+        self.assertIn("404", result.output)
+        self.assertIn("1 of 2 download(s) failed", result.output)
+
+
+class TestGetWarcDateRange(unittest.TestCase):
+    """Tests for get-warc --from/--to."""
+
+    def setUp(self):
+        """Set up the CLI test runner and a fake plan."""
+        self.runner = CliRunner()
+        self.paths = [
+            "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260202120000-00004.warc.gz",
+            "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260203000000-00005.warc.gz",
+        ]
+        self.plan = [PlannedWarc(path, parse_warc_timestamp(path)) for path in self.paths]
+
+    @patch("cc_news_analyzer.cli.estimate_sizes")
+    @patch("cc_news_analyzer.cli.plan_date_range")
+    @patch("cc_news_analyzer.cli.download_warcs")
+    def test_dry_run_prints_plan(self, mock_download, mock_plan, mock_sizes):
+        """Should print the planned files and estimated size without downloading."""
+        mock_plan.return_value = self.plan
+        mock_sizes.return_value = [1_500_000, None]
+
+        result = self.runner.invoke(cli, ["get-warc", "--from", "2026-02-03T00", "--to", "2026-02-05T12", "--dry-run"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        start, end = mock_plan.call_args.args[:2]
+        self.assertEqual(
+            (start.isoformat(), end.isoformat()), ("2026-02-03T00:00:00+00:00", "2026-02-05T12:00:00+00:00")
+        )
+        self.assertIn(f"{self.paths[0]}\t1.5 MB", result.output)
+        self.assertIn(f"{self.paths[1]}\t?", result.output)
+        self.assertIn("Plan: 2 file(s), 1.5 MB estimated (1 of unknown size)", result.output)
+        mock_download.assert_not_called()
+
+    @patch("cc_news_analyzer.cli.plan_date_range")
+    @patch("cc_news_analyzer.cli.download_warcs")
+    def test_downloads_planned_files(self, mock_download, mock_plan):
+        """Should hand the planned files to the parallel downloader."""
+        mock_plan.return_value = self.plan
+        mock_download.return_value = [DownloadResult(path, f".tmp/{os.path.basename(path)}", 10) for path in self.paths]
+
+        result = self.runner.invoke(cli, ["get-warc", "--from", "2026-02-03", "--parallel", "3"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(mock_download.call_args.args, (self.paths, ".tmp"))
+        self.assertEqual(mock_download.call_args.kwargs["parallel"], 3)
+
+    def test_invalid_bound(self):
+        """Should show a friendly error for a malformed date."""
+        result = self.runner.invoke(cli, ["get-warc", "--from", "yesterday"])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Invalid date-time", result.output)
+
+    def test_modes_are_exclusive(self):
+        """Should reject --from combined with paths or --from-index, and --to alone."""
+        for args in (
+            ["--from", "2026-02-03", self.paths[0]],
+            ["--from", "2026-02-03", "--from-index"],
+            ["--to", "2026-02-03"],
+        ):
+            with self.subTest(args=args):
+                self.assertEqual(self.runner.invoke(cli, ["get-warc", *args]).exit_code, 2)
+
+
 class TestCountRecordsCmd(unittest.TestCase):
     """Smoke tests for the existing count-records command."""
 
@@ -290,7 +468,7 @@ class TestCountRecordsCmd(unittest.TestCase):
         self.assertNotEqual(result.exit_code, 0)
         self.assertIn("does not appear to be a WARC file", result.output)
 
-    @patch("cc_news_analyzer.cli._count_records")
+    @patch("cc_news_analyzer.cli.scan_warc_files")
     def test_archive_load_failed_shows_friendly_error(self, mock_count):
         """Should show a friendly error when warcio cannot parse the file."""
         from warcio.exceptions import ArchiveLoadFailed
@@ -365,23 +543,38 @@ class TestCountArticlesCmd(unittest.TestCase):
         self.assertIn(".tmp/", result.output)
         self.assertIn("Did you mean", result.output)
 
-    @patch("cc_news_analyzer.cli._count_articles")
+    @patch("cc_news_analyzer.cli.scan_warc_files")
     def test_outputs_article_count(self, mock_count):
-        """Should display the article count from count_articles."""
-        mock_count.return_value = 42
+        """Should display the article count from the scanned statistics."""
         warc_file = self._create_file("test.warc.gz")
+        mock_count.return_value = [(warc_file, WarcStats(articles=42))]
 
         result = self.runner.invoke(cli, ["count-articles", warc_file])
 
         self.assertEqual(result.exit_code, 0)
-        mock_count.assert_called_once_with(warc_file)
+        mock_count.assert_called_once_with(
+            [warc_file], workers=1, headers_only=False, write_index=True, cache_dir=cli_module.DEFAULT_CACHE_DIR
+        )
         self.assertIn("42", result.output)
         self.assertIn("Total articles", result.output)
 
-    @patch("cc_news_analyzer.cli._count_articles")
+    @patch("cc_news_analyzer.cli.scan_warc_files")
+    def test_headers_only_flag(self, mock_count):
+        """Should pass --headers-only through to the scanner."""
+        warc_file = self._create_file("test.warc.gz")
+        mock_count.return_value = [(warc_file, WarcStats(articles=7))]
+
+        result = self.runner.invoke(cli, ["count-articles", "--headers-only", warc_file])
+
+        self.assertEqual(result.exit_code, 0)
+        mock_count.assert_called_once_with(
+            [warc_file], workers=1, headers_only=True, write_index=True, cache_dir=cli_module.DEFAULT_CACHE_DIR
+        )
+
+    @patch("cc_news_analyzer.cli.scan_warc_files")
     def test_outputs_zero_count(self, mock_count):
         """Should display zero when no articles are found."""
-        mock_count.return_value = 0
+        mock_count.return_value = [("test.warc", WarcStats())]
         warc_file = self._create_file("test.warc")
 
         result = self.runner.invoke(cli, ["count-articles", warc_file])
@@ -389,7 +582,7 @@ class TestCountArticlesCmd(unittest.TestCase):
         self.assertEqual(result.exit_code, 0)
         self.assertIn("0", result.output)
 
-    @patch("cc_news_analyzer.cli._count_articles")
+    @patch("cc_news_analyzer.cli.scan_warc_files")
     def test_archive_load_failed_shows_friendly_error(self, mock_count):
         """Should show a friendly error when warcio cannot parse the file."""
         from warcio.exceptions import ArchiveLoadFailed
@@ -404,6 +597,593 @@ class TestCountArticlesCmd(unittest.TestCase):
         self.assertNotIn("Traceback", result.output)
 
 
+class TestCountMultipleFiles(unittest.TestCase):
+    """Tests for counting across several files, directories and globs."""
+
+    def setUp(self):
+        """Write three small WARC files into a temporary directory."""
+        from tests.warc_fixtures import request, response, write_warc
+
+        self.runner = CliRunner()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.paths = []
+        for i, name in enumerate(("a.warc.gz", "b.warc.gz", "c.warc")):
+            path = os.path.join(self.tmp_dir, name)
+            records = [request("http://example.com/")]
+            records += [response(f"http://example.com/{n}", b"<html></html>") for n in range(i + 1)]
+            write_warc(path, records)
+            self.paths.append(path)
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        import shutil
+
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_directory_input_prints_rows_and_total(self):
+        """Should expand a directory, print a row per file and the grand total."""
+        result = self.runner.invoke(cli, ["count-articles", "--no-index", self.tmp_dir])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        for path, count in zip(self.paths, (1, 2, 3), strict=True):
+            self.assertIn(f"{path}: {count}", result.output)
+        self.assertIn("Total articles: 6", result.output)
+
+    def test_glob_input_with_workers(self):
+        """Should expand a glob pattern and scan files in a process pool."""
+        pattern = os.path.join(self.tmp_dir, "*.warc.gz")
+
+        result = self.runner.invoke(cli, ["count-records", "--workers", "2", "--no-index", pattern])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertNotIn(self.paths[2], result.output)
+        self.assertIn("Total WARC records with WARC-Record-ID: 7", result.output)
+
+    def test_streams_remote_paths(self):
+        """Should accept a CC-NEWS relative path and scan it without saving it."""
+        remote = "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260204051206-06668.warc.gz"
+        with open(self.paths[1], "rb") as f:
+            files = {f"/{remote}": f.read()}
+
+        with serve_files(files) as server, patch("cc_news_analyzer.index.CC_NEWS_BASE_URL", server.url("")):
+            result = self.runner.invoke(cli, ["count-articles", remote, self.paths[0]])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn(f"{remote}: 2", result.output)
+        self.assertIn("Total articles: 3", result.output)
+
+    def test_remote_path_not_found(self):
+        """Should show a friendly error when a remote file cannot be fetched."""
+        with serve_files({}) as server, patch("cc_news_analyzer.index.CC_NEWS_BASE_URL", server.url("")):
+            result = self.runner.invoke(cli, ["count-records", "crawl-data/CC-NEWS/2026/02/missing.warc.gz"])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Failed to stream remote WARC file", result.output)
+        self.assertNotIn("Traceback", result.output)
+
+    def test_glob_without_matches(self):
+        """Should fail with a clear message when nothing matches."""
+        pattern = os.path.join(self.tmp_dir, "*.nothing.warc")
+
+        result = self.runner.invoke(cli, ["count-records", pattern])
+
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("No WARC files found", result.output)
+
+
+class TestStatsCmd(unittest.TestCase):
+    """Tests for the stats CLI command."""
+
+    def setUp(self):
+        """Set up the CLI test runner."""
+        self.runner = CliRunner()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        import shutil
+
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_prints_statistics(self):
+        """Should print counts, content types and date range from a real WARC."""
+        from tests.warc_fixtures import request, response, write_warc
+
+        warc_file = os.path.join(self.tmp_dir, "test.warc.gz")
+        write_warc(
+            warc_file,
+            [
+                request("http://example.com/", date="2026-02-04T05:12:06Z"),
+                response("http://example.com/", b"<html></html>", date="2026-02-04T05:12:07Z"),
+            ],
+        )
+
+        result = self.runner.invoke(cli, ["stats", warc_file])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Total WARC records with WARC-Record-ID: 3", result.output)
+        self.assertIn("Total articles: 1", result.output)
+        self.assertIn("text/html: 1", result.output)
+        self.assertIn("to 2026-02-04T05:12:07Z", result.output)
+
+    @patch("cc_news_analyzer.cli.scan_warc")
+    def test_archive_load_failed_shows_friendly_error(self, mock_scan):
+        """Should show a friendly error when warcio cannot parse the file."""
+        from warcio.exceptions import ArchiveLoadFailed
+
+        mock_scan.side_effect = ArchiveLoadFailed("bad format")
+        warc_file = os.path.join(self.tmp_dir, "test.warc.gz")
+        with open(warc_file, "w") as f:
+            f.write("fake")
+
+        result = self.runner.invoke(cli, ["stats", warc_file])
+
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("Failed to read WARC file", result.output)
+
+    @patch("cc_news_analyzer.cli.scan_warc")
+    def test_no_cache_flag(self, mock_scan):
+        """--no-cache should scan without a cache directory."""
+        warc_file = os.path.join(self.tmp_dir, "test.warc.gz")
+        with open(warc_file, "w") as f:
+            f.write("fake")
+
+        self.runner.invoke(cli, ["stats", "--no-cache", warc_file])
+
+        self.assertIsNone(mock_scan.call_args.kwargs["cache_dir"])
+
+
+class TestCachePruneCmd(unittest.TestCase):
+    """Tests for the cache-prune CLI command."""
+
+    def setUp(self):
+        """Set up the CLI test runner."""
+        self.runner = CliRunner()
+
+    @patch("cc_news_analyzer.cli.prune_cache")
+    def test_reports_counts(self, mock_prune):
+        """Should prune the default cache and report what was removed."""
+        from cc_news_analyzer.cache import PruneResult
+
+        mock_prune.return_value = PruneResult(removed=2, kept=5)
+
+        result = self.runner.invoke(cli, ["cache-prune", "--older-than", "1"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Removed 2 cached result(s), kept 5.", result.output)
+        mock_prune.assert_called_once_with(
+            cli_module.DEFAULT_CACHE_DIR, cli_module.SCANNER_VERSION, max_age=86400, remove_all=False
+        )
+
+    @patch("cc_news_analyzer.cli.prune_cache")
+    def test_all_flag(self, mock_prune):
+        """--all should remove every entry."""
+        from cc_news_analyzer.cache import PruneResult
+
+        mock_prune.return_value = PruneResult(removed=1)
+
+        self.runner.invoke(cli, ["cache-prune", "--all"])
+
+        self.assertTrue(mock_prune.call_args.kwargs["remove_all"])
+        self.assertIsNone(mock_prune.call_args.kwargs["max_age"])
+
+
+class TestIndexWarcCmd(unittest.TestCase):
+    """Tests for the index-warc CLI command."""
+
+    def setUp(self):
+        """Set up the CLI test runner."""
+        self.runner = CliRunner()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        import shutil
+
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_writes_sidecar(self):
+        """Should write <file>.idx next to the WARC and report the record count."""
+        from tests.warc_fixtures import response, write_warc
+
+        warc_file = os.path.join(self.tmp_dir, "test.warc.gz")
+        write_warc(warc_file, [response("http://example.com/", b"<html></html>")])
+
+        result = self.runner.invoke(cli, ["index-warc", warc_file])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Indexed 2 records", result.output)
+        self.assertTrue(os.path.isfile(warc_file + ".idx"))
+
+
+class TestToJsonlCmd(unittest.TestCase):
+    """Tests for the to-jsonl CLI command."""
+
+    def setUp(self):
+        """Write a WARC file with one article."""
+        from tests.warc_fixtures import request, response, write_warc
+
+        self.runner = CliRunner()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.warc_file = os.path.join(self.tmp_dir, "test.warc.gz")
+        write_warc(self.warc_file, [request("http://example.com/"), response("http://example.com/", b"<p>hi</p>")])
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_writes_to_stdout(self):
+        """Should print one JSON line per article and nothing else."""
+        result = self.runner.invoke(cli, ["to-jsonl", self.warc_file])
+
+        self.assertEqual(result.exit_code, 0)
+        [line] = result.stdout.splitlines()
+        self.assertEqual(json.loads(line)["body"], "<p>hi</p>")
+
+    def test_gzips_output_ending_in_gz(self):
+        """Should gzip an output file named .gz and report what was written."""
+        output = os.path.join(self.tmp_dir, "articles.jsonl.gz")
+
+        result = self.runner.invoke(cli, ["to-jsonl", "--workers", "2", "-o", output, self.warc_file, self.warc_file])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Wrote 1 article(s)", result.output)
+        with gzip.open(output, "rt", encoding="utf-8") as f:
+            self.assertEqual(json.loads(f.readline())["uri"], "http://example.com/")
+
+    def test_invalid_warc_shows_friendly_error(self):
+        """Should report files that are not WARC files."""
+        bad = os.path.join(self.tmp_dir, "bad.warc")
+        with open(bad, "w") as f:
+            f.write("not a warc")
+
+        result = self.runner.invoke(cli, ["to-jsonl", bad])
+
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("Failed to read WARC file", result.output)
+
+
+class TestToMarkdownCmd(unittest.TestCase):
+    """Tests for the to-markdown CLI command."""
+
+    def setUp(self):
+        """Write a WARC file with three articles."""
+        from tests.warc_fixtures import response, write_warc
+
+        self.runner = CliRunner()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.warc_file = os.path.join(self.tmp_dir, "test.warc.gz")
+        self.record_ids = write_warc(
+            self.warc_file, [response(f"http://example.com/{n}", f"<h2>Title {n}</h2>".encode()) for n in range(3)]
+        )
+        self.output = os.path.join(self.tmp_dir, "articles.jsonl")
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write_checkpoint(self, record_id: str) -> None:
+        """Pretend a run was killed after writing the first article."""
+        from cc_news_analyzer.batch import Checkpoint, write_checkpoint
+        from cc_news_analyzer.cdx import RecordIndex, build_record_index
+
+        with RecordIndex(build_record_index(self.warc_file)) as index:
+            offset = index.find_by_id(self.record_ids[2]).offset
+        with open(self.output, "w", encoding="utf-8") as f:
+            f.write('{"partial": "line"}\n')
+        size = os.path.getsize(self.warc_file)
+        write_checkpoint(Checkpoint(size, False, offset, record_id, 1, 20), self.output + ".checkpoint")
+
+    def test_writes_markdown_lines(self):
+        """Should write one JSON line of Markdown per article and report the count."""
+        result = self.runner.invoke(cli, ["to-markdown", self.warc_file, "-o", self.output])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Wrote 3 article(s)", result.output)
+        with open(self.output, encoding="utf-8") as f:
+            self.assertEqual(json.loads(f.readline())["markdown"], "## Title 0")
+
+    def test_resumes_from_checkpoint(self):
+        """Should carry on from the checkpoint's offset and say so."""
+        self._write_checkpoint(self.record_ids[2])
+
+        result = self.runner.invoke(cli, ["to-markdown", self.warc_file, "-o", self.output])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Resumed after 1 article(s)", result.output)
+        self.assertIn("Wrote 3 article(s)", result.output)
+        with open(self.output, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0], '{"partial": "line"}')
+        self.assertEqual(
+            [json.loads(line)["uri"] for line in lines[1:]], ["http://example.com/1", "http://example.com/2"]
+        )
+
+    def test_mismatched_checkpoint_suggests_restart(self):
+        """Should refuse a checkpoint that names another record, and start over with --restart."""
+        self._write_checkpoint("<urn:uuid:other>")
+
+        result = self.runner.invoke(cli, ["to-markdown", self.warc_file, "-o", self.output])
+
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("Cannot resume", result.output)
+        self.assertIn("--restart", result.output)
+
+        result = self.runner.invoke(cli, ["to-markdown", "--restart", self.warc_file, "-o", self.output])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertNotIn("Resumed", result.output)
+
+
+class TestSearchCmd(unittest.TestCase):
+    """Tests for the search CLI command."""
+
+    def setUp(self):
+        """Write a WARC file with two articles."""
+        from tests.warc_fixtures import response, write_warc
+
+        self.runner = CliRunner()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.warc_file = os.path.join(self.tmp_dir, "test.warc.gz")
+        self.record_ids = write_warc(
+            self.warc_file,
+            [
+                response("http://example.com/1", b"<p>New York election</p>"),
+                response("http://example.com/2", b"<p>Rain in new york, new york</p>"),
+            ],
+        )
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_prints_hits_and_summary(self):
+        """Should print one tab-separated line per hit and keyword totals on stderr."""
+        keywords = os.path.join(self.tmp_dir, "keywords.txt")
+        with open(keywords, "w", encoding="utf-8") as f:
+            f.write("new york\n")
+
+        result = self.runner.invoke(cli, ["search", self.warc_file, "--keywords", keywords, "-k", "election"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(
+            result.stdout.splitlines(),
+            [
+                f"{self.record_ids[1]}\thttp://example.com/1\telection=1\tnew york=1",
+                f"{self.record_ids[2]}\thttp://example.com/2\tnew york=2",
+            ],
+        )
+        self.assertIn("Matched 2 article(s).", result.stderr)
+        self.assertIn("new york: 3", result.stderr)
+
+    def test_requires_keywords(self):
+        """Should fail with a usage error without keywords."""
+        result = self.runner.invoke(cli, ["search", self.warc_file])
+
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("--keywords", result.output)
+
+    def test_query_with_and_without_text_index(self):
+        """Should answer a boolean query the same way before and after build-text-index."""
+        args = ["search", self.warc_file, "--query", '"new york" AND (rain OR snow)']
+        scanned = self.runner.invoke(cli, args)
+
+        built = self.runner.invoke(cli, ["build-text-index", self.warc_file])
+        self.assertEqual(built.exit_code, 0)
+        self.assertIn(f"Indexed 2 article(s), 5 words: {self.warc_file}.tix", built.output)
+        indexed = self.runner.invoke(cli, args)
+
+        self.assertEqual(scanned.exit_code, 0)
+        self.assertEqual(scanned.stdout, f"{self.record_ids[2]}\thttp://example.com/2\tnew york=2\train=1\n")
+        self.assertEqual(indexed.stdout, scanned.stdout)
+        self.assertEqual(indexed.stderr, scanned.stderr)
+
+    def test_rejects_bad_query(self):
+        """Should fail with a usage error for a malformed query or a query with keywords."""
+        for args in (["--query", "(rain"], ["--query", "rain", "-k", "snow"]):
+            with self.subTest(args=args):
+                result = self.runner.invoke(cli, ["search", self.warc_file, *args])
+
+                self.assertEqual(result.exit_code, 2)
+
+
+class TestTableCmds(unittest.TestCase):
+    """Tests for the build-table and query-table CLI commands."""
+
+    def setUp(self):
+        """Write a WARC file with an article and a JSON response."""
+        from tests.warc_fixtures import response, write_warc
+
+        self.runner = CliRunner()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.warc_file = os.path.join(self.tmp_dir, "test.warc.gz")
+        self.record_ids = write_warc(
+            self.warc_file,
+            [
+                response("http://a.example/1", b"<html></html>", date="2026-02-01T10:00:00Z"),
+                response("http://b.example/2", b"{}", "application/json", date="2026-02-01T11:00:00Z"),
+            ],
+        )
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    @unittest.skipIf(table_module.np is None, "NumPy is not installed")
+    def test_build_then_query(self):
+        """Should build the table and print matching records or counts."""
+        result = self.runner.invoke(cli, ["build-table", self.tmp_dir])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("1 file(s), 3 records", result.output)
+
+        result = self.runner.invoke(cli, ["query-table", self.warc_file, "--articles"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output, f"2026-02-01T10:00:00Z\t{self.record_ids[1]}\thttp://a.example/1\n")
+
+        result = self.runner.invoke(
+            cli, ["query-table", self.warc_file, "--from", "2026-02-01T10:30", "--count-by", "host"]
+        )
+        self.assertEqual(result.output, "b.example\t1\n")
+
+        result = self.runner.invoke(
+            cli, ["query-table", self.warc_file, "--record-id", self.record_ids[2], "--uri", "http://b.example/2"]
+        )
+        self.assertEqual(result.output, f"2026-02-01T11:00:00Z\t{self.record_ids[2]}\thttp://b.example/2\n")
+        result = self.runner.invoke(
+            cli, ["query-table", self.warc_file, "--uri", "http://a.example/1", "--count-by", "host"]
+        )
+        self.assertEqual(result.output, "a.example\t1\n")
+
+    @unittest.skipIf(table_module.np is None, "NumPy is not installed")
+    def test_names_a_missing_column_file(self):
+        """Should report which column file of a table is missing."""
+        self.runner.invoke(cli, ["build-table", self.warc_file])
+        os.remove(os.path.join(self.warc_file + ".cols", "date.npy"))
+
+        result = self.runner.invoke(cli, ["query-table", self.warc_file])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("missing column file", result.output)
+        self.assertIn("date.npy", result.output)
+        self.assertIn("rebuild it with build-table", result.output)
+
+    def test_missing_numpy_shows_install_hint(self):
+        """Should explain how to install the optional dependency."""
+        with patch.object(table_module, "np", None):
+            result = self.runner.invoke(cli, ["query-table", self.warc_file])
+
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("cc-news-analyzer[table]", result.output)
+
+
+class TestTitlesCmd(unittest.TestCase):
+    """Tests for the titles CLI command."""
+
+    def setUp(self):
+        """Write a WARC file with five titled articles."""
+        from tests.warc_fixtures import response, write_warc
+
+        self.runner = CliRunner()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.warc_file = os.path.join(self.tmp_dir, "test.warc.gz")
+        write_warc(
+            self.warc_file,
+            [response(f"http://example.com/{n}", f"<title>Story {n}</title>".encode()) for n in range(4)]
+            + [response("http://example.com/untitled", b"<p>no title</p>")],
+        )
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_lists_one_page_of_titles(self):
+        """Should print the page header and one numbered title per article."""
+        result = self.runner.invoke(cli, ["titles", self.warc_file, "--count", "2", "--page", "2"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(
+            result.output,
+            "Page 2 of 3 (5 articles)\n3\tStory 2\thttp://example.com/2\n4\tStory 3\thttp://example.com/3\n",
+        )
+        self.assertTrue(os.path.exists(self.warc_file + ".pages"))
+
+    def test_rebuilds_table_for_another_stride(self):
+        """Should rebuild the page table when --stride differs from the existing table's."""
+        self.runner.invoke(cli, ["titles", self.warc_file])
+
+        result = self.runner.invoke(cli, ["titles", self.warc_file, "--stride", "2"])
+
+        self.assertEqual(result.exit_code, 0)
+        with PageTable(self.warc_file + ".pages") as table:
+            self.assertEqual(table.stride, 2)
+
+    def test_marks_articles_without_a_title(self):
+        """Should show a placeholder for articles without a title."""
+        result = self.runner.invoke(cli, ["titles", self.warc_file, "--count", "2", "--page", "3"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("5\t(no title)\thttp://example.com/untitled", result.output)
+
+
+class TestSummariesCmd(unittest.TestCase):
+    """Tests for the summaries CLI command."""
+
+    def setUp(self):
+        """Write a WARC file with one article."""
+        from tests.warc_fixtures import response, write_warc
+
+        self.runner = CliRunner()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.warc_file = os.path.join(self.tmp_dir, "test.warc.gz")
+        page = (
+            b'<head><title>Hello</title><meta name="description" content="About it"></head>'
+            b"<body><p>This is the first paragraph of the article body.</p></body>"
+        )
+        write_warc(self.warc_file, [response("http://example.com/", page)])
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_prints_one_summary_per_line(self):
+        """Should print the title, description and meta tags as JSON, with the lede only when asked."""
+        result = self.runner.invoke(cli, ["summaries", self.warc_file])
+
+        self.assertEqual(result.exit_code, 0)
+        [line] = result.output.splitlines()
+        summary = json.loads(line)
+        self.assertEqual((summary["title"], summary["description"]), ("Hello", "About it"))
+        self.assertEqual(summary["meta"], {"description": "About it"})
+        self.assertNotIn("lede", summary)
+
+        result = self.runner.invoke(cli, ["summaries", "--lede", "--no-index", self.warc_file])
+
+        self.assertEqual(json.loads(result.output)["lede"], "This is the first paragraph of the article body.")
+
+
+class TestGetArticleCmd(unittest.TestCase):
+    """Tests for the get-article CLI command."""
+
+    def setUp(self):
+        """Write a WARC file with a request and an article."""
+        from tests.warc_fixtures import request, response, write_warc
+
+        self.runner = CliRunner()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.warc_file = os.path.join(self.tmp_dir, "test.warc.gz")
+        uri = "http://example.com/"
+        self.record_ids = write_warc(self.warc_file, [request(uri), response(uri, b"<p>Hello <b>world</b></p>")])
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_prints_articles_by_record_id(self):
+        """Should print each article asked for as a JSON line, as HTML or text."""
+        record_id = self.record_ids[2]
+
+        result = self.runner.invoke(cli, ["get-article", self.warc_file, "--id", record_id, "--id", record_id])
+
+        self.assertEqual(result.exit_code, 0)
+        lines = [json.loads(line) for line in result.output.splitlines()]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual((lines[0]["record_id"], lines[0]["body"]), (record_id, "<p>Hello <b>world</b></p>"))
+
+        result = self.runner.invoke(cli, ["get-article", "--text", self.warc_file, "--id", record_id])
+
+        self.assertEqual(json.loads(result.output)["text"], "Hello world")
+
+    def test_unknown_id_is_an_error(self):
+        """Should print the articles found and fail naming the record IDs that are not articles."""
+        result = self.runner.invoke(
+            cli, ["get-article", self.warc_file, "--id", self.record_ids[2], "--id", self.record_ids[1]]
+        )
+
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn(self.record_ids[2], result.output)
+        self.assertIn(f"No article with record ID: {self.record_ids[1]}", result.output)
+
+
 class TestCliGroup(unittest.TestCase):
     """Tests for the CLI group itself."""
 
@@ -436,5 +1216,111 @@ class TestCliGroup(unittest.TestCase):
         self.assertIn("MM-YYYY", result.output)
 
 
+class TestProfileOption(unittest.TestCase):
+    """Tests for the global --profile and --profile-out options."""
+
+    def setUp(self):
+        """Set up the CLI test runner."""
+        self.runner = CliRunner()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_scan_prints_phase_breakdown(self):
+        """Should print phase timings, records/s and peak RSS to stderr after the command's output."""
+        from tests.warc_fixtures import response, write_warc
+
+        warc_file = os.path.join(self.tmp_dir, "test.warc.gz")
+        write_warc(warc_file, [response("http://example.com/", b"<html></html>")])
+
+        result = self.runner.invoke(cli, ["--profile", "count-records", "--no-cache", warc_file])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Total WARC records with WARC-Record-ID: 2", result.stdout)
+        for label in ("Profile:", "open", "decompress", "parse", "filter", "output", "Peak RSS:"):
+            self.assertIn(label, result.stderr)
+        self.assertIn("Records: 2 (", result.stderr)
+        self.assertNotIn("Profile:", result.stdout)
+
+    @patch("cc_news_analyzer.cli.fetch_warc_paths")
+    def test_profile_out_works_for_get_index(self, mock_fetch):
+        """--profile-out should imply --profile and write a pstats file for any subcommand."""
+        mock_fetch.return_value = ["crawl-data/CC-NEWS/2026/02/file1.warc.gz"]
+        pstats_path = os.path.join(self.tmp_dir, "get-index.pstats")
+
+        result = self.runner.invoke(cli, ["--profile-out", pstats_path, "get-index", "--date", "02-2026"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Profile:", result.stderr)
+        self.assertNotIn("Records:", result.stderr)
+        self.assertTrue(os.path.isfile(pstats_path))
+
+    def test_report_is_printed_when_the_command_fails(self):
+        """Should still report the profile when the subcommand exits with an error."""
+        result = self.runner.invoke(cli, ["--profile", "get-warc"])
+
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("Profile:", result.stderr)
+
+
+class TestMetricsJsonOption(unittest.TestCase):
+    """Tests for the global --metrics-json option."""
+
+    def setUp(self):
+        """Set up the CLI test runner."""
+        self.runner = CliRunner()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_scan_writes_counters_per_file_and_in_total(self):
+        """Should write bytes, records by type, times and throughput of the scanned files."""
+        from tests.warc_fixtures import request, response, write_warc
+
+        warc_file = os.path.join(self.tmp_dir, "test.warc.gz")
+        write_warc(warc_file, [request("http://example.com/"), response("http://example.com/", b"<html></html>")])
+        metrics_path = os.path.join(self.tmp_dir, "metrics.json")
+
+        result = self.runner.invoke(cli, ["--metrics-json", metrics_path, "count-articles", "--no-cache", warc_file])
+
+        self.assertEqual(result.exit_code, 0)
+        with open(metrics_path) as f:
+            metrics = json.load(f)
+        self.assertEqual(metrics["command"], "count-articles")
+        self.assertEqual(metrics["records"], 3)
+        self.assertEqual(metrics["records_by_type"], {"request": 1, "response": 1, "warcinfo": 1})
+        self.assertEqual(metrics["compressed_bytes"], os.path.getsize(warc_file))
+        self.assertGreater(metrics["uncompressed_bytes"], metrics["compressed_bytes"])
+        self.assertGreater(metrics["records_per_second"], 0)
+        self.assertEqual([entry["path"] for entry in metrics["files"]], [warc_file])
+        self.assertFalse(metrics["files"][0]["from_cache"])
+
+    def test_download_writes_status_retries_and_bytes(self):
+        """Should write the HTTP status, retries and bytes transferred of each download."""
+        body = b"x" * 1000
+        dest = os.path.join(self.tmp_dir, "dest")
+        with (
+            serve_files({"/crawl-data/CC-NEWS/2026/02/a.warc.gz": body}) as server,
+            patch("cc_news_analyzer.index.CC_NEWS_BASE_URL", server.url("")),
+        ):
+            result = self.runner.invoke(
+                cli, ["--metrics-json", "-", "get-warc", "--dest", dest, "crawl-data/CC-NEWS/2026/02/a.warc.gz"]
+            )
+
+        self.assertEqual(result.exit_code, 0)
+        metrics = json.loads(result.stdout[result.stdout.index("{") :])
+        self.assertEqual(metrics["command"], "get-warc")
+        self.assertEqual(metrics["bytes_transferred"], len(body))
+        [download] = metrics["downloads"]
+        self.assertEqual(download["status"], 200)
+        self.assertEqual(download["retries"], 0)
+        self.assertEqual(download["bytes_transferred"], len(body))
+        self.assertIsNone(download["error"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,149 @@
+"""Tests for cc_news_analyzer.headers module."""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from cc_news_analyzer.headers import iter_warc_headers
+from cc_news_analyzer.warc import scan_warc
+from warcio.archiveiterator import ArchiveIterator
+from warcio.exceptions import ArchiveLoadFailed
+
+from tests.warc_fixtures import request, response, write_warc
+
+
+class _UnseekableStream(io.RawIOBase):
+    """A read-only stream that cannot seek, like an HTTP response."""
+
+    def __init__(self, data: bytes):
+        self._inner = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return self._inner.read(size)
+
+
+class TestIterWarcHeaders(unittest.TestCase):
+    """Tests for iter_warc_headers()."""
+
+    def setUp(self):
+        """Create a temporary directory for WARC files."""
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write(self, name: str) -> str:
+        """Write a WARC with a mix of record types and body sizes."""
+        path = os.path.join(self.tmp_dir, name)
+        write_warc(
+            path,
+            [
+                request("http://example.com/a"),
+                response("http://example.com/a", b"<html>" + b"x" * 5000 + b"</html>"),
+                response("http://example.com/b.png", b"\x89PNG\r\n\r\n\n\n", "image/png"),
+                response("http://example.com/c", b""),
+            ],
+        )
+        return path
+
+    def _expected(self, path: str) -> list[tuple]:
+        """Read the same fields with ArchiveIterator for comparison."""
+        expected = []
+        with open(path, "rb") as f:
+            for record in ArchiveIterator(f):
+                content_type = None
+                if record.rec_headers.get_header("WARC-Type") == "response":
+                    content_type = record.http_headers.get_header("Content-Type", "")
+                expected.append(
+                    (
+                        record.rec_headers.get_header("WARC-Type"),
+                        record.rec_headers.get_header("WARC-Record-ID"),
+                        record.rec_headers.get_header("WARC-Target-URI"),
+                        int(record.rec_headers.get_header("Content-Length")),
+                        content_type,
+                    )
+                )
+        return expected
+
+    def _actual(self, stream) -> list[tuple]:
+        """Collect the same fields from iter_warc_headers."""
+        return [
+            (h.warc_type, h.record_id, h.target_uri, h.content_length, h.http_content_type)
+            for h in iter_warc_headers(stream, http_content_type=True)
+        ]
+
+    def test_matches_archive_iterator(self):
+        """Should report the same headers as ArchiveIterator for both formats."""
+        for name in ("test.warc.gz", "test.warc"):
+            with self.subTest(name=name):
+                path = self._write(name)
+                with open(path, "rb") as f:
+                    self.assertEqual(self._actual(f), self._expected(path))
+
+    def test_small_read_chunks(self):
+        """Should handle headers and bodies that straddle read-chunk boundaries."""
+        for name in ("test.warc.gz", "test.warc"):
+            with self.subTest(name=name), patch("cc_news_analyzer.headers.READ_CHUNK_SIZE", 7):
+                path = self._write(name)
+                with open(path, "rb") as f:
+                    self.assertEqual(self._actual(f), self._expected(path))
+
+    def test_unseekable_stream(self):
+        """Should skip bodies by reading when the stream cannot seek."""
+        path = self._write("test.warc")
+        with open(path, "rb") as f:
+            stream = _UnseekableStream(f.read())
+
+        self.assertEqual(self._actual(stream), self._expected(path))
+
+    def test_content_type_not_read_by_default(self):
+        """Should leave http_content_type unset unless requested."""
+        path = self._write("test.warc.gz")
+        with open(path, "rb") as f:
+            headers = list(iter_warc_headers(f))
+
+        self.assertTrue(all(h.http_content_type is None for h in headers))
+
+    def test_empty_stream(self):
+        """Should yield nothing for an empty stream."""
+        self.assertEqual(list(iter_warc_headers(io.BytesIO(b""))), [])
+
+    def test_rejects_non_warc_data(self):
+        """Should raise ArchiveLoadFailed for data that is not a WARC file."""
+        with self.assertRaises(ArchiveLoadFailed):
+            list(iter_warc_headers(io.BytesIO(b"<html>not a warc</html>\n")))
+
+
+class TestScanWarcHeadersOnly(unittest.TestCase):
+    """Tests for scan_warc(headers_only=True)."""
+
+    def test_matches_full_scan(self):
+        """Header-only statistics should equal full-parse statistics."""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            for name in ("test.warc.gz", "test.warc"):
+                with self.subTest(name=name):
+                    path = os.path.join(tmp_dir, name)
+                    write_warc(
+                        path,
+                        [
+                            request("http://example.com/a", date="2026-02-04T05:12:06Z"),
+                            response("http://example.com/a", b"<html></html>", date="2026-02-04T05:12:07Z"),
+                            response("http://example.com/b", b"{}", "application/json; charset=utf-8"),
+                        ],
+                    )
+
+                    self.assertEqual(scan_warc(path, headers_only=True), scan_warc(path))
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
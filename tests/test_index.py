@@ -1,22 +1,41 @@
 """Tests for cc_news_analyzer.index module."""
 
+import calendar
 import gzip
+import io
+import json
 import os
+import shutil
+import tempfile
+import threading
+import time
 import unittest
+import urllib.error
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from cc_news_analyzer.index import (
     CC_NEWS_BASE_URL,
+    PART_SUFFIX,
+    DownloadResult,
+    PrefetchingReader,
     build_current_month_index_url,
     build_index_url,
     build_warc_urls,
+    cached_month_index_paths,
+    download_warc,
     download_warc_by_path,
+    download_warcs,
     fetch_warc_paths,
+    is_remote_warc_path,
+    load_basename_index,
+    month_index_path,
     parse_month_date,
     resolve_warc_path,
 )
 
+from tests.http_fixtures import serve_files
+
 
 class TestBuildIndexUrl(unittest.TestCase):
     """Tests for build_index_url."""
@@ -143,6 +162,8 @@ class TestFetchWarcPaths(unittest.TestCase):
         """Create a temporary directory for test files."""
         self.test_dir = os.path.join(os.path.dirname(__file__), ".test_tmp")
         os.makedirs(self.test_dir, exist_ok=True)
+        now = datetime.now()
+        self.current = (now.year, now.month)
 
     def tearDown(self):
         """Clean up the temporary directory."""
@@ -151,25 +172,27 @@ class TestFetchWarcPaths(unittest.TestCase):
         if os.path.exists(self.test_dir):
             shutil.rmtree(self.test_dir)
 
-    def _create_fake_gz(self, content: str, dest: str):
-        """Helper: write gzipped content to dest."""
-        with gzip.open(dest, "wt") as f:
-            f.write(content)
+    def _index_files(self, content: str, *months: tuple[int, int]) -> dict[str, bytes]:
+        """Helper: gzipped index bodies keyed by their URL path."""
+        return {
+            f"/crawl-data/CC-NEWS/{year}/{month:02d}/warc.paths.gz": gzip.compress(content.encode())
+            for year, month in months
+        }
+
+    def _fetch(self, files: dict[str, bytes], year: int, month: int, dest_dir: str | None = None):
+        """Helper: run fetch_warc_paths against a local server; return paths and requests."""
+        with serve_files(files) as server, patch("cc_news_analyzer.index.CC_NEWS_BASE_URL", server.url("")):
+            paths = fetch_warc_paths(year, month, dest_dir or self.test_dir)
+        return paths, server.request_headers
 
-    @patch("cc_news_analyzer.index.urllib.request.urlretrieve")
-    def test_returns_parsed_paths(self, mock_urlretrieve):
+    def test_returns_parsed_paths(self):
         """Should download, decompress, and return parsed WARC paths."""
         lines = (
             "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260201022924-06627.warc.gz\n"
             "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260201054311-06628.warc.gz\n"
         )
 
-        def fake_download(url, dest):
-            self._create_fake_gz(lines, dest)
-
-        mock_urlretrieve.side_effect = fake_download
-
-        paths = fetch_warc_paths(2026, 2, self.test_dir)
+        paths, _ = self._fetch(self._index_files(lines, (2026, 2)), 2026, 2)
 
         self.assertEqual(len(paths), 2)
         self.assertEqual(
@@ -181,29 +204,16 @@ class TestFetchWarcPaths(unittest.TestCase):
             "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260201054311-06628.warc.gz",
         )
 
-    @patch("cc_news_analyzer.index.urllib.request.urlretrieve")
-    def test_skips_blank_lines(self, mock_urlretrieve):
+    def test_skips_blank_lines(self):
         """Should skip blank lines in the index file."""
         lines = "crawl-data/CC-NEWS/2026/02/file1.warc.gz\n\ncrawl-data/CC-NEWS/2026/02/file2.warc.gz\n\n"
 
-        def fake_download(url, dest):
-            self._create_fake_gz(lines, dest)
-
-        mock_urlretrieve.side_effect = fake_download
-
-        paths = fetch_warc_paths(2026, 2, self.test_dir)
+        paths, _ = self._fetch(self._index_files(lines, (2026, 2)), 2026, 2)
         self.assertEqual(len(paths), 2)
 
-    @patch("cc_news_analyzer.index.urllib.request.urlretrieve")
-    def test_returns_empty_for_empty_index(self, mock_urlretrieve):
+    def test_returns_empty_for_empty_index(self):
         """Should return an empty list if the index is empty."""
-
-        def fake_download(url, dest):
-            self._create_fake_gz("", dest)
-
-        mock_urlretrieve.side_effect = fake_download
-
-        paths = fetch_warc_paths(2026, 2, self.test_dir)
+        paths, _ = self._fetch(self._index_files("", (2026, 2)), 2026, 2)
         self.assertEqual(paths, [])
 
     def test_invalid_year_raises(self):
@@ -211,23 +221,115 @@ class TestFetchWarcPaths(unittest.TestCase):
         with self.assertRaises(ValueError):
             fetch_warc_paths(2015, 1, self.test_dir)
 
-    @patch("cc_news_analyzer.index.urllib.request.urlretrieve")
-    def test_creates_dest_dir(self, mock_urlretrieve):
+    def test_creates_dest_dir(self):
         """Should create the destination directory if it does not exist."""
         new_dir = os.path.join(self.test_dir, "subdir")
 
-        def fake_download(url, dest):
-            self._create_fake_gz("path/to/file.warc.gz\n", dest)
+        self._fetch(self._index_files("path/to/file.warc.gz\n", (2026, 2)), 2026, 2, new_dir)
+        self.assertTrue(os.path.isfile(month_index_path(2026, 2, new_dir)))
 
-        mock_urlretrieve.side_effect = fake_download
+    def test_months_are_cached_separately(self):
+        """Fetching a second month should not replace the first month's index."""
+        files = self._index_files("crawl-data/CC-NEWS/2026/01/a.warc.gz\n", (2026, 1))
+        files.update(self._index_files("crawl-data/CC-NEWS/2026/02/b.warc.gz\n", (2026, 2)))
 
-        fetch_warc_paths(2026, 2, new_dir)
-        self.assertTrue(os.path.isdir(new_dir))
+        self._fetch(files, 2026, 1)
+        self._fetch(files, 2026, 2)
+
+        self.assertEqual(
+            cached_month_index_paths(self.test_dir),
+            [month_index_path(2026, 2, self.test_dir), month_index_path(2026, 1, self.test_dir)],
+        )
+
+    def test_past_month_is_never_refetched(self):
+        """A month fetched after it ended should be served from the cache forever."""
+        files = self._index_files("crawl-data/CC-NEWS/2026/02/a.warc.gz\n", (2026, 2))
+        self._fetch(files, 2026, 2)
+
+        with patch("cc_news_analyzer.index.INDEX_CACHE_TTL", 0):
+            paths, requests = self._fetch({}, 2026, 2)
+
+        self.assertEqual(paths, ["crawl-data/CC-NEWS/2026/02/a.warc.gz"])
+        self.assertEqual(requests, [])
+
+    def test_current_month_is_fresh_within_ttl(self):
+        """A current month fetched moments ago should not be requested again."""
+        files = self._index_files("crawl-data/a.warc.gz\n", self.current)
+        self._fetch(files, *self.current)
+
+        paths, requests = self._fetch(files, *self.current)
+
+        self.assertEqual(paths, ["crawl-data/a.warc.gz"])
+        self.assertEqual(requests, [])
+
+    def test_current_month_is_revalidated_after_ttl(self):
+        """An expired current month should be revalidated with a conditional request."""
+        files = self._index_files("crawl-data/a.warc.gz\n", self.current)
+        self._fetch(files, *self.current)
+
+        with patch("cc_news_analyzer.index.INDEX_CACHE_TTL", 0):
+            paths, requests = self._fetch(files, *self.current)
+            self.assertEqual(paths, ["crawl-data/a.warc.gz"])
+            self.assertIn("If-None-Match", requests[0])
+            self.assertIn("If-Modified-Since", requests[0])
+
+            # a changed index is downloaded again
+            files = self._index_files("crawl-data/a.warc.gz\ncrawl-data/b.warc.gz\n", self.current)
+            paths, _ = self._fetch(files, *self.current)
+            self.assertEqual(paths, ["crawl-data/a.warc.gz", "crawl-data/b.warc.gz"])
+
+    def test_past_month_fetched_early_is_revalidated(self):
+        """A month cached before it ended may have grown and should be revalidated."""
+        files = self._index_files("crawl-data/CC-NEWS/2026/02/a.warc.gz\n", (2026, 2))
+        self._fetch(files, 2026, 2)
+        cache_path = month_index_path(2026, 2, self.test_dir)
+        with open(cache_path) as f:
+            record = json.load(f)
+        record["fetched_at"] = calendar.timegm((2026, 2, 20, 0, 0, 0))
+        with open(cache_path, "w") as f:
+            json.dump(record, f)
+
+        with patch("cc_news_analyzer.index.INDEX_CACHE_TTL", 0):
+            _, requests = self._fetch(files, 2026, 2)
+            self.assertEqual(len(requests), 1)
+
+            # validated after the month settled: final from now on
+            paths, requests = self._fetch(files, 2026, 2)
+
+        self.assertEqual(paths, ["crawl-data/CC-NEWS/2026/02/a.warc.gz"])
+        self.assertEqual(requests, [])
+
+    def test_corrupt_or_partial_cache_is_refetched(self):
+        """A cache file that is not valid JSON or lacks fetched_at or paths should be fetched again."""
+        files = self._index_files("crawl-data/CC-NEWS/2026/02/a.warc.gz\n", (2026, 2))
+        cache_path = month_index_path(2026, 2, self.test_dir)
+        garbage = {
+            "not json": "\x00{garbage",
+            "no fetched_at": json.dumps({"paths": ["crawl-data/CC-NEWS/2026/02/stale.warc.gz"]}),
+            "no paths": json.dumps({"fetched_at": time.time()}),
+            "not an object": "[]",
+        }
+
+        for step, (name, contents) in enumerate(garbage.items(), 1):
+            with self.subTest(name):
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                with open(cache_path, "w") as f:
+                    f.write(contents)
+                # a distinct mtime, so the in-memory copy of an earlier record is not reused
+                os.utime(cache_path, ns=(step, step))
+
+                paths, requests = self._fetch(files, 2026, 2)
+
+                self.assertEqual(paths, ["crawl-data/CC-NEWS/2026/02/a.warc.gz"])
+                self.assertEqual(len(requests), 1)
+                self.assertNotIn("If-None-Match", requests[0])
 
 
 class TestDownloadWarcByPath(unittest.TestCase):
     """Tests for download_warc_by_path."""
 
+    WARC_PATH = "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260204051206-06668.warc.gz"
+
     def setUp(self):
         """Create a temporary directory for test files."""
         self.test_dir = os.path.join(os.path.dirname(__file__), ".test_tmp_dl")
@@ -240,43 +342,30 @@ class TestDownloadWarcByPath(unittest.TestCase):
         if os.path.exists(self.test_dir):
             shutil.rmtree(self.test_dir)
 
-    @patch("cc_news_analyzer.index.urllib.request.urlretrieve")
-    def test_downloads_file_and_returns_path(self, mock_urlretrieve):
+    def test_downloads_file_and_returns_path(self):
         """Should build URL from relative path and download the file."""
-        warc_path = "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260204051206-06668.warc.gz"
+        with (
+            serve_files({f"/{self.WARC_PATH}": b"fake warc content"}) as server,
+            patch("cc_news_analyzer.index.CC_NEWS_BASE_URL", server.url("")),
+        ):
+            result = download_warc_by_path(self.WARC_PATH, self.test_dir)
 
-        def fake_download(url, dest):
-            with open(dest, "w") as f:
-                f.write("fake warc content")
-
-        mock_urlretrieve.side_effect = fake_download
-
-        result = download_warc_by_path(warc_path, self.test_dir)
-
-        expected_url = f"{CC_NEWS_BASE_URL}/{warc_path}"
-        mock_urlretrieve.assert_called_once_with(
-            expected_url,
-            os.path.join(self.test_dir, "CC-NEWS-20260204051206-06668.warc.gz"),
-        )
+        self.assertEqual(server.requests, [("GET", f"/{self.WARC_PATH}", None)])
         self.assertEqual(
             result,
             os.path.join(self.test_dir, "CC-NEWS-20260204051206-06668.warc.gz"),
         )
-        self.assertTrue(os.path.exists(result))
+        with open(result, "rb") as f:
+            self.assertEqual(f.read(), b"fake warc content")
 
-    @patch("cc_news_analyzer.index.urllib.request.urlretrieve")
-    def test_creates_dest_dir_if_missing(self, mock_urlretrieve):
+    def test_creates_dest_dir_if_missing(self):
         """Should create the destination directory if it does not exist."""
         new_dir = os.path.join(self.test_dir, "nested")
-        warc_path = "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260204051206-06668.warc.gz"
-
-        def fake_download(url, dest):
-            with open(dest, "w") as f:
-                f.write("fake")
-
-        mock_urlretrieve.side_effect = fake_download
-
-        download_warc_by_path(warc_path, new_dir)
+        with (
+            serve_files({f"/{self.WARC_PATH}": b"fake"}) as server,
+            patch("cc_news_analyzer.index.CC_NEWS_BASE_URL", server.url("")),
+        ):
+            download_warc_by_path(self.WARC_PATH, new_dir)
         self.assertTrue(os.path.isdir(new_dir))
 
     def test_empty_path_raises(self):
@@ -289,13 +378,138 @@ class TestDownloadWarcByPath(unittest.TestCase):
         with self.assertRaises(ValueError):
             download_warc_by_path("crawl-data/CC-NEWS/2026/02/", self.test_dir)
 
-    @patch("cc_news_analyzer.index.urllib.request.urlretrieve")
-    def test_network_error_propagates(self, mock_urlretrieve):
-        """Should propagate OSError from urlretrieve."""
-        mock_urlretrieve.side_effect = OSError("Network error")
-        warc_path = "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260204051206-06668.warc.gz"
+    @patch("cc_news_analyzer.index.urllib.request.urlopen")
+    def test_network_error_propagates(self, mock_urlopen):
+        """Should raise OSError when the server cannot be reached."""
+        mock_urlopen.side_effect = OSError("Network error")
         with self.assertRaises(OSError):
-            download_warc_by_path(warc_path, self.test_dir)
+            download_warc_by_path(self.WARC_PATH, self.test_dir)
+
+
+class TestDownloadWarc(unittest.TestCase):
+    """Tests for download_warc's resumable, verified transfers."""
+
+    DATA = bytes(range(256)) * 400
+
+    def setUp(self):
+        """Create a temporary directory for downloaded files."""
+        self.test_dir = tempfile.mkdtemp()
+        self.dest_path = os.path.join(self.test_dir, "test.warc.gz")
+        self.part_path = self.dest_path + PART_SUFFIX
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _read(self, path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_resumes_after_dropped_connection(self):
+        """Should resume a cut-off transfer with a Range request and verify the result."""
+        with serve_files({"/test.warc.gz": self.DATA}, truncate=1) as server:
+            result = download_warc(server.url("/test.warc.gz"), self.test_dir)
+
+        self.assertEqual(result, self.dest_path)
+        self.assertEqual(self._read(result), self.DATA)
+        self.assertFalse(os.path.exists(self.part_path))
+        self.assertEqual([r[2] for r in server.requests], [None, f"bytes={len(self.DATA) // 2}-"])
+
+    def test_resumes_leftover_part_file(self):
+        """Should continue from an existing .part file left by an earlier run."""
+        with open(self.part_path, "wb") as f:
+            f.write(self.DATA[:1000])
+
+        with serve_files({"/test.warc.gz": self.DATA}) as server:
+            download_warc(server.url("/test.warc.gz"), self.test_dir)
+
+        self.assertEqual(self._read(self.dest_path), self.DATA)
+        self.assertEqual(server.requests, [("GET", "/test.warc.gz", "bytes=1000-")])
+
+    def test_restarts_when_range_is_ignored(self):
+        """Should overwrite the .part file when the server sends the whole file."""
+        with open(self.part_path, "wb") as f:
+            f.write(b"stale")
+
+        with serve_files({"/test.warc.gz": self.DATA}, ranges=False) as server:
+            download_warc(server.url("/test.warc.gz"), self.test_dir)
+
+        self.assertEqual(self._read(self.dest_path), self.DATA)
+
+    def test_completes_finished_part_file(self):
+        """Should rename a .part file that already holds the whole body."""
+        with open(self.part_path, "wb") as f:
+            f.write(self.DATA)
+
+        with serve_files({"/test.warc.gz": self.DATA}) as server:
+            download_warc(server.url("/test.warc.gz"), self.test_dir)
+
+        self.assertEqual(self._read(self.dest_path), self.DATA)
+
+    def test_refetches_oversized_part_file(self):
+        """Should start over when the .part file is longer than the remote file."""
+        with open(self.part_path, "wb") as f:
+            f.write(self.DATA + b"extra")
+
+        with serve_files({"/test.warc.gz": self.DATA}) as server:
+            download_warc(server.url("/test.warc.gz"), self.test_dir)
+
+        self.assertEqual(self._read(self.dest_path), self.DATA)
+
+    def test_incomplete_download_keeps_part_file(self):
+        """Should fail without creating the final file when every attempt is cut off."""
+        with serve_files({"/test.warc.gz": self.DATA}, truncate=10) as server, self.assertRaises(OSError) as ctx:
+            download_warc(server.url("/test.warc.gz"), self.test_dir, retries=1)
+
+        self.assertIn("incomplete", str(ctx.exception))
+        self.assertFalse(os.path.exists(self.dest_path))
+        self.assertTrue(os.path.exists(self.part_path))
+
+    def test_skips_existing_file(self):
+        """Should not contact the server when the final file already exists."""
+        with open(self.dest_path, "wb") as f:
+            f.write(self.DATA)
+
+        with serve_files({"/test.warc.gz": self.DATA}) as server:
+            result = download_warc(server.url("/test.warc.gz"), self.test_dir)
+
+        self.assertEqual(result, self.dest_path)
+        self.assertEqual(server.requests, [])
+
+    def test_http_error_is_not_retried(self):
+        """Should raise HTTP errors such as 404 straight away."""
+        with serve_files({}) as server, self.assertRaises(urllib.error.HTTPError):
+            download_warc(server.url("/missing.warc.gz"), self.test_dir)
+
+        self.assertEqual(len(server.requests), 1)
+
+    def test_result_records_transfer_counters(self):
+        """Should fill in the status, retries and bytes of a resumed transfer."""
+        result = DownloadResult("test.warc.gz")
+        with serve_files({"/test.warc.gz": self.DATA}, truncate=1) as server:
+            download_warc(server.url("/test.warc.gz"), self.test_dir, result=result)
+
+        self.assertEqual(result.local_path, self.dest_path)
+        self.assertEqual(result.size, len(self.DATA))
+        self.assertEqual(result.status, 206)
+        self.assertEqual(result.retries, 1)
+        self.assertEqual(result.bytes_transferred, len(self.DATA))
+        self.assertGreater(result.wall_seconds, 0)
+
+    def test_result_of_skipped_and_failed_downloads(self):
+        """Should report no transfer for an existing file and the status of an HTTP error."""
+        with open(self.dest_path, "wb") as f:
+            f.write(self.DATA)
+        skipped, failed = DownloadResult("test.warc.gz"), DownloadResult("missing.warc.gz")
+
+        with serve_files({}) as server:
+            download_warc(server.url("/test.warc.gz"), self.test_dir, result=skipped)
+            with self.assertRaises(urllib.error.HTTPError):
+                download_warc(server.url("/missing.warc.gz"), self.test_dir, result=failed)
+
+        self.assertEqual((skipped.status, skipped.bytes_transferred, skipped.size), (None, 0, len(self.DATA)))
+        self.assertEqual(failed.status, 404)
+        self.assertIsNone(failed.local_path)
 
 
 class TestBuildWarcUrls(unittest.TestCase):
@@ -392,6 +606,51 @@ class TestResolveWarcPath(unittest.TestCase):
 
             shutil.rmtree(index_dir, ignore_errors=True)
 
+    def test_bare_filename_resolved_from_any_cached_month(self):
+        """Should resolve bare filenames from every month in the index cache."""
+        with tempfile.TemporaryDirectory() as index_dir:
+            for month in (1, 2):
+                path = month_index_path(2026, month, index_dir)
+                os.makedirs(os.path.dirname(path))
+                with open(path, "w") as f:
+                    json.dump({"fetched_at": 0, "paths": [f"crawl-data/CC-NEWS/2026/{month:02d}/m{month}.warc.gz"]}, f)
+
+            for month in (1, 2):
+                self.assertEqual(
+                    resolve_warc_path(f"m{month}.warc.gz", index_dir=index_dir),
+                    f"crawl-data/CC-NEWS/2026/{month:02d}/m{month}.warc.gz",
+                )
+
+    def test_newer_month_wins_and_map_is_saved(self):
+        """Should prefer the newest month for duplicate names and save the map to disk."""
+        with tempfile.TemporaryDirectory() as index_dir:
+            for month in (1, 2):
+                path = month_index_path(2026, month, index_dir)
+                os.makedirs(os.path.dirname(path))
+                with open(path, "w") as f:
+                    json.dump({"fetched_at": 0, "paths": [f"crawl-data/CC-NEWS/2026/{month:02d}/dup.warc.gz"]}, f)
+
+            self.assertEqual(
+                resolve_warc_path("dup.warc.gz", index_dir=index_dir), "crawl-data/CC-NEWS/2026/02/dup.warc.gz"
+            )
+            self.assertTrue(os.path.isfile(os.path.join(index_dir, "index", "basenames.json")))
+
+    def test_basename_map_is_rebuilt_when_an_index_changes(self):
+        """Should pick up a month index written after the map was built."""
+        with tempfile.TemporaryDirectory() as index_dir:
+            path = month_index_path(2026, 3, index_dir)
+            os.makedirs(os.path.dirname(path))
+            with open(path, "w") as f:
+                json.dump({"fetched_at": 0, "paths": ["crawl-data/CC-NEWS/2026/03/a.warc.gz"]}, f)
+            self.assertEqual(load_basename_index(index_dir), {"a.warc.gz": "crawl-data/CC-NEWS/2026/03/a.warc.gz"})
+
+            with open(path, "w") as f:
+                json.dump({"fetched_at": 0, "paths": ["crawl-data/CC-NEWS/2026/03/b.warc.gz", "x/y/c.warc.gz"]}, f)
+            os.utime(path, ns=(0, 1))
+
+            self.assertEqual(resolve_warc_path("c.warc.gz", index_dir=index_dir), "x/y/c.warc.gz")
+            self.assertNotIn("a.warc.gz", load_basename_index(index_dir))
+
     def test_bare_filename_no_index_file_raises(self):
         """Should raise ValueError when no local index file exists."""
         with self.assertRaises(ValueError) as ctx:
@@ -412,5 +671,112 @@ class TestResolveWarcPath(unittest.TestCase):
             resolve_warc_path("   ")
 
 
+class TestDownloadWarcs(unittest.TestCase):
+    """Tests for download_warcs."""
+
+    def setUp(self):
+        """Create a temporary directory for downloaded files."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _fake_download(self, url, dest_dir, *, result=None):
+        if "bad" in url:
+            raise OSError("Connection reset")
+        dest = os.path.join(dest_dir, os.path.basename(url))
+        with open(dest, "w") as f:
+            f.write(os.path.basename(dest))
+        result.local_path, result.size = dest, os.path.getsize(dest)
+        return dest
+
+    @patch("cc_news_analyzer.index.download_warc")
+    def test_returns_results_in_input_order(self, mock_download):
+        """Should download every path and return results in the order given."""
+        mock_download.side_effect = self._fake_download
+        paths = [f"crawl-data/CC-NEWS/2026/02/CC-NEWS-{n}.warc.gz" for n in range(6)]
+
+        results = download_warcs(paths, self.test_dir, parallel=3)
+
+        self.assertEqual([r.warc_path for r in results], paths)
+        self.assertEqual(mock_download.call_count, 6)
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertEqual(result.size, os.path.getsize(result.local_path))
+
+    @patch("cc_news_analyzer.index.download_warc")
+    def test_failures_do_not_stop_the_batch(self, mock_download):
+        """Should record a failed download and keep downloading the rest."""
+        mock_download.side_effect = self._fake_download
+        paths = ["crawl-data/good-1.warc.gz", "crawl-data/bad.warc.gz", "crawl-data/good-2.warc.gz"]
+        reported = []
+
+        results = download_warcs(paths, self.test_dir, parallel=2, on_result=reported.append)
+
+        self.assertEqual([r.error is None for r in results], [True, False, True])
+        self.assertIsNone(results[1].local_path)
+        self.assertIn("Connection reset", str(results[1].error))
+        self.assertCountEqual(reported, results)
+
+
+class TestPrefetchingReader(unittest.TestCase):
+    """Tests for PrefetchingReader."""
+
+    def test_reads_whole_stream(self):
+        """Should return the source bytes unchanged across chunk boundaries."""
+        data = bytes(range(256)) * 100
+        reader = PrefetchingReader(io.BytesIO(data), chunk_size=1000, depth=2)
+
+        self.assertEqual(reader.read(10) + reader.read(), data)
+        self.assertEqual(reader.read(), b"")
+
+    def test_reraises_source_errors(self):
+        """Should raise errors from the source stream in the consuming thread."""
+        source = MagicMock()
+        source.read.side_effect = [b"abc", OSError("Connection reset")]
+        reader = PrefetchingReader(source)
+
+        self.assertEqual(reader.read(3), b"abc")
+        with self.assertRaises(OSError):
+            reader.read(3)
+
+    def test_keeps_raising_after_an_error(self):
+        """Should raise the source error again on later reads instead of waiting for more data."""
+        source = MagicMock()
+        source.read.side_effect = [OSError("Connection reset")]
+        reader = PrefetchingReader(source)
+        errors = []
+
+        def read_three_times():
+            for _ in range(3):
+                try:
+                    reader.read(3)
+                except OSError as exc:
+                    errors.append(exc)
+
+        thread = threading.Thread(target=read_three_times, daemon=True)
+        thread.start()
+        thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(errors), 3)
+        self.assertIs(errors[2], errors[0])
+
+
+class TestIsRemoteWarcPath(unittest.TestCase):
+    """Tests for is_remote_warc_path."""
+
+    def test_relative_paths_and_urls_are_remote(self):
+        """Should recognise dataset relative paths and full CC-NEWS URLs."""
+        self.assertTrue(is_remote_warc_path("crawl-data/CC-NEWS/2026/02/CC-NEWS-20260204051206-06668.warc.gz"))
+        self.assertTrue(is_remote_warc_path(f"{CC_NEWS_BASE_URL}/crawl-data/CC-NEWS/2026/02/x.warc.gz"))
+
+    def test_local_names_are_not_remote(self):
+        """Should not treat local paths or bare filenames as remote."""
+        self.assertFalse(is_remote_warc_path(".tmp/CC-NEWS-20260204051206-06668.warc.gz"))
+        self.assertFalse(is_remote_warc_path("CC-NEWS-20260204051206-06668.warc.gz"))
+
+
 if __name__ == "__main__":
     unittest.main()
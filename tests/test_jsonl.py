@@ -0,0 +1,104 @@
+"""Tests for cc_news_analyzer.jsonl and cc_news_analyzer.articles."""
+
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from cc_news_analyzer.articles import charset_of
+from cc_news_analyzer.jsonl import write_jsonl
+
+from tests.warc_fixtures import request, response, write_warc
+
+
+class TestCharsetOf(unittest.TestCase):
+    """Tests for charset_of()."""
+
+    def test_reads_charset_parameter(self):
+        """Should normalize declared charsets and fall back to UTF-8."""
+        cases = [
+            ("text/html; charset=ISO-8859-1", "iso8859-1"),
+            ('text/html; charset="windows-1252"', "cp1252"),
+            ("text/html", "utf-8"),
+            ("text/html; charset=no-such-codec", "utf-8"),
+        ]
+        for content_type, expected in cases:
+            with self.subTest(content_type=content_type):
+                self.assertEqual(charset_of(content_type), expected)
+
+
+class TestWriteJsonl(unittest.TestCase):
+    """Tests for write_jsonl()."""
+
+    def setUp(self):
+        """Write two WARC files with articles, other responses and requests."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.paths = []
+        self.record_ids = []
+        for i in range(2):
+            path = os.path.join(self.tmp_dir, f"{i}.warc.gz")
+            records = []
+            for n in range(20):
+                uri = f"http://example.com/{i}/{n}"
+                records.append(request(uri))
+                records.append(response(uri, f"<p>café {i}-{n}</p>".encode("latin-1"), "text/html; charset=latin-1"))
+                records.append(response(uri + ".json", b"{}", "application/json"))
+            ids = write_warc(path, records)
+            self.record_ids.extend(ids[2::3])
+            self.paths.append(path)
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _lines(self, data: bytes) -> list[dict]:
+        return [json.loads(line) for line in data.decode("utf-8").splitlines()]
+
+    def test_writes_one_decoded_article_per_line(self):
+        """Should write only articles, with their headers and the body decoded from its charset."""
+        output = io.BytesIO()
+
+        result = write_jsonl(self.paths[:1], output)
+
+        lines = self._lines(output.getvalue())
+        self.assertEqual(result.articles, 20)
+        self.assertEqual(result.bytes_written, len(output.getvalue()))
+        self.assertEqual([line["record_id"] for line in lines], self.record_ids[:20])
+        self.assertEqual(lines[3]["uri"], "http://example.com/0/3")
+        self.assertEqual(lines[3]["body"], "<p>café 0-3</p>")
+        self.assertEqual(lines[3]["content_type"], "text/html; charset=latin-1")
+        self.assertEqual(lines[3]["date"], "2026-02-01T00:00:00Z")
+
+    def test_parallel_output_matches_serial_output(self):
+        """Should write the same lines in the same order with workers, across files and within one file."""
+        for paths in (self.paths, self.paths[:1]):
+            with self.subTest(files=len(paths)):
+                serial, parallel = io.BytesIO(), io.BytesIO()
+                write_jsonl(paths, serial)
+                result = write_jsonl(paths, parallel, workers=4, spool_dir=self.tmp_dir)
+
+                self.assertEqual(parallel.getvalue(), serial.getvalue())
+                self.assertEqual(result.articles, 20 * len(paths))
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)), ["0.warc.gz", "1.warc.gz"])
+
+    def test_gzip_output(self):
+        """Compressed output should decompress to the uncompressed output."""
+        plain, compressed = io.BytesIO(), io.BytesIO()
+        write_jsonl(self.paths, plain)
+
+        result = write_jsonl(self.paths, compressed, workers=2, compress=True)
+
+        self.assertEqual(gzip.decompress(compressed.getvalue()), plain.getvalue())
+        self.assertEqual(result.bytes_written, len(compressed.getvalue()))
+
+    def test_raises_on_missing_file(self):
+        """Should raise FileNotFoundError before writing anything."""
+        with self.assertRaises(FileNotFoundError):
+            write_jsonl([os.path.join(self.tmp_dir, "missing.warc.gz")], io.BytesIO())
+
+
+if __name__ == "__main__":
+    unittest.main()
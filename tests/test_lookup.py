@@ -0,0 +1,145 @@
+"""Tests for cc_news_analyzer.lookup."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from cc_news_analyzer.articles import Article
+from cc_news_analyzer.cdx import read_record_at, sidecar_path
+from cc_news_analyzer.lookup import ArticleLookup, RecordCache, article_size
+
+from tests.warc_fixtures import request, response, write_warc
+
+
+def _article(record_id: str, size: int) -> Article:
+    return Article(record_id, "", "", "", b"x" * size)
+
+
+class TestRecordCache(unittest.TestCase):
+    """Tests for RecordCache."""
+
+    def test_evicts_least_recently_used_to_stay_within_bytes(self):
+        """Should evict the least recently used articles once the byte bound is reached."""
+        a, b, c = (_article(record_id, 1000) for record_id in "abc")
+        cache = RecordCache(2 * article_size(a))
+        cache.put(a)
+        cache.put(b)
+        self.assertIs(cache.get("a"), a)
+
+        cache.put(c)
+
+        self.assertEqual((len(cache), "b" in cache), (2, False))
+        self.assertEqual(cache.size, article_size(a) + article_size(c))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_large_article_evicts_several(self):
+        """Should evict as many articles as it takes to fit a large one."""
+        small = [_article(str(n), 100) for n in range(5)]
+        cache = RecordCache(sum(article_size(article) for article in small))
+        for article in small:
+            cache.put(article)
+
+        cache.put(_article("big", 2 * article_size(small[0]) - article_size(_article("big", 0))))
+
+        self.assertEqual([str(n) in cache for n in range(5)], [False, False, True, True, True])
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+    def test_article_larger_than_cache_is_not_cached(self):
+        """Should not cache an article larger than the whole cache, nor evict others for it."""
+        cache = RecordCache(article_size(_article("a", 100)))
+        cache.put(_article("a", 100))
+
+        cache.put(_article("big", 101))
+
+        self.assertEqual(("a" in cache, "big" in cache), (True, False))
+
+    def test_replacing_an_article_keeps_size_right(self):
+        """Should account for the old copy when an article is cached again."""
+        cache = RecordCache(10_000)
+        cache.put(_article("a", 100))
+        cache.put(_article("a", 300))
+        cache.discard("missing")
+
+        self.assertEqual((len(cache), cache.size), (1, article_size(_article("a", 300))))
+        cache.clear()
+        self.assertEqual((len(cache), cache.size), (0, 0))
+        with self.assertRaises(ValueError):
+            RecordCache(-1)
+
+
+class TestArticleLookup(unittest.TestCase):
+    """Tests for ArticleLookup."""
+
+    def setUp(self):
+        """Write a compressed and an uncompressed WARC file of requests and responses."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.paths = [os.path.join(self.tmp_dir, "a.warc.gz"), os.path.join(self.tmp_dir, "b.warc")]
+        self.record_ids = {}
+        for path in self.paths:
+            name = os.path.basename(path)
+            self.record_ids[path] = write_warc(
+                path,
+                [
+                    request(f"http://example.com/{name}"),
+                    response(f"http://example.com/{name}", f"<html>{name} café</html>".encode()),
+                    response(f"http://example.com/{name}.json", b"{}", "application/json"),
+                ],
+            )
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_finds_articles_in_every_file(self):
+        """Should return the article of a record ID from whichever file holds it, building missing indexes."""
+        with ArticleLookup(self.paths) as lookup:
+            for path in self.paths:
+                with self.subTest(path=os.path.basename(path)):
+                    record_id = self.record_ids[path][2]
+                    article = lookup.get_article(record_id)
+
+                    self.assertEqual(article.record_id, record_id)
+                    self.assertEqual(article.uri, f"http://example.com/{os.path.basename(path)}")
+                    self.assertGreater(article.offset, 0)
+                    self.assertEqual(
+                        lookup.get_article_contents(record_id), f"<html>{os.path.basename(path)} café</html>"
+                    )
+                    self.assertTrue(os.path.exists(sidecar_path(path)))
+
+    def test_non_articles_and_unknown_ids_are_none(self):
+        """Should return None for requests, non-HTML responses and unknown record IDs."""
+        request_id, _, json_id = self.record_ids[self.paths[0]][1:]
+
+        with ArticleLookup(self.paths) as lookup:
+            for record_id in (request_id, json_id, "<urn:uuid:missing>"):
+                self.assertIsNone(lookup.get_article(record_id))
+                self.assertIsNone(lookup.get_article_contents(record_id))
+            self.assertEqual(len(lookup.cache), 0)
+
+    def test_warm_lookups_do_not_read_the_file(self):
+        """Should decode a record once and serve repeated lookups from the cache."""
+        record_id = self.record_ids[self.paths[0]][2]
+
+        with ArticleLookup(self.paths) as lookup:
+            with patch("cc_news_analyzer.lookup.read_record_at", wraps=read_record_at) as read:
+                first = lookup.get_article(record_id)
+                second = lookup.get_article(record_id)
+
+            self.assertIs(first, second)
+            read.assert_called_once()
+            self.assertEqual((lookup.cache.hits, lookup.cache.misses), (1, 1))
+
+    def test_cache_size_is_configurable(self):
+        """Should not cache anything with a zero-byte cache."""
+        record_id = self.record_ids[self.paths[0]][2]
+
+        with ArticleLookup(self.paths, cache_bytes=0) as lookup:
+            self.assertEqual(lookup.get_article(record_id), lookup.get_article(record_id))
+            self.assertEqual((len(lookup.cache), lookup.cache.hits), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Tests for cc_news_analyzer.mapped."""
+
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+import unittest
+
+from cc_news_analyzer.cdx import RecordIndex, build_record_index
+from cc_news_analyzer.mapped import MappedWarc, open_mapped_warc
+from warcio.archiveiterator import ArchiveIterator
+from warcio.exceptions import ArchiveLoadFailed
+
+from tests.warc_fixtures import request, response, write_warc
+
+
+class TestMappedWarc(unittest.TestCase):
+    """Tests for MappedWarc."""
+
+    def setUp(self):
+        """Write an uncompressed WARC file with a warcinfo, a request and two responses."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.warc_path = os.path.join(self.tmp_dir, "test.warc")
+        self.record_ids = write_warc(
+            self.warc_path,
+            [
+                request("http://example.com/a"),
+                response("http://example.com/a", b"<html>caf\xc3\xa9</html>"),
+                response("http://example.com/b", b"{}", "application/json"),
+            ],
+        )
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_records_match_the_record_index(self):
+        """Should find the same records, offsets and lengths as ArchiveIterator."""
+        with RecordIndex(build_record_index(self.warc_path)) as index, MappedWarc(self.warc_path) as warc:
+            records = list(warc)
+            for entry, record in zip(index, records, strict=True):
+                self.assertEqual(
+                    (record.offset, record.length, len(record.block)),
+                    (entry.offset, entry.length, entry.content_length),
+                )
+                self.assertEqual(
+                    (record.warc_type, record.record_id, record.target_uri, record.date, record.content_type),
+                    (entry.warc_type, entry.record_id, entry.target_uri, entry.date, entry.content_type),
+                )
+                self.assertEqual(warc.record_at(entry.offset), record)
+            self.assertEqual([record.record_id for record in records], self.record_ids)
+
+    def test_payloads_are_views_of_the_map(self):
+        """Should expose the same payloads as ArchiveIterator, as memoryviews of the map."""
+        with open(self.warc_path, "rb") as f:
+            expected = [record.raw_stream.read() for record in ArchiveIterator(f)]
+
+        with MappedWarc(self.warc_path) as warc:
+            records = list(warc)
+            self.assertEqual([bytes(record.payload) for record in records], expected)
+            self.assertEqual(bytes(records[2].payload), b"<html>caf\xc3\xa9</html>")
+            self.assertEqual(hashlib.sha1(records[2].payload).digest(), hashlib.sha1(expected[2]).digest())
+            self.assertIsInstance(records[2].payload.obj, mmap.mmap)
+            self.assertEqual(records[0].payload, records[0].block)
+            self.assertTrue(bytes(records[2].block).startswith(b"HTTP/1.1 200"))
+            payload = records[2].payload
+            del records
+
+        # a view held past close keeps the map alive
+        self.assertEqual(bytes(payload), b"<html>caf\xc3\xa9</html>")
+
+    def test_rejects_compressed_and_non_warc_files(self):
+        """Should refuse gzip files and raise ArchiveLoadFailed where no record starts."""
+        gz_path = os.path.join(self.tmp_dir, "test.warc.gz")
+        write_warc(gz_path, [response("http://example.com/", b"<html></html>")])
+        self.assertIsNone(open_mapped_warc(gz_path))
+        with self.assertRaises(ValueError):
+            MappedWarc(gz_path)
+
+        bad = os.path.join(self.tmp_dir, "bad.warc")
+        with open(bad, "wb") as f:
+            f.write(b"<html>not a warc</html>\n")
+        with MappedWarc(bad) as warc, self.assertRaises(ArchiveLoadFailed):
+            list(warc)
+        with MappedWarc(self.warc_path) as warc, self.assertRaises(ArchiveLoadFailed):
+            warc.record_at(1)
+
+    def test_empty_file_has_no_records(self):
+        """Should map an empty file as one without records."""
+        empty = os.path.join(self.tmp_dir, "empty.warc")
+        open(empty, "wb").close()
+
+        with open_mapped_warc(empty) as warc:
+            self.assertEqual((warc.size, list(warc)), (0, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Tests for cc_news_analyzer.markdown module."""
+
+import unittest
+
+from cc_news_analyzer.markdown import convert_html_to_markdown, iter_markdown_blocks, join_blocks
+
+PAGE = """<!DOCTYPE html><html><head><title>Title</title><style>p { color: red }</style>
+<script>var html = "<p>not text</p>";</script></head>
+<body><header><nav><ul><li><a href="/">Home</a></li></ul></nav>
+<svg viewBox="0 0 10 10"><g><path d="M0 0"/></g><text>Logo</text></svg></header>
+<article><h1>Big  <em>news</em> today</h1>
+<p>First paragraph with <a href="https://example.com/a">a
+link</a>,<b> bold </b>text and <code>x = 1</code>.<br>Second line.</p>
+<ul><li>One</li><li>Two<ol><li>Sub</li></ol></li></ul>
+<blockquote><p>Quoted</p></blockquote>
+<pre>def f():
+    return 1</pre>
+<p>Caf&eacute; &amp; <a href="#top">back</a> <a href="javascript:void(0)">share</a></p>
+<form><button>Subscribe</button></form></article>
+<aside>Related stories</aside><footer>&copy; News</footer></body></html>"""
+
+
+class TestConvertHtmlToMarkdown(unittest.TestCase):
+    """Tests for convert_html_to_markdown()."""
+
+    def test_markdown(self):
+        """Should keep the article's structure as compact Markdown and drop page chrome."""
+        self.assertEqual(
+            convert_html_to_markdown(PAGE),
+            "# Big _news_ today\n\n"
+            "First paragraph with [a link](https://example.com/a), **bold** text and `x = 1`.\n"
+            "Second line.\n\n"
+            "- One\n"
+            "- Two\n"
+            "  1. Sub\n\n"
+            "> Quoted\n\n"
+            "```\ndef f():\n    return 1\n```\n\n"
+            "Café & back share",
+        )
+
+    def test_plain_text(self):
+        """Should emit the same blocks without Markdown markers."""
+        self.assertEqual(
+            convert_html_to_markdown(PAGE, text=True),
+            "Big news today\n\n"
+            "First paragraph with a link, bold text and x = 1.\n"
+            "Second line.\n\n"
+            "- One\n"
+            "- Two\n"
+            "  1. Sub\n\n"
+            "Quoted\n\n"
+            "def f():\n    return 1\n\n"
+            "Café & back share",
+        )
+
+    def test_nested_and_unclosed_skipped_elements(self):
+        """Should skip a nested skipped element whole, and an unclosed one up to the end of the body."""
+        html = "<div><nav>a<nav>b</nav>c</nav>kept</div><p>also kept<aside>lost"
+
+        self.assertEqual(convert_html_to_markdown(html), "kept\n\nalso kept")
+        self.assertEqual(convert_html_to_markdown("<body><nav>menu</body><p>after</p>"), "after")
+
+    def test_streaming_matches_whole_document(self):
+        """Should give the same result whatever the chunking, yielding blocks before the end."""
+        chunks = [PAGE[i : i + 7] for i in range(0, len(PAGE), 7)]
+        blocks = iter_markdown_blocks(chunks)
+
+        self.assertEqual(next(blocks), ("# Big _news_ today", False))
+        self.assertEqual(join_blocks([("# Big _news_ today", False), *blocks]), convert_html_to_markdown(PAGE))
+
+    def test_output_is_smaller_than_html(self):
+        """Should be a small fraction of a page that is mostly chrome."""
+        self.assertLess(len(convert_html_to_markdown(PAGE)), len(PAGE) / 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Tests for cc_news_analyzer.members module."""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from itertools import pairwise
+from unittest.mock import patch
+
+from cc_news_analyzer.cdx import RecordIndex, build_record_index, sidecar_path
+from cc_news_analyzer.members import RangeReader, find_member_start, is_record_member, split_member_ranges
+from cc_news_analyzer.warc import scan_warc
+
+from tests.warc_fixtures import request, response, write_warc
+
+
+class TestSplitMemberRanges(unittest.TestCase):
+    """Tests for split_member_ranges() and parallel scanning."""
+
+    def setUp(self):
+        """Write a WARC with enough records to split."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.records = []
+        for n in range(40):
+            self.records.append(request(f"http://example.com/{n}"))
+            body = b"<html>" + os.urandom(500 + 50 * n).hex().encode() + b"</html>"
+            self.records.append(response(f"http://example.com/{n}", body, "text/html" if n % 3 else "image/png"))
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write(self, name: str) -> str:
+        path = os.path.join(self.tmp_dir, name)
+        write_warc(path, self.records)
+        return path
+
+    def _assert_ranges_cover(self, ranges: list[tuple[int, int]], size: int) -> None:
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], size)
+        for (_, end), (start, _) in pairwise(ranges):
+            self.assertEqual(end, start)
+
+    def test_resyncs_on_gzip_members(self):
+        """Without a sidecar, every range should start at a record's gzip member."""
+        path = self._write("test.warc.gz")
+        with patch("cc_news_analyzer.members.RESYNC_WINDOW_SIZE", 1000):
+            ranges = split_member_ranges(path, 4)
+
+        self.assertEqual(len(ranges), 4)
+        self._assert_ranges_cover(ranges, os.path.getsize(path))
+        with open(path, "rb") as f:
+            for start, _ in ranges:
+                self.assertTrue(is_record_member(f, start))
+
+    def test_uses_sidecar_offsets(self):
+        """With a sidecar, every range should start at an indexed record offset."""
+        path = self._write("test.warc")
+        build_record_index(path)
+        with RecordIndex(sidecar_path(path)) as index:
+            offsets = {entry.offset for entry in index}
+
+        ranges = split_member_ranges(path, 3)
+
+        self.assertEqual(len(ranges), 3)
+        self._assert_ranges_cover(ranges, os.path.getsize(path))
+        self.assertTrue({start for start, _ in ranges} <= offsets)
+
+    def test_uncompressed_without_sidecar_is_one_range(self):
+        """Should not guess record boundaries in an unindexed plain WARC."""
+        path = self._write("test.warc")
+        self.assertEqual(split_member_ranges(path, 4), [(0, os.path.getsize(path))])
+
+    def test_parallel_scan_matches_serial(self):
+        """Scanning split ranges in parallel should match a serial scan."""
+        for name in ("test.warc.gz", "indexed.warc"):
+            path = self._write(name)
+            if name == "indexed.warc":
+                build_record_index(path)
+            for headers_only in (False, True):
+                with self.subTest(name=name, headers_only=headers_only):
+                    expected = scan_warc(path, headers_only=headers_only)
+                    self.assertEqual(scan_warc(path, headers_only=headers_only, workers=3), expected)
+
+    def test_parallel_scan_writes_complete_sidecar(self):
+        """The by-product sidecar from a parallel scan should index every record in order."""
+        path = self._write("test.warc.gz")
+
+        scan_warc(path, write_index=True, workers=3)
+
+        with RecordIndex(sidecar_path(path)) as index:
+            entries = list(index)
+        self.assertEqual(len(entries), len(self.records) + 1)
+        self.assertEqual([entry.offset for entry in entries], sorted(entry.offset for entry in entries))
+
+
+class TestFindMemberStart(unittest.TestCase):
+    """Tests for find_member_start()."""
+
+    def test_skips_false_magic(self):
+        """Should skip gzip magic bytes that do not start a WARC record member."""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, "one.warc.gz")
+            write_warc(path, [], warcinfo=True)
+            with open(path, "rb") as f:
+                member = f.read()
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        data = b"junk\x1f\x8b\x08not-a-member" + member
+        start = data.index(member)
+
+        self.assertEqual(find_member_start(io.BytesIO(data), 0, len(data)), start)
+        self.assertEqual(find_member_start(io.BytesIO(data), start + 1, len(data)), len(data))
+
+
+class TestRangeReader(unittest.TestCase):
+    """Tests for RangeReader."""
+
+    def test_reads_and_seeks_within_range(self):
+        """Should expose only the requested byte range, with absolute tell()."""
+        reader = RangeReader(io.BytesIO(b"0123456789"), 2, 8)
+
+        self.assertEqual(reader.read(2), b"23")
+        self.assertEqual(reader.tell(), 4)
+        reader.seek(1)
+        self.assertEqual(reader.read(), b"567")
+        self.assertEqual(reader.read(), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Tests for cc_news_analyzer.metrics."""
+
+import json
+import unittest
+
+from cc_news_analyzer.index import DownloadResult
+from cc_news_analyzer.metrics import RunMetrics
+from cc_news_analyzer.warc import WarcStats
+
+
+def _stats(records_by_type: dict[str, int], compressed_bytes: int) -> WarcStats:
+    """Create scan statistics with the given record counts and bytes read."""
+    return WarcStats(
+        records=sum(records_by_type.values()),
+        records_by_type=records_by_type,
+        compressed_bytes=compressed_bytes,
+        uncompressed_bytes=4 * compressed_bytes,
+        wall_seconds=0.5,
+        cpu_seconds=0.4,
+    )
+
+
+class TestRunMetrics(unittest.TestCase):
+    """Tests for RunMetrics.to_dict()."""
+
+    def test_totals_scans_and_downloads(self):
+        """Should total the counters of every file and download and list each of them."""
+        metrics = RunMetrics("count-records")
+        metrics.add_scans(
+            [
+                ("a.warc.gz", _stats({"request": 2, "response": 2}, 100)),
+                ("b.warc.gz", _stats({"response": 3, "warcinfo": 1}, 50)),
+            ]
+        )
+        metrics.add_download(
+            DownloadResult("c.warc.gz", "dest/c.warc.gz", 70, status=206, retries=1, bytes_transferred=30)
+        )
+        metrics.add_download(DownloadResult("d.warc.gz", error=OSError("refused")))
+        metrics.count("index_files", 2)
+
+        report = metrics.to_dict()
+
+        self.assertEqual(report["command"], "count-records")
+        self.assertEqual(report["records"], 8)
+        self.assertEqual(report["records_by_type"], {"request": 2, "response": 5, "warcinfo": 1})
+        self.assertEqual(report["compressed_bytes"], 150)
+        self.assertEqual(report["uncompressed_bytes"], 600)
+        self.assertEqual(report["bytes_transferred"], 30)
+        self.assertGreater(report["wall_seconds"], 0)
+        self.assertGreater(report["records_per_second"], 0)
+        self.assertEqual([entry["path"] for entry in report["files"]], ["a.warc.gz", "b.warc.gz"])
+        self.assertEqual(report["files"][1]["cpu_seconds"], 0.4)
+        self.assertEqual(
+            [(entry["status"], entry["retries"], entry["error"]) for entry in report["downloads"]],
+            [(206, 1, None), (None, 0, "refused")],
+        )
+        self.assertEqual(report["counts"], {"index_files": 2})
+        json.dumps(report)
+
+    def test_empty_run(self):
+        """Should report zeros, not divide by zero, when nothing was scanned or downloaded."""
+        report = RunMetrics("cache-prune").to_dict()
+
+        self.assertEqual(report["records"], 0)
+        self.assertEqual(report["compressed_mb_per_second"], 0.0)
+        self.assertEqual(report["files"], [])
+        self.assertEqual(report["downloads"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
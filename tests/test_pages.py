@@ -0,0 +1,167 @@
+"""Tests for cc_news_analyzer.pages."""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from cc_news_analyzer.cdx import sidecar_path
+from cc_news_analyzer.pages import (
+    PageTable,
+    build_page_table,
+    load_page_table,
+    open_page_table,
+    page_table_path,
+    read_title,
+    titles_from_page,
+)
+
+from tests.warc_fixtures import request, response, rewrite_in_place, write_warc
+
+
+class TestReadTitle(unittest.TestCase):
+    """Tests for read_title()."""
+
+    def test_reads_title_with_entities_and_whitespace(self):
+        """Should decode entities and collapse whitespace."""
+        body = b"<html><head><TITLE lang='en'>\n  Caf&eacute;   news </TITLE></head><body>x</body></html>"
+
+        self.assertEqual(read_title(io.BytesIO(body)), "Café news")
+
+    def test_stops_reading_after_the_title(self):
+        """Should read no further than the chunk holding </title>."""
+        stream = io.BytesIO(b"<title>Short</title>" + b"x" * 100_000)
+
+        self.assertEqual(read_title(stream), "Short")
+        self.assertLessEqual(stream.tell(), 4096)
+
+    def test_finds_an_end_tag_split_across_chunks(self):
+        """Should find </title> when it straddles two reads."""
+        body = b"<title>" + b"a" * (4096 - len(b"<title>") - 3) + b"</title>" + b"x" * 100_000
+        stream = io.BytesIO(body)
+
+        self.assertEqual(read_title(stream), "a" * (4096 - len(b"<title>") - 3))
+        self.assertEqual(stream.tell(), 8192)
+
+    def test_decodes_with_the_given_charset(self):
+        """Should decode the title with the body's charset."""
+        body = "<title>Überblick</title>".encode("latin-1")
+
+        self.assertEqual(read_title(io.BytesIO(body), "iso8859-1"), "Überblick")
+
+    def test_missing_title_within_limit_is_empty(self):
+        """Should return an empty title when there is none within the limit."""
+        self.assertEqual(read_title(io.BytesIO(b"<p>no title</p>")), "")
+        stream = io.BytesIO(b"x" * 10_000 + b"<title>late</title>")
+        self.assertEqual(read_title(stream, limit=5000), "")
+        self.assertEqual(stream.tell(), 5000)
+
+
+class TestPageTable(unittest.TestCase):
+    """Tests for build_page_table() and titles_from_page()."""
+
+    def setUp(self):
+        """Write WARC files with 23 articles between requests and other responses."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.paths = []
+        for extension in (".warc.gz", ".warc"):
+            path = os.path.join(self.tmp_dir, "test" + extension)
+            records = []
+            for n in range(23):
+                uri = f"http://example.com/{n}"
+                records.append(request(uri))
+                records.append(response(uri, f"<html><head><title>Story {n}</title></head><p>{n}</p>".encode()))
+                records.append(response(uri + ".css", b"p {}", "text/css"))
+            write_warc(path, records)
+            self.paths.append(path)
+        self.warc_path = self.paths[0]
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_pages_list_articles_in_order(self):
+        """Should return the same titles for every page whatever the stride."""
+        for path in self.paths:
+            for stride in (1, 4, 10, 50):
+                with self.subTest(path=os.path.basename(path), stride=stride):
+                    build_page_table(path, stride=stride)
+                    with load_page_table(path) as table:
+                        self.assertEqual(table.stride, stride)
+                        self.assertEqual(len(table), 23)
+                        self.assertEqual(table.page_count(5), 5)
+                        pages = [titles_from_page(path, 5, page, table=table) for page in range(1, 7)]
+
+                    self.assertEqual([len(page) for page in pages], [5, 5, 5, 5, 3, 0])
+                    titles = [title for page in pages for title in page]
+                    self.assertEqual([title.title for title in titles], [f"Story {n}" for n in range(23)])
+                    self.assertEqual([title.number for title in titles], list(range(23)))
+                    self.assertEqual(titles[7].uri, "http://example.com/7")
+
+    def test_builds_table_and_record_index_when_missing(self):
+        """Should build the record index and the page table on first use."""
+        titles = titles_from_page(self.warc_path, 3, 2)
+
+        self.assertEqual([title.title for title in titles], ["Story 3", "Story 4", "Story 5"])
+        self.assertTrue(os.path.exists(sidecar_path(self.warc_path)))
+        self.assertTrue(os.path.exists(page_table_path(self.warc_path)))
+
+    def test_stale_table_is_rebuilt(self):
+        """Should ignore a table built for another version of the file."""
+        build_page_table(self.warc_path)
+        write_warc(self.warc_path, [response("http://example.com/new", b"<title>New</title>")])
+
+        self.assertIsNone(open_page_table(self.warc_path))
+        self.assertEqual([title.title for title in titles_from_page(self.warc_path, 10, 1)], ["New"])
+
+    def test_corrupt_table_is_rebuilt(self):
+        """Should ignore an empty or truncated table and build a new one."""
+        table_path = build_page_table(self.warc_path, stride=1)
+        with open(table_path, "rb") as f:
+            contents = f.read()
+
+        # 16 bytes cut the header short; the rest keeps it but drops offsets
+        for truncated in (b"", contents[:16], contents[:-8]):
+            with self.subTest(size=len(truncated)):
+                with open(table_path, "wb") as f:
+                    f.write(truncated)
+                self.assertIsNone(open_page_table(self.warc_path))
+                self.assertEqual([title.title for title in titles_from_page(self.warc_path, 2, 12)], ["Story 22"])
+
+    def test_table_with_another_stride_is_rebuilt(self):
+        """Should rebuild a table whose stride differs from the one asked for, and keep it otherwise."""
+        build_page_table(self.warc_path, stride=4)
+
+        with load_page_table(self.warc_path) as table:
+            self.assertEqual(table.stride, 4)
+        with load_page_table(self.warc_path, stride=7) as table:
+            self.assertEqual(table.stride, 7)
+        with open_page_table(self.warc_path) as table:
+            self.assertEqual(table.stride, 7)
+
+    def test_table_of_a_file_rewritten_at_the_same_size_is_ignored(self):
+        """Should ignore a table once the file was modified, even if its size did not change."""
+        path = self.paths[1]
+        build_page_table(path)
+        rewrite_in_place(path)
+
+        self.assertIsNone(open_page_table(path))
+
+    def test_rejects_bad_arguments(self):
+        """Should reject non-positive page sizes, pages and strides."""
+        with self.assertRaises(ValueError):
+            titles_from_page(self.warc_path, 0, 1)
+        with self.assertRaises(ValueError):
+            titles_from_page(self.warc_path, 10, 0)
+        with self.assertRaises(ValueError):
+            build_page_table(self.warc_path, stride=0)
+
+    def test_rejects_other_files(self):
+        """Should raise ValueError when opening a file that is not a page table."""
+        path = os.path.join(self.tmp_dir, "bogus.pages")
+        with open(path, "wb") as f:
+            f.write(b"not a page table at all, really")
+
+        with self.assertRaises(ValueError):
+            PageTable(path)
@@ -0,0 +1,146 @@
+"""Tests for cc_news_analyzer.planner module."""
+
+import unittest
+from datetime import UTC, datetime, timedelta, timezone
+from unittest.mock import patch
+
+from cc_news_analyzer.planner import (
+    estimate_sizes,
+    months_between,
+    parse_datetime_bound,
+    parse_warc_timestamp,
+    plan_date_range,
+)
+
+from tests.http_fixtures import serve_files
+
+
+def _path(timestamp: str, serial: int) -> str:
+    return f"crawl-data/CC-NEWS/{timestamp[:4]}/{timestamp[4:6]}/CC-NEWS-{timestamp}-{serial:05d}.warc.gz"
+
+
+MONTH_INDEXES = {
+    (2026, 1): [_path("20260131180000", 1), _path("20260131220000", 2)],
+    (2026, 2): [
+        _path("20260201020000", 3),
+        _path("20260203000000", 5),
+        _path("20260202120000", 4),
+        _path("20260205120000", 6),
+        _path("20260207000000", 7),
+    ],
+    (2026, 3): [_path("20260301010000", 8)],
+}
+
+
+def _fake_fetch(year: int, month: int, dest_dir: str) -> list[str]:
+    if (year, month) not in MONTH_INDEXES:
+        raise OSError(f"HTTP Error 404: {year}-{month:02d}")
+    return MONTH_INDEXES[(year, month)]
+
+
+class TestParsing(unittest.TestCase):
+    """Tests for timestamp and range-bound parsing."""
+
+    def test_parse_warc_timestamp(self):
+        """Should read the UTC timestamp from a CC-NEWS filename or path."""
+        self.assertEqual(
+            parse_warc_timestamp(_path("20260204051206", 6668)),
+            datetime(2026, 2, 4, 5, 12, 6, tzinfo=UTC),
+        )
+        self.assertIsNone(parse_warc_timestamp("crawl-data/other.warc.gz"))
+
+    def test_parse_datetime_bound(self):
+        """Should accept dates and hour or minute precision, defaulting to UTC."""
+        self.assertEqual(parse_datetime_bound("2026-02-03"), datetime(2026, 2, 3, tzinfo=UTC))
+        self.assertEqual(parse_datetime_bound("2026-02-03T12"), datetime(2026, 2, 3, 12, tzinfo=UTC))
+        self.assertEqual(parse_datetime_bound("2026-02-03T12:30"), datetime(2026, 2, 3, 12, 30, tzinfo=UTC))
+        self.assertEqual(
+            parse_datetime_bound("2026-02-03T12:00+02:00"),
+            datetime(2026, 2, 3, 12, tzinfo=timezone(timedelta(hours=2))),
+        )
+
+    def test_parse_datetime_bound_invalid(self):
+        """Should raise ValueError for values that are not ISO dates."""
+        with self.assertRaises(ValueError):
+            parse_datetime_bound("03/02/2026")
+
+    def test_months_between_crosses_years(self):
+        """Should list every month between the bounds inclusive."""
+        self.assertEqual(
+            months_between(datetime(2025, 11, 30), datetime(2026, 2, 1)),
+            [(2025, 11), (2025, 12), (2026, 1), (2026, 2)],
+        )
+
+
+class TestPlanDateRange(unittest.TestCase):
+    """Tests for plan_date_range."""
+
+    def setUp(self):
+        """Serve month indexes from MONTH_INDEXES instead of the network."""
+        patcher = patch("cc_news_analyzer.planner.fetch_warc_paths", side_effect=_fake_fetch)
+        self.mock_fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _plan(self, start: str, end: str) -> list[str]:
+        planned = plan_date_range(parse_datetime_bound(start), parse_datetime_bound(end), ".tmp")
+        return [warc.warc_path for warc in planned]
+
+    def test_selects_covering_files(self):
+        """Should include the file running at the start and exclude one starting at the end."""
+        self.assertEqual(
+            self._plan("2026-02-03T00", "2026-02-05T12"),
+            [_path("20260203000000", 5)],
+        )
+        self.assertEqual(
+            self._plan("2026-02-02T13", "2026-02-05T12:00:01"),
+            [_path("20260202120000", 4), _path("20260203000000", 5), _path("20260205120000", 6)],
+        )
+
+    def test_start_covered_by_previous_month(self):
+        """Should reach into the previous month for the file running at the start."""
+        self.assertEqual(
+            self._plan("2026-02-01T00", "2026-02-02T00"),
+            [_path("20260131220000", 2), _path("20260201020000", 3)],
+        )
+
+    def test_range_spanning_months(self):
+        """Should fetch every month in the range and merge them in time order."""
+        planned = self._plan("2026-02-06", "2026-03-02")
+
+        self.assertEqual(planned, [_path("20260205120000", 6), _path("20260207000000", 7), _path("20260301010000", 8)])
+
+    def test_end_at_month_boundary_skips_next_month(self):
+        """An exclusive end at midnight on the 1st should not fetch that month."""
+        self._plan("2026-02-06", "2026-03-01")
+
+        self.assertNotIn((2026, 3, ".tmp"), [call.args for call in self.mock_fetch.call_args_list])
+
+    def test_missing_previous_month_is_tolerated(self):
+        """Should start from the first known file when the previous month has no index."""
+        self.assertEqual(self._plan("2026-01-01", "2026-01-31T19"), [_path("20260131180000", 1)])
+
+    def test_end_before_start_raises(self):
+        """Should reject an empty or inverted range."""
+        with self.assertRaises(ValueError):
+            self._plan("2026-02-05", "2026-02-05")
+
+
+class TestEstimateSizes(unittest.TestCase):
+    """Tests for estimate_sizes."""
+
+    def test_reports_sizes_from_head_requests(self):
+        """Should return Content-Length per file and None for files the server lacks."""
+        paths = [_path("20260203000000", 5), _path("20260205120000", 6)]
+
+        with (
+            serve_files({f"/{paths[0]}": b"x" * 1234}) as server,
+            patch("cc_news_analyzer.index.CC_NEWS_BASE_URL", server.url("")),
+        ):
+            sizes = estimate_sizes(paths, parallel=2)
+
+        self.assertEqual(sizes, [1234, None])
+        self.assertEqual({method for method, _, _ in server.requests}, {"HEAD"})
+
+
+if __name__ == "__main__":
+    unittest.main()
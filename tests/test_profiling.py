@@ -0,0 +1,108 @@
+"""Tests for cc_news_analyzer.profiling."""
+
+import io
+import os
+import pstats
+import shutil
+import tempfile
+import time
+import unittest
+import zlib
+
+from cc_news_analyzer.profiling import (
+    PHASES,
+    gzip_decompressor,
+    phase,
+    start_profiling,
+    stop_profiling,
+    timed_iter,
+    timed_stream,
+)
+from cc_news_analyzer.warc import scan_warc
+from warcio.bufferedreaders import BufferedReader
+
+from tests.warc_fixtures import request, response, write_warc
+
+
+class TestProfilingOff(unittest.TestCase):
+    """The instrumentation hooks should cost nothing while profiling is off."""
+
+    def test_hooks_return_their_arguments(self):
+        """Should hand back the original stream, iterable and a plain zlib decompressor."""
+        stream = io.BytesIO(b"data")
+        items = [1, 2]
+
+        self.assertIs(timed_stream(stream), stream)
+        self.assertIs(timed_iter(items, "parse"), items)
+        self.assertIsInstance(gzip_decompressor(), type(zlib.decompressobj()))
+        with phase("output"):
+            pass
+
+
+class TestProfiler(unittest.TestCase):
+    """Tests for start_profiling() and stop_profiling()."""
+
+    def setUp(self):
+        """Create a temporary directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_nested_phases_report_exclusive_time(self):
+        """A phase nested in another should not be counted twice."""
+        profiler = start_profiling()
+        with phase("parse"):
+            time.sleep(0.02)
+            with phase("open"):
+                time.sleep(0.05)
+        report = stop_profiling(profiler)
+
+        self.assertEqual(list(report.phases), list(PHASES))
+        self.assertGreaterEqual(report.phases["open"], 0.05)
+        self.assertGreaterEqual(report.phases["parse"], 0.02)
+        self.assertLess(report.phases["parse"], 0.05)
+        self.assertGreaterEqual(report.wall_seconds, sum(report.phases.values()))
+
+    def test_scan_is_broken_down_by_phase(self):
+        """Should charge a real scan to decompress, parse and filter and count its records."""
+        path = os.path.join(self.tmp_dir, "test.warc.gz")
+        write_warc(path, [request("http://example.com/"), response("http://example.com/", b"<html></html>" * 500)])
+
+        profiler = start_profiling()
+        stats = scan_warc(path)
+        report = stop_profiling(profiler)
+
+        self.assertEqual(report.records, stats.records)
+        for name in ("open", "decompress", "parse", "filter"):
+            with self.subTest(phase=name):
+                self.assertGreater(report.phases[name], 0)
+        self.assertGreater(report.records_per_second, 0)
+        self.assertGreater(report.peak_rss, 0)
+
+    def test_restores_warcio_decompressor(self):
+        """Should put warcio's own gzip decompressor back when profiling stops."""
+        original = BufferedReader.DECOMPRESSORS["gzip"]
+
+        profiler = start_profiling()
+        self.assertIsNot(BufferedReader.DECOMPRESSORS["gzip"], original)
+        stop_profiling(profiler)
+
+        self.assertIs(BufferedReader.DECOMPRESSORS["gzip"], original)
+        self.assertIs(timed_stream(io.BytesIO()).__class__, io.BytesIO)
+
+    def test_writes_pstats_file(self):
+        """Should write cProfile statistics readable by pstats."""
+        pstats_path = os.path.join(self.tmp_dir, "scan.pstats")
+
+        profiler = start_profiling(pstats_path)
+        sum(range(1000))
+        report = stop_profiling(profiler)
+
+        self.assertEqual(report.pstats_path, pstats_path)
+        self.assertGreater(pstats.Stats(pstats_path).total_calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+"""Tests for cc_news_analyzer.search."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from cc_news_analyzer.search import KeywordMatcher, Query, read_keywords, search_warcs
+from cc_news_analyzer.textindex import build_text_index
+from warcio.exceptions import ArchiveLoadFailed
+
+from tests.warc_fixtures import request, response, write_warc
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Tests for KeywordMatcher.count()."""
+
+    def test_counts_overlapping_keywords_in_one_pass(self):
+        """Should count every occurrence, including keywords inside other keywords."""
+        matcher = KeywordMatcher(["he", "she", "his", "hers"], case_sensitive=True)
+
+        self.assertEqual(matcher.count("ushers and his shed"), {"he": 2, "she": 2, "his": 1, "hers": 1})
+
+    def test_matches_brute_force(self):
+        """Should agree with counting each keyword separately."""
+        keywords = ["ab", "b", "abc", "cab", "bca", "a"]
+        text = "abcabcab cabbage abca"
+        expected = {keyword: sum(text.startswith(keyword, i) for i in range(len(text))) for keyword in keywords}
+
+        self.assertEqual(KeywordMatcher(keywords, case_sensitive=True).count(text), expected)
+
+    def test_case_folding(self):
+        """Should ignore case unless asked not to, reporting keywords as given."""
+        text = "Straße in NEW York, new york"
+
+        self.assertEqual(KeywordMatcher(["New York", "STRASSE"]).count(text), {"New York": 2, "STRASSE": 1})
+        self.assertEqual(KeywordMatcher(["New York"], case_sensitive=True).count(text), {})
+
+    def test_whole_word(self):
+        """Should skip occurrences inside longer words when whole_word is set."""
+        text = "rain, rainfall and brain; rain_gauge (rain)"
+
+        self.assertEqual(KeywordMatcher(["rain"]).count(text), {"rain": 5})
+        self.assertEqual(KeywordMatcher(["rain"], whole_word=True).count(text), {"rain": 2})
+
+    def test_whole_word_matches_words_in_sequence(self):
+        """Should match a whole-word phrase across any separators, but not across other words."""
+        text = "New-York, new  york; new jersey york"
+
+        self.assertEqual(KeywordMatcher(["new york"], whole_word=True).count(text), {"new york": 2})
+        self.assertEqual(KeywordMatcher(["a a"], whole_word=True).count("a a a"), {"a a": 2})
+        self.assertEqual(KeywordMatcher(["++"], whole_word=True).keywords, [])
+
+    def test_ignores_blank_and_duplicate_keywords(self):
+        """Should compile each keyword once."""
+        self.assertEqual(KeywordMatcher(["a", "", "  ", "a"]).keywords, ["a"])
+
+
+class TestQuery(unittest.TestCase):
+    """Tests for Query parsing and matching."""
+
+    def test_and_binds_tighter_than_or(self):
+        """Should read 'a b OR c' as '(a AND b) OR c'."""
+        query = Query("rain snow OR sun")
+
+        self.assertEqual(query.keywords, ["rain", "snow", "sun"])
+        self.assertEqual(query.count("Sun today"), {"sun": 1})
+        self.assertEqual(query.count("rain and snow, rain"), {"rain": 2, "snow": 1})
+        self.assertEqual(query.count("rain only"), {})
+
+    def test_parentheses_and_phrases(self):
+        """Should group with parentheses and match quoted phrases word by word."""
+        query = Query('climate AND ("carbon tax" OR covid-19)')
+
+        self.assertEqual(query.keywords, ["climate", "carbon tax", "covid 19"])
+        self.assertEqual(query.count("Climate: a CARBON, tax"), {"climate": 1, "carbon tax": 1})
+        self.assertEqual(query.count("climate, COVID 19"), {"climate": 1, "covid 19": 1})
+        self.assertEqual(query.count("climate carbon and tax"), {})
+
+    def test_malformed_queries(self):
+        """Should raise ValueError for malformed queries."""
+        for expression in ("", "a OR", "(a", "a)", 'a "b', "AND a", "a OR ()", "--"):
+            with self.subTest(expression=expression), self.assertRaises(ValueError):
+                Query(expression)
+
+
+class TestSearchWarcs(unittest.TestCase):
+    """Tests for search_warcs() and read_keywords()."""
+
+    def setUp(self):
+        """Write two WARC files of articles mentioning different keywords."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.paths = []
+        self.ids = []
+        for i in range(2):
+            path = os.path.join(self.tmp_dir, f"{i}.warc.gz")
+            records = [request("http://example.com/")]
+            for n in range(10):
+                body = b"<p>Election news</p>" if n % 3 == 0 else b"<p>Weather: rain, more rain</p>"
+                records.append(response(f"http://example.com/{i}/{n}", body))
+            records.append(response("http://example.com/x.json", b'"election"', "application/json"))
+            self.ids.append(write_warc(path, records))
+            self.paths.append(path)
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_finds_articles_with_counts(self):
+        """Should yield matching articles only, in file order, with per-keyword counts."""
+        hits = list(search_warcs(self.paths[:1], KeywordMatcher(["election", "rain"])))
+
+        self.assertEqual(len(hits), 10)
+        self.assertEqual(hits[0].record_id, self.ids[0][2])
+        self.assertEqual(hits[0].counts, {"election": 1})
+        self.assertEqual(hits[1].counts, {"rain": 2})
+        self.assertEqual(hits[1].uri, "http://example.com/0/1")
+
+    def test_parallel_search_matches_serial(self):
+        """Should find the same hits in the same order with workers."""
+        matcher = KeywordMatcher(["election"])
+        for paths in (self.paths, self.paths[:1]):
+            with self.subTest(files=len(paths)):
+                serial = list(search_warcs(paths, matcher))
+                parallel = list(search_warcs(paths, matcher, workers=3))
+
+                self.assertEqual(parallel, serial)
+                self.assertEqual(len(serial), 4 * len(paths))
+
+    def test_searches_text_not_markup(self):
+        """Should not match tag names, attributes or scripts."""
+        self.assertEqual(list(search_warcs(self.paths, KeywordMatcher(["<p>", "json"]))), [])
+
+    def test_text_index_gives_the_same_hits(self):
+        """Should answer word searches from a text index with the same results as a scan."""
+        searches = [
+            KeywordMatcher(["election news", "rain", "weather rain"], whole_word=True),
+            Query('(election OR "more rain") AND NOT_A_WORD OR weather'),
+        ]
+        scanned = [list(search_warcs(self.paths, matcher)) for matcher in searches]
+        build_text_index(self.paths[1])
+
+        for matcher, expected in zip(searches, scanned, strict=True):
+            with self.subTest(matcher=type(matcher).__name__):
+                self.assertEqual(list(search_warcs(self.paths, matcher)), expected)
+                self.assertGreater(len(expected), 0)
+
+    def test_scans_when_text_index_is_corrupt(self):
+        """Should fall back to scanning a file whose text index is empty or truncated."""
+        expected = list(search_warcs(self.paths[:1], Query("election")))
+        index_path = build_text_index(self.paths[0])
+
+        for contents in (b"", b"CCNXTIX1" + b"\0" * 32):
+            with self.subTest(size=len(contents)):
+                with open(index_path, "wb") as f:
+                    f.write(contents)
+                self.assertEqual(list(search_warcs(self.paths[:1], Query("election"))), expected)
+
+    def test_uses_text_index(self):
+        """Should read hits from the text index instead of the WARC when it is current."""
+        build_text_index(self.paths[0])
+        # same size and modification time, but no longer a WARC: only the index can answer
+        st = os.stat(self.paths[0])
+        with open(self.paths[0], "r+b") as f:
+            f.write(b"\0" * 64)
+        os.utime(self.paths[0], ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        hits = list(search_warcs(self.paths[:1], Query("election")))
+        self.assertEqual(len(hits), 4)
+        self.assertEqual(hits[0].record_id, self.ids[0][2])
+        for matcher, use_index in ((KeywordMatcher(["election"]), True), (Query("election"), False)):
+            with self.subTest(use_index=use_index), self.assertRaises(ArchiveLoadFailed):
+                list(search_warcs(self.paths[:1], matcher, use_index=use_index))
+
+    def test_read_keywords_skips_comments_and_blank_lines(self):
+        """Should read one stripped keyword per line."""
+        path = os.path.join(self.tmp_dir, "keywords.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# topics\nelection\n\n  climate change  \n")
+
+        self.assertEqual(read_keywords(path), ["election", "climate change"])
+
+
+if __name__ == "__main__":
+    unittest.main()
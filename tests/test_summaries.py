@@ -0,0 +1,96 @@
+"""Tests for cc_news_analyzer.summaries."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from cc_news_analyzer.cdx import build_record_index
+from cc_news_analyzer.summaries import extract_lede, extract_meta, summarize_articles
+
+from tests.warc_fixtures import response, write_warc
+
+PAGE = (
+    b"<html><head><title>Storm hits &amp; floods</title>"
+    b'<meta charset="utf-8"><meta name="Description" content="A  storm &quot;hit&quot; the coast.">'
+    b"<meta property='og:title' content='Storm'><meta property=og:type content=article>"
+    b'<meta name="description" content="A second description"></head>'
+    b"<body><nav><p>Home</p></nav><p>Short teaser.</p>"
+    b"<p>The storm reached the <b>coast</b> early on Sunday, flooding several towns.</p>"
+    b"<p>Second paragraph with more than eight words in it, too.</p></body></html>"
+)
+
+
+class TestExtractors(unittest.TestCase):
+    """Tests for extract_meta() and extract_lede()."""
+
+    def test_extracts_meta_tags_by_name_and_property(self):
+        """Should key meta contents by lowercased name or property, keeping the first of each."""
+        meta = extract_meta(PAGE, "utf-8")
+
+        self.assertEqual(
+            meta,
+            {"description": 'A storm "hit" the coast.', "og:title": "Storm", "og:type": "article"},
+        )
+
+    def test_lede_is_first_paragraph_long_enough(self):
+        """Should skip short paragraphs and strip tags from the lede."""
+        self.assertEqual(
+            extract_lede(PAGE, "utf-8"), "The storm reached the coast early on Sunday, flooding several towns."
+        )
+
+    def test_lede_cut_off_is_empty(self):
+        """Should return no lede when no long paragraph is complete."""
+        self.assertEqual(extract_lede(PAGE[: PAGE.index(b"early")], "utf-8"), "")
+
+
+class TestSummarizeArticles(unittest.TestCase):
+    """Tests for summarize_articles()."""
+
+    def setUp(self):
+        """Write a WARC file with two long articles and a JSON response."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.warc_path = os.path.join(self.tmp_dir, "test.warc.gz")
+        self.record_ids = write_warc(
+            self.warc_path,
+            [
+                response("http://example.com/storm", PAGE + b"x" * 100_000),
+                response("http://example.com/data.json", b"{}", "application/json"),
+                response("http://example.com/bare", b"<p>no head at all</p>" + b"y" * 100_000),
+            ],
+        )
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_summarizes_the_head_of_every_article(self):
+        """Should fill title, description and meta from the head, and no lede unless asked."""
+        storm, bare = summarize_articles(self.warc_path)
+
+        self.assertEqual(storm.record_id, self.record_ids[1])
+        self.assertEqual(storm.uri, "http://example.com/storm")
+        self.assertEqual(storm.title, "Storm hits & floods")
+        self.assertEqual(storm.description, 'A storm "hit" the coast.')
+        self.assertEqual(storm.meta["og:type"], "article")
+        self.assertEqual(storm.lede, "")
+        self.assertEqual((bare.title, bare.description, bare.meta), ("", "", {}))
+
+    def test_lede_reads_into_the_body(self):
+        """Should find the lede when asked, with or without the record index."""
+        for use_index in (False, True):
+            with self.subTest(use_index=use_index):
+                if use_index:
+                    build_record_index(self.warc_path)
+                storm, _ = summarize_articles(self.warc_path, lede=True, use_index=use_index)
+
+                self.assertEqual(storm.lede, "The storm reached the coast early on Sunday, flooding several towns.")
+
+    def test_og_description_wins(self):
+        """Should prefer og:description over the description meta tag."""
+        page = b'<head><meta name="description" content="plain"><meta property="og:description" content="og"></head>'
+        write_warc(self.warc_path, [response("http://example.com/", page)])
+
+        [summary] = summarize_articles(self.warc_path)
+
+        self.assertEqual(summary.description, "og")
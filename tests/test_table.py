@@ -0,0 +1,159 @@
+"""Tests for cc_news_analyzer.table."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import UTC, datetime
+
+from cc_news_analyzer import table as table_module
+from cc_news_analyzer.cdx import build_record_index
+from cc_news_analyzer.table import StringColumn, build_table, load_tables, open_table, table_path
+
+from tests.warc_fixtures import request, response, rewrite_in_place, write_warc
+
+np = table_module.np
+
+
+@unittest.skipIf(table_module.np is None, "NumPy is not installed")
+class TestMetadataTable(unittest.TestCase):
+    """Tests for building, loading and querying metadata tables."""
+
+    def setUp(self):
+        """Write two WARC files from different hosts and days."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.a = os.path.join(self.tmp_dir, "a.warc.gz")
+        self.a_ids = write_warc(
+            self.a,
+            [
+                request("http://One.example/x", date="2026-02-01T10:00:00Z"),
+                response("http://One.example/x", b"<html></html>", date="2026-02-01T10:00:00Z"),
+                response("http://two.example/y.json", b"{}", "application/json", date="2026-02-01T11:00:00Z"),
+            ],
+        )
+        self.b = os.path.join(self.tmp_dir, "b.warc")
+        self.b_ids = write_warc(
+            self.b,
+            [
+                response(
+                    "http://two.example/z", b"<html></html>", "Text/HTML; charset=latin-1", date="2026-02-02T00:00:00Z"
+                )
+            ],
+        )
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_build_and_open_round_trip(self):
+        """Should store every record's metadata in file order."""
+        build_table(self.a)
+        table = open_table(self.a)
+
+        self.assertEqual(len(table), 4)
+        self.assertEqual([table.record_id[i] for i in range(4)], self.a_ids)
+        row = table.row(2)
+        self.assertEqual(row["target_uri"], "http://One.example/x")
+        self.assertEqual(row["host"], "one.example")
+        self.assertEqual(row["content_type"], "text/html")
+        self.assertEqual(row["warc_type"], "response")
+        self.assertEqual(row["date"], int(datetime(2026, 2, 1, 10, tzinfo=UTC).timestamp()))
+        self.assertGreater(row["payload_length"], 0)
+        with open(self.a, "rb") as f:
+            f.seek(row["offset"])
+            self.assertEqual(f.read(3), b"\x1f\x8b\x08")
+
+    def test_built_from_sidecar_matches_scan(self):
+        """A table built from the record index sidecar should equal one built by scanning."""
+        build_table(self.a)
+        scanned = open_table(self.a).row(3)
+        build_record_index(self.a)
+        build_table(self.a)
+
+        self.assertEqual(open_table(self.a).row(3), scanned)
+
+    def test_stale_table_is_not_opened(self):
+        """Should ignore a table built for a different version of the file."""
+        build_table(self.a)
+        write_warc(self.a, [request("http://one.example/")])
+
+        self.assertIsNone(open_table(self.a))
+
+    def test_table_of_a_file_rewritten_at_the_same_size_is_not_opened(self):
+        """Should ignore a table once the file was modified, even if its size did not change."""
+        build_table(self.a)
+        rewrite_in_place(self.a)
+
+        self.assertIsNone(open_table(self.a))
+
+    def test_load_directory_as_one_table(self):
+        """Should build missing tables and concatenate files with merged vocabularies."""
+        table = load_tables([self.tmp_dir], workers=2)
+
+        self.assertTrue(os.path.isdir(table_path(self.a)))
+        self.assertEqual(len(table), 6)
+        self.assertEqual(table.files, [self.a, self.b])
+        self.assertEqual(table.value_counts("file"), {self.a: 4, self.b: 2})
+        self.assertEqual(table.value_counts("host", table.select(articles=True)), {"one.example": 1, "two.example": 1})
+        self.assertEqual(table.row(5)["record_id"], self.b_ids[1])
+        self.assertEqual(table.row(5)["file"], self.b)
+        with self.assertRaises(IndexError):
+            table.row(6)
+
+    def test_loaded_columns_stay_memory_mapped(self):
+        """Should return the mapped table of a single file, and the mapped tables of several, uncopied."""
+        single = load_tables([self.a])
+        several = load_tables([self.a, self.b])
+
+        self.assertIsInstance(single.date, np.memmap)
+        self.assertIsInstance(single.record_id.data, np.memmap)
+        self.assertEqual(single.files, [self.a])
+        self.assertEqual(single.value_counts("file"), {self.a: 4})
+        for table in several.tables:
+            self.assertIsInstance(table.offset, np.memmap)
+            self.assertIsInstance(table.target_uri.offsets, np.memmap)
+
+    def test_string_column_equals(self):
+        """Should mask exactly the rows equal to a string, whatever their length."""
+        column = StringColumn.from_strings(["abc", "abd", "", "abc", "ab", "xbc", "é"])
+
+        self.assertEqual(column.equals("abc").tolist(), [True, False, False, True, False, False, False])
+        self.assertEqual(column.equals("").tolist(), [False, False, True, False, False, False, False])
+        self.assertEqual(column.equals("é").tolist(), [False] * 6 + [True])
+        self.assertFalse(column.equals("abcd").any())
+        table = load_tables([self.a])
+        self.assertEqual(table.record_id.equals(self.a_ids[2]).nonzero()[0].tolist(), [2])
+
+    def test_select_filters(self):
+        """Should combine host, type, content type and date filters."""
+        table = load_tables([self.a, self.b])
+        cases = [
+            ({"hosts": ["TWO.example"]}, 2),
+            ({"warc_types": ["response"], "content_types": ["text/html"]}, 2),
+            ({"since": datetime(2026, 2, 1, 10, 30, tzinfo=UTC)}, 2),
+            ({"until": datetime(2026, 2, 1, 10, 30, tzinfo=UTC)}, 4),
+            ({"hosts": ["nowhere.example"]}, 0),
+            ({"record_ids": [self.b_ids[1]]}, 1),
+            ({"uris": ["http://One.example/x", "http://two.example/z"]}, 3),
+            ({"record_ids": [self.a_ids[2]], "uris": ["http://two.example/z"]}, 0),
+        ]
+        for filters, expected in cases:
+            with self.subTest(**filters):
+                self.assertEqual(int(table.select(**filters).sum()), expected)
+
+    def test_missing_column_file_is_named(self):
+        """Should name the column file missing from a current table."""
+        build_table(self.a)
+        os.remove(os.path.join(table_path(self.a), "host.npy"))
+
+        with self.assertRaisesRegex(ValueError, r"missing column file: .*host\.npy"):
+            open_table(self.a)
+
+    def test_load_without_build_raises(self):
+        """Should not build tables when asked not to."""
+        with self.assertRaises(FileNotFoundError):
+            load_tables([self.a], build=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+"""Tests for cc_news_analyzer.textindex module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from cc_news_analyzer.textindex import (
+    TextIndex,
+    _append_varint,
+    _decode_varints,
+    build_text_index,
+    open_text_index,
+    phrase_occurrences,
+    text_index_path,
+    tokenize,
+    word_positions,
+)
+
+from tests.warc_fixtures import request, response, rewrite_in_place, write_warc
+
+
+class TestTokenize(unittest.TestCase):
+    """Tests for tokenize() and the phrase helpers."""
+
+    def test_splits_on_non_word_characters(self):
+        """Should return case-folded runs of letters, digits and underscores."""
+        self.assertEqual(tokenize("COVID-19 in Straße; rain_gauge!"), ["covid", "19", "in", "strasse", "rain_gauge"])
+        self.assertEqual(tokenize("New York", fold_case=False), ["New", "York"])
+
+    def test_phrase_occurrences(self):
+        """Should count the positions where the words follow one another."""
+        positions = word_positions(tokenize("a b a b b a b"))
+
+        self.assertEqual(phrase_occurrences([positions["a"], positions["b"]]), 3)
+        self.assertEqual(phrase_occurrences([positions["b"], positions["a"]]), 2)
+        self.assertEqual(phrase_occurrences([positions["b"]]), 4)
+
+    def test_varint_round_trip(self):
+        """Should decode what was encoded, across byte boundaries."""
+        values = [0, 1, 127, 128, 300, 16383, 16384, 2**40]
+        buffer = bytearray()
+        for value in values:
+            _append_varint(buffer, value)
+
+        self.assertEqual(_decode_varints(bytes(buffer)), values)
+        self.assertEqual(_decode_varints(bytes([1, 2, 127])), [1, 2, 127])
+        self.assertEqual(len(buffer), 1 + 1 + 1 + 2 + 2 + 2 + 3 + 6)
+
+
+class TestTextIndex(unittest.TestCase):
+    """Tests for building and querying the text index sidecar."""
+
+    def setUp(self):
+        """Write a WARC file with three articles and a non-article."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "test.warc.gz")
+        self.record_ids = write_warc(
+            self.path,
+            [
+                request("http://example.com/1"),
+                response("http://example.com/1", b"<title>Rain</title><p>Rain in New York, new york</p>"),
+                response("http://example.com/x.json", b'"new york"', "application/json"),
+                response("http://example.com/2", b"<p>York, new</p><script>new york</script>"),
+                response("http://example.com/3", "<p>Caf&eacute; in Zürich</p>".encode()),
+            ],
+        )
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_documents_in_file_order(self):
+        """Should index each article with its record ID, URI and offset."""
+        with TextIndex(build_text_index(self.path)) as index:
+            self.assertEqual(len(index), 3)
+            self.assertEqual(
+                [index.document(i).record_id for i in range(3)],
+                [self.record_ids[2], self.record_ids[4], self.record_ids[5]],
+            )
+            self.assertEqual(index.document(1).uri, "http://example.com/2")
+            self.assertGreater(index.document(1).offset, index.document(0).offset)
+            with self.assertRaises(IndexError):
+                index.document(3)
+
+    def test_postings_and_positions(self):
+        """Should map each word of the text to its occurrences, ignoring markup and scripts."""
+        with TextIndex(build_text_index(self.path)) as index:
+            self.assertEqual(index.postings("new"), {0: 2, 1: 1})
+            self.assertEqual(index.postings("café"), {2: 1})
+            self.assertEqual(index.postings("script"), {})
+            self.assertEqual(index.positions("york"), {0: [4, 6], 1: [0]})
+            self.assertEqual(index.positions("york", [1]), {1: [0]})
+
+    def test_phrase(self):
+        """Should count only the occurrences of the words in sequence."""
+        with TextIndex(build_text_index(self.path)) as index:
+            self.assertEqual(index.phrase(["new", "york"]), {0: 2})
+            self.assertEqual(index.phrase(["york", "new"]), {0: 1, 1: 1})
+            self.assertEqual(index.phrase(["rain", "in"]), {0: 1})
+            self.assertEqual(index.phrase(["new", "zürich"]), {})
+
+    def test_open_text_index_rejects_stale_sidecar(self):
+        """Should ignore a missing sidecar or one built for a different file size."""
+        self.assertIsNone(open_text_index(self.path))
+        build_text_index(self.path)
+        index = open_text_index(self.path)
+        self.assertIsNotNone(index)
+        index.close()
+
+        with open(self.path, "ab") as f:
+            f.write(b"\0")
+        self.assertIsNone(open_text_index(self.path))
+
+    def test_open_text_index_rejects_sidecar_of_a_file_rewritten_at_the_same_size(self):
+        """Should ignore a sidecar once the file was modified, even if its size did not change."""
+        build_text_index(self.path)
+        rewrite_in_place(self.path)
+
+        self.assertIsNone(open_text_index(self.path))
+
+    def test_open_text_index_ignores_corrupt_sidecar(self):
+        """Should return None for an empty or truncated sidecar instead of raising."""
+        index_path = build_text_index(self.path)
+        with open(index_path, "rb") as f:
+            contents = f.read()
+
+        # 40 bytes cut the header short; 72 keep it but cut the sections it points to
+        for truncated in (b"", contents[:40], contents[:72]):
+            with self.subTest(size=len(truncated)):
+                with open(index_path, "wb") as f:
+                    f.write(truncated)
+                self.assertIsNone(open_text_index(self.path))
+
+    def test_rejects_non_index_file(self):
+        """Should raise ValueError for a file that is not a text index."""
+        with open(text_index_path(self.path), "wb") as f:
+            f.write(b"not an index at all, but long enough to unpack a header from it..........")
+
+        with self.assertRaises(ValueError):
+            TextIndex(text_index_path(self.path))
+
+    def test_missing_warc(self):
+        """Should raise FileNotFoundError for a missing WARC file."""
+        with self.assertRaises(FileNotFoundError):
+            build_text_index(os.path.join(self.tmp_dir, "missing.warc.gz"))
+
+
+if __name__ == "__main__":
+    unittest.main()
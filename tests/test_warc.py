@@ -1,9 +1,28 @@
 """Tests for cc_news_analyzer.warc module."""
 
+import gzip
+import io
+import os
+import shutil
+import tempfile
 import unittest
 from unittest.mock import MagicMock, mock_open, patch
 
-from cc_news_analyzer.warc import count_articles
+from cc_news_analyzer.cdx import build_record_index
+from cc_news_analyzer.warc import (
+    WarcStats,
+    count_articles,
+    count_records,
+    expand_warc_inputs,
+    iter_payload_prefixes,
+    read_prefix,
+    scan_warc,
+    scan_warc_files,
+)
+from warcio.exceptions import ArchiveLoadFailed
+
+from tests.http_fixtures import serve_files
+from tests.warc_fixtures import request, response, write_warc
 
 
 def _make_record(warc_type, content_type=None, has_http_headers=True):
@@ -26,6 +45,14 @@ def _make_record(warc_type, content_type=None, has_http_headers=True):
     return record
 
 
+def _archive_iterator(records):
+    """Create a mock ArchiveIterator yielding the given records."""
+    iterator = MagicMock()
+    iterator.__iter__.return_value = iter(records)
+    iterator.reader.num_read = 0
+    return iterator
+
+
 class TestCountArticles(unittest.TestCase):
     """Tests for count_articles()."""
 
@@ -39,12 +66,14 @@ class TestCountArticles(unittest.TestCase):
     @patch("cc_news_analyzer.warc.os.path.isfile", return_value=True)
     def test_counts_only_response_records_with_html(self, _mock_isfile, _mock_open, mock_iterator):
         """Should count only response records with text/html content type."""
-        mock_iterator.return_value = [
-            _make_record("response", "text/html"),
-            _make_record("request"),
-            _make_record("response", "text/html"),
-            _make_record("warcinfo", has_http_headers=False),
-        ]
+        mock_iterator.return_value = _archive_iterator(
+            [
+                _make_record("response", "text/html"),
+                _make_record("request"),
+                _make_record("response", "text/html"),
+                _make_record("warcinfo", has_http_headers=False),
+            ]
+        )
 
         result = count_articles("test.warc")
 
@@ -55,12 +84,14 @@ class TestCountArticles(unittest.TestCase):
     @patch("cc_news_analyzer.warc.os.path.isfile", return_value=True)
     def test_ignores_non_html_responses(self, _mock_isfile, _mock_open, mock_iterator):
         """Should not count response records with non-HTML content types."""
-        mock_iterator.return_value = [
-            _make_record("response", "text/html"),
-            _make_record("response", "application/json"),
-            _make_record("response", "image/png"),
-            _make_record("response", "application/pdf"),
-        ]
+        mock_iterator.return_value = _archive_iterator(
+            [
+                _make_record("response", "text/html"),
+                _make_record("response", "application/json"),
+                _make_record("response", "image/png"),
+                _make_record("response", "application/pdf"),
+            ]
+        )
 
         result = count_articles("test.warc")
 
@@ -71,10 +102,12 @@ class TestCountArticles(unittest.TestCase):
     @patch("cc_news_analyzer.warc.os.path.isfile", return_value=True)
     def test_ignores_request_records(self, _mock_isfile, _mock_open, mock_iterator):
         """Should not count request records even if they reference HTML."""
-        mock_iterator.return_value = [
-            _make_record("request", "text/html"),
-            _make_record("request"),
-        ]
+        mock_iterator.return_value = _archive_iterator(
+            [
+                _make_record("request", "text/html"),
+                _make_record("request"),
+            ]
+        )
 
         result = count_articles("test.warc")
 
@@ -85,9 +118,11 @@ class TestCountArticles(unittest.TestCase):
     @patch("cc_news_analyzer.warc.os.path.isfile", return_value=True)
     def test_ignores_warcinfo_records(self, _mock_isfile, _mock_open, mock_iterator):
         """Should not count warcinfo records."""
-        mock_iterator.return_value = [
-            _make_record("warcinfo", has_http_headers=False),
-        ]
+        mock_iterator.return_value = _archive_iterator(
+            [
+                _make_record("warcinfo", has_http_headers=False),
+            ]
+        )
 
         result = count_articles("test.warc")
 
@@ -98,7 +133,7 @@ class TestCountArticles(unittest.TestCase):
     @patch("cc_news_analyzer.warc.os.path.isfile", return_value=True)
     def test_returns_zero_for_empty_warc(self, _mock_isfile, _mock_open, mock_iterator):
         """Should return zero when the WARC file has no records."""
-        mock_iterator.return_value = []
+        mock_iterator.return_value = _archive_iterator([])
 
         result = count_articles("test.warc")
 
@@ -109,10 +144,12 @@ class TestCountArticles(unittest.TestCase):
     @patch("cc_news_analyzer.warc.os.path.isfile", return_value=True)
     def test_counts_html_with_charset(self, _mock_isfile, _mock_open, mock_iterator):
         """Should count response records with text/html; charset=utf-8."""
-        mock_iterator.return_value = [
-            _make_record("response", "text/html; charset=utf-8"),
-            _make_record("response", "text/html; charset=iso-8859-1"),
-        ]
+        mock_iterator.return_value = _archive_iterator(
+            [
+                _make_record("response", "text/html; charset=utf-8"),
+                _make_record("response", "text/html; charset=iso-8859-1"),
+            ]
+        )
 
         result = count_articles("test.warc")
 
@@ -123,14 +160,342 @@ class TestCountArticles(unittest.TestCase):
     @patch("cc_news_analyzer.warc.os.path.isfile", return_value=True)
     def test_response_without_http_headers(self, _mock_isfile, _mock_open, mock_iterator):
         """Should not count response records that lack HTTP headers."""
-        mock_iterator.return_value = [
-            _make_record("response", has_http_headers=False),
-        ]
+        mock_iterator.return_value = _archive_iterator(
+            [
+                _make_record("response", has_http_headers=False),
+            ]
+        )
 
         result = count_articles("test.warc")
 
         self.assertEqual(result, 0)
 
 
+class TestScanWarc(unittest.TestCase):
+    """Tests for scan_warc() against real WARC files."""
+
+    def setUp(self):
+        """Create a temporary directory for WARC files."""
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write(self, name: str) -> str:
+        """Write a small mixed WARC and return its path."""
+        path = os.path.join(self.tmp_dir, name)
+        write_warc(
+            path,
+            [
+                request("http://example.com/a", date="2026-02-04T05:12:06Z"),
+                response("http://example.com/a", b"<html>a</html>", date="2026-02-04T05:12:07Z"),
+                response("http://example.com/b.json", b"{}", "application/json", date="2026-02-03T01:00:00Z"),
+                response("http://example.com/c", b"<html>c</html>", "TEXT/HTML", date="2026-02-05T00:00:00Z"),
+            ],
+            warcinfo=True,
+        )
+        return path
+
+    def test_raises_on_missing_file(self):
+        """Should raise FileNotFoundError when the file does not exist."""
+        with self.assertRaises(FileNotFoundError):
+            scan_warc("/no/such/file.warc.gz")
+
+    def test_gathers_all_statistics_in_one_pass(self):
+        """Should report counts, histogram, bytes and date range for both formats."""
+        for name in ("mixed.warc.gz", "mixed.warc"):
+            with self.subTest(name=name):
+                stats = scan_warc(self._write(name))
+
+                self.assertEqual(stats.records, 5)
+                self.assertEqual(stats.records_by_type, {"warcinfo": 1, "request": 1, "response": 3})
+                self.assertEqual(stats.articles, 1)
+                self.assertEqual(stats.content_types, {"text/html": 2, "application/json": 1})
+                self.assertGreater(stats.payload_bytes, 0)
+                self.assertEqual(stats.max_date, "2026-02-05T00:00:00Z")
+                self.assertEqual(stats.min_date, "2026-02-01T00:00:00Z")
+
+    def test_count_functions_agree_with_scan(self):
+        """count_records and count_articles should be views over scan_warc."""
+        path = self._write("mixed.warc.gz")
+        stats = scan_warc(path)
+
+        self.assertEqual(count_records(path), stats.records)
+        self.assertEqual(count_articles(path), stats.articles)
+
+    def test_reports_bytes_read_and_time_of_every_scanner(self):
+        """Every scanner should count the same compressed and uncompressed bytes."""
+        path = self._write("mixed.warc.gz")
+        with gzip.open(path) as f:
+            uncompressed = len(f.read())
+        options = [{}, {"headers_only": True}, {"write_index": True}, {"workers": 2}]
+        for kwargs in options:
+            with self.subTest(**kwargs):
+                stats = scan_warc(path, **kwargs)
+
+                self.assertEqual(stats.compressed_bytes, os.path.getsize(path))
+                self.assertEqual(stats.uncompressed_bytes, uncompressed)
+                self.assertGreater(stats.wall_seconds, 0)
+                self.assertGreater(stats.records_per_second, 0)
+                self.assertFalse(stats.from_cache)
+
+    def test_cached_result_reads_nothing(self):
+        """A cache hit should equal the scan that stored it but report no bytes read."""
+        path = self._write("mixed.warc.gz")
+        cache_dir = os.path.join(self.tmp_dir, "cache")
+
+        scanned = scan_warc(path, cache_dir=cache_dir)
+        cached = scan_warc(path, cache_dir=cache_dir)
+
+        self.assertEqual(cached, scanned)
+        self.assertTrue(cached.from_cache)
+        self.assertEqual(cached.compressed_bytes, 0)
+        self.assertEqual(cached.uncompressed_bytes, 0)
+
+
+class TestExpandWarcInputs(unittest.TestCase):
+    """Tests for expand_warc_inputs()."""
+
+    def setUp(self):
+        """Create a directory with WARC and non-WARC files."""
+        self.tmp_dir = tempfile.mkdtemp()
+        for name in ("b.warc.gz", "a.warc", "warc.paths", "c.warc.gz"):
+            with open(os.path.join(self.tmp_dir, name), "w") as f:
+                f.write("x")
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_expands_directories_globs_and_files(self):
+        """Should expand each kind of input, sorted and without duplicates."""
+        a, b, c = (os.path.join(self.tmp_dir, n) for n in ("a.warc", "b.warc.gz", "c.warc.gz"))
+        cases = [
+            ([self.tmp_dir], [a, b, c]),
+            ([os.path.join(self.tmp_dir, "*.gz")], [b, c]),
+            ([os.path.join(self.tmp_dir, "*")], [a, b, c]),
+            ([c, self.tmp_dir], [c, a, b]),
+            (["missing.warc.gz"], ["missing.warc.gz"]),
+        ]
+        for inputs, expected in cases:
+            with self.subTest(inputs=inputs):
+                self.assertEqual(expand_warc_inputs(inputs), expected)
+
+
+class TestScanWarcFiles(unittest.TestCase):
+    """Tests for scan_warc_files()."""
+
+    def setUp(self):
+        """Write two small WARC files."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.paths = []
+        for i in range(2):
+            path = os.path.join(self.tmp_dir, f"{i}.warc.gz")
+            write_warc(path, [response(f"http://example.com/{n}", b"<html></html>") for n in range(i + 1)])
+            self.paths.append(path)
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_serial_and_pooled_results_match(self):
+        """Should return per-file stats in input order with or without a pool."""
+        serial = scan_warc_files(self.paths)
+        pooled = scan_warc_files(self.paths, workers=2)
+
+        self.assertEqual(serial, pooled)
+        self.assertEqual([path for path, _ in pooled], self.paths)
+        self.assertEqual([stats.articles for _, stats in pooled], [1, 2])
+
+    def test_load_error_names_the_file(self):
+        """Should prefix ArchiveLoadFailed messages with the failing path."""
+        bad = os.path.join(self.tmp_dir, "bad.warc")
+        with open(bad, "w") as f:
+            f.write("this is not a warc file")
+
+        with self.assertRaises(ArchiveLoadFailed) as ctx:
+            scan_warc_files([self.paths[0], bad], headers_only=True)
+        self.assertIn(bad, str(ctx.exception))
+
+
+class TestWarcStatsMerge(unittest.TestCase):
+    """Tests for WarcStats.merge()."""
+
+    def test_merges_counts_histograms_and_dates(self):
+        """Should sum counters and widen the date range."""
+        left = WarcStats()
+        left.add_record("response", "<urn:1>", "text/html", 10, "2026-02-02T00:00:00Z")
+        right = WarcStats()
+        right.add_record("response", "<urn:2>", "text/html; charset=utf-8", 5, "2026-02-01T00:00:00Z")
+        right.add_record("request", "<urn:3>", "", 0, "2026-02-03T00:00:00Z")
+
+        left.merge(right)
+
+        self.assertEqual(left.records, 3)
+        self.assertEqual(left.articles, 2)
+        self.assertEqual(left.records_by_type, {"response": 2, "request": 1})
+        self.assertEqual(left.content_types, {"text/html": 2})
+        self.assertEqual(left.payload_bytes, 15)
+        self.assertEqual((left.min_date, left.max_date), ("2026-02-01T00:00:00Z", "2026-02-03T00:00:00Z"))
+
+    def test_merge_into_empty_stats(self):
+        """Merging into empty stats should copy the other side."""
+        other = WarcStats()
+        other.add_record("warcinfo", "<urn:1>", "", 3, "2026-02-02T00:00:00Z")
+        merged = WarcStats()
+
+        merged.merge(other)
+
+        self.assertEqual(merged, other)
+
+
+class TestScanRemoteWarc(unittest.TestCase):
+    """Tests for scanning a CC-NEWS path or URL straight from HTTP."""
+
+    REMOTE_PATH = "crawl-data/CC-NEWS/2026/02/CC-NEWS-20260204051206-06668.warc.gz"
+
+    def setUp(self):
+        """Write a local WARC file to serve."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.local_path = os.path.join(self.tmp_dir, "local.warc.gz")
+        write_warc(
+            self.local_path,
+            [
+                request("http://example.com/a"),
+                response("http://example.com/a", b"<html>" + b"a" * 200_000 + b"</html>"),
+                response("http://example.com/b.png", b"\x89PNG", "image/png"),
+            ],
+        )
+        with open(self.local_path, "rb") as f:
+            self.data = f.read()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_matches_local_scan(self):
+        """Relative paths and URLs should be streamed and scanned like the local file."""
+        with (
+            serve_files({f"/{self.REMOTE_PATH}": self.data}) as server,
+            patch("cc_news_analyzer.index.CC_NEWS_BASE_URL", server.url("")),
+        ):
+            for remote in (self.REMOTE_PATH, server.url(f"/{self.REMOTE_PATH}")):
+                for headers_only in (False, True):
+                    with self.subTest(remote=remote, headers_only=headers_only):
+                        self.assertEqual(
+                            scan_warc(remote, headers_only=headers_only, write_index=True),
+                            scan_warc(self.local_path, headers_only=headers_only),
+                        )
+
+        self.assertFalse(os.path.exists(self.REMOTE_PATH))
+        self.assertFalse(os.path.exists(os.path.basename(self.REMOTE_PATH)))
+
+    def test_missing_remote_file_raises(self):
+        """Should raise the HTTP error for a path the server does not have."""
+        with (
+            serve_files({}) as server,
+            patch("cc_news_analyzer.index.CC_NEWS_BASE_URL", server.url("")),
+            self.assertRaises(OSError),
+        ):
+            count_records(self.REMOTE_PATH)
+
+    def test_relative_path_that_is_not_remote_raises(self):
+        """Should still raise FileNotFoundError for a missing local file."""
+        with self.assertRaises(FileNotFoundError):
+            scan_warc("missing/file.warc.gz")
+
+
+class TestReadPrefix(unittest.TestCase):
+    """Tests for read_prefix()."""
+
+    def test_reads_at_most_limit_bytes(self):
+        """Should stop at the limit without reading further."""
+        stream = io.BytesIO(b"x" * 100_000)
+
+        self.assertEqual(read_prefix(stream, 10_000), b"x" * 10_000)
+        self.assertEqual(stream.tell(), 10_000)
+
+    def test_stops_after_sentinel(self):
+        """Should return the bytes up to and including the sentinel, matched case-insensitively."""
+        stream = io.BytesIO(b"<html><head><title>t</title></HEAD><body>" + b"x" * 100_000)
+
+        self.assertEqual(read_prefix(stream, 50_000, b"</head>"), b"<html><head><title>t</title></HEAD>")
+        self.assertLessEqual(stream.tell(), 4096)
+
+    def test_finds_sentinel_split_across_chunks(self):
+        """Should find a sentinel that straddles two reads."""
+        data = b"a" * 4093 + b"</head>" + b"b" * 10_000
+
+        self.assertEqual(read_prefix(io.BytesIO(data), 50_000, b"</head>"), data[:4100])
+
+    def test_short_stream_without_sentinel(self):
+        """Should return the whole stream when it is shorter than the limit."""
+        self.assertEqual(read_prefix(io.BytesIO(b"<p>short</p>"), 1000, b"</head>"), b"<p>short</p>")
+
+
+class TestIterPayloadPrefixes(unittest.TestCase):
+    """Tests for iter_payload_prefixes()."""
+
+    def setUp(self):
+        """Write WARC files with large articles, a gzip-encoded one and other records."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.head = b"<html><head><title>Story</title></head>"
+        records = []
+        for n in range(5):
+            uri = f"http://example.com/{n}"
+            records.append(request(uri))
+            records.append(response(uri, self.head + b"<body>" + b"x" * 200_000 + b"</body></html>"))
+            records.append(response(uri + ".png", b"\x89PNG", "image/png"))
+        records.append(
+            response(
+                "http://example.com/encoded",
+                gzip.compress(self.head + b"y" * 50_000),
+                headers=[("Content-Encoding", "gzip")],
+            )
+        )
+        self.paths = []
+        for extension in (".warc.gz", ".warc"):
+            path = os.path.join(self.tmp_dir, "test" + extension)
+            write_warc(path, records)
+            self.paths.append(path)
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_reads_the_start_of_every_article(self):
+        """Should yield each article's decoded payload up to the sentinel, in order."""
+        for path in self.paths:
+            with self.subTest(path=os.path.basename(path)):
+                prefixes = list(iter_payload_prefixes(path, sentinel=b"</head>"))
+
+                self.assertEqual(len(prefixes), 6)
+                self.assertEqual({prefix.prefix for prefix in prefixes}, {self.head})
+                self.assertEqual(prefixes[2].uri, "http://example.com/2")
+                self.assertEqual(prefixes[5].uri, "http://example.com/encoded")
+
+    def test_stops_at_the_limit(self):
+        """Should read no more than the limit from each payload."""
+        prefixes = list(iter_payload_prefixes(self.paths[0], limit=100))
+
+        self.assertEqual([len(prefix.prefix) for prefix in prefixes], [100] * 6)
+        self.assertTrue(prefixes[0].prefix.startswith(self.head))
+
+    def test_index_gives_the_same_prefixes(self):
+        """Should seek with the record index and yield the same prefixes and offsets as a scan."""
+        for path in self.paths:
+            with self.subTest(path=os.path.basename(path)):
+                scanned = list(iter_payload_prefixes(path, sentinel=b"</head>"))
+                build_record_index(path)
+
+                self.assertEqual(list(iter_payload_prefixes(path, sentinel=b"</head>")), scanned)
+
+    def test_missing_file_raises(self):
+        """Should raise FileNotFoundError for a missing local file."""
+        with self.assertRaises(FileNotFoundError):
+            list(iter_payload_prefixes(os.path.join(self.tmp_dir, "missing.warc.gz")))
+
+
 if __name__ == "__main__":
     unittest.main()
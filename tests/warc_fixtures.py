@@ -0,0 +1,85 @@
+"""Helpers for writing small, real WARC files in tests."""
+
+import os
+from io import BytesIO
+
+from warcio.statusandheaders import StatusAndHeaders
+from warcio.warcwriter import WARCWriter
+
+DEFAULT_DATE = "2026-02-01T00:00:00Z"
+
+
+def response(
+    uri: str,
+    body: bytes,
+    content_type: str = "text/html; charset=utf-8",
+    date: str | None = None,
+    headers: list[tuple[str, str]] | None = None,
+) -> dict:
+    """Describe a ``response`` record for :func:`write_warc`, with optional extra HTTP *headers*."""
+    return {
+        "type": "response",
+        "uri": uri,
+        "body": body,
+        "content_type": content_type,
+        "date": date,
+        "headers": headers or [],
+    }
+
+
+def request(uri: str, date: str | None = None) -> dict:
+    """Describe a ``request`` record for :func:`write_warc`."""
+    return {"type": "request", "uri": uri, "date": date}
+
+
+def write_warc(path: str, records: list[dict], *, warcinfo: bool = True) -> list[str]:
+    """Write records to *path*, gzip-compressed per record if it ends in ``.gz``.
+
+    Args:
+        path: Destination ``.warc`` or ``.warc.gz`` path.
+        records: Record descriptions from :func:`response` / :func:`request`.
+        warcinfo: Whether to start the file with a ``warcinfo`` record.
+
+    Returns:
+        The ``WARC-Record-ID`` of every written record, in order.
+    """
+    record_ids = []
+    with open(path, "wb") as out:
+        writer = WARCWriter(out, gzip=path.endswith(".gz"))
+        if warcinfo:
+            info = writer.create_warcinfo_record(path, {"software": "tests"})
+            info.rec_headers.replace_header("WARC-Date", DEFAULT_DATE)
+            writer.write_record(info)
+            record_ids.append(info.rec_headers.get_header("WARC-Record-ID"))
+        for spec in records:
+            record = _build_record(writer, spec)
+            writer.write_record(record)
+            record_ids.append(record.rec_headers.get_header("WARC-Record-ID"))
+    return record_ids
+
+
+def rewrite_in_place(path: str) -> None:
+    """Overwrite the last byte of a file, keeping its size and inode but moving its mtime a second later."""
+    st = os.stat(path)
+    with open(path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+    # filesystem timestamps can be coarser than the time the write takes
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def _build_record(writer: WARCWriter, spec: dict):
+    """Create a warcio record object from a record description."""
+    if spec["type"] == "request":
+        http_headers = StatusAndHeaders("GET / HTTP/1.1", [("Host", "example.com")], is_http_request=True)
+        payload = b""
+    else:
+        http_headers = StatusAndHeaders(
+            "200 OK", [("Content-Type", spec["content_type"]), *spec.get("headers", [])], protocol="HTTP/1.1"
+        )
+        payload = spec["body"]
+    record = writer.create_warc_record(spec["uri"], spec["type"], payload=BytesIO(payload), http_headers=http_headers)
+    record.rec_headers.replace_header("WARC-Date", spec.get("date") or DEFAULT_DATE)
+    return record